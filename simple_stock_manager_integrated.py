@@ -15,6 +15,7 @@ from datetime import datetime, timedelta
 import requests
 from bs4 import BeautifulSoup
 import re
+from concurrent.futures import ThreadPoolExecutor
 from filelock import FileLock
 import importlib
 import smtplib
@@ -49,6 +50,12 @@ NOTIFICATIONS_FILE = os.path.join(BASE_PATH, "notifications.json")
 EMAIL_CONFIG_FILE = os.path.join(BASE_PATH, "email_config.json")
 os.makedirs(BASE_PATH, exist_ok=True)
 
+# 주가 업데이트 주기 및 조회 동시성 (사이클 초과 시 상한까지 상향, 상한은 조회처 부하 고려)
+PRICE_UPDATE_INTERVAL = 60
+MIN_FETCH_WORKERS = 1
+MAX_FETCH_WORKERS = 4
+MAX_SHED_LEVEL = 3  # 감축 단계 n: 알림가에서 먼 종목의 n/4를 이번 사이클에서 제외
+
 # 전역 변수
 monitoring_stocks = {}
 notifications = []
@@ -56,6 +63,7 @@ daemon_process = None
 update_thread = None
 is_running = False
 update_event = None
+price_cycle = None  # 주가 업데이트 사이클 제어기 (CycleController)
 
 # PyKrx 사용 가능 여부 확인
 try:
@@ -496,18 +504,119 @@ def send_daily_summary_email():
         return False
 
 # 주가 정보 업데이트 스레드
+class CycleController:
+    """
+    주가 업데이트 사이클 초과 감지 및 조회 동시성 조정
+    - 초과(소요 > 주기): 동시성 +1, 이미 상한이면 감축 단계 +1
+    - 여유(소요 < 주기의 절반): 감축 단계부터 -1, 감축이 없으면 동시성 -1
+    """
+    def __init__(self, interval, min_workers=MIN_FETCH_WORKERS, max_workers=MAX_FETCH_WORKERS, max_shed_level=MAX_SHED_LEVEL):
+        self.interval = interval
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.max_shed_level = max_shed_level
+        self.workers = min_workers
+        self.shed_level = 0
+        self.cycles = 0
+        self.overruns = 0
+        self.last_duration = 0.0
+        self.max_duration = 0.0
+        self.last_lag = 0.0
+        self.last_shed_count = 0
+
+    @property
+    def shed_ratio(self):
+        return self.shed_level / (self.max_shed_level + 1)
+
+    def record(self, duration):
+        """사이클 소요 시간 반영, 초과 여부 반환"""
+        overrun = duration > self.interval
+        self.cycles += 1
+        self.last_duration = duration
+        self.max_duration = max(self.max_duration, duration)
+        self.last_lag = max(0.0, duration - self.interval)
+        if overrun:
+            self.overruns += 1
+            if self.workers < self.max_workers:
+                self.workers += 1
+                logger.warning(f"주가 업데이트 주기 초과 ({duration:.1f}초) - 조회 동시성 {self.workers}로 상향")
+            elif self.shed_level < self.max_shed_level:
+                self.shed_level += 1
+                logger.warning(f"주가 업데이트 주기 초과 ({duration:.1f}초) - 원거리 종목 {self.shed_ratio:.0%} 감축")
+            else:
+                logger.warning(f"주가 업데이트 주기 초과 ({duration:.1f}초) - 동시성/감축 모두 상한")
+        elif duration < self.interval * 0.5:
+            if self.shed_level > 0:
+                self.shed_level -= 1
+            elif self.workers > self.min_workers:
+                self.workers -= 1
+        return overrun
+
+    def summary(self):
+        """상태 표시줄용 요약"""
+        text = f"사이클 {self.last_duration:.1f}초 (최대 {self.max_duration:.1f}초) | 초과 {self.overruns}/{self.cycles}회 | 동시성 {self.workers}"
+        if self.last_shed_count:
+            text += f" | 감축 {self.last_shed_count}종목"
+        return text
+
+def alert_distance(stock_info):
+    """현재가와 가장 가까운 알림가 사이 거리 (%), 가격 미조회 종목은 0(최우선), 알림가가 없으면 무한대"""
+    current_price = stock_info.get("current_price") or 0
+    if current_price <= 0:
+        return 0.0
+    prices = [a.get("price", 0) for a in stock_info.get("alert_prices", [])]
+    prices = [p for p in prices if p and p > 0]
+    if not prices:
+        return float("inf")
+    return min(abs(current_price - p) / current_price * 100 for p in prices)
+
+def is_stale(stock_info, stale_before):
+    """마지막 갱신이 기준 시각보다 오래됐거나 갱신 기록이 없는지 여부"""
+    last_checked = stock_info.get("last_checked")
+    try:
+        return not last_checked or datetime.strptime(last_checked, "%Y-%m-%d %H:%M:%S") < stale_before
+    except ValueError:
+        return True
+
+def select_update_targets(stocks, shed_ratio):
+    """
+    감축 비율만큼 알림가에서 먼 종목을 이번 사이클에서 제외
+    단, 마지막 갱신이 주기의 5배보다 오래된 종목은 감축하지 않는다.
+    """
+    codes = list(stocks)
+    shed_count = int(len(codes) * shed_ratio)
+    if shed_count <= 0:
+        return codes, 0
+    stale_before = datetime.now() - timedelta(seconds=PRICE_UPDATE_INTERVAL * 5)
+    candidates = sorted(
+        (code for code in codes if not is_stale(stocks[code], stale_before)),
+        key=lambda code: alert_distance(stocks[code]),
+        reverse=True
+    )
+    shed_codes = set(candidates[:shed_count])
+    return [code for code in codes if code not in shed_codes], len(shed_codes)
+
 def update_prices_thread():
     """백그라운드에서 주가 정보를 주기적으로 업데이트합니다."""
-    global monitoring_stocks, is_running, update_event
+    global monitoring_stocks, is_running, update_event, price_cycle
     daily_mail_sent = False  # 1일 1회 발송 플래그
+    price_cycle = CycleController(PRICE_UPDATE_INTERVAL)
     while is_running:
         try:
             now = datetime.now()
             # 09:00~15:35만 주가 업데이트
             if (now.hour > 9 or (now.hour == 9 and now.minute >= 0)) and (now.hour < 15 or (now.hour == 15 and now.minute <= 35)):
-                for stock_code, stock_info in list(monitoring_stocks.items()):
+                cycle_start = time.time()
+                stocks = dict(monitoring_stocks)
+                targets, price_cycle.last_shed_count = select_update_targets(stocks, price_cycle.shed_ratio)
+                # 조회만 병렬로, 결과 반영/알림 확인은 순차 처리
+                with ThreadPoolExecutor(max_workers=price_cycle.workers) as pool:
+                    results = list(zip(targets, pool.map(get_stock_price, targets)))
+                for stock_code, (current_price, change_percent, error) in results:
+                    if stock_code not in monitoring_stocks:  # 조회 중 삭제된 종목
+                        continue
+                    stock_info = stocks[stock_code]
                     try:
-                        current_price, change_percent, error = get_stock_price(stock_code)
                         if not error and current_price is not None:
                             previous_price = stock_info.get("current_price", 0)
                             monitoring_stocks[stock_code]["current_price"] = current_price
@@ -525,7 +634,10 @@ def update_prices_thread():
                 if update_event is not None:
                     update_event.set()
                 save_data()
-                time.sleep(60)
+                duration = time.time() - cycle_start
+                price_cycle.record(duration)
+                logger.info(f"주가 업데이트 사이클: {len(targets)}종목 - {price_cycle.summary()}")
+                time.sleep(max(0, PRICE_UPDATE_INTERVAL - duration))
                 daily_mail_sent = False  # 장중에는 매일 플래그 초기화
             else:
                 # 15:35~15:40 사이에만 1회 요약 메일 발송
@@ -841,6 +953,8 @@ class SimpleStockManager:
             if self.update_event.is_set():
                 self.update_stock_list()
                 self.update_notification_list()
+                if price_cycle is not None and price_cycle.cycles:
+                    self.status_label.config(text=f"모니터링 중 | {price_cycle.summary()}")
                 self.update_event.clear()
             self.root.after(1000, self.schedule_ui_update)
 
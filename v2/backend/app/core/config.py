@@ -50,6 +50,19 @@ class Settings(BaseSettings):
     stock_update_interval: int = 10  # 10 seconds
     market_open_time: str = "09:00"
     market_close_time: str = "15:35"
+    price_fetch_concurrency: int = 8  # 주가 동시 조회 한도 (적응형 제어 시작값)
+    price_fetch_min_concurrency: int = 2   # 적응형 제어 하한
+    price_fetch_max_concurrency: int = 16  # 적응형 제어 상한 (주가 제공자 호출 제한 고려)
+    cycle_max_shed_level: int = 3          # 상한 초과 시 저우선 종목 감축 단계 (단계당 25%)
+    cycle_low_watermark: float = 0.5       # 소요 시간이 주기의 이 비율 미만이면 감축/동시성 완화
+    
+    # === 블로킹 작업 실행기 (이벤트 루프 보호) ===
+    pykrx_executor_workers: int = 4        # PyKrx/pandas 스레드 수
+    pykrx_executor_max_pending: int = 16   # PyKrx 동시 제출 한도
+    parser_executor_workers: int = 2       # HTML 파싱 프로세스 수
+    parser_executor_max_pending: int = 8   # HTML 파싱 동시 제출 한도
+    smtp_executor_workers: int = 2         # SMTP 발송 스레드 수
+    smtp_executor_max_pending: int = 20    # SMTP 동시 제출 한도
     
     # === WebSocket ===
     max_websocket_connections: int = 100
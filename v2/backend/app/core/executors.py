@@ -0,0 +1,167 @@
+"""
+V2 Investment Monitor - 블로킹 작업 실행기
+PyKrx/pandas, HTML 파싱, SMTP 등 동기 작업을 이벤트 루프 밖으로 분리
+"""
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+import logging
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _timed_call(func: Callable, *args) -> tuple:
+    """워커에서 실행되어 결과와 워커 점유 시간을 함께 반환 (프로세스 풀 호환을 위해 모듈 수준 함수)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+class BlockingExecutor:
+    """동시성 한도가 있는 스레드/프로세스 실행기 (호출별 점유 시간 기록)"""
+
+    def __init__(self, name: str, kind: str, max_workers: int, max_pending: int, history_size: int = 200):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"지원하지 않는 실행기 유형: {kind}")
+
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+
+        self._pool: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        # 통계
+        self.calls = 0
+        self.failures = 0
+        self.active = 0
+        self.max_active = 0
+        self.total_held = 0.0
+        self.total_wait = 0.0
+        self.max_held = 0.0
+        self.recent = deque(maxlen=history_size)
+
+    def _get_pool(self) -> Executor:
+        """풀 지연 생성 (프로세스 풀은 첫 사용 시에만 기동)"""
+        if self._pool is None:
+            if self.kind == "thread":
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{self.name}-worker")
+            else:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            logger.info(f"[EXECUTOR] {self.name} {self.kind} 풀 creating (workers={self.max_workers}, pending={self.max_pending})")
+        return self._pool
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """제출 한도 세마포어 (실행 중인 이벤트 루프에서 생성)"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+        return self._semaphore
+
+    async def run(self, func: Callable, *args, label: Optional[str] = None) -> Any:
+        """블로킹 함수를 워커에서 실행하고 결과 반환"""
+        loop = asyncio.get_running_loop()
+        submitted = time.perf_counter()
+
+        async with self._get_semaphore():
+            acquired = time.perf_counter()
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+            held = None
+            success = False
+            try:
+                result, held = await loop.run_in_executor(self._get_pool(), _timed_call, func, *args)
+                success = True
+                return result
+            finally:
+                self.active -= 1
+                total = time.perf_counter() - submitted
+                wait_time = acquired - submitted
+                self._record(func, label, wait_time, held if held is not None else total, total, success)
+
+    def _record(self, func: Callable, label: Optional[str], wait_time: float, held: float, total: float, success: bool):
+        """호출별 타이밍 기록"""
+        self.calls += 1
+        if not success:
+            self.failures += 1
+        self.total_held += held
+        self.total_wait += wait_time
+        self.max_held = max(self.max_held, held)
+
+        self.recent.append({
+            "function": getattr(func, "__name__", str(func)),
+            "label": label,
+            "queue_wait_ms": round(wait_time * 1000, 2),
+            "worker_held_ms": round(held * 1000, 2),
+            "total_ms": round(total * 1000, 2),
+            "success": success,
+            "finished_at": datetime.now().isoformat()
+        })
+
+    def get_stats(self, recent: int = 20) -> Dict:
+        """실행기 통계"""
+        held_samples = sorted(entry["worker_held_ms"] for entry in self.recent)
+        p95 = held_samples[int(0.95 * (len(held_samples) - 1))] if held_samples else None
+
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "started": self._pool is not None,
+            "active": self.active,
+            "max_active": self.max_active,
+            "calls": self.calls,
+            "failures": self.failures,
+            "avg_worker_held_ms": round(self.total_held / self.calls * 1000, 2) if self.calls else None,
+            "p95_worker_held_ms": p95,
+            "max_worker_held_ms": round(self.max_held * 1000, 2),
+            "avg_queue_wait_ms": round(self.total_wait / self.calls * 1000, 2) if self.calls else None,
+            "recent_calls": list(self.recent)[-recent:] if recent > 0 else []
+        }
+
+    def shutdown(self):
+        """풀 종료"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            logger.info(f"[EXECUTOR] {self.name} 풀 stopping")
+
+
+# === 전역 실행기 ===
+executors: Dict[str, BlockingExecutor] = {
+    "pykrx": BlockingExecutor(
+        "pykrx", "thread",
+        settings.pykrx_executor_workers, settings.pykrx_executor_max_pending
+    ),
+    "parser": BlockingExecutor(
+        "parser", "process",
+        settings.parser_executor_workers, settings.parser_executor_max_pending
+    ),
+    "smtp": BlockingExecutor(
+        "smtp", "thread",
+        settings.smtp_executor_workers, settings.smtp_executor_max_pending
+    ),
+}
+
+
+async def run_blocking(executor_name: str, func: Callable, *args, label: Optional[str] = None) -> Any:
+    """이름으로 지정한 실행기에서 블로킹 함수 실행"""
+    return await executors[executor_name].run(func, *args, label=label)
+
+
+def get_executor_stats(recent: int = 20) -> Dict:
+    """전체 실행기 통계"""
+    return {name: executor.get_stats(recent) for name, executor in executors.items()}
+
+
+def shutdown_executors():
+    """전체 실행기 종료"""
+    for executor in executors.values():
+        executor.shutdown()
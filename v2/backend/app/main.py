@@ -9,12 +9,15 @@ from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 import asyncio
 import logging
+import time
 from typing import List, Dict
 import json
 from pathlib import Path
 
 from app.core.config import settings
 from app.core.database import init_database, close_database, check_database_health
+from app.core.executors import shutdown_executors
+from app.core.cycle_control import cycle_controllers
 from app.routers import dart_router, stock_router, notification_router, system_router
 from app.services.dart_service import dart_service
 from app.services.stock_service import stock_service
@@ -51,6 +54,9 @@ async def lifespan(app: FastAPI):
     # 백그라운드 task stopped
     await stop_background_tasks()
     
+    # 블로킹 작업 실행기 stopping
+    shutdown_executors()
+    
     # 데이터베이스 connected stopping
     await close_database()
     
@@ -272,13 +278,18 @@ async def dart_monitoring_task():
             await asyncio.sleep(60)  # error 시 1 minutes 대기
 
 async def stock_monitoring_task():
-    """주식 가격 모니터링 백그라운드 task"""
+    """주식 가격 모니터링 백그라운드 task (사이클 초과 시 동시성 상향/저우선 종목 감축)"""
+    controller = cycle_controllers["stock_prices"]
     while True:
         try:
             # 장  hours에만 실행
             if stock_service.is_market_open():
                 logger.info("[STOCK] 주가 updating in progress...")
-                result = await stock_service.update_all_prices()
+                cycle_start = time.perf_counter()
+                result = await stock_service.update_all_prices(
+                    concurrency=controller.concurrency,
+                    shed_ratio=controller.shed_ratio
+                )
                 
                 if result["updated_count"] > 0:
                     # updating된 주가 info broadcast
@@ -290,7 +301,10 @@ async def stock_monitoring_task():
                         "alert_count": result["alert_count"]
                     })
                 
-                await asyncio.sleep(settings.stock_update_interval)
+                # 사이클 측정 후 남은 주기만큼만 대기 (초과 시 즉시 다음 사이클)
+                duration = time.perf_counter() - cycle_start
+                controller.record(duration, settings.stock_update_interval)
+                await asyncio.sleep(max(0.0, settings.stock_update_interval - duration))
             else:
                 # 장 마감  hours에는 30 minutes 대기
                 await asyncio.sleep(30 * 60)
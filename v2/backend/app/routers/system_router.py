@@ -13,6 +13,8 @@ from pathlib import Path
 
 from ..core.config import settings
 from ..core.database import check_database_health, database
+from ..core.executors import get_executor_stats
+from ..core.cycle_control import get_cycle_stats
 from ..services.dart_service import dart_service
 from ..services.stock_service import stock_service
 from ..services.notification_service import notification_service
@@ -384,6 +386,38 @@ async def get_websocket_connections():
         logger.error(f"[ERROR] WebSocket connected info querying failed: {e}")
         raise HTTPException(status_code=500, detail="WebSocket connected info querying 중 error가 발생했습니다.")
 
+# === 블로킹 작업 실행기 ===
+
+@router.get("/executors")
+async def get_executors_status(
+    recent: int = Query(20, ge=0, le=200, description="최근 호출 기록 개수")
+):
+    """블로킹 작업 실행기 상태 (호출별 워커 점유 시간 포함)"""
+    try:
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "executors": get_executor_stats(recent)
+        }
+        
+    except Exception as e:
+        logger.error(f"[ERROR] 실행기 상태 querying failed: {e}")
+        raise HTTPException(status_code=500, detail="실행기 상태 querying 중 error가 발생했습니다.")
+
+@router.get("/cycles")
+async def get_cycles_status(
+    recent: int = Query(20, ge=0, le=100, description="최근 사이클 기록 개수")
+):
+    """주기 작업 지표 (사이클 소요 시간, 지연, 초과 횟수, 적응형 동시성/감축 단계)"""
+    try:
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "cycles": get_cycle_stats(recent)
+        }
+        
+    except Exception as e:
+        logger.error(f"[ERROR] 주기 작업 지표 querying failed: {e}")
+        raise HTTPException(status_code=500, detail="주기 작업 지표 querying 중 error가 발생했습니다.")
+
 # === 시스템 관리 task ===
 
 @router.post("/maintenance/cleanup")
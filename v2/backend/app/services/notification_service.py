@@ -13,6 +13,7 @@ import json
 
 from ..core.config import settings
 from ..core.database import database
+from ..core.executors import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -152,11 +153,8 @@ class NotificationService:
             html_part = MIMEText(html_content, 'html', 'utf-8')
             msg.attach(html_part)
             
-            # SMTP sending
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.email_sender, self.email_password)
-                server.send_message(msg)
+            # SMTP sending (smtp 스레드 풀에서 실행)
+            await run_blocking("smtp", self._smtp_send, msg, label=title)
             
             # sending 상태 updating
             await self._update_notification_sent_status(title, True)
@@ -169,6 +167,13 @@ class NotificationService:
             await self._update_notification_sent_status(title, False)
             return False
     
+    def _smtp_send(self, msg: MIMEMultipart) -> None:
+        """SMTP 동기 sending (워커 스레드에서 실행)"""
+        with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=30) as server:
+            server.starttls()
+            server.login(self.email_sender, self.email_password)
+            server.send_message(msg)
+    
     async def _update_notification_sent_status(self, title: str, is_sent: bool) -> None:
         """알림 sending 상태 updating"""
         query = """
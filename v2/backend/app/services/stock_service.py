@@ -4,16 +4,18 @@ V2 Investment Monitor - 주식 모니터링 서비스
 """
 import httpx
 import asyncio
+import time
 from datetime import datetime, time as dt_time, timedelta
 from typing import List, Dict, Optional
 import logging
 import json
 import re
 from pathlib import Path
-from bs4 import BeautifulSoup
 
 from ..core.config import settings
 from ..core.database import database
+from ..core.executors import run_blocking
+from ..utils.html_parsers import parse_naver_quote_html
 from .notification_service import NotificationService
 
 logger = logging.getLogger(__name__)
@@ -28,6 +30,51 @@ except ImportError:
     logger.warning("[WARNING] PyKrx 라이브러리 없음, 웹 스크래핑 사용")
 
 
+def _fetch_pykrx_quote(stock_code: str) -> Optional[Dict]:
+    """PyKrx 동기 조회 (pandas 연산 포함, 이벤트 루프 밖의 워커 스레드에서 실행)"""
+    today = datetime.now().strftime("%Y%m%d")
+    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y%m%d")
+    
+    # 현재가 querying - 오늘 데이터가 없으면 어제 데이터 사용
+    current_price = stock.get_market_ohlcv_by_date(today, today, stock_code)
+    if current_price.empty:
+        # 장이 열리지 않았거나 데이터가 없는 경우 어제 데이터 사용
+        current_price = stock.get_market_ohlcv_by_date(yesterday, yesterday, stock_code)
+        if current_price.empty:
+            return None
+    
+    price_data = current_price.iloc[-1]
+    
+    # 전일 종가와 비교하여 변화율 계산
+    try:
+        prev_data = stock.get_market_ohlcv_by_date(yesterday, yesterday, stock_code)
+        if not prev_data.empty:
+            prev_close = prev_data.iloc[-1]['종가']
+            current = price_data['종가']
+            change = current - prev_close
+            change_rate = (change / prev_close) * 100 if prev_close != 0 else 0
+        else:
+            # 전일 데이터가 없으면 시가 대비로 계산
+            prev_close = price_data['시가']
+            current = price_data['종가']
+            change = current - prev_close
+            change_rate = (change / prev_close) * 100 if prev_close != 0 else 0
+            
+    except:
+        # 계산 failed 시 0으로 설정
+        current = price_data['종가']
+        change = 0
+        change_rate = 0
+    
+    return {
+        "price": float(current),
+        "change": float(change),
+        "change_rate": float(change_rate),
+        "volume": int(price_data['거래량']),
+        "updated_at": datetime.now().isoformat()
+    }
+
+
 class StockService:
     """주식 모니터링 서비스 (기존 GUI → 웹 서비스)"""
     
@@ -109,101 +156,55 @@ class StockService:
         return PYKRX_AVAILABLE
     
     async def get_stock_price_pykrx(self, stock_code: str) -> Optional[Dict]:
-        """PyKrx로 주가 info querying (기존 로직)"""
+        """PyKrx로 주가 info querying (기존 로직, pykrx 스레드 풀에서 실행)"""
         if not PYKRX_AVAILABLE:
             return None
         
         try:
-            today = datetime.now().strftime("%Y%m%d")
-            yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y%m%d")
-            
-            # 현재가 querying - 오늘 데이터가 없으면 어제 데이터 사용
-            current_price = stock.get_market_ohlcv_by_date(today, today, stock_code)
-            if current_price.empty:
-                # 장이 열리지 않았거나 데이터가 없는 경우 어제 데이터 사용
-                current_price = stock.get_market_ohlcv_by_date(yesterday, yesterday, stock_code)
-                if current_price.empty:
-                    return None
-            
-            price_data = current_price.iloc[-1]
-            
-            # 전일 종가와 비교하여 변화율 계산
-            try:
-                prev_data = stock.get_market_ohlcv_by_date(yesterday, yesterday, stock_code)
-                if not prev_data.empty:
-                    prev_close = prev_data.iloc[-1]['종가']
-                    current = price_data['종가']
-                    change = current - prev_close
-                    change_rate = (change / prev_close) * 100 if prev_close != 0 else 0
-                else:
-                    # 전일 데이터가 없으면 시가 대비로 계산
-                    prev_close = price_data['시가']
-                    current = price_data['종가']
-                    change = current - prev_close
-                    change_rate = (change / prev_close) * 100 if prev_close != 0 else 0
-                    
-            except:
-                # 계산 failed 시 0으로 설정
-                current = price_data['종가']
-                change = 0
-                change_rate = 0
-            
-            return {
-                "price": float(current),
-                "change": float(change),
-                "change_rate": float(change_rate),
-                "volume": int(price_data['거래량']),
-                "updated_at": datetime.now().isoformat()
-            }
+            return await run_blocking("pykrx", _fetch_pykrx_quote, stock_code, label=stock_code)
             
         except Exception as e:
             logger.error(f"[ERROR] PyKrx 주가 querying failed ({stock_code}): {e}")
             return None
     
-    async def get_stock_price_web(self, stock_code: str) -> Optional[Dict]:
-        """웹 스크래핑으로 주가 querying (Naver 증권, 기존 로직)"""
+    def _create_http_client(self) -> httpx.AsyncClient:
+        """Naver 증권 조회용 HTTP 클라이언트"""
+        return httpx.AsyncClient(
+            headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"},
+            timeout=15.0,
+            limits=httpx.Limits(max_connections=settings.price_fetch_concurrency)
+        )
+    
+    async def get_stock_price_web(self, stock_code: str, client: Optional[httpx.AsyncClient] = None) -> Optional[Dict]:
+        """웹 스크래핑으로 주가 querying (Naver 증권, 기존 로직, HTML 파싱은 프로세스 풀에서 실행)
+        
+        client를 넘기면 해당 클라이언트의 connected 풀을 재사용한다
+        """
         url = f"https://finance.naver.com/item/main.nhn?code={stock_code}"
         
         try:
-            async with httpx.AsyncClient(
-                headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"},
-                timeout=15.0
-            ) as client:
+            if client is None:
+                async with self._create_http_client() as own_client:
+                    response = await own_client.get(url)
+            else:
                 response = await client.get(url)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # 현재가 추출
-                price_element = soup.select_one('.no_today .blind')
-                if not price_element:
-                    return None
-                
-                current_price = float(price_element.text.replace(',', ''))
-                
-                # 변화량 추출
-                change_element = soup.select_one('.no_exday .blind')
-                change = 0
-                if change_element:
-                    change_text = change_element.text.replace(',', '')
-                    change = float(change_text) if change_text.replace('-', '').replace('.', '').isdigit() else 0
-                
-                # 변화율 계산
-                change_rate = (change / (current_price - change)) * 100 if (current_price - change) != 0 else 0
-                
-                return {
-                    "price": current_price,
-                    "change": change,
-                    "change_rate": change_rate,
-                    "volume": 0,  # 웹에서는 거래량 생략
-                    "updated_at": datetime.now().isoformat()
-                }
+            response.raise_for_status()
+            
+            quote = await run_blocking("parser", parse_naver_quote_html, response.text, label=stock_code)
+            if not quote:
+                return None
+            
+            return {
+                **quote,
+                "volume": 0,  # 웹에서는 거래량 생략
+                "updated_at": datetime.now().isoformat()
+            }
                 
         except Exception as e:
             logger.error(f"[ERROR] 웹 주가 querying failed ({stock_code}): {e}")
             return None
     
-    async def get_stock_price(self, stock_code: str) -> Optional[Dict]:
+    async def get_stock_price(self, stock_code: str, client: Optional[httpx.AsyncClient] = None) -> Optional[Dict]:
         """주가 querying (PyKrx 우선, failed 시 웹 스크래핑)"""
         # PyKrx 시도
         price_data = await self.get_stock_price_pykrx(stock_code)
@@ -211,7 +212,7 @@ class StockService:
             return price_data
         
         # 웹 스크래핑 시도
-        return await self.get_stock_price_web(stock_code)
+        return await self.get_stock_price_web(stock_code, client)
     
     async def get_current_price(self, stock_code: str) -> Optional[Dict]:
         """현재 주가 querying (별칭 메서드)"""
@@ -281,49 +282,134 @@ class StockService:
             logger.error(f"[ERROR] 주식 제거 failed ({stock_code}): {e}")
             return False
     
-    async def update_all_prices(self) -> Dict:
-        """모든 모니터링 주식 가격 updating"""
-        updated_count = 0
+    @staticmethod
+    def _alert_distance(stock_info: Dict) -> float:
+        """현재가 기준 가장 가까운 목표가/손절가까지 거리 (%, 기준이 없으면 inf)"""
+        current_price = stock_info.get("current_price") or stock_info.get("price")
+        if not current_price:
+            return 0.0  # 가격 미조회 종목은 최우선
+        
+        levels = [level for level in (stock_info.get("target_price"), stock_info.get("stop_loss_price")) if level]
+        if not levels:
+            return float("inf")
+        return min(abs(level - current_price) / current_price * 100 for level in levels)
+    
+    def _select_update_targets(self, shed_ratio: float) -> tuple:
+        """
+        이번 사이클 조회 대상 선택
+        
+        shed_ratio > 0이면 알림 기준에서 가장 먼 종목부터 해당 비율만큼 건너뛴다.
+        단, 마지막 갱신이 주기의 5배보다 오래된 종목은 감축하지 않는다.
+        """
+        targets = [
+            (stock_code, stock_info)
+            for stock_code, stock_info in self.monitoring_stocks.items()
+            if stock_info.get("monitoring_enabled", True)
+        ]
+        shed_count = int(len(targets) * shed_ratio)
+        if not shed_count:
+            return targets, 0
+        
+        stale_before = datetime.now() - timedelta(seconds=settings.stock_update_interval * 5)
+        
+        def is_stale(stock_info: Dict) -> bool:
+            last_updated = stock_info.get("last_updated")
+            try:
+                return not last_updated or datetime.fromisoformat(str(last_updated)) < stale_before
+            except ValueError:
+                return True
+        
+        candidates = sorted(
+            (item for item in targets if not is_stale(item[1])),
+            key=lambda item: self._alert_distance(item[1]),
+            reverse=True
+        )
+        shed_codes = {stock_code for stock_code, _ in candidates[:shed_count]}
+        return [item for item in targets if item[0] not in shed_codes], len(shed_codes)
+    
+    async def update_all_prices(self, concurrency: Optional[int] = None, shed_ratio: float = 0.0) -> Dict:
+        """모든 모니터링 주식 가격 updating
+        
+        1) 조회: 공유 HTTP 클라이언트 + 세마포어로 동시 조회
+        2) 알림: 조회된 종목별 알림 체크
+        3) 저장: 단일 트랜잭션의 executemany로 DB 일괄 updating 후 파일 동기화
+        
+        Args:
+            concurrency: 동시 조회 한도 (생략 시 설정값, 주기 제어기가 조정)
+            shed_ratio: 알림 기준에서 먼 저우선 종목을 건너뛸 비율
+        """
+        cycle_start = time.perf_counter()
         alert_count = 0
         
-        for stock_code, stock_info in self.monitoring_stocks.items():
-            if not stock_info.get("monitoring_enabled", True):
+        targets, shed_count = self._select_update_targets(shed_ratio)
+        
+        # 1) 동시 조회
+        semaphore = asyncio.Semaphore(concurrency or settings.price_fetch_concurrency)
+        
+        async def fetch(stock_code: str) -> Optional[Dict]:
+            async with semaphore:
+                try:
+                    return await self.get_stock_price(stock_code, client)
+                except Exception as e:
+                    logger.error(f"[ERROR] 가격 querying failed ({stock_code}): {e}")
+                    return None
+        
+        async with self._create_http_client() as client:
+            results = await asyncio.gather(*(fetch(stock_code) for stock_code, _ in targets))
+        
+        fetch_done = time.perf_counter()
+        
+        # 2) 메모리 updating + 알림 체크
+        updated: List[tuple] = []
+        for (stock_code, stock_info), price_data in zip(targets, results):
+            if not price_data:
                 continue
             
             try:
-                # 현재 가격 querying
-                price_data = await self.get_stock_price(stock_code)
-                if not price_data:
-                    continue
-                
-                # 기존 info updating
                 old_price = stock_info.get("current_price")
                 stock_info.update(price_data)
+                stock_info["current_price"] = price_data.get("price") or old_price
                 stock_info["last_updated"] = datetime.now().isoformat()
+                updated.append((stock_code, price_data))
                 
-                # DB updating  
-                await self._update_stock_price_in_db(stock_code, price_data)
-                
-                # 알림 체크
                 alerts = await self._check_price_alerts(stock_info, old_price)
                 alert_count += len(alerts)
                 
-                updated_count += 1
-                
             except Exception as e:
                 logger.error(f"[ERROR] 가격 updating failed ({stock_code}): {e}")
         
-        # 메모리 → 파일 동기화
+        alert_done = time.perf_counter()
+        
+        # 3) DB 일괄 updating + 메모리 → 파일 동기화
+        try:
+            await self._update_stock_prices_in_db(updated)
+        except Exception as e:
+            logger.error(f"[ERROR] 주가 DB 일괄 updating failed: {e}")
+        
         self._save_monitoring_stocks()
         
+        persist_done = time.perf_counter()
+        
+        timings = {
+            "fetch_ms": round((fetch_done - cycle_start) * 1000, 1),
+            "alert_ms": round((alert_done - fetch_done) * 1000, 1),
+            "persist_ms": round((persist_done - alert_done) * 1000, 1),
+            "total_ms": round((persist_done - cycle_start) * 1000, 1)
+        }
+        
         result = {
-            "updated_count": updated_count,
+            "updated_count": len(updated),
             "alert_count": alert_count,
+            "shed_count": shed_count,
             "total_stocks": len(self.monitoring_stocks),
+            "timings": timings,
             "updated_at": datetime.now().isoformat()
         }
         
-        logger.info(f"💹 주가 updating completed: {updated_count} items 종목, {alert_count} items 알림")
+        logger.info(
+            f"💹 주가 updating completed: {len(updated)} items 종목, {alert_count} items 알림 "
+            f"(조회 {timings['fetch_ms']}ms, 알림 {timings['alert_ms']}ms, 저장 {timings['persist_ms']}ms)"
+        )
         return result
     
     async def _check_price_alerts(self, stock_info: Dict, old_price: Optional[float]) -> List[Dict]:
@@ -391,8 +477,11 @@ class StockService:
             "updated_at": now
         })
     
-    async def _update_stock_price_in_db(self, stock_code: str, price_data: Dict) -> None:
-        """데이터베이스의 주가 info updating"""
+    async def _update_stock_prices_in_db(self, updates: List[tuple]) -> None:
+        """여러 종목의 주가 info를 단일 트랜잭션으로 일괄 updating"""
+        if not updates:
+            return
+        
         query = """
             UPDATE stock_monitoring 
             SET current_price = :current_price, 
@@ -402,13 +491,20 @@ class StockService:
             WHERE stock_code = :stock_code
         """
         
-        await database.execute(query, {
-            "current_price": price_data["price"],
-            "change": price_data["change"], 
-            "change_rate": price_data["change_rate"],
-            "last_updated": datetime.now(),
-            "stock_code": stock_code
-        })
+        now = datetime.now()
+        values = [
+            {
+                "current_price": price_data["price"],
+                "change": price_data["change"],
+                "change_rate": price_data["change_rate"],
+                "last_updated": now,
+                "stock_code": stock_code
+            }
+            for stock_code, price_data in updates
+        ]
+        
+        async with database.transaction():
+            await database.execute_many(query, values)
     
     async def get_monitoring_stocks(self) -> List[Dict]:
         """모니터링 중인 주식 목록 querying"""
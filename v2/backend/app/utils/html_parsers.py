@@ -0,0 +1,35 @@
+"""
+V2 Investment Monitor - HTML 파서
+프로세스 풀에서 실행되므로 앱 설정/DB 등 부수효과가 있는 모듈을 import하지 않는다
+"""
+from typing import Dict, Optional
+
+from bs4 import BeautifulSoup
+
+
+def parse_naver_quote_html(html: str) -> Optional[Dict]:
+    """Naver 증권 종목 페이지에서 현재가/변화량 추출 (기존 get_stock_price_web 로직)"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # 현재가 추출
+    price_element = soup.select_one('.no_today .blind')
+    if not price_element:
+        return None
+
+    current_price = float(price_element.text.replace(',', ''))
+
+    # 변화량 추출
+    change_element = soup.select_one('.no_exday .blind')
+    change = 0
+    if change_element:
+        change_text = change_element.text.replace(',', '')
+        change = float(change_text) if change_text.replace('-', '').replace('.', '').isdigit() else 0
+
+    # 변화율 계산
+    change_rate = (change / (current_price - change)) * 100 if (current_price - change) != 0 else 0
+
+    return {
+        "price": current_price,
+        "change": change,
+        "change_rate": change_rate
+    }
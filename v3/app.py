@@ -21,15 +21,16 @@ from modules.config import (
     FLASK_PORT, 
     FLASK_DEBUG,
     DART_CHECK_INTERVAL,
-    STOCK_CHECK_INTERVAL,
-    STOCK_MARKET_OPEN_TIME,
-    STOCK_MARKET_CLOSE_TIME,
     LOG_LEVEL,
     LOGS_DIR,
     DATA_DIR  # 추가
 )
 from modules.dart_monitor import check_new_disclosures, send_dart_notifications
-from modules.stock_monitor import update_all_stocks, get_monitoring_stocks, stock_monitor
+from modules.stock_monitor import update_all_stocks, get_monitoring_stocks, stock_monitor, JOB_STOCK_PRICES
+from modules.monitor_scheduler import monitor_scheduler
+from modules.backtest import backtester, bar_cache, parse_overrides
+from modules.alert_expr import validate_expression
+from modules.alert_journal import validate_day
 from modules.email_utils import send_email, send_test_email
 
 # 개선된 로깅 시스템 설정
@@ -184,12 +185,12 @@ def create_success_response(data=None, message: str = None):
     
     return jsonify(response)
 
+# 통합 모니터링 스케줄러 작업 이름
+JOB_DART = 'dart'
+
 # 전역 상태 관리
 app_state = {
-    'dart_monitoring': False,
-    'stock_monitoring': False,
     'last_dart_check': None,
-    'last_stock_update': None,
     'dart_alerts_today': 0,
     'stock_alerts_today': 0,
     'system_start_time': datetime.now(),
@@ -198,7 +199,6 @@ app_state = {
 
 # 스레드 동시성 제어
 state_lock = threading.Lock()
-monitoring_threads = {}
 
 def add_alert_to_history(alert_type: str, title: str, message: str, priority: int = 1):
     """알림 히스토리에 추가"""
@@ -225,111 +225,53 @@ def add_alert_to_history(alert_type: str, title: str, message: str, priority: in
         elif alert_type == 'stock':
             app_state['stock_alerts_today'] += 1
 
-@log_exception('app')
-def dart_monitor_thread():
-    """DART 모니터링 백그라운드 스레드"""
-    dart_logger.info("DART 모니터링 스레드 시작", thread_name="dart_monitor")
-    
-    with state_lock:
-        app_state['dart_monitoring'] = True
-    
-    while app_state['dart_monitoring']:
-        try:
-            dart_logger.info("DART 공시 확인 시작", check_interval=DART_CHECK_INTERVAL)
-            
-            # 새로운 공시 확인
-            new_disclosures = check_new_disclosures()
-            
-            with state_lock:
-                app_state['last_dart_check'] = datetime.now().isoformat()
-            
-            if new_disclosures:
-                dart_logger.info("새로운 공시 발견", 
-                    disclosure_count=len(new_disclosures),
-                    companies=[d.get('corp_name', 'Unknown') for d in new_disclosures[:3]]  # 최대 3개만 표시
-                )
-                
-                # 이메일 알림 발송
-                sent_count = send_dart_notifications(new_disclosures)
-                email_logger.info("DART 알림 이메일 발송", sent_count=sent_count, requested_count=len(new_disclosures))
-                
-                # 알림 히스토리에 추가
-                for disclosure in new_disclosures:
-                    # 키워드 정보 가져오기
-                    keyword_info = disclosure.get('keyword_info', {})
-                    keywords_text = ', '.join(disclosure['keywords'])
-                    
-                    # AND 조건이 매칭된 경우 별도 표시
-                    if keyword_info.get('and_groups'):
-                        keywords_text += f" [AND: {', '.join(['+'.join(group) for group in keyword_info['and_groups']])}]"
-                    
-                    add_alert_to_history(
-                        'dart',
-                        f"{disclosure['company']} - {disclosure['title'][:50]}...",
-                        f"우선순위: {disclosure['priority']}점, 키워드: {keywords_text}, 조건: {keyword_info.get('filter_mode', 'OR')}",
-                        disclosure['priority']
-                    )
-            else:
-                logger.info("새로운 공시 없음")
-            
-            # 다음 체크까지 대기
-            time.sleep(DART_CHECK_INTERVAL)
-            
-        except Exception as e:
-            logger.error(f"DART 모니터링 오류: {e}")
-            time.sleep(60)  # 오류 시 1분 후 재시도
+def dart_check_job():
+    """DART 공시 확인 작업 (통합 모니터링 스케줄러에서 주기 실행)"""
+    dart_logger.info("DART 공시 확인 시작", check_interval=DART_CHECK_INTERVAL)
     
-    logger.info("DART 모니터링 스레드 종료")
-
-@log_exception('app')
-def stock_monitor_thread():
-    """주식 모니터링 백그라운드 스레드"""
-    stock_logger.info("주식 모니터링 스레드 시작", thread_name="stock_monitor")
+    # 새로운 공시 확인
+    new_disclosures = check_new_disclosures()
     
     with state_lock:
-        app_state['stock_monitoring'] = True
+        app_state['last_dart_check'] = datetime.now().isoformat()
     
-    while app_state['stock_monitoring']:
-        try:
-            stock_logger.info("주식 가격 업데이트 시작", 
-                update_interval=STOCK_CHECK_INTERVAL,
-                market_hours=f"{STOCK_MARKET_OPEN_TIME}-{STOCK_MARKET_CLOSE_TIME}"
-            )
-            
-            # 모든 종목 가격 업데이트
-            updated_stocks = update_all_stocks()
-            
-            with state_lock:
-                app_state['last_stock_update'] = datetime.now().isoformat()
-            
-            # 알림이 발생한 종목 확인
-            alert_count = 0
-            for stock_code, stock_info in updated_stocks.items():
-                if stock_info.get('triggered_alerts'):
-                    alert_count += len(stock_info['triggered_alerts'])
-                    
-                    # 알림 히스토리에 추가 (간단화)
-                    add_alert_to_history(
-                        'stock',
-                        f"{stock_info.get('name', stock_code)} 가격 알림",
-                        f"현재가: {stock_info.get('current_price', 0):,}원 ({stock_info.get('change_percent', 0):+.2f}%)",
-                        2
-                    )
-            
-            if alert_count > 0:
-                stock_logger.info("주식 가격 알림 발생", 
-                    alert_count=alert_count,
-                    updated_stocks_count=len(updated_stocks)
-                )
+    if new_disclosures:
+        dart_logger.info("새로운 공시 발견", 
+            disclosure_count=len(new_disclosures),
+            companies=[d.get('corp_name', 'Unknown') for d in new_disclosures[:3]]  # 최대 3개만 표시
+        )
+        
+        # 이메일 알림 발송
+        sent_count = send_dart_notifications(new_disclosures)
+        email_logger.info("DART 알림 이메일 발송", sent_count=sent_count, requested_count=len(new_disclosures))
+        
+        # 알림 히스토리에 추가
+        for disclosure in new_disclosures:
+            # 키워드 정보 가져오기
+            keyword_info = disclosure.get('keyword_info', {})
+            keywords_text = ', '.join(disclosure['keywords'])
             
-            # 다음 업데이트까지 대기
-            time.sleep(STOCK_CHECK_INTERVAL)
+            # AND 조건이 매칭된 경우 별도 표시
+            if keyword_info.get('and_groups'):
+                keywords_text += f" [AND: {', '.join(['+'.join(group) for group in keyword_info['and_groups']])}]"
             
-        except Exception as e:
-            logger.error(f"주식 모니터링 오류: {e}")
-            time.sleep(30)  # 오류 시 30초 후 재시도
-    
-    logger.info("주식 모니터링 스레드 종료")
+            add_alert_to_history(
+                'dart',
+                f"{disclosure['company']} - {disclosure['title'][:50]}...",
+                f"우선순위: {disclosure['priority']}점, 키워드: {keywords_text}, 조건: {keyword_info.get('filter_mode', 'OR')}",
+                disclosure['priority']
+            )
+    else:
+        logger.info("새로운 공시 없음")
+
+def on_stock_alert(hit: Dict, stock_info: Dict):
+    """주식 알림 발송 시 알림 히스토리에 추가 (StockMonitor 알림 리스너)"""
+    add_alert_to_history(
+        'stock',
+        f"{stock_info.get('name', hit['stock_code'])} 가격 알림",
+        f"현재가: {int(hit['price']):,}원 ({hit['change_percent']:+.2f}%)",
+        2
+    )
 
 # === 인증 관련 API 엔드포인트 ===
 
@@ -833,16 +775,16 @@ def get_status():
                 'start_time': app_state['system_start_time'].isoformat()
             },
             'dart_monitoring': {
-                'enabled': app_state['dart_monitoring'],
+                'enabled': monitor_scheduler.is_job_active(JOB_DART),
                 'last_check': app_state['last_dart_check'],
                 'alerts_today': app_state['dart_alerts_today'],
                 'check_interval': DART_CHECK_INTERVAL
             },
             'stock_monitoring': {
-                'enabled': app_state['stock_monitoring'],
-                'last_update': app_state['last_stock_update'],
+                'enabled': stock_monitor.is_monitoring,
+                'last_update': monitor_scheduler.get_job(JOB_STOCK_PRICES).metrics['last_finished_at'],
                 'alerts_today': app_state['stock_alerts_today'],
-                'update_interval': STOCK_CHECK_INTERVAL
+                'update_interval': stock_monitor.monitor_interval
             },
             'monitoring_stocks_count': len(get_monitoring_stocks()),
             'recent_alerts_count': len(app_state['recent_alerts'])
@@ -859,12 +801,12 @@ def get_stocks():
         # 강제 새로고침 파라미터 확인
         force_refresh = request.args.get('force_refresh', 'false').lower() == 'true'
         
-        # 강제 새로고침이 요청된 경우 주가 업데이트 수행
+        # 강제 새로고침이 요청된 경우 스케줄러에 주가 갱신 즉시 실행 예약 (결과는 다음 조회에 반영)
+        refresh_scheduled = False
         if force_refresh:
-            try:
-                update_all_stocks()
-            except Exception as e:
-                logger.warning(f"강제 새로고침 실패: {e}")
+            refresh_scheduled = stock_monitor.request_price_refresh()
+            if not refresh_scheduled:
+                logger.warning("강제 새로고침 예약 실패: 주가 갱신 작업 비활성 (모니터링 중지 상태)")
         
         # get_monitoring_stocks() 사용해서 데이터 로드
         stocks = get_monitoring_stocks()
@@ -875,7 +817,8 @@ def get_stocks():
             'update_count': 0,
             'total_stocks': len(stocks),
             'enabled_stocks': len([code for code, info in stocks.items() if info.get('enabled', True)]),
-            'data_version': '1.0'
+            'data_version': '1.0',
+            'refresh_scheduled': refresh_scheduled
         }        
         
         # JSON 직렬화를 위해 set을 list로 변환
@@ -1013,6 +956,50 @@ def mark_alert_read(alert_id):
             'error': str(e)
         }), 500
 
+@app.route('/api/v1/alerts/history', methods=['GET'])
+@login_required
+@performance_monitor('알림 이력 조회')
+@api_request_logger
+def get_alert_history():
+    """알림 이력 조회 (기간/종목/유형 필터, 커서 페이지네이션)"""
+    try:
+        from modules.alert_history import parse_time_bound
+        from modules.config import ALERT_HISTORY_PAGE_LIMIT
+        
+        try:
+            start = parse_time_bound(request.args.get('start'))
+            end = parse_time_bound(request.args.get('end'), end=True)
+        except ValueError:
+            return create_error_response("기간 형식이 올바르지 않습니다 (YYYY-MM-DD 또는 ISO 시각)", 'INVALID_DATE_FORMAT', 400)
+        
+        if start and end and end <= start:
+            return create_error_response("종료 시각이 시작 시각보다 빠릅니다", 'INVALID_DATE_RANGE', 400)
+        
+        limit = min(max(request.args.get('limit', 100, type=int), 1), ALERT_HISTORY_PAGE_LIMIT)
+        
+        try:
+            page = stock_monitor.query_alert_history(
+                start=start,
+                end=end,
+                stock_code=request.args.get('stock_code'),
+                alert_type=request.args.get('alert_type'),
+                cursor=request.args.get('cursor'),
+                limit=limit
+            )
+        except ValueError:
+            return create_error_response("커서 값이 올바르지 않습니다", 'INVALID_CURSOR', 400)
+        
+        return create_success_response({
+            'items': page['items'],
+            'count': len(page['items']),
+            'next_cursor': page['next_cursor'],
+            'has_next': page['next_cursor'] is not None,
+            'limit': limit
+        })
+        
+    except Exception as e:
+        return create_error_response(str(e), 'ALERT_HISTORY_ERROR')
+
 # === DART 관련 API 엔드포인트 ===
 
 @app.route('/api/v1/dart/companies')
@@ -1201,6 +1188,7 @@ def add_stock():
         
         # 확장된 필드
         acquisition_price = data.get('acquisition_price', 0)
+        quantity = data.get('quantity', 0)
         conversion_price = data.get('conversion_price', 0)  # 메자닌 전환가
         memo = data.get('memo', '').strip()
         alert_settings = data.get('alert_settings', {})
@@ -1224,6 +1212,10 @@ def add_stock():
         # 취득가 검증 (선택사항)
         if acquisition_price and acquisition_price < 0:
             return create_error_response("취득가는 0 이상이어야 합니다", 'INVALID_ACQUISITION_PRICE', 400)
+        
+        # 보유 수량 검증 (선택사항)
+        if quantity and quantity < 0:
+            return create_error_response("보유 수량은 0 이상이어야 합니다", 'INVALID_QUANTITY', 400)
         # 멤자닌 전환가 검증
         if category == '멤자닌':
             if not conversion_price or conversion_price <= 0:
@@ -1246,7 +1238,8 @@ def add_stock():
             acquisition_price=float(acquisition_price),
             alert_settings=alert_settings,
             memo=memo,
-            conversion_price=float(conversion_price) if conversion_price else 0
+            conversion_price=float(conversion_price) if conversion_price else 0,
+            quantity=float(quantity) if quantity else 0
         )
         
         if success:
@@ -1321,6 +1314,7 @@ def update_stock(stock_code):
         
         # 확장된 필드
         acquisition_price = data.get('acquisition_price')
+        quantity = data.get('quantity')
         memo = data.get('memo')
         alert_settings = data.get('alert_settings')
         
@@ -1337,6 +1331,9 @@ def update_stock(stock_code):
         if acquisition_price is not None and acquisition_price < 0:
             return create_error_response("취득가는 0 이상이어야 합니다", 'INVALID_ACQUISITION_PRICE', 400)
         
+        if quantity is not None and quantity < 0:
+            return create_error_response("보유 수량은 0 이상이어야 합니다", 'INVALID_QUANTITY', 400)
+        
         # 종목 정보 업데이트 (부분 업데이트 지원)
         success = update_monitoring_stock(
             stock_code=stock_code,
@@ -1347,7 +1344,8 @@ def update_stock(stock_code):
             acquisition_price=acquisition_price,
             alert_settings=alert_settings,
             memo=memo,
-            enabled=enabled
+            enabled=enabled,
+            quantity=quantity
         )
         
         if success:
@@ -1472,7 +1470,7 @@ def add_mezzanine_stock():
         if success:
             # 전환가격 추가
             stock_monitor.monitoring_stocks[stock_code]['conversion_price'] = int(conversion_price)
-            stock_monitor.save_monitoring_stocks(stock_monitor.monitoring_stocks)
+            stock_monitor.save_monitoring_stocks(codes=[stock_code])
             
             logger.info(f"메자닌 종목 추가 성공", 
                 stock_code=stock_code,
@@ -1516,7 +1514,7 @@ def migrate_stock_categories():
                     stock_info['triggered_alerts'] = set()
         
         if updated_count > 0:
-            stock_monitor.save_monitoring_stocks(stock_monitor.monitoring_stocks)
+            stock_monitor.save_monitoring_stocks()
         
         logger.info(f"카테고리 마이그레이션 완료", updated_count=updated_count)
         
@@ -1593,6 +1591,127 @@ def get_monitoring_status():
     except Exception as e:
         return create_error_response(str(e), 'MONITORING_STATUS_ERROR')
 
+@app.route('/api/v1/monitoring/scheduler')
+@login_required
+@performance_monitor('스케줄러 상태 조회')
+@api_request_logger
+def get_scheduler_status():
+    """통합 모니터링 스케줄러 및 작업별 지표 조회"""
+    try:
+        return create_success_response({
+            'scheduler': monitor_scheduler.get_status()
+        })
+
+    except Exception as e:
+        return create_error_response(str(e), 'SCHEDULER_STATUS_ERROR')
+
+@app.route('/api/v1/monitoring/scheduler/<action>', methods=['POST'])
+@login_required
+@performance_monitor('스케줄러 시작/중지')
+@api_request_logger
+def control_scheduler(action):
+    """통합 모니터링 스케줄러 시작/중지 (action: start | stop)"""
+    try:
+        if action == 'start':
+            changed = monitor_scheduler.start()
+        elif action == 'stop':
+            changed = monitor_scheduler.stop()
+        else:
+            return create_error_response(f"지원하지 않는 동작입니다: {action}", 'INVALID_ACTION', 400)
+
+        if not changed:
+            return create_error_response(
+                "스케줄러가 이미 실행 중입니다" if action == 'start' else "스케줄러가 실행되지 않고 있습니다",
+                'SCHEDULER_STATE_CONFLICT', 409
+            )
+
+        return create_success_response({'scheduler': monitor_scheduler.get_status()})
+
+    except Exception as e:
+        return create_error_response(str(e), 'SCHEDULER_CONTROL_ERROR')
+
+@app.route('/api/v1/monitoring/scheduler/jobs/<job_name>/<action>', methods=['POST'])
+@login_required
+@performance_monitor('스케줄러 작업 제어')
+@api_request_logger
+def control_scheduler_job(job_name, action):
+    """스케줄러 작업 제어 (action: start | stop | run)"""
+    try:
+        if action == 'start':
+            found = monitor_scheduler.enable_job(job_name)
+        elif action == 'stop':
+            found = monitor_scheduler.disable_job(job_name)
+        elif action == 'run':
+            found = monitor_scheduler.run_job_now(job_name)
+        else:
+            return create_error_response(f"지원하지 않는 동작입니다: {action}", 'INVALID_ACTION', 400)
+
+        if not found:
+            return create_error_response(f"등록되지 않은 작업입니다: {job_name}", 'JOB_NOT_FOUND', 404)
+
+        return create_success_response({'job': monitor_scheduler.get_job(job_name).to_dict()})
+
+    except Exception as e:
+        return create_error_response(str(e), 'SCHEDULER_JOB_CONTROL_ERROR')
+
+@app.route('/api/v1/monitoring/providers')
+@login_required
+@performance_monitor('주가 제공자 상태 조회')
+@api_request_logger
+def get_price_provider_stats():
+    """주가 제공자별 통계 및 최근 라우팅 결정 조회"""
+    try:
+        recent = min(request.args.get('recent', 20, type=int), 200)
+
+        return create_success_response({
+            'provider_stats': stock_monitor.get_provider_stats(recent)
+        })
+
+    except Exception as e:
+        return create_error_response(str(e), 'PROVIDER_STATS_ERROR')
+
+@app.route('/api/v1/monitoring/ticker-master')
+@login_required
+@performance_monitor('종목 마스터 상태 조회')
+@api_request_logger
+def get_ticker_master_stats():
+    """종목 마스터 상태 조회"""
+    try:
+        return create_success_response({
+            'ticker_master': stock_monitor.ticker_master.get_stats()
+        })
+
+    except Exception as e:
+        return create_error_response(str(e), 'TICKER_MASTER_STATS_ERROR')
+
+@app.route('/api/v1/monitoring/quote-cache')
+@login_required
+@performance_monitor('시세 캐시 상태 조회')
+@api_request_logger
+def get_quote_cache_stats():
+    """시세 캐시 적중률 및 상태 조회"""
+    try:
+        return create_success_response({
+            'quote_cache': stock_monitor.get_quote_cache_stats()
+        })
+
+    except Exception as e:
+        return create_error_response(str(e), 'QUOTE_CACHE_STATS_ERROR')
+
+@app.route('/api/v1/monitoring/poll-scheduler')
+@login_required
+@performance_monitor('폴링 스케줄러 상태 조회')
+@api_request_logger
+def get_poll_scheduler_stats():
+    """실시간 폴링 구간별 통계 조회"""
+    try:
+        return create_success_response({
+            'poll_scheduler': stock_monitor.poll_scheduler.get_stats()
+        })
+
+    except Exception as e:
+        return create_error_response(str(e), 'POLL_SCHEDULER_STATS_ERROR')
+
 @app.route('/api/v1/monitoring/daily-report', methods=['POST'])
 @login_required
 @performance_monitor('수동 일일 보고서 생성')
@@ -1832,29 +1951,21 @@ def get_dart_realtime_logs():
     except Exception as e:
         return create_error_response(str(e), 'DART_LOGS_ERROR')
 
-def start_monitoring_threads():
-    """백그라운드 모니터링 스레드 시작"""
-    global monitoring_threads
-    
-    # DART 모니터링 스레드
-    dart_thread = threading.Thread(target=dart_monitor_thread, daemon=True)
-    dart_thread.start()
-    monitoring_threads['dart'] = dart_thread
+def start_monitoring_scheduler():
+    """통합 모니터링 스케줄러 시작 (DART 확인 + 주식 모니터링 작업)"""
+    monitor_scheduler.register(JOB_DART, dart_check_job, DART_CHECK_INTERVAL, description='DART 공시 확인')
+    stock_monitor.add_alert_listener(on_stock_alert)
     
-    # 주식 모니터링 스레드  
-    stock_thread = threading.Thread(target=stock_monitor_thread, daemon=True)
-    stock_thread.start()
-    monitoring_threads['stock'] = stock_thread
+    # 주식 작업 활성화와 함께 스케줄러 시작
+    stock_monitor.start_real_time_monitoring()
+    monitor_scheduler.start()
     
-    logger.info("모든 백그라운드 모니터링 스레드 시작 완료")
+    logger.info("통합 모니터링 스케줄러 시작 완료")
 
-def stop_monitoring_threads():
-    """백그라운드 모니터링 스레드 종료"""
-    with state_lock:
-        app_state['dart_monitoring'] = False
-        app_state['stock_monitoring'] = False
-    
-    logger.info("모니터링 스레드 종료 신호 전송")
+def stop_monitoring_scheduler():
+    """통합 모니터링 스케줄러 종료"""
+    monitor_scheduler.stop()
+    logger.info("모니터링 스케줄러 종료 완료")
 
 # === SPA 지원을 위한 Catch-All 라우트 임시 비활성화 ===
 # API 테스트를 위해 임시로 주석 처리
@@ -1891,6 +2002,10 @@ def get_daily_history():
     """일일 알림 내역 조회"""
     try:
         target_date = request.args.get('date', datetime.now().strftime('%Y-%m-%d'))
+        try:
+            target_date = validate_day(target_date)
+        except ValueError as e:
+            return create_error_response(str(e), 'INVALID_DATE', 400)
         
         # 알림 파일에서 당일 알림 내역 조회
         from modules.config import NOTIFICATIONS_FILE
@@ -1928,9 +2043,15 @@ def get_daily_history():
                     'alert_count': len(triggered_alerts)
                 })
         
+        # 저널에 기록된 일일 알림 내역
+        from modules.stock_monitor import stock_monitor
+        journal_alerts = stock_monitor.get_daily_alerts(target_date, request.args.get('stock_code'))
+        
         return create_success_response({
             'date': target_date,
             'daily_alerts': daily_alerts,
+            'journal_alerts': journal_alerts,
+            'total_journal_alerts': len(journal_alerts),
             'stock_alerts': stock_alerts,
             'total_alerts': len(daily_alerts),
             'total_stock_alerts': len(stock_alerts)
@@ -2021,14 +2142,31 @@ def get_stock_logs():
 @performance_monitor('종목 코드 검증')
 @api_request_logger
 def validate_stock_code():
-    """종목 코드 유효성 검증"""
+    """종목 코드 유효성 검증 (expression/alert_expressions가 있으면 조건식도 컴파일 검증)"""
     try:
         data = request.get_json()
         if not data:
             return create_error_response("요청 데이터가 없습니다", 'NO_DATA', 400)
         
+        # 조건식 검증 (문자열 또는 {'expression': ...} 목록)
+        expressions = data.get('alert_expressions', [data['expression']] if 'expression' in data else [])
+        if not isinstance(expressions, list):
+            return create_error_response("alert_expressions는 목록이어야 합니다", 'INVALID_ALERT_EXPRESSION', 400)
+        expression_results = [
+            validate_expression(item.get('expression') if isinstance(item, dict) else item)
+            for item in expressions
+        ]
+        invalid = [result for result in expression_results if not result['valid']]
+        if invalid:
+            return create_error_response(
+                f"조건식 오류: {invalid[0]['error']}", 'INVALID_ALERT_EXPRESSION', 400
+            )
+        
         stock_code = data.get('stock_code', '').strip()
         
+        if not stock_code and expression_results:
+            return create_success_response({'expressions': expression_results, 'is_valid': True})
+        
         if not stock_code:
             return create_error_response("종목코드를 입력해주세요", 'MISSING_STOCK_CODE', 400)
         
@@ -2042,21 +2180,27 @@ def validate_stock_code():
         from modules.stock_monitor import stock_monitor
         
         try:
-            # 종목명 조회로 유효성 검증
+            # 종목 마스터로 상장 여부 검증 (마스터 미구축 시 종목명 조회 결과로 판단)
+            listed = stock_monitor.is_listed_stock(stock_code)
+            ticker_info = stock_monitor.get_ticker_info(stock_code)
             stock_name = stock_monitor.get_stock_name(stock_code)
             
-            # 현재가 조회 시도 (선택적)
-            current_price, change_percent, error = stock_monitor.get_stock_price(stock_code)
+            # 현재가 조회 시도 (선택적, 시세 캐시 사용)
+            quote, error = stock_monitor.get_stock_quote(stock_code)
             
             validation_result = {
                 'stock_code': stock_code,
                 'stock_name': stock_name,
-                'is_valid': True,
-                'price_available': current_price is not None,
-                'current_price': current_price,
-                'change_percent': change_percent,
+                'is_valid': listed is not False,
+                'listing_status': ticker_info['status'] if ticker_info else None,
+                'price_available': quote is not None,
+                'current_price': quote['price'] if quote else None,
+                'change_percent': quote['change_percent'] if quote else 0.0,
+                'price_age': quote['age'] if quote else None,
                 'already_monitored': stock_code in stock_monitor.monitoring_stocks
             }
+            if expression_results:
+                validation_result['expressions'] = expression_results
             
             if error:
                 validation_result['price_error'] = error
@@ -2188,6 +2332,437 @@ def calculate_stop_loss(stock_code):
     except Exception as e:
         return create_error_response(str(e), 'STOP_LOSS_CALCULATE_ERROR')
 
+@app.route('/api/v1/stocks/<stock_code>/intraday', methods=['GET'])
+@login_required
+@performance_monitor('장중 시계열 조회')
+@api_request_logger
+def get_stock_intraday(stock_code):
+    """종목 장중 시계열 조회 (모니터링 중 기록된 틱, 외부 호출 없음)"""
+    try:
+        seconds = request.args.get('seconds', type=float)
+        points = request.args.get('points', type=int)
+        ma_window = request.args.get('ma', 0, type=int)
+        
+        series = stock_monitor.get_intraday_series(stock_code, seconds=seconds, points=points, ma_window=ma_window)
+        if series is None:
+            return create_error_response(f"장중 시계열 기록이 없습니다: {stock_code}", 'INTRADAY_NOT_FOUND', 404)
+        
+        return create_success_response(series)
+        
+    except Exception as e:
+        return create_error_response(str(e), 'INTRADAY_ERROR')
+
+@app.route('/api/v1/stocks/<stock_code>/ticks', methods=['GET'])
+@login_required
+@performance_monitor('틱 아카이브 조회')
+@api_request_logger
+def get_stock_ticks(stock_code):
+    """종목 기간 틱 조회 (차트용, 틱 아카이브 memmap 조회)"""
+    try:
+        start = request.args.get('start', datetime.now().strftime('%Y-%m-%d'))
+        end = request.args.get('end', start)
+        step = request.args.get('step', 1, type=int)
+        
+        try:
+            start_date = datetime.strptime(start, '%Y-%m-%d').date()
+            end_date = datetime.strptime(end, '%Y-%m-%d').date()
+        except ValueError:
+            return create_error_response("날짜 형식이 올바르지 않습니다 (YYYY-MM-DD)", 'INVALID_DATE_FORMAT', 400)
+        
+        if end_date < start_date:
+            return create_error_response("종료일이 시작일보다 빠릅니다", 'INVALID_DATE_RANGE', 400)
+        
+        series = stock_monitor.get_tick_history(stock_code, start_date, end_date, step)
+        series.update({'start': start, 'end': end, 'step': step})
+        
+        return create_success_response(series)
+        
+    except Exception as e:
+        return create_error_response(str(e), 'TICK_HISTORY_ERROR')
+
+@app.route('/api/v1/stocks/session', methods=['GET'])
+@login_required
+@performance_monitor('장중 세션 집계 조회')
+@api_request_logger
+def get_session_stats():
+    """당일 종목별 세션 집계 (시가/고가/저가/현재가/VWAP/틱 수, stock_code로 단일 종목)"""
+    try:
+        stats = stock_monitor.get_session_stats(request.args.get('stock_code'))
+        return create_success_response({
+            'trading_date': stock_monitor.session_stats.get_stats()['trading_date'],
+            'stocks': stats,
+            'count': len(stats)
+        })
+        
+    except Exception as e:
+        return create_error_response(str(e), 'SESSION_STATS_ERROR')
+
+@app.route('/api/v1/stocks/movers', methods=['GET'])
+@login_required
+@performance_monitor('등락 상위 종목 조회')
+@api_request_logger
+def get_top_movers():
+    """당일 등락률 상/하위 종목 (k: 기본 10, 최대 50)"""
+    try:
+        k = min(max(request.args.get('k', 10, type=int), 1), 50)
+        movers = stock_monitor.get_top_movers(k)
+        movers['k'] = k
+        return create_success_response(movers)
+        
+    except Exception as e:
+        return create_error_response(str(e), 'TOP_MOVERS_ERROR')
+
+@app.route('/api/v1/stocks/<stock_code>/indicators', methods=['GET'])
+@login_required
+@performance_monitor('기술적 지표 조회')
+@api_request_logger
+def get_stock_indicators(stock_code):
+    """종목 기술적 지표 상태 (단기/장기 이동평균, 거래량 평균/표준편차, 전일 종가, 시가 갭)"""
+    try:
+        indicators = stock_monitor.get_stock_indicators(stock_code)
+        if indicators is None:
+            return create_error_response(f"지표 상태가 없습니다: {stock_code}", 'INDICATORS_NOT_FOUND', 404)
+        return create_success_response({
+            'stock_code': stock_code,
+            'indicators': indicators
+        })
+        
+    except Exception as e:
+        return create_error_response(str(e), 'INDICATORS_ERROR')
+
+@app.route('/api/v1/portfolio', methods=['GET'])
+@login_required
+@performance_monitor('포트폴리오 조회')
+@api_request_logger
+def get_portfolio():
+    """보유 포지션 평가손익/수익률/카테고리별 노출/고점 대비 낙폭 (가격 갱신 시 계산된 스냅샷)"""
+    try:
+        return create_success_response(stock_monitor.get_portfolio_snapshot())
+        
+    except Exception as e:
+        return create_error_response(str(e), 'PORTFOLIO_ERROR')
+
+@app.route('/api/v1/scanner', methods=['GET'])
+@login_required
+@performance_monitor('시장 스캐너 조회')
+@api_request_logger
+def get_market_scanner():
+    """마지막 전체 시장 스캔 결과 (스크린별 건수, 적중 종목, 단계별 소요 시간) 및 기준값 상태"""
+    try:
+        return create_success_response({
+            'result': stock_monitor.get_scanner_results(),
+            'stats': stock_monitor.market_scanner.get_stats()
+        })
+        
+    except Exception as e:
+        return create_error_response(str(e), 'SCANNER_ERROR')
+
+@app.route('/api/v1/scanner/scan', methods=['POST'])
+@login_required
+@performance_monitor('시장 스캐너 실행')
+@api_request_logger
+def run_market_scanner():
+    """전체 시장 즉시 스캔 (결과만 반환, 알림은 스케줄러 작업에서만 발송)"""
+    try:
+        try:
+            stock_monitor.market_scanner.scan(exclude=list(stock_monitor.monitoring_stocks.keys()))
+        except RuntimeError as e:
+            return create_error_response(str(e), 'SCANNER_UNAVAILABLE', 503)
+        return create_success_response(stock_monitor.get_scanner_results())
+        
+    except Exception as e:
+        return create_error_response(str(e), 'SCANNER_RUN_ERROR')
+
+@app.route('/api/v1/market/indices', methods=['GET'])
+@login_required
+@performance_monitor('시장 지수 조회')
+@api_request_logger
+def get_market_indices():
+    """KOSPI/KOSDAQ 지수 수준/등락률 (가격 주기마다 갱신) 및 종목별 야간 추정 베타"""
+    try:
+        return create_success_response(stock_monitor.get_market_index_status())
+        
+    except Exception as e:
+        return create_error_response(str(e), 'MARKET_INDEX_ERROR')
+
+@app.route('/api/v1/mezzanine', methods=['GET'])
+@login_required
+@performance_monitor('메자닌 현황 조회')
+@api_request_logger
+def get_mezzanine_status():
+    """메자닌 종목별 유효 전환가/패리티/전환 가능 여부/다음 리픽싱 (마지막 판정 결과)"""
+    try:
+        instruments = stock_monitor.get_mezzanine_results()
+        return create_success_response({
+            'instruments': instruments,
+            'count': len(instruments)
+        })
+        
+    except Exception as e:
+        return create_error_response(str(e), 'MEZZANINE_GET_ERROR')
+
+@app.route('/api/v1/stocks/<stock_code>/mezzanine', methods=['PUT'])
+@login_required
+@performance_monitor('메자닌 발행 조건 설정')
+@api_request_logger
+def set_stock_mezzanine_terms(stock_code):
+    """종목 메자닌 발행 조건 설정 (type, conversion_price, refix_floor, refix_dates, conversion_start/end, parity_levels)"""
+    try:
+        data = request.get_json()
+        if not data:
+            return create_error_response("요청 데이터가 없습니다", 'NO_DATA', 400)
+        
+        try:
+            terms = stock_monitor.set_mezzanine_terms(stock_code, data)
+        except KeyError:
+            return create_error_response(f"모니터링 중이지 않은 종목입니다: {stock_code}", 'STOCK_NOT_FOUND', 404)
+        except ValueError as e:
+            return create_error_response(str(e), 'INVALID_MEZZANINE_TERMS', 400)
+        
+        return create_success_response({
+            'stock_code': stock_code,
+            'terms': terms
+        })
+        
+    except Exception as e:
+        return create_error_response(str(e), 'MEZZANINE_SET_ERROR')
+
+@app.route('/api/v1/backtest', methods=['POST'])
+@login_required
+@performance_monitor('알림 규칙 백테스트')
+@api_request_logger
+def run_alert_backtest():
+    """
+    캐시된 봉 데이터로 알림 규칙 백테스트 (네트워크 미사용)
+    
+    codes(기본: 전체 모니터링 종목), start/end(YYYY-MM-DD), interval(기본 1d), path(close|ohlc),
+    overrides(target_percent, stop_percent, surge_threshold, drop_threshold, parity_levels 등), dedup
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        stocks = stock_monitor.get_monitoring_stocks()
+        codes = data.get('codes')
+        if codes:
+            unknown = [code for code in codes if code not in stocks]
+            if unknown:
+                return create_error_response(f"모니터링 중이지 않은 종목입니다: {', '.join(unknown)}", 'STOCK_NOT_FOUND', 404)
+            stocks = {code: stocks[code] for code in codes}
+        
+        try:
+            start = datetime.strptime(data['start'], '%Y-%m-%d').date() if data.get('start') else None
+            end = datetime.strptime(data['end'], '%Y-%m-%d').date() if data.get('end') else None
+            result = backtester.run(
+                stocks, start=start, end=end,
+                interval=data.get('interval', '1d'),
+                path=data.get('path', 'close'),
+                overrides=parse_overrides(data.get('overrides')),
+                dedup=bool(data.get('dedup', True))
+            )
+        except ValueError as e:
+            return create_error_response(str(e), 'INVALID_BACKTEST_REQUEST', 400)
+        
+        return create_success_response(result)
+        
+    except Exception as e:
+        return create_error_response(str(e), 'BACKTEST_ERROR')
+
+@app.route('/api/v1/backtest/bars', methods=['GET'])
+@login_required
+@performance_monitor('백테스트 봉 캐시 조회')
+@api_request_logger
+def get_backtest_bars():
+    """캐시된 봉 데이터 종목 목록 (interval: 기본 1d)"""
+    try:
+        interval = request.args.get('interval', '1d')
+        try:
+            codes = bar_cache.codes(interval)
+        except ValueError as e:
+            return create_error_response(str(e), 'INVALID_BARS_REQUEST', 400)
+        return create_success_response({
+            'interval': interval,
+            'codes': codes,
+            'count': len(codes)
+        })
+        
+    except Exception as e:
+        return create_error_response(str(e), 'BACKTEST_BARS_GET_ERROR')
+
+@app.route('/api/v1/backtest/bars', methods=['POST'])
+@login_required
+@performance_monitor('백테스트 봉 캐시 채우기')
+@api_request_logger
+def populate_backtest_bars():
+    """
+    봉 데이터 캐시 채우기
+    
+    csv(픽스처 CSV 본문, stock_code/interval 선택) 또는 codes/start/end(pykrx 일봉 조회)
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return create_error_response("요청 데이터가 없습니다", 'NO_DATA', 400)
+        
+        try:
+            if data.get('csv'):
+                saved = bar_cache.import_csv(data['csv'], data.get('stock_code'), data.get('interval', '1d'))
+            else:
+                codes = data.get('codes') or list(stock_monitor.get_monitoring_stocks().keys())
+                end = datetime.strptime(data['end'], '%Y-%m-%d').date() if data.get('end') else datetime.now().date()
+                start = datetime.strptime(data['start'], '%Y-%m-%d').date() if data.get('start') else end - timedelta(days=365)
+                saved = bar_cache.populate_pykrx(codes, start, end)
+        except ValueError as e:
+            return create_error_response(str(e), 'INVALID_BARS_REQUEST', 400)
+        except RuntimeError as e:
+            return create_error_response(str(e), 'PYKRX_UNAVAILABLE', 503)
+        
+        return create_success_response({
+            'saved': saved,
+            'count': len(saved)
+        })
+        
+    except Exception as e:
+        return create_error_response(str(e), 'BACKTEST_BARS_ERROR')
+
+@app.route('/api/v1/stocks/<stock_code>/ladder', methods=['GET'])
+@login_required
+@performance_monitor('가격 래더 조회')
+@api_request_logger
+def get_stock_ladder(stock_code):
+    """종목 가격 래더 레벨 조회 (가격 오름차순)"""
+    try:
+        levels = stock_monitor.get_ladder_levels(stock_code)
+        if levels is None:
+            return create_error_response(f"모니터링 중이지 않은 종목입니다: {stock_code}", 'STOCK_NOT_FOUND', 404)
+
+        return create_success_response({
+            'stock_code': stock_code,
+            'levels': levels,
+            'count': len(levels)
+        })
+
+    except Exception as e:
+        return create_error_response(str(e), 'LADDER_GET_ERROR')
+
+@app.route('/api/v1/stocks/<stock_code>/ladder', methods=['POST'])
+@login_required
+@performance_monitor('가격 래더 추가')
+@api_request_logger
+def add_stock_ladder_levels(stock_code):
+    """종목 가격 래더 레벨 추가 (단일 레벨 또는 levels 목록)"""
+    try:
+        data = request.get_json()
+        if not data:
+            return create_error_response("요청 데이터가 없습니다", 'NO_DATA', 400)
+
+        levels = data.get('levels', [data])
+        if not isinstance(levels, list) or not levels:
+            return create_error_response("추가할 레벨이 없습니다", 'EMPTY_LEVELS', 400)
+
+        try:
+            added = stock_monitor.add_ladder_levels(stock_code, levels)
+        except KeyError:
+            return create_error_response(f"모니터링 중이지 않은 종목입니다: {stock_code}", 'STOCK_NOT_FOUND', 404)
+        except ValueError as e:
+            return create_error_response(str(e), 'INVALID_LADDER_LEVEL', 400)
+
+        return create_success_response({
+            'stock_code': stock_code,
+            'added': added,
+            'count': len(stock_monitor.get_ladder_levels(stock_code))
+        })
+
+    except Exception as e:
+        return create_error_response(str(e), 'LADDER_ADD_ERROR')
+
+@app.route('/api/v1/stocks/<stock_code>/ladder/<level_id>', methods=['DELETE'])
+@login_required
+@performance_monitor('가격 래더 삭제')
+@api_request_logger
+def remove_stock_ladder_level(stock_code, level_id):
+    """종목 가격 래더 레벨 삭제"""
+    try:
+        removed = stock_monitor.remove_ladder_level(stock_code, level_id)
+        if removed is None:
+            return create_error_response(f"래더 레벨을 찾을 수 없습니다: {level_id}", 'LADDER_LEVEL_NOT_FOUND', 404)
+
+        return create_success_response({
+            'stock_code': stock_code,
+            'removed': removed
+        })
+
+    except Exception as e:
+        return create_error_response(str(e), 'LADDER_DELETE_ERROR')
+
+@app.route('/api/v1/stocks/<stock_code>/expressions', methods=['GET'])
+@login_required
+@performance_monitor('조건식 조회')
+@api_request_logger
+def get_stock_expressions(stock_code):
+    """종목 조건식 규칙 조회 (규칙별 평가 횟수/적중/평균·최대 소요 시간 포함)"""
+    try:
+        rules = stock_monitor.get_alert_expressions(stock_code)
+        if rules is None:
+            return create_error_response(f"모니터링 중이지 않은 종목입니다: {stock_code}", 'STOCK_NOT_FOUND', 404)
+
+        return create_success_response({
+            'stock_code': stock_code,
+            'expressions': rules,
+            'count': len(rules)
+        })
+
+    except Exception as e:
+        return create_error_response(str(e), 'EXPRESSION_GET_ERROR')
+
+@app.route('/api/v1/stocks/<stock_code>/expressions', methods=['POST'])
+@login_required
+@performance_monitor('조건식 추가')
+@api_request_logger
+def add_stock_expressions(stock_code):
+    """종목 조건식 규칙 추가 (단일 규칙 또는 expressions 목록, 저장 전 컴파일 검증)"""
+    try:
+        data = request.get_json()
+        if not data:
+            return create_error_response("요청 데이터가 없습니다", 'NO_DATA', 400)
+
+        rules = data.get('expressions', [data])
+        if not isinstance(rules, list) or not rules or not all(isinstance(rule, dict) for rule in rules):
+            return create_error_response("추가할 조건식이 없습니다", 'EMPTY_EXPRESSIONS', 400)
+
+        try:
+            added = stock_monitor.add_alert_expressions(stock_code, rules)
+        except KeyError:
+            return create_error_response(f"모니터링 중이지 않은 종목입니다: {stock_code}", 'STOCK_NOT_FOUND', 404)
+        except ValueError as e:
+            return create_error_response(str(e), 'INVALID_ALERT_EXPRESSION', 400)
+
+        return create_success_response({
+            'stock_code': stock_code,
+            'added': added,
+            'count': len(stock_monitor.get_alert_expressions(stock_code))
+        })
+
+    except Exception as e:
+        return create_error_response(str(e), 'EXPRESSION_ADD_ERROR')
+
+@app.route('/api/v1/stocks/<stock_code>/expressions/<rule_id>', methods=['DELETE'])
+@login_required
+@performance_monitor('조건식 삭제')
+@api_request_logger
+def remove_stock_expression(stock_code, rule_id):
+    """종목 조건식 규칙 삭제"""
+    try:
+        removed = stock_monitor.remove_alert_expression(stock_code, rule_id)
+        if removed is None:
+            return create_error_response(f"조건식을 찾을 수 없습니다: {rule_id}", 'EXPRESSION_NOT_FOUND', 404)
+
+        return create_success_response({
+            'stock_code': stock_code,
+            'removed': removed
+        })
+
+    except Exception as e:
+        return create_error_response(str(e), 'EXPRESSION_DELETE_ERROR')
+
 @app.route('/api/v1/stocks/stop-loss/batch', methods=['POST'])
 @login_required
 @performance_monitor('일괄 손절가 설정')
@@ -2295,13 +2870,19 @@ def get_stock_info():
         previous_close = None
         change_percent = None
         price_error = None
+        price_age = None
+        price_cache = None
         
         try:
-            # PyKrx를 우선으로 사용하여 주가 정보 조회
-            price_info = stock_monitor.get_stock_price(stock_code)
-            current_price, change_percent, error = price_info
+            # 시세 캐시를 거쳐 주가 정보 조회 (미스 시 제공자 우선순위에 따라 조회)
+            quote, error = stock_monitor.get_stock_quote(stock_code)
             
-            if current_price is not None:
+            if quote is not None:
+                current_price = quote['price']
+                change_percent = quote['change_percent']
+                price_age = quote['age']
+                price_cache = quote['cache']
+                
                 # 전일 종가 계산 (현재가에서 등락률 역산)
                 if change_percent != 0:
                     previous_close = round(current_price / (1 + change_percent / 100))
@@ -2316,16 +2897,21 @@ def get_stock_info():
         
         # 3. 기존 모니터링 여부 확인
         already_monitored = stock_code in stock_monitor.monitoring_stocks
+        ticker_info = stock_monitor.get_ticker_info(stock_code)
         
         # 4. 응답 데이터 구성
         result = {
             'stock_code': stock_code,
             'stock_name': stock_name,
-            'is_valid': True,
+            'is_valid': stock_monitor.is_listed_stock(stock_code) is not False,
             'price_available': current_price is not None,
             'current_price': current_price,
             'previous_close': previous_close,
             'change_percent': change_percent,
+            'price_age': price_age,
+            'price_cache': price_cache,
+            'market': ticker_info['market'] if ticker_info else None,
+            'listing_status': ticker_info['status'] if ticker_info else None,
             'already_monitored': already_monitored,
             'fetched_at': datetime.now().isoformat()
         }
@@ -2679,11 +3265,11 @@ if __name__ == '__main__':
             port=FLASK_PORT,
             debug_mode=FLASK_DEBUG,
             dart_interval=DART_CHECK_INTERVAL,
-            stock_interval=STOCK_CHECK_INTERVAL
+            stock_interval=stock_monitor.monitor_interval
         )
         
-        # 백그라운드 모니터링 스레드 시작
-        start_monitoring_threads()
+        # 통합 모니터링 스케줄러 시작
+        start_monitoring_scheduler()
         
         # Flask 서버 시작
         app.run(
@@ -2702,5 +3288,5 @@ if __name__ == '__main__':
             error_type=type(e).__name__
         )
     finally:
-        stop_monitoring_threads()
+        stop_monitoring_scheduler()
         logger.info("D2 Dash 시스템 종료", version="v3")
\ No newline at end of file
@@ -0,0 +1,395 @@
+"""
+벡터화 알림 엔진 모듈
+전 종목의 알림 임계값(목표가/손절가/알림가, 급등/급락)을 정렬된 NumPy 배열로 유지하고
+사이클마다 한 번의 벡터 연산으로 교차(crossing)를 찾아 적중 항목만 반환
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .logger_utils import get_logger
+from .price_ladder import LadderIndex
+
+logger = get_logger('stock')
+
+# 알림 규칙
+RULE_PARITY = 'parity'   # 패리티 도달 (메자닌, MezzanineEngine에서 판정)
+RULE_REFIX = 'refix'     # 리픽싱 예정 (메자닌, MezzanineEngine에서 판정)
+RULE_TARGET = 'target'   # 목표가 도달
+RULE_STOP = 'stop'       # 손절가 도달
+RULE_LEVEL = 'level'     # alert_prices 알림가 (TP/SL/Up/Down)
+RULE_SURGE = 'surge'     # 일일 급등
+RULE_DROP = 'drop'       # 일일 급락
+RULE_LADDER = 'ladder'   # 가격 래더 레벨 (종목별 다수 가격대)
+RULE_MA_CROSS = 'ma_cross'           # 이동평균 교차 (IndicatorEngine에서 판정)
+RULE_VOLUME_SPIKE = 'volume_spike'   # 거래량 급증 (IndicatorEngine에서 판정)
+RULE_GAP = 'gap'                     # 시가 갭 (IndicatorEngine에서 판정)
+RULE_EXPR = 'expr'                   # 사용자 조건식 (ExpressionEngine에서 판정)
+
+# 교차 방향
+DIRECTION_UP = 1     # 이전가 < 레벨 <= 현재가
+DIRECTION_DOWN = -1  # 현재가 <= 레벨 < 이전가
+
+# 급등/급락 기본 임계값 (%)
+DEFAULT_SURGE_THRESHOLD = 5.0
+DEFAULT_DROP_THRESHOLD = -5.0
+
+
+def settings_signature(stock_info: Dict) -> tuple:
+    """임계값에 영향을 주는 종목 설정 요약 (변경 감지용)"""
+    alert_settings = stock_info.get('alert_settings') or {}
+    return (
+        stock_info.get('category'),
+        stock_info.get('acquisition_price', 0),
+        stock_info.get('target_price', 0),
+        stock_info.get('stop_loss', 0),
+        tuple(sorted((key, repr(value)) for key, value in alert_settings.items())),
+        tuple((a.get('id'), a.get('price'), a.get('type')) for a in stock_info.get('alert_prices') or [])
+    )
+
+
+def build_stock_levels(stock_info: Dict) -> List[Tuple[float, int, str, str, Dict]]:
+    """
+    종목 설정에서 가격 레벨 목록 생성
+
+    Returns:
+        List: (레벨 가격, 방향, 규칙, 알림 ID, 부가 정보)
+    """
+    levels = []
+    alert_settings = stock_info.get('alert_settings', {})
+    acquisition_price = stock_info.get('acquisition_price', 0)
+
+    # 목표가/손절가
+    if alert_settings.get('target_stop_enabled', True):
+        target_price = stock_info.get('target_price', 0)
+        if target_price > 0:
+            levels.append((target_price, DIRECTION_UP, RULE_TARGET, f"target_price_{target_price}",
+                           {'acquisition_price': acquisition_price}))
+
+        stop_loss = stock_info.get('stop_loss', 0)
+        if stop_loss > 0:
+            levels.append((stop_loss, DIRECTION_DOWN, RULE_STOP, f"stop_loss_{stop_loss}",
+                           {'acquisition_price': acquisition_price}))
+
+    # alert_prices 알림가
+    for alert in stock_info.get('alert_prices') or []:
+        alert_type = alert.get('type', '')
+        if alert_type in ('TP Alert', 'Up Alert'):
+            direction = DIRECTION_UP
+        elif alert_type in ('SL Alert', 'Down Alert'):
+            direction = DIRECTION_DOWN
+        else:
+            continue
+        levels.append((alert.get('price', 0), direction, RULE_LEVEL, alert.get('id', ''), {'type': alert_type}))
+
+    return levels
+
+
+class AlertEngine:
+    """
+    전 종목 알림 임계값 테이블
+
+    레벨 테이블은 (종목 인덱스, 레벨 가격, 방향)을 나란히 둔 평탄한 배열이며,
+    종목 설정 요약이 바뀐 경우에만 다시 만든다.
+    종목별 레벨 수가 많은 가격 래더는 별도의 정렬 인덱스(LadderIndex)에서 이분 탐색한다.
+    """
+
+    def __init__(self, ladders: Optional[LadderIndex] = None):
+        self.ladders = ladders
+        self.codes: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.signatures: Dict[str, tuple] = {}
+
+        # 종목별 배열
+        self.last_prices = np.empty(0)
+        self.volatility_enabled = np.empty(0, dtype=bool)
+        self.surge_thresholds = np.empty(0)
+        self.drop_thresholds = np.empty(0)
+        self.relative_enabled = np.empty(0, dtype=bool)   # 지수 대비 초과 등락률 판정
+        self.excess_surge_thresholds = np.empty(0)
+        self.excess_drop_thresholds = np.empty(0)
+
+        # 레벨 테이블
+        self.level_stock = np.empty(0, dtype=np.int32)
+        self.level_price = np.empty(0)
+        self.level_direction = np.empty(0, dtype=np.int8)
+        self.level_rule: List[str] = []
+        self.level_alert_id: List[str] = []
+        self.level_meta: List[Dict] = []
+
+        self.stats = {
+            'rebuilds': 0,
+            'evaluations': 0,
+            'hits': 0,
+            'last_rebuild_ms': 0.0,
+            'last_evaluate_ms': 0.0,
+            'last_rebuilt_at': None
+        }
+        self._lock = threading.RLock()
+
+    def sync(self, stocks: Dict[str, Dict]) -> bool:
+        """설정이 바뀐 종목이 있으면 테이블 재구성 (재구성 시 True)"""
+        signatures = {code: settings_signature(info) for code, info in stocks.items()}
+        with self._lock:
+            if signatures == self.signatures:
+                return False
+            self._rebuild(stocks, signatures)
+            return True
+
+    def _rebuild(self, stocks: Dict[str, Dict], signatures: Dict[str, tuple]):
+        start = time.perf_counter()
+
+        previous = {code: self.last_prices[i] for code, i in self.index.items()}
+        codes = list(stocks.keys())
+        count = len(codes)
+
+        last_prices = np.full(count, np.nan)
+        volatility_enabled = np.zeros(count, dtype=bool)
+        surge_thresholds = np.full(count, np.inf)
+        drop_thresholds = np.full(count, -np.inf)
+        relative_enabled = np.zeros(count, dtype=bool)
+        excess_surge_thresholds = np.full(count, np.inf)
+        excess_drop_thresholds = np.full(count, -np.inf)
+
+        level_stock, level_price, level_direction = [], [], []
+        level_rule, level_alert_id, level_meta = [], [], []
+
+        for i, code in enumerate(codes):
+            info = stocks[code]
+
+            # 이전가는 기존 테이블 값 유지, 신규 종목은 저장된 현재가로 시작
+            seed = previous.get(code, info.get('current_price') or np.nan)
+            last_prices[i] = seed if seed and seed > 0 else np.nan
+
+            alert_settings = info.get('alert_settings', {})
+            if alert_settings.get('volatility_enabled', True):
+                volatility_enabled[i] = True
+                surge_thresholds[i] = alert_settings.get('surge_threshold', DEFAULT_SURGE_THRESHOLD)
+                drop_thresholds[i] = alert_settings.get('drop_threshold', DEFAULT_DROP_THRESHOLD)
+                if alert_settings.get('relative_alert', False):
+                    relative_enabled[i] = True
+                    excess_surge_thresholds[i] = abs(alert_settings.get('excess_rise_threshold', DEFAULT_SURGE_THRESHOLD))
+                    excess_drop_thresholds[i] = -abs(alert_settings.get('excess_fall_threshold', DEFAULT_DROP_THRESHOLD))
+
+            for price, direction, rule, alert_id, meta in build_stock_levels(info):
+                level_stock.append(i)
+                level_price.append(price)
+                level_direction.append(direction)
+                level_rule.append(rule)
+                level_alert_id.append(alert_id)
+                level_meta.append(meta)
+
+        self.codes = codes
+        self.index = {code: i for i, code in enumerate(codes)}
+        self.signatures = signatures
+        self.last_prices = last_prices
+        self.volatility_enabled = volatility_enabled
+        self.surge_thresholds = surge_thresholds
+        self.drop_thresholds = drop_thresholds
+        self.relative_enabled = relative_enabled
+        self.excess_surge_thresholds = excess_surge_thresholds
+        self.excess_drop_thresholds = excess_drop_thresholds
+        self.level_stock = np.array(level_stock, dtype=np.int32)
+        self.level_price = np.array(level_price, dtype=np.float64)
+        self.level_direction = np.array(level_direction, dtype=np.int8)
+        self.level_rule = level_rule
+        self.level_alert_id = level_alert_id
+        self.level_meta = level_meta
+
+        self.stats['rebuilds'] += 1
+        self.stats['last_rebuild_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        self.stats['last_rebuilt_at'] = datetime.now().isoformat()
+        logger.debug(f"알림 엔진 재구성: {count}개 종목, {len(level_price)}개 레벨")
+
+    def evaluate(self, stocks: Dict[str, Dict], updates: Dict[str, Tuple[float, float]],
+                 benchmark: Optional[Dict[str, float]] = None) -> List[Dict]:
+        """
+        한 사이클의 가격 갱신에 대해 교차/급등락 판정
+
+        Args:
+            stocks: 모니터링 종목 (설정 변경 감지용)
+            updates: 종목코드 -> (현재가, 등락률)
+            benchmark: 종목코드 -> 시장 지수 기준 기대 등락률 (지수 대비 판정 종목만 사용)
+
+        Returns:
+            List[Dict]: 적중 항목 (중복 발송 여부는 호출자가 판단)
+        """
+        self.sync(stocks)
+
+        with self._lock:
+            count = len(self.codes)
+            current = np.full(count, np.nan)
+            change = np.full(count, np.nan)
+            for code, (price, change_percent) in updates.items():
+                i = self.index.get(code)
+                if i is not None:
+                    current[i] = price
+                    change[i] = change_percent
+            expected = None
+            if benchmark:
+                expected = np.full(count, np.nan)
+                for code, value in benchmark.items():
+                    i = self.index.get(code)
+                    if i is not None:
+                        expected[i] = value
+            return self.evaluate_arrays(current, change, benchmark=expected)
+
+    def evaluate_arrays(self, current: np.ndarray, change: np.ndarray, day_key: Optional[str] = None,
+                        benchmark: Optional[np.ndarray] = None) -> List[Dict]:
+        """
+        종목 인덱스 순서 배열로 판정 (evaluate/백테스트 공용)
+
+        Args:
+            current: 종목별 현재가 (갱신 없는 종목은 NaN)
+            change: 종목별 등락률
+            day_key: 급등/급락/래더 알림 ID의 일자 (기본 오늘, YYYYMMDD)
+            benchmark: 종목별 시장 지수 기준 기대 등락률 (NaN이면 등락률 그대로 판정)
+        """
+        start = time.perf_counter()
+        today = day_key or datetime.now().strftime('%Y%m%d')
+
+        with self._lock:
+            previous = self.last_prices
+            hits = []
+
+            # 가격 레벨 교차 (NaN 비교는 항상 False)
+            if len(self.level_price):
+                p0 = previous[self.level_stock]
+                p1 = current[self.level_stock]
+                levels = self.level_price
+                crossed_up = (self.level_direction == DIRECTION_UP) & (p1 >= levels) & (p0 < levels)
+                crossed_down = (self.level_direction == DIRECTION_DOWN) & (p1 <= levels) & (p0 > levels)
+
+                for l in np.flatnonzero((p0 > 0) & (crossed_up | crossed_down)):
+                    i = self.level_stock[l]
+                    hits.append({
+                        'stock_code': self.codes[i],
+                        'rule': self.level_rule[l],
+                        'alert_id': self.level_alert_id[l],
+                        'level': float(levels[l]),
+                        'direction': int(self.level_direction[l]),
+                        'price': float(current[i]),
+                        'previous_price': float(previous[i]),
+                        'change_percent': float(change[i]),
+                        'meta': self.level_meta[l]
+                    })
+
+            # 급등/급락 (당일 1회, 알림 ID는 날짜 기준)
+            # 지수 대비 판정 종목은 기대 등락률이 있으면 초과 등락률을 초과 임계값과 비교
+            active = (previous > 0) & self.volatility_enabled & ~np.isnan(current)
+            if benchmark is None:
+                benchmark = np.full(len(self.codes), np.nan)
+            relative = self.relative_enabled & ~np.isnan(benchmark)
+            excess = change - benchmark
+            surge_thresholds = np.where(relative, self.excess_surge_thresholds, self.surge_thresholds)
+            drop_thresholds = np.where(relative, self.excess_drop_thresholds, self.drop_thresholds)
+            measured = np.where(relative, excess, change)
+            for rule, mask, thresholds in (
+                (RULE_SURGE, active & (measured >= surge_thresholds), surge_thresholds),
+                (RULE_DROP, active & (measured <= drop_thresholds), drop_thresholds)
+            ):
+                for i in np.flatnonzero(mask):
+                    meta = {}
+                    if relative[i]:
+                        meta = {
+                            'relative': True,
+                            'excess_percent': round(float(excess[i]), 2),
+                            'benchmark_percent': round(float(benchmark[i]), 2)
+                        }
+                    hits.append({
+                        'stock_code': self.codes[i],
+                        'rule': rule,
+                        'alert_id': f"{rule}_{today}",
+                        'level': float(thresholds[i]),
+                        'direction': DIRECTION_UP if rule == RULE_SURGE else DIRECTION_DOWN,
+                        'price': float(current[i]),
+                        'previous_price': float(previous[i]),
+                        'change_percent': float(change[i]),
+                        'meta': meta
+                    })
+
+            # 가격 래더 (래더가 있는 갱신 종목만 이분 탐색)
+            if self.ladders is not None:
+                for code in list(self.ladders.ladders.keys()):
+                    i = self.index.get(code)
+                    if i is None or not previous[i] > 0 or np.isnan(current[i]):
+                        continue
+                    for level in self.ladders.crossed(code, previous[i], current[i]):
+                        direction = DIRECTION_UP if current[i] > previous[i] else DIRECTION_DOWN
+                        hits.append({
+                            'stock_code': code,
+                            'rule': RULE_LADDER,
+                            'alert_id': f"ladder_{level['id']}_{'up' if direction == DIRECTION_UP else 'down'}_{today}",
+                            'level': float(level['price']),
+                            'direction': direction,
+                            'price': float(current[i]),
+                            'previous_price': float(previous[i]),
+                            'change_percent': float(change[i]),
+                            'meta': {'level_id': level['id'], 'label': level['label']}
+                        })
+
+            updated = ~np.isnan(current)
+            self.last_prices[updated] = current[updated]
+
+            self.stats['evaluations'] += 1
+            self.stats['hits'] += len(hits)
+            self.stats['last_evaluate_ms'] = round((time.perf_counter() - start) * 1000, 3)
+
+        return hits
+
+    def nearest_level_distances(self) -> Dict[str, float]:
+        """
+        종목별 이전가 기준 가장 가까운 알림 레벨까지의 거리 (%)
+
+        레벨 테이블은 한 번의 벡터 연산(np.minimum.at)으로, 래더는 종목별 이분 탐색으로 계산한다.
+        가격 기록이 없거나 레벨이 없는 종목은 inf.
+        """
+        with self._lock:
+            distances = np.full(len(self.codes), np.inf)
+            if len(self.level_price):
+                base = self.last_prices[self.level_stock]
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    level_distance = np.abs(self.level_price - base) / base * 100
+                level_distance[~(base > 0)] = np.inf
+                np.minimum.at(distances, self.level_stock, level_distance)
+
+            if self.ladders is not None:
+                for code in self.ladders.ladders.keys() & self.index.keys():
+                    i = self.index[code]
+                    price = self.last_prices[i]
+                    if not price > 0:
+                        continue
+                    level_price = self.ladders.nearest(code, price)
+                    if level_price is not None:
+                        distances[i] = min(distances[i], abs(level_price - price) / price * 100)
+
+            return {code: float(distances[i]) for i, code in enumerate(self.codes)}
+
+    def get_stock_levels(self, stock_code: str) -> Optional[List[Dict]]:
+        """종목의 현재 레벨 테이블 조회"""
+        with self._lock:
+            i = self.index.get(stock_code)
+            if i is None:
+                return None
+            return [
+                {
+                    'rule': self.level_rule[l],
+                    'alert_id': self.level_alert_id[l],
+                    'level': float(self.level_price[l]),
+                    'direction': int(self.level_direction[l])
+                }
+                for l in np.flatnonzero(self.level_stock == i)
+            ]
+
+    def get_stats(self) -> Dict:
+        """엔진 상태"""
+        with self._lock:
+            return {
+                **self.stats,
+                'stocks': len(self.codes),
+                'levels': int(len(self.level_price)),
+                'ladders': self.ladders.get_stats() if self.ladders is not None else None
+            }
@@ -0,0 +1,633 @@
+"""
+조건식 알림 모듈
+"price < 0.95 * ma20 and change_pct < -3" 같은 종목별 알림 조건을 안전한 식 언어로 받아
+저장 시 한 번 파싱/컴파일(클로저 트리)하고, 가격 주기마다 전체 종목에 대해 평가 (eval 미사용)
+"""
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .alert_engine import DIRECTION_UP, RULE_EXPR
+from .config import (
+    ALERT_EXPR_MAX_PER_STOCK,
+    ALERT_EXPR_MAX_LENGTH,
+    ALERT_EXPR_MAX_DEPTH,
+    ALERT_EXPR_CACHE_SIZE,
+    INDICATOR_MA_FAST,
+    INDICATOR_MA_SLOW
+)
+from .logger_utils import get_logger
+
+logger = get_logger('stock')
+
+# 필드 출처
+SOURCE_TICK = 'tick'              # 현재 시세 / 종목 설정
+SOURCE_SESSION = 'session'        # 장중 세션 집계 (SessionStats)
+SOURCE_INDICATORS = 'indicators'  # 기술적 지표 (IndicatorEngine)
+
+# 식에서 사용할 수 있는 필드 -> (출처, 설명)
+FIELDS: Dict[str, Tuple[str, str]] = {
+    'price': (SOURCE_TICK, '현재가'),
+    'prev_price': (SOURCE_TICK, '직전 주기 가격'),
+    'change_pct': (SOURCE_TICK, '전일 대비 등락률 (%)'),
+    'target_price': (SOURCE_TICK, '목표가'),
+    'stop_loss': (SOURCE_TICK, '손절가'),
+    'acquisition_price': (SOURCE_TICK, '취득가'),
+    'return_pct': (SOURCE_TICK, '취득가 대비 수익률 (%)'),
+    'open': (SOURCE_SESSION, '당일 시가'),
+    'high': (SOURCE_SESSION, '당일 고가'),
+    'low': (SOURCE_SESSION, '당일 저가'),
+    'vwap': (SOURCE_SESSION, '당일 VWAP'),
+    'prev_close': (SOURCE_INDICATORS, '전일 종가'),
+    'gap_pct': (SOURCE_INDICATORS, '시가 갭 (%)'),
+    'volume': (SOURCE_INDICATORS, '당일 누적 거래량'),
+    'volume_mean': (SOURCE_INDICATORS, '일 거래량 평균'),
+    'ma_fast': (SOURCE_INDICATORS, f'{INDICATOR_MA_FAST}일 이동평균'),
+    'ma_slow': (SOURCE_INDICATORS, f'{INDICATOR_MA_SLOW}일 이동평균'),
+}
+# 설정된 이동평균 기간 별칭 (예: ma5, ma20)
+FIELD_ALIASES = {f'ma{INDICATOR_MA_FAST}': 'ma_fast', f'ma{INDICATOR_MA_SLOW}': 'ma_slow'}
+
+# 함수 이름 -> (최소 인자 수, 최대 인자 수, 구현)
+FUNCTIONS: Dict[str, Tuple[int, int, Callable]] = {
+    'abs': (1, 1, abs),
+    'min': (2, 8, min),
+    'max': (2, 8, max),
+}
+
+_TOKEN_RE = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<op><=|>=|==|!=|<|>|\+|-|\*|/|\(|\)|,)
+""", re.VERBOSE)
+
+_KEYWORDS = ('and', 'or', 'not')
+_COMPARE = {
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+}
+_ARITH = {
+    '+': lambda a, b: a + b,
+    '-': lambda a, b: a - b,
+    '*': lambda a, b: a * b,
+    '/': lambda a, b: a / b if b else None,
+}
+
+
+class ExpressionError(ValueError):
+    """조건식 문법/검증 오류 (위치는 0부터 시작하는 문자 오프셋)"""
+
+    def __init__(self, message: str, position: Optional[int] = None):
+        super().__init__(f"{message} (위치 {position})" if position is not None else message)
+        self.position = position
+
+
+def tokenize(source: str) -> List[Tuple[str, str, int]]:
+    """조건식 -> (종류, 값, 위치) 토큰 목록 (마지막은 ('end', '', 길이))"""
+    tokens = []
+    position = 0
+    while position < len(source):
+        match = _TOKEN_RE.match(source, position)
+        if match is None:
+            raise ExpressionError(f"알 수 없는 문자 '{source[position]}'", position)
+        kind = match.lastgroup
+        if kind != 'space':
+            value = match.group()
+            if kind == 'name' and value in _KEYWORDS:
+                kind = 'keyword'
+            tokens.append((kind, value, position))
+        position = match.end()
+    tokens.append(('end', '', len(source)))
+    return tokens
+
+
+class _Parser:
+    """
+    재귀 하강 파서 (토큰 -> 클로저)
+
+    우선순위: or < and < not < 비교(연쇄 가능) < 덧셈/뺄셈 < 곱셈/나눗셈 < 단항 - < 괄호/함수/필드/숫자
+    각 노드는 context 딕셔너리를 받아 값을 돌려주는 클로저로 바로 컴파일된다.
+    값이 없는 필드(None)는 산술/비교 결과를 None(알 수 없음)으로 만들고, not/and/or는 3값 논리로
+    None을 전파한다 (not None은 None, 거짓이 하나라도 있는 and는 거짓, 참이 하나라도 있는 or는 참).
+    최종 판정에서 None은 거짓이므로 값이 없는 필드가 낀 조건은 not을 붙여도 충족되지 않는다.
+    """
+
+    def __init__(self, source: str):
+        self.tokens = tokenize(source)
+        self.index = 0
+        self.depth = 0
+        self.fields: set = set()
+
+    # --- 토큰 ---
+
+    def _peek(self) -> Tuple[str, str, int]:
+        return self.tokens[self.index]
+
+    def _next(self) -> Tuple[str, str, int]:
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def _accept(self, kind: str, value: Optional[str] = None) -> bool:
+        token = self._peek()
+        if token[0] == kind and (value is None or token[1] == value):
+            self.index += 1
+            return True
+        return False
+
+    def _expect(self, kind: str, value: str):
+        if not self._accept(kind, value):
+            token = self._peek()
+            found = token[1] or '식의 끝'
+            raise ExpressionError(f"'{value}'가 필요하지만 '{found}'가 있습니다", token[2])
+
+    def _enter(self):
+        self.depth += 1
+        if self.depth > ALERT_EXPR_MAX_DEPTH:
+            raise ExpressionError(f"조건식 중첩이 너무 깊습니다 (최대 {ALERT_EXPR_MAX_DEPTH})", self._peek()[2])
+
+    # --- 문법 ---
+
+    def parse(self) -> Callable[[Dict], object]:
+        node = self._or()
+        token = self._peek()
+        if token[0] != 'end':
+            raise ExpressionError(f"예상하지 못한 '{token[1]}'", token[2])
+        return node
+
+    def _or(self):
+        operands = [self._and()]
+        while self._accept('keyword', 'or'):
+            operands.append(self._and())
+        if len(operands) == 1:
+            return operands[0]
+
+        def any_true(ctx):
+            unknown = False
+            for operand in operands:
+                value = operand(ctx)
+                if value is None:
+                    unknown = True
+                elif value:
+                    return True
+            return None if unknown else False
+        return any_true
+
+    def _and(self):
+        operands = [self._not()]
+        while self._accept('keyword', 'and'):
+            operands.append(self._not())
+        if len(operands) == 1:
+            return operands[0]
+
+        def all_true(ctx):
+            unknown = False
+            for operand in operands:
+                value = operand(ctx)
+                if value is None:
+                    unknown = True
+                elif not value:
+                    return False
+            return None if unknown else True
+        return all_true
+
+    def _not(self):
+        if self._accept('keyword', 'not'):
+            self._enter()
+            operand = self._not()
+            self.depth -= 1
+
+            def invert(ctx):
+                value = operand(ctx)
+                return None if value is None else not value
+            return invert
+        return self._comparison()
+
+    def _comparison(self):
+        left = self._additive()
+        chain = []
+        while self._peek()[0] == 'op' and self._peek()[1] in _COMPARE:
+            chain.append((_COMPARE[self._next()[1]], self._additive()))
+        if not chain:
+            return left
+
+        def compare(ctx):
+            a = left(ctx)
+            for op, right in chain:
+                b = right(ctx)
+                if a is None or b is None:
+                    return None
+                if not op(a, b):
+                    return False
+                a = b
+            return True
+        return compare
+
+    def _additive(self):
+        node = self._multiplicative()
+        while self._peek()[0] == 'op' and self._peek()[1] in ('+', '-'):
+            node = self._binary(_ARITH[self._next()[1]], node, self._multiplicative())
+        return node
+
+    def _multiplicative(self):
+        node = self._unary()
+        while self._peek()[0] == 'op' and self._peek()[1] in ('*', '/'):
+            node = self._binary(_ARITH[self._next()[1]], node, self._unary())
+        return node
+
+    @staticmethod
+    def _binary(op, left, right):
+        def binary(ctx):
+            a, b = left(ctx), right(ctx)
+            if a is None or b is None:
+                return None
+            return op(a, b)
+        return binary
+
+    def _unary(self):
+        if self._accept('op', '-'):
+            self._enter()
+            operand = self._unary()
+            self.depth -= 1
+            if getattr(operand, 'constant', None) is not None:
+                return self._constant(-operand.constant)
+
+            def negate(ctx):
+                value = operand(ctx)
+                return None if value is None else -value
+            return negate
+        return self._primary()
+
+    @staticmethod
+    def _constant(value: float):
+        def constant(ctx):
+            return value
+        constant.constant = value
+        return constant
+
+    def _primary(self):
+        kind, value, position = self._next()
+
+        if kind == 'number':
+            return self._constant(float(value))
+
+        if kind == 'op' and value == '(':
+            self._enter()
+            node = self._or()
+            self._expect('op', ')')
+            self.depth -= 1
+            return node
+
+        if kind == 'name':
+            if self._peek()[0] == 'op' and self._peek()[1] == '(':
+                return self._call(value, position)
+            field = FIELD_ALIASES.get(value, value)
+            if field not in FIELDS:
+                raise ExpressionError(f"알 수 없는 필드 '{value}'", position)
+            self.fields.add(field)
+            return lambda ctx: ctx.get(field)
+
+        raise ExpressionError(f"값이 필요하지만 '{value or '식의 끝'}'가 있습니다", position)
+
+    def _call(self, name: str, position: int):
+        if name not in FUNCTIONS:
+            raise ExpressionError(f"알 수 없는 함수 '{name}'", position)
+        minimum, maximum, function = FUNCTIONS[name]
+        self._expect('op', '(')
+        self._enter()
+        args = [self._or()]
+        while self._accept('op', ','):
+            args.append(self._or())
+        self._expect('op', ')')
+        self.depth -= 1
+        if not minimum <= len(args) <= maximum:
+            raise ExpressionError(f"{name}() 인자 수는 {minimum}~{maximum}개여야 합니다", position)
+
+        def call(ctx):
+            values = [arg(ctx) for arg in args]
+            if any(value is None for value in values):
+                return None
+            return function(*values)
+        return call
+
+
+class CompiledExpression:
+    """컴파일된 조건식 (참/거짓 판정, 사용 필드/출처 포함)"""
+
+    __slots__ = ('source', 'fields', 'sources', '_fn')
+
+    def __init__(self, source: str, fn: Callable[[Dict], object], fields: set):
+        self.source = source
+        self.fields = frozenset(fields)
+        self.sources = frozenset(FIELDS[field][0] for field in fields)
+        self._fn = fn
+
+    def __call__(self, context: Dict) -> bool:
+        return bool(self._fn(context))
+
+
+# 컴파일 결과 LRU 캐시 (검증 API로 임의 식이 들어오므로 ALERT_EXPR_CACHE_SIZE로 제한)
+_compiled_cache: 'OrderedDict[str, CompiledExpression]' = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def compile_expression(source: str) -> CompiledExpression:
+    """
+    조건식 컴파일 (같은 식은 캐시 재사용, 최근 사용 ALERT_EXPR_CACHE_SIZE개까지 보관)
+
+    Raises:
+        ExpressionError: 문법 오류, 알 수 없는 필드/함수, 길이/중첩 초과
+    """
+    if not isinstance(source, str) or not source.strip():
+        raise ExpressionError("조건식이 비어 있습니다")
+    source = source.strip()
+    if len(source) > ALERT_EXPR_MAX_LENGTH:
+        raise ExpressionError(f"조건식이 너무 깁니다 (최대 {ALERT_EXPR_MAX_LENGTH}자)")
+
+    with _cache_lock:
+        compiled = _compiled_cache.get(source)
+        if compiled is not None:
+            _compiled_cache.move_to_end(source)
+            return compiled
+
+    parser = _Parser(source)
+    compiled = CompiledExpression(source, parser.parse(), parser.fields)
+    with _cache_lock:
+        _compiled_cache[source] = compiled
+        _compiled_cache.move_to_end(source)
+        while len(_compiled_cache) > ALERT_EXPR_CACHE_SIZE:
+            _compiled_cache.popitem(last=False)
+    return compiled
+
+
+def validate_expression(source: str) -> Dict:
+    """조건식 검증 결과 (API 응답용, 예외를 던지지 않음)"""
+    try:
+        compiled = compile_expression(source)
+        return {'expression': compiled.source, 'valid': True, 'fields': sorted(compiled.fields)}
+    except ExpressionError as e:
+        return {'expression': source, 'valid': False, 'error': str(e), 'position': e.position}
+
+
+def make_rule(expression: str, message: str = '', enabled: bool = True) -> Dict:
+    """
+    조건식 규칙 생성 (저장 전 컴파일로 검증)
+
+    Raises:
+        ExpressionError: 조건식이 유효하지 않은 경우
+    """
+    compiled = compile_expression(expression)
+    return {
+        'id': uuid.uuid4().hex[:8],
+        'expression': compiled.source,
+        'message': str(message or ''),
+        'enabled': bool(enabled),
+        'created_at': datetime.now().isoformat()
+    }
+
+
+def build_context(stock_info: Dict, price: float, previous_price: Optional[float], change_percent: float,
+                  session: Optional[Dict] = None, indicators: Optional[Dict] = None) -> Dict:
+    """조건식 평가용 필드 값 (없는 값은 None)"""
+    acquisition_price = stock_info.get('acquisition_price') or None
+    context = {
+        'price': price,
+        'prev_price': previous_price,
+        'change_pct': change_percent,
+        'target_price': stock_info.get('target_price') or None,
+        'stop_loss': stock_info.get('stop_loss') or None,
+        'acquisition_price': acquisition_price,
+        'return_pct': (price / acquisition_price - 1) * 100 if acquisition_price else None,
+    }
+    if session:
+        context.update(open=session.get('open'), high=session.get('high'),
+                       low=session.get('low'), vwap=session.get('vwap'))
+    if indicators:
+        context.update(prev_close=indicators.get('prev_close'), gap_pct=indicators.get('gap_percent'),
+                       volume=indicators.get('last_volume'), volume_mean=indicators.get('volume_mean'),
+                       ma_fast=indicators.get('fast_ma'), ma_slow=indicators.get('slow_ma'))
+    return context
+
+
+class ExpressionEngine:
+    """
+    종목별 조건식 규칙 평가
+
+    종목 데이터의 alert_expressions가 바뀐 경우에만 다시 컴파일하고, evaluate()는 규칙이 있는
+    모든 종목을 매 주기 평가한다. 조건이 참이면 적중으로 내보내되, 발송 결과를 complete()로 받아
+    발송된 규칙은 조건이 다시 거짓이 될 때까지 내보내지 않는다 (거짓 -> 참 전환당 1회).
+    장외라 발송하지 않았거나 발송에 실패한 적중은 조건이 계속 참이면 다음 주기에 다시 내보낸다.
+    규칙별 평가 횟수/적중/오류/소요 시간을 누적한다.
+    """
+
+    def __init__(self, max_rules: int = ALERT_EXPR_MAX_PER_STOCK):
+        self.max_rules = max_rules
+        self.rules: Dict[str, List[Tuple[Dict, CompiledExpression]]] = {}
+        self.signatures: Dict[str, tuple] = {}
+        self.sources: Dict[str, frozenset] = {}
+        self.last_price: Dict[str, float] = {}
+        self.last_result: Dict[Tuple[str, str], bool] = {}
+        self.latched: set = set()   # 발송 후 조건이 아직 참인 (종목, 규칙 ID)
+        self.timings: Dict[Tuple[str, str], Dict] = {}
+        self.stats = {'compiles': 0, 'invalid': 0, 'cycles': 0, 'evaluations': 0, 'hits': 0, 'last_cycle_ms': 0.0}
+        self._lock = threading.Lock()
+
+    # === 규칙 테이블 ===
+
+    @staticmethod
+    def _signature(info: Dict) -> tuple:
+        return tuple(
+            (rule.get('id'), rule.get('expression'), bool(rule.get('enabled', True)))
+            for rule in info.get('alert_expressions') or []
+        )
+
+    def sync(self, stocks: Dict[str, Dict]):
+        """alert_expressions가 바뀐 종목만 다시 컴파일"""
+        with self._lock:
+            for code in [code for code in self.rules if code not in stocks]:
+                self._drop(code)
+            for code, info in stocks.items():
+                signature = self._signature(info) if info.get('enabled', True) else ()
+                if signature == self.signatures.get(code, ()):
+                    continue
+                self._compile_stock(code, info, signature)
+
+    def _compile_stock(self, stock_code: str, info: Dict, signature: tuple):
+        compiled_rules = []
+        for rule in info.get('alert_expressions') or []:
+            if not rule.get('enabled', True):
+                continue
+            try:
+                compiled_rules.append((rule, compile_expression(rule.get('expression'))))
+                self.stats['compiles'] += 1
+            except ExpressionError as e:
+                self.stats['invalid'] += 1
+                logger.warning(f"조건식 컴파일 실패: {stock_code} {rule.get('id')} - {e}")
+
+        active = {rule['id'] for rule, _ in compiled_rules}
+        for key in [key for key in self.timings if key[0] == stock_code and key[1] not in active]:
+            self.timings.pop(key, None)
+            self.last_result.pop(key, None)
+            self.latched.discard(key)
+
+        self.signatures[stock_code] = signature
+        if compiled_rules:
+            self.rules[stock_code] = compiled_rules
+            self.sources[stock_code] = frozenset().union(*(compiled.sources for _, compiled in compiled_rules))
+        else:
+            self.rules.pop(stock_code, None)
+            self.sources.pop(stock_code, None)
+
+    def _drop(self, stock_code: str):
+        self.rules.pop(stock_code, None)
+        self.signatures.pop(stock_code, None)
+        self.sources.pop(stock_code, None)
+        self.last_price.pop(stock_code, None)
+        for key in [key for key in self.timings if key[0] == stock_code]:
+            self.timings.pop(key, None)
+            self.last_result.pop(key, None)
+            self.latched.discard(key)
+
+    def remove(self, stock_code: str):
+        with self._lock:
+            self._drop(stock_code)
+
+    # === 평가 ===
+
+    def evaluate(self, stocks: Dict[str, Dict], updates: Dict[str, Tuple[float, float]],
+                 session_lookup: Optional[Callable[[str], Optional[Dict]]] = None,
+                 indicator_lookup: Optional[Callable[[str], Optional[Dict]]] = None,
+                 day_key: Optional[str] = None) -> List[Dict]:
+        """
+        규칙이 있는 전체 종목 평가
+
+        Args:
+            stocks: 모니터링 종목
+            updates: 이번 주기 가격 갱신 (종목코드 -> (현재가, 등락률)), 갱신이 없는 종목은 저장된 현재가 사용
+            session_lookup / indicator_lookup: 종목 세션 집계 / 지표 상태 조회 (해당 필드를 쓰는 종목만 호출)
+            day_key: 알림 ID 일자 (기본 오늘, YYYYMMDD)
+
+        Returns:
+            List[Dict]: 조건이 참이고 아직 발송되지 않은 규칙의 적중 항목 (발송 결과는 complete()로 알림)
+        """
+        self.sync(stocks)
+        today = day_key or datetime.now().strftime('%Y%m%d')
+        start = time.perf_counter()
+        hits = []
+
+        with self._lock:
+            for code, compiled_rules in self.rules.items():
+                info = stocks.get(code)
+                if info is None:
+                    continue
+                if code in updates:
+                    price, change_percent = updates[code]
+                else:
+                    price, change_percent = info.get('current_price') or 0, info.get('change_percent') or 0.0
+                if not price or price <= 0:
+                    continue
+                previous_price = self.last_price.get(code)
+                self.last_price[code] = price
+
+                sources = self.sources[code]
+                context = build_context(
+                    info, price, previous_price, change_percent,
+                    session_lookup(code) if session_lookup and SOURCE_SESSION in sources else None,
+                    indicator_lookup(code) if indicator_lookup and SOURCE_INDICATORS in sources else None
+                )
+
+                for rule, compiled in compiled_rules:
+                    key = (code, rule['id'])
+                    timing = self.timings.get(key)
+                    if timing is None:
+                        timing = {'evaluations': 0, 'hits': 0, 'errors': 0, 'total_us': 0.0, 'max_us': 0.0}
+                        self.timings[key] = timing
+
+                    rule_start = time.perf_counter()
+                    try:
+                        result = compiled(context)
+                    except (ArithmeticError, TypeError) as e:
+                        result = False
+                        timing['errors'] += 1
+                        logger.debug(f"조건식 평가 오류: {code} {rule['id']} - {e}")
+                    elapsed_us = (time.perf_counter() - rule_start) * 1e6
+                    timing['evaluations'] += 1
+                    timing['total_us'] += elapsed_us
+                    timing['max_us'] = max(timing['max_us'], elapsed_us)
+
+                    self.last_result[key] = result
+                    if not result:
+                        self.latched.discard(key)   # 조건이 거짓이 되면 다시 무장
+                    elif key not in self.latched:
+                        hits.append({
+                            'stock_code': code,
+                            'rule': RULE_EXPR,
+                            'alert_id': f"expr_{rule['id']}_{today}",
+                            'level': float(price),
+                            'direction': DIRECTION_UP,
+                            'price': float(price),
+                            'previous_price': float(previous_price or price),
+                            'change_percent': float(change_percent),
+                            'meta': {
+                                'rule_id': rule['id'],
+                                'expression': compiled.source,
+                                'message': rule.get('message') or f"조건 충족: {compiled.source}",
+                                'values': {field: context.get(field) for field in sorted(compiled.fields)}
+                            }
+                        })
+                    self.stats['evaluations'] += 1
+
+            self.stats['cycles'] += 1
+            self.stats['last_cycle_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        return hits
+
+    def complete(self, hit: Dict, sent: bool):
+        """적중 항목 발송 결과 반영 (발송했으면 조건이 다시 거짓이 될 때까지 적중을 내보내지 않음)"""
+        if not sent:
+            return
+        key = (hit['stock_code'], hit['meta']['rule_id'])
+        with self._lock:
+            if key in self.latched:
+                return
+            self.latched.add(key)
+            self.stats['hits'] += 1
+            timing = self.timings.get(key)
+            if timing is not None:
+                timing['hits'] += 1
+
+    # === 조회 ===
+
+    def get_rule_stats(self, stock_code: str) -> Dict[str, Dict]:
+        """종목 규칙별 평가 통계 (규칙 ID -> 횟수/적중/오류/평균·최대 소요 시간, 마지막 결과)"""
+        with self._lock:
+            result = {}
+            for (code, rule_id), timing in self.timings.items():
+                if code != stock_code:
+                    continue
+                evaluations = timing['evaluations']
+                result[rule_id] = {
+                    'evaluations': evaluations,
+                    'hits': timing['hits'],
+                    'errors': timing['errors'],
+                    'avg_us': round(timing['total_us'] / evaluations, 2) if evaluations else 0.0,
+                    'max_us': round(timing['max_us'], 2),
+                    'last_result': self.last_result.get((code, rule_id))
+                }
+            return result
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'stocks': len(self.rules),
+                'rules': sum(len(rules) for rules in self.rules.values()),
+                **self.stats
+            }
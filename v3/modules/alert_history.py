@@ -0,0 +1,219 @@
+"""
+알림 이력 저장소 모듈
+발송된 알림을 SQLite에 기록하고 (일자, 종목, 알림 유형) 보조 인덱스로 기간/종목/유형 조회
+커서 기반 페이지네이션으로 이력 크기와 무관하게 일정한 조회 시간 유지
+"""
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from .config import ALERT_HISTORY_DB, ALERT_HISTORY_RETENTION_DAYS
+from .logger_utils import get_logger
+
+logger = get_logger('stock')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    trade_date TEXT NOT NULL,
+    stock_code TEXT NOT NULL,
+    stock_name TEXT,
+    alert_type TEXT NOT NULL,
+    message TEXT,
+    current_price REAL,
+    change_percent REAL
+);
+CREATE INDEX IF NOT EXISTS idx_alerts_ts ON alerts (ts, id);
+CREATE INDEX IF NOT EXISTS idx_alerts_date ON alerts (trade_date, stock_code, alert_type);
+CREATE INDEX IF NOT EXISTS idx_alerts_stock ON alerts (stock_code, ts, id);
+CREATE INDEX IF NOT EXISTS idx_alerts_type ON alerts (alert_type, ts, id);
+"""
+
+COLUMNS = ('id', 'ts', 'trade_date', 'stock_code', 'stock_name', 'alert_type',
+           'message', 'current_price', 'change_percent')
+
+
+def encode_cursor(ts: float, row_id: int) -> str:
+    return f"{ts!r}:{row_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """커서 해석 (형식 오류 시 ValueError)"""
+    ts, row_id = cursor.split(':', 1)
+    return float(ts), int(row_id)
+
+
+class AlertHistoryStore:
+    """
+    SQLite 알림 이력
+
+    조회는 (ts, id) 내림차순이며, 마지막 항목의 (ts, id)를 커서로 돌려주어 다음 페이지를
+    인덱스 탐색으로 이어간다 (OFFSET 미사용).
+    """
+
+    def __init__(self, db_path: str = ALERT_HISTORY_DB, retention_days: int = ALERT_HISTORY_RETENTION_DAYS):
+        self.db_path = db_path
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    # === 기록 ===
+
+    def record(self, entry: Dict) -> Optional[int]:
+        """알림 1건 기록 (save_daily_alert 항목 형식), 행 ID 반환"""
+        when = datetime.fromisoformat(entry['timestamp']) if entry.get('timestamp') else datetime.now()
+        try:
+            with self._lock:
+                cursor = self._conn.execute(
+                    'INSERT INTO alerts (ts, trade_date, stock_code, stock_name, alert_type, message, '
+                    'current_price, change_percent) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (when.timestamp(), when.strftime('%Y-%m-%d'), entry.get('stock_code', ''),
+                     entry.get('stock_name'), entry.get('alert_type', ''), entry.get('message'),
+                     entry.get('current_price'), entry.get('change_percent'))
+                )
+                self._conn.commit()
+                return cursor.lastrowid
+        except Exception as e:
+            logger.error(f"알림 이력 기록 실패: {e}")
+            return None
+
+    def import_entries(self, entries: List[Dict]) -> int:
+        """과거 알림 일괄 기록 (저널 이관용)"""
+        count = 0
+        for entry in entries:
+            if entry.get('timestamp') and self.record(entry) is not None:
+                count += 1
+        return count
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM alerts LIMIT 1').fetchone() is None
+
+    # === 조회 ===
+
+    def query(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+              stock_code: Optional[str] = None, alert_type: Optional[str] = None,
+              cursor: Optional[str] = None, limit: int = 100) -> Dict:
+        """
+        기간/종목/유형 조회 (최신순)
+
+        Args:
+            start, end: 기간 (end 미포함)
+            cursor: 이전 페이지의 next_cursor (형식 오류 시 ValueError)
+
+        Returns:
+            Dict: {'items': [...], 'next_cursor': str 또는 None}
+        """
+        conditions, params = [], []
+        if stock_code:
+            conditions.append('stock_code = ?')
+            params.append(stock_code)
+        if alert_type:
+            conditions.append('alert_type = ?')
+            params.append(alert_type)
+        if start is not None:
+            conditions.append('ts >= ?')
+            params.append(start.timestamp())
+        if end is not None:
+            conditions.append('ts < ?')
+            params.append(end.timestamp())
+        if cursor:
+            cursor_ts, cursor_id = decode_cursor(cursor)
+            conditions.append('(ts < ? OR (ts = ? AND id < ?))')
+            params.extend([cursor_ts, cursor_ts, cursor_id])
+
+        sql = f"SELECT {', '.join(COLUMNS)} FROM alerts"
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY ts DESC, id DESC LIMIT ?'
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        items = [self._row_to_dict(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = encode_cursor(last['ts'], last['id'])
+        return {'items': items, 'next_cursor': next_cursor}
+
+    def count_by_type(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                      stock_code: Optional[str] = None) -> Dict[str, int]:
+        """기간 내 유형별 건수"""
+        conditions, params = [], []
+        if stock_code:
+            conditions.append('stock_code = ?')
+            params.append(stock_code)
+        if start is not None:
+            conditions.append('ts >= ?')
+            params.append(start.timestamp())
+        if end is not None:
+            conditions.append('ts < ?')
+            params.append(end.timestamp())
+        sql = 'SELECT alert_type, COUNT(*) FROM alerts'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' GROUP BY alert_type'
+        with self._lock:
+            return {row[0]: row[1] for row in self._conn.execute(sql, params).fetchall()}
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict:
+        item = dict(row)
+        item['timestamp'] = datetime.fromtimestamp(item.pop('ts')).isoformat()
+        return item
+
+    # === 보관 기간 ===
+
+    def prune(self) -> int:
+        """보관 기간이 지난 이력 삭제 (retention_days <= 0이면 무기한 보관)"""
+        if self.retention_days <= 0:
+            return 0
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).timestamp()
+        with self._lock:
+            deleted = self._conn.execute('DELETE FROM alerts WHERE ts < ?', (cutoff,)).rowcount
+            self._conn.commit()
+        if deleted:
+            logger.info(f"알림 이력 보관 기간 정리: {deleted}건 삭제")
+        return deleted
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            row = self._conn.execute('SELECT COUNT(*), MIN(ts), MAX(ts) FROM alerts').fetchone()
+        return {
+            'db_path': self.db_path,
+            'retention_days': self.retention_days,
+            'total': row[0],
+            'oldest': datetime.fromtimestamp(row[1]).isoformat() if row[1] else None,
+            'newest': datetime.fromtimestamp(row[2]).isoformat() if row[2] else None,
+            'db_bytes': os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def parse_time_bound(value: Optional[str], end: bool = False) -> Optional[datetime]:
+    """
+    조회 기간 값 해석 (YYYY-MM-DD 또는 ISO 시각, 형식 오류 시 ValueError)
+
+    날짜만 주어진 end는 해당 일자 전체를 포함하도록 다음날 0시로 바꾼다.
+    """
+    if not value:
+        return None
+    if len(value) == 10:
+        day = datetime.strptime(value, '%Y-%m-%d')
+        return day + timedelta(days=1) if end else day
+    return datetime.fromisoformat(value)
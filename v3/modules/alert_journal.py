@@ -0,0 +1,236 @@
+"""
+일일 알림 저널 모듈
+거래일별 추가 전용 JSONL 파일에 알림 내역을 기록 (배치 fsync, 당일 내역은 메모리 인덱스로 조회)
+보관 기간이 지난 내역은 일자 파일 단위로 삭제
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from filelock import FileLock
+
+from .config import (
+    ALERT_JOURNAL_DIR,
+    ALERT_JOURNAL_RETENTION_DAYS,
+    ALERT_JOURNAL_FSYNC_ENTRIES,
+    ALERT_JOURNAL_FSYNC_SECONDS,
+    DAILY_HISTORY_FILE
+)
+from .logger_utils import get_logger
+
+logger = get_logger('stock')
+
+DAY_FORMAT = '%Y-%m-%d'
+JOURNAL_SUFFIX = '.jsonl'
+
+
+def validate_day(day: str) -> str:
+    """
+    조회 일자 검증 (YYYY-MM-DD, 일자 파일 경로에 쓰이므로 그 외 형식은 거부)
+
+    Returns:
+        정규화된 일자 문자열
+
+    Raises:
+        ValueError: 형식이 올바르지 않은 경우
+    """
+    try:
+        return datetime.strptime(day, DAY_FORMAT).strftime(DAY_FORMAT)
+    except (TypeError, ValueError):
+        raise ValueError(f"일자는 YYYY-MM-DD 형식이어야 합니다: {day}")
+
+
+class AlertJournal:
+    """
+    거래일별 알림 저널
+
+    {dir}/YYYY-MM-DD.jsonl 에 알림 1건당 한 줄을 추가한다.
+    append()는 열린 당일 파일에 한 줄 쓰고 메모리 인덱스에 추가하는 상수 비용 작업이며,
+    fsync는 ALERT_JOURNAL_FSYNC_ENTRIES건 또는 ALERT_JOURNAL_FSYNC_SECONDS초마다 모아서 수행한다.
+    """
+
+    def __init__(self, base_dir: str = ALERT_JOURNAL_DIR, retention_days: int = ALERT_JOURNAL_RETENTION_DAYS):
+        self.base_dir = base_dir
+        self.retention_days = retention_days
+        self.lock_file = os.path.join(base_dir, 'journal.lock')
+
+        self._lock = threading.Lock()
+        self._day: Optional[str] = None
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.time()
+
+        # 당일 내역 인덱스
+        self._today_entries: List[Dict] = []
+        self._today_by_stock: Dict[str, List[Dict]] = {}
+
+        self.stats = {'appended': 0, 'syncs': 0, 'removed_days': 0, 'last_error': None}
+
+        os.makedirs(base_dir, exist_ok=True)
+        self._import_legacy_history()
+        self.enforce_retention()
+
+    def _day_file(self, day: str) -> str:
+        return os.path.join(self.base_dir, f"{day}{JOURNAL_SUFFIX}")
+
+    # === 기록 ===
+
+    def append(self, entry: Dict, when: Optional[datetime] = None) -> bool:
+        """알림 1건 기록 (당일 파일 끝에 추가)"""
+        day = (when or datetime.now()).strftime(DAY_FORMAT)
+        line = json.dumps(entry, ensure_ascii=False, default=str) + '\n'
+
+        with self._lock:
+            try:
+                if day != self._day:
+                    self._open_day(day)
+                self._file.write(line)
+                self._file.flush()
+                self._unsynced += 1
+
+                self._today_entries.append(entry)
+                self._today_by_stock.setdefault(entry.get('stock_code', ''), []).append(entry)
+                self.stats['appended'] += 1
+
+                if (self._unsynced >= ALERT_JOURNAL_FSYNC_ENTRIES or
+                        time.time() - self._last_sync >= ALERT_JOURNAL_FSYNC_SECONDS):
+                    self._sync_locked()
+                return True
+            except Exception as e:
+                self.stats['last_error'] = str(e)
+                logger.error(f"알림 저널 기록 실패: {e}")
+                return False
+
+    def sync(self):
+        """미동기화 기록 fsync (정기 저장 작업/종료 시 호출)"""
+        with self._lock:
+            self._sync_locked()
+
+    def _sync_locked(self):
+        if self._file is None or not self._unsynced:
+            return
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.time()
+        self.stats['syncs'] += 1
+
+    def _open_day(self, day: str):
+        """일자 전환: 이전 파일 동기화/닫기, 당일 인덱스 재구성, 보관 기간 정리"""
+        if self._file is not None:
+            self._sync_locked()
+            self._file.close()
+            self._file = None
+
+        self._today_entries = self._read_day(day)
+        self._today_by_stock = {}
+        for entry in self._today_entries:
+            self._today_by_stock.setdefault(entry.get('stock_code', ''), []).append(entry)
+
+        self._file = open(self._day_file(day), 'a', encoding='utf-8')
+        self._day = day
+        self._enforce_retention_locked(day)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._sync_locked()
+                self._file.close()
+                self._file = None
+                self._day = None
+
+    # === 조회 ===
+
+    def _read_day(self, day: str) -> List[Dict]:
+        path = self._day_file(day)
+        if not os.path.exists(path):
+            return []
+        entries = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # 비정상 종료로 잘린 마지막 줄 등은 건너뜀
+                    logger.warning(f"알림 저널 손상 줄 무시: {day}")
+        return entries
+
+    def get_entries(self, day: Optional[str] = None, stock_code: Optional[str] = None) -> List[Dict]:
+        """
+        일자별 알림 내역 (당일은 메모리 인덱스, 지난 날짜는 일자 파일)
+
+        Raises:
+            ValueError: 일자 형식이 올바르지 않은 경우
+        """
+        day = validate_day(day) if day else datetime.now().strftime(DAY_FORMAT)
+        with self._lock:
+            if day == self._day:
+                source = self._today_by_stock.get(stock_code, []) if stock_code else self._today_entries
+                return list(source)
+        entries = self._read_day(day)
+        if stock_code:
+            entries = [entry for entry in entries if entry.get('stock_code') == stock_code]
+        return entries
+
+    def days(self) -> List[str]:
+        """보관 중인 일자 목록 (최신순)"""
+        return sorted(
+            (name[:-len(JOURNAL_SUFFIX)] for name in os.listdir(self.base_dir) if name.endswith(JOURNAL_SUFFIX)),
+            reverse=True
+        )
+
+    # === 보관 기간 ===
+
+    def enforce_retention(self):
+        with self._lock:
+            self._enforce_retention_locked(datetime.now().strftime(DAY_FORMAT))
+
+    def _enforce_retention_locked(self, today: str):
+        """보관 기간이 지난 일자 파일 삭제"""
+        cutoff = (datetime.strptime(today, DAY_FORMAT) - timedelta(days=self.retention_days)).strftime(DAY_FORMAT)
+        for day in self.days():
+            if day < cutoff:
+                try:
+                    os.remove(self._day_file(day))
+                    self.stats['removed_days'] += 1
+                    logger.debug(f"오래된 알림 저널 삭제: {day}")
+                except OSError as e:
+                    logger.warning(f"알림 저널 삭제 실패: {day} - {e}")
+
+    def _import_legacy_history(self):
+        """이전 daily_history.json 내역을 일자 파일로 옮기고 원본은 .migrated로 이름 변경"""
+        if not os.path.exists(DAILY_HISTORY_FILE):
+            return
+        try:
+            with FileLock(DAILY_HISTORY_FILE + '.lock'):
+                with open(DAILY_HISTORY_FILE, 'r', encoding='utf-8') as f:
+                    legacy = json.load(f)
+                imported = 0
+                for day, entries in legacy.get('alerts', {}).items():
+                    if os.path.exists(self._day_file(day)) or not entries:
+                        continue
+                    with open(self._day_file(day), 'w', encoding='utf-8') as f:
+                        for entry in entries:
+                            f.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+                    imported += len(entries)
+                os.replace(DAILY_HISTORY_FILE, DAILY_HISTORY_FILE + '.migrated')
+            logger.info(f"이전 일일 알림 내역 이관: {imported}건")
+        except Exception as e:
+            logger.error(f"이전 일일 알림 내역 이관 실패: {e}")
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'dir': self.base_dir,
+                'retention_days': self.retention_days,
+                'current_day': self._day,
+                'today_entries': len(self._today_entries),
+                'unsynced': self._unsynced,
+                'days': len(self.days()),
+                **self.stats
+            }
@@ -0,0 +1,121 @@
+"""
+알림 발송 상태 저장소 모듈
+(종목, 알림 ID, 거래일) 단위 발송 기록을 SQLite에 즉시 기록하고 당일분은 메모리 캐시로 조회
+거래일이 바뀌면 지난 거래일 기록을 만료시켜, 재시작 후에도 당일 중복 발송이 없도록 함
+"""
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from .config import ALERT_STATE_DB
+from .logger_utils import get_logger
+
+logger = get_logger('stock')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS alert_state (
+    stock_code TEXT NOT NULL,
+    alert_id TEXT NOT NULL,
+    trade_date TEXT NOT NULL,
+    sent_at REAL NOT NULL,
+    PRIMARY KEY (trade_date, stock_code, alert_id)
+) WITHOUT ROWID;
+"""
+
+# 종목에 속하지 않는 일 1회 작업 (일일 보고서 등)
+SYSTEM_KEY = '_system'
+
+
+def trade_date_key(now: Optional[datetime] = None) -> str:
+    """거래일 키 (KRX 일자 기준 YYYYMMDD)"""
+    return (now or datetime.now()).strftime('%Y%m%d')
+
+
+class AlertStateStore:
+    """
+    당일 알림 발송 상태
+
+    was_sent()는 메모리 캐시만 조회하고, mark_sent()는 캐시 추가 + 즉시 커밋한다.
+    시작 시에는 당일 거래일 행만 읽어 캐시를 만들며, 거래일이 바뀌면 캐시를 비우고 지난 행을 삭제한다.
+    """
+
+    def __init__(self, db_path: str = ALERT_STATE_DB):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._trade_date: Optional[str] = None
+        self._sent: set = set()
+        self.stats = {'checks': 0, 'suppressed': 0, 'marked': 0, 'expired': 0}
+
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+        with self._lock:
+            self._roll_locked(trade_date_key())
+
+    def _roll_locked(self, today: str):
+        """거래일 전환: 지난 거래일 기록 만료, 당일 기록으로 캐시 재구성"""
+        if today == self._trade_date:
+            return
+        expired = self._conn.execute('DELETE FROM alert_state WHERE trade_date < ?', (today,)).rowcount
+        self._conn.commit()
+        rows = self._conn.execute(
+            'SELECT stock_code, alert_id FROM alert_state WHERE trade_date = ?', (today,)
+        ).fetchall()
+        self._sent = {(stock_code, alert_id) for stock_code, alert_id in rows}
+        self._trade_date = today
+        self.stats['expired'] += expired
+        logger.info(f"알림 발송 상태 거래일 전환: {today} (당일 {len(self._sent)}건, 만료 {expired}건)")
+
+    def roll(self, now: Optional[datetime] = None):
+        """거래일이 바뀌었으면 만료 처리"""
+        with self._lock:
+            self._roll_locked(trade_date_key(now))
+
+    def was_sent(self, stock_code: str, alert_id: str) -> bool:
+        """당일 발송 여부 (메모리 캐시 조회)"""
+        with self._lock:
+            self._roll_locked(trade_date_key())
+            self.stats['checks'] += 1
+            sent = (stock_code, alert_id) in self._sent
+            if sent:
+                self.stats['suppressed'] += 1
+            return sent
+
+    def mark_sent(self, stock_code: str, alert_id: str) -> bool:
+        """당일 발송 기록 (즉시 커밋), 이미 기록된 경우 False"""
+        with self._lock:
+            self._roll_locked(trade_date_key())
+            key = (stock_code, alert_id)
+            if key in self._sent:
+                return False
+            try:
+                self._conn.execute(
+                    'INSERT OR IGNORE INTO alert_state (stock_code, alert_id, trade_date, sent_at) VALUES (?, ?, ?, ?)',
+                    (stock_code, alert_id, self._trade_date, time.time())
+                )
+                self._conn.commit()
+            except Exception as e:
+                # 기록 실패 시에도 이번 실행 중에는 캐시로 중복을 막는다
+                logger.error(f"알림 발송 상태 기록 실패: {stock_code} {alert_id} - {e}")
+            self._sent.add(key)
+            self.stats['marked'] += 1
+            return True
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'db_path': self.db_path,
+                'trade_date': self._trade_date,
+                'sent_today': len(self._sent),
+                **self.stats
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,456 @@
+"""
+알림 규칙 백테스트 모듈
+로컬 봉 데이터 캐시(일봉/분봉)를 종목 x 시각 행렬로 정렬한 뒤, 실시간과 같은 알림 엔진
+(AlertEngine.evaluate_arrays, MezzanineEngine.evaluate)에 시각 순서대로 재생하여
+종목별/일자별/규칙별 적중 수를 집계 (네트워크 없이 캐시/CSV 픽스처만으로 실행)
+"""
+import csv
+import io
+import os
+import re
+import threading
+import time
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .alert_engine import AlertEngine, RULE_REFIX
+from .config import BACKTEST_BAR_DIR, BACKTEST_SAMPLE_TRIGGERS, BACKTEST_PYKRX_DELAY_SECONDS
+from .logger_utils import get_logger
+from .mezzanine import MezzanineEngine, instrument_terms
+from .price_ladder import LadderIndex
+
+# PyKrx 가용성 확인 (캐시 채우기 전용, 백테스트 실행에는 불필요)
+try:
+    from pykrx import stock
+    PYKRX_AVAILABLE = True
+except ImportError:
+    PYKRX_AVAILABLE = False
+
+logger = get_logger('stock')
+
+BAR_COLUMNS = ('ts', 'open', 'high', 'low', 'close', 'volume')
+INTERVALS = ('1d', '1m', '5m', '10m', '30m', '60m')
+_STOCK_CODE_RE = re.compile(r'^\d{6}$')
+
+# 봉 내부 재생 경로
+PATH_CLOSE = 'close'   # 종가만
+PATH_OHLC = 'ohlc'     # 시가 -> 저가/고가 -> 고가/저가 -> 종가 (양봉은 저가 먼저, 음봉은 고가 먼저)
+PATHS = (PATH_CLOSE, PATH_OHLC)
+
+# 백테스트 전용 덮어쓰기 항목
+OVERRIDE_SETTINGS = ('surge_threshold', 'drop_threshold', 'volatility_enabled',
+                     'target_stop_enabled', 'parity_enabled')
+OVERRIDE_KEYS = OVERRIDE_SETTINGS + ('target_percent', 'stop_percent', 'parity_levels')
+
+
+def validate_interval(interval: str) -> str:
+    """
+    봉 주기 검증
+
+    Raises:
+        ValueError: 지원하지 않는 주기인 경우
+    """
+    if interval not in INTERVALS:
+        raise ValueError(f"주기는 {', '.join(INTERVALS)} 중 하나여야 합니다")
+    return interval
+
+
+def validate_stock_code(stock_code: str) -> str:
+    """
+    종목코드 검증 (6자리 숫자, 캐시 경로에 그대로 쓰이므로 그 외 문자는 거부)
+
+    Raises:
+        ValueError: 형식이 올바르지 않은 경우
+    """
+    if not isinstance(stock_code, str) or not _STOCK_CODE_RE.match(stock_code):
+        raise ValueError(f"종목코드는 6자리 숫자여야 합니다: {stock_code}")
+    return stock_code
+
+
+def _empty_bars() -> Dict[str, np.ndarray]:
+    return {name: np.empty(0) for name in BAR_COLUMNS}
+
+
+def _parse_time(value: str) -> float:
+    """봉 시각 (YYYY-MM-DD, YYYYMMDD, YYYY-MM-DD HH:MM[:SS]) -> epoch 초"""
+    value = value.strip()
+    for fmt in ('%Y-%m-%d', '%Y%m%d', '%Y-%m-%d %H:%M', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S'):
+        try:
+            return datetime.strptime(value, fmt).timestamp()
+        except ValueError:
+            continue
+    raise ValueError(f"봉 시각 형식이 올바르지 않습니다: {value}")
+
+
+def merge_bars(old: Dict[str, np.ndarray], new: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """봉 병합 (같은 시각은 새 값 우선, 시각 오름차순)"""
+    ts = np.concatenate([new['ts'], old['ts']])
+    _, first = np.unique(ts, return_index=True)   # 정렬된 고유 시각별 첫 위치 (새 값이 앞)
+    return {name: np.concatenate([new[name], old[name]])[first] for name in BAR_COLUMNS}
+
+
+class BarCache:
+    """
+    봉 데이터 캐시
+
+    {dir}/{interval}/{종목코드}.npz 에 BAR_COLUMNS 순서로 쌓은 (6 x 봉 수) 배열 하나를 시각 오름차순으로 저장한다
+    (열별 배열로 저장된 이전 형식도 읽는다). 종목코드/주기는 검증 후에만 경로에 쓴다.
+    CSV 픽스처 가져오기(import_csv)와 pykrx 일봉 채우기(populate_pykrx)로 만든다.
+    """
+
+    def __init__(self, base_dir: str = BACKTEST_BAR_DIR):
+        self.base_dir = base_dir
+        self._lock = threading.Lock()
+
+    def _path(self, stock_code: str, interval: str) -> str:
+        return os.path.join(self.base_dir, validate_interval(interval), f"{validate_stock_code(stock_code)}.npz")
+
+    def load(self, stock_code: str, interval: str = '1d') -> Optional[Dict[str, np.ndarray]]:
+        path = self._path(stock_code, interval)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if 'bars' in data.files:
+                return dict(zip(BAR_COLUMNS, data['bars']))
+            return {name: data[name] for name in BAR_COLUMNS}
+
+    def save(self, stock_code: str, bars: Dict[str, np.ndarray], interval: str = '1d', merge: bool = True) -> int:
+        """
+        봉 저장 (기존 캐시와 병합, 임시 파일 기록 후 교체), 저장된 봉 수 반환
+
+        Raises:
+            ValueError: 종목코드/주기가 유효하지 않은 경우
+        """
+        path = self._path(stock_code, interval)
+        with self._lock:
+            existing = self.load(stock_code, interval) if merge else None
+            bars = merge_bars(existing, bars) if existing is not None else merge_bars(_empty_bars(), bars)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                np.savez(f, bars=np.stack([bars[name].astype(np.float64) for name in BAR_COLUMNS]))
+            os.replace(temp_path, path)
+            return len(bars['ts'])
+
+    def codes(self, interval: str = '1d') -> List[str]:
+        directory = os.path.join(self.base_dir, validate_interval(interval))
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-4] for name in os.listdir(directory) if name.endswith('.npz'))
+
+    def import_csv(self, text: str, stock_code: Optional[str] = None, interval: str = '1d') -> Dict[str, int]:
+        """
+        CSV 픽스처 가져오기
+
+        열: date, open, high, low, close[, volume][, code]
+        code 열이 없으면 stock_code를 사용한다.
+
+        Raises:
+            ValueError: 형식/종목코드/주기가 올바르지 않은 경우
+        """
+        validate_interval(interval)
+        rows: Dict[str, List[Tuple[float, ...]]] = {}
+        reader = csv.DictReader(io.StringIO(text))
+        required = {'date', 'open', 'high', 'low', 'close'}
+        if not reader.fieldnames or not required <= set(reader.fieldnames):
+            raise ValueError(f"CSV 열이 부족합니다 (필수: {', '.join(sorted(required))})")
+        for line_no, row in enumerate(reader, start=2):
+            code = (row.get('code') or stock_code or '').strip()
+            if not code:
+                raise ValueError("종목코드가 없습니다 (code 열 또는 stock_code 지정)")
+            try:
+                validate_stock_code(code)
+            except ValueError as e:
+                raise ValueError(f"CSV {line_no}행 오류: {e}")
+            try:
+                rows.setdefault(code, []).append((
+                    _parse_time(row['date']), float(row['open']), float(row['high']),
+                    float(row['low']), float(row['close']), float(row.get('volume') or 0)
+                ))
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"CSV {line_no}행 오류: {e}")
+
+        saved = {}
+        for code, values in rows.items():
+            columns = np.array(values, dtype=np.float64).T
+            saved[code] = self.save(code, dict(zip(BAR_COLUMNS, columns)), interval)
+        logger.info(f"봉 데이터 CSV 가져오기: {len(saved)}개 종목, {sum(len(v) for v in rows.values())}개 봉")
+        return saved
+
+    def populate_pykrx(self, codes: Iterable[str], start: date, end: date) -> Dict[str, int]:
+        """
+        pykrx 일봉으로 캐시 채우기 (종목별 저장된 봉 수 반환, 실패 종목은 0)
+
+        Raises:
+            RuntimeError: pykrx를 사용할 수 없는 경우
+        """
+        if not PYKRX_AVAILABLE:
+            raise RuntimeError("pykrx를 사용할 수 없습니다")
+        codes = [validate_stock_code(code) for code in codes]
+        saved = {}
+        for code in codes:
+            try:
+                df = stock.get_market_ohlcv_by_date(start.strftime('%Y%m%d'), end.strftime('%Y%m%d'), code)
+                if df is None or df.empty:
+                    saved[code] = 0
+                    continue
+                bars = {
+                    'ts': np.array([ts.to_pydatetime().timestamp() for ts in df.index], dtype=np.float64),
+                    'open': df['시가'].to_numpy(dtype=np.float64),
+                    'high': df['고가'].to_numpy(dtype=np.float64),
+                    'low': df['저가'].to_numpy(dtype=np.float64),
+                    'close': df['종가'].to_numpy(dtype=np.float64),
+                    'volume': df['거래량'].to_numpy(dtype=np.float64)
+                }
+                saved[code] = self.save(code, bars, '1d')
+            except Exception as e:
+                logger.warning(f"pykrx 일봉 조회 실패: {code} - {e}")
+                saved[code] = 0
+            time.sleep(BACKTEST_PYKRX_DELAY_SECONDS)  # API 부하 방지
+        logger.info(f"pykrx 일봉 캐시 채우기: {len(saved)}개 종목 ({start} ~ {end})")
+        return saved
+
+
+def parse_overrides(data: Optional[Dict]) -> Dict:
+    """
+    백테스트 설정 덮어쓰기 검증
+
+    Args:
+        data: {'target_percent', 'stop_percent', 'surge_threshold', 'drop_threshold',
+               'parity_levels', 'volatility_enabled', 'target_stop_enabled', 'parity_enabled'}
+
+    Raises:
+        ValueError: 값이 유효하지 않은 경우
+    """
+    overrides = {}
+    for key, value in (data or {}).items():
+        if key not in OVERRIDE_KEYS:
+            raise ValueError(f"알 수 없는 설정입니다: {key}")
+        try:
+            if key == 'parity_levels':
+                parsed = sorted({float(level) for level in value})
+            elif key.endswith('_enabled'):
+                parsed = bool(value)
+            else:
+                parsed = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{key} 값이 올바르지 않습니다")
+
+        if key in ('target_percent', 'surge_threshold') and parsed <= 0:
+            raise ValueError(f"{key}는 0보다 커야 합니다")
+        if key in ('stop_percent', 'drop_threshold') and parsed >= 0:
+            raise ValueError(f"{key}는 0보다 작아야 합니다")
+        if key == 'parity_levels' and (not parsed or parsed[0] <= 0):
+            raise ValueError("패리티 기준은 0보다 커야 합니다")
+        overrides[key] = parsed
+    return overrides
+
+
+def prepare_stocks(stocks: Dict[str, Dict], overrides: Dict, base_prices: Dict[str, float]) -> Dict[str, Dict]:
+    """
+    재생용 종목 설정 (실시간 상태 제외, 덮어쓰기 반영)
+
+    목표/손절 비율은 취득가(없으면 기간 첫 종가) 기준으로 목표가/손절가를 다시 계산한다.
+    메자닌 발행 조건은 리픽싱 적용 이력 없이 최초 조건으로 재생한다.
+    """
+    replay = {}
+    for code, info in stocks.items():
+        item = {key: value for key, value in info.items()
+                if key not in ('current_price', 'change_percent', 'triggered_alerts', 'mezzanine')}
+        alert_settings = dict(info.get('alert_settings') or {})
+        for key in OVERRIDE_SETTINGS:
+            if key in overrides:
+                alert_settings[key] = overrides[key]
+        item['alert_settings'] = alert_settings
+
+        base = info.get('acquisition_price') or base_prices.get(code, 0)
+        if 'target_percent' in overrides and base > 0:
+            item['target_price'] = round(base * (1 + overrides['target_percent'] / 100), 2)
+        if 'stop_percent' in overrides and base > 0:
+            item['stop_loss'] = round(base * (1 + overrides['stop_percent'] / 100), 2)
+
+        terms = instrument_terms({**info, 'alert_settings': alert_settings})
+        if terms is not None:
+            terms = {key: value for key, value in terms.items()
+                     if key not in ('effective_conversion_price', 'refix_history')}
+            if 'parity_levels' in overrides:
+                terms['parity_levels'] = overrides['parity_levels']
+            item['mezzanine'] = terms
+        replay[code] = item
+    return replay
+
+
+def _forward_fill(values: np.ndarray) -> np.ndarray:
+    """열별 직전 유효값 채우기 (행 = 시각)"""
+    rows = np.arange(values.shape[0])[:, None]
+    last = np.maximum.accumulate(np.where(~np.isnan(values), rows, 0), axis=0)
+    return values[last, np.arange(values.shape[1])]
+
+
+class Backtester:
+    """
+    알림 규칙 백테스트
+
+    종목별 봉을 공통 시각축 행렬(시각 x 종목)로 맞춘 뒤 시각 순서대로 알림 엔진에 재생한다.
+    각 시각은 전 종목 한 번의 벡터 판정이며, 등락률은 직전 거래일 종가 기준이다.
+    중복 제외(dedup)는 실시간 triggered_alerts와 같이 (종목, 알림 ID) 기준 1회다.
+    목표가/손절가/알림가는 기간 전체에서 한 번만 세고, 급등락/래더처럼 알림 ID에
+    거래일이 들어가는 규칙은 거래일마다 한 번씩 센다.
+    """
+
+    def __init__(self, cache: Optional[BarCache] = None):
+        self.cache = cache or BarCache()
+
+    def run(self, stocks: Dict[str, Dict], start: Optional[date] = None, end: Optional[date] = None,
+            interval: str = '1d', path: str = PATH_CLOSE, overrides: Optional[Dict] = None,
+            dedup: bool = True, sample_limit: int = BACKTEST_SAMPLE_TRIGGERS) -> Dict:
+        """
+        백테스트 실행
+
+        Args:
+            stocks: 종목 설정 (모니터링 종목 형식)
+            start, end: 기간 (포함)
+            interval: 봉 주기
+            path: 봉 내부 재생 경로 (close | ohlc)
+            overrides: parse_overrides() 결과
+
+        Raises:
+            ValueError: 주기/경로가 유효하지 않은 경우
+        """
+        validate_interval(interval)
+        if path not in PATHS:
+            raise ValueError(f"재생 경로는 {', '.join(PATHS)} 중 하나여야 합니다")
+        started = time.perf_counter()
+        overrides = overrides or {}
+
+        # 봉 로드 및 기간 필터
+        start_ts = datetime.combine(start, datetime.min.time()).timestamp() if start else -np.inf
+        end_ts = datetime.combine(end, datetime.max.time()).timestamp() if end else np.inf
+        bars, missing = {}, []
+        for code in stocks:
+            data = self.cache.load(code, interval) if _STOCK_CODE_RE.match(code) else None
+            if data is not None:
+                mask = (data['ts'] >= start_ts) & (data['ts'] <= end_ts)
+                data = {name: column[mask] for name, column in data.items()}
+            if data is None or not len(data['ts']):
+                missing.append(code)
+                continue
+            bars[code] = data
+
+        replay = prepare_stocks({code: stocks[code] for code in bars}, overrides,
+                                {code: float(data['close'][0]) for code, data in bars.items()})
+        ladders = LadderIndex()
+        ladders.load(replay)
+        engine = AlertEngine(ladders=ladders)
+        engine.sync(replay)
+        mezzanine = MezzanineEngine()
+        mezzanine_stocks = {code: replay[code] for code in replay if replay[code].get('mezzanine')}
+        mezzanine.sync(mezzanine_stocks)
+
+        # 시각축 행렬 (시각 x 종목, 엔진 종목 순서)
+        timeline = np.unique(np.concatenate([data['ts'] for data in bars.values()])) if bars else np.empty(0)
+        steps, count = len(timeline), len(engine.codes)
+        matrices = {name: np.full((steps, count), np.nan) for name in ('open', 'high', 'low', 'close')}
+        for code, data in bars.items():
+            rows = np.searchsorted(timeline, data['ts'])
+            for name, matrix in matrices.items():
+                matrix[rows, engine.index[code]] = data[name]
+
+        # 직전 거래일 종가 (등락률 기준)
+        days = np.array([datetime.fromtimestamp(ts).date().toordinal() for ts in timeline], dtype=np.int64)
+        previous_row = np.searchsorted(days, days, side='left') - 1
+        filled_close = _forward_fill(matrices['close']) if steps else matrices['close']
+        previous_close = np.where((previous_row >= 0)[:, None], filled_close[np.maximum(previous_row, 0)], np.nan)
+
+        if path == PATH_OHLC:
+            rising = matrices['close'] >= matrices['open']
+            sequence = (matrices['open'],
+                        np.where(rising, matrices['low'], matrices['high']),
+                        np.where(rising, matrices['high'], matrices['low']),
+                        matrices['close'])
+        else:
+            sequence = (matrices['close'],)
+
+        mezzanine_columns = np.array([engine.index[code] for code in mezzanine.codes], dtype=np.int64)
+        totals: Dict[str, int] = {}
+        by_stock: Dict[str, Dict[str, int]] = {}
+        by_day: Dict[str, Dict[str, int]] = {}
+        triggers: List[Dict] = []
+        seen = set()
+        refixes = 0
+
+        for r in range(steps):
+            day = date.fromordinal(int(days[r]))
+            day_key = day.strftime('%Y%m%d')
+            base = previous_close[r]
+            for prices in sequence:
+                current = prices[r]
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    change = (current - base) / base * 100
+                hits = engine.evaluate_arrays(current, np.nan_to_num(change), day_key)
+
+                if len(mezzanine_columns):
+                    updates = {
+                        code: (float(current[j]), float(np.nan_to_num(change[j])))
+                        for code, j in zip(mezzanine.codes, mezzanine_columns) if current[j] > 0
+                    }
+                    mezzanine_hits = mezzanine.evaluate(mezzanine_stocks, updates, today=day)
+                    for hit in mezzanine_hits:
+                        if hit['rule'] == RULE_REFIX:
+                            mezzanine.mark_notified(hit['stock_code'], hit['meta']['refix_date'])
+                    hits += mezzanine_hits
+                    refixes += len(mezzanine.drain_events())
+
+                for hit in hits:
+                    code, rule = hit['stock_code'], hit['rule']
+                    if dedup:
+                        key = (code, hit['alert_id'])
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                    totals[rule] = totals.get(rule, 0) + 1
+                    stock_counts = by_stock.setdefault(code, {})
+                    stock_counts[rule] = stock_counts.get(rule, 0) + 1
+                    day_counts = by_day.setdefault(day.isoformat(), {})
+                    day_counts[rule] = day_counts.get(rule, 0) + 1
+                    if len(triggers) < sample_limit:
+                        triggers.append({
+                            'time': datetime.fromtimestamp(timeline[r]).isoformat(),
+                            'stock_code': code,
+                            'rule': rule,
+                            'alert_id': hit['alert_id'],
+                            'price': hit['price'],
+                            'level': hit['level'],
+                            'change_percent': round(hit['change_percent'], 2)
+                        })
+
+        bar_count = int(sum(len(data['ts']) for data in bars.values()))
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(f"알림 백테스트: {len(bars)}개 종목, {bar_count}개 봉, {sum(totals.values())}건 적중 ({elapsed_ms}ms)")
+        return {
+            'interval': interval,
+            'path': path,
+            'overrides': overrides,
+            'dedup': dedup,
+            'period': {
+                'start': datetime.fromtimestamp(timeline[0]).isoformat() if steps else None,
+                'end': datetime.fromtimestamp(timeline[-1]).isoformat() if steps else None
+            },
+            'stocks': len(bars),
+            'missing': missing,
+            'bars': bar_count,
+            'steps': steps * len(sequence),
+            'totals': {**totals, 'all': sum(totals.values())},
+            'by_stock': by_stock,
+            'by_day': dict(sorted(by_day.items())),
+            'refixes': refixes,
+            'triggers': triggers,
+            'elapsed_ms': elapsed_ms
+        }
+
+
+# 전역 인스턴스
+bar_cache = BarCache()
+backtester = Backtester(bar_cache)
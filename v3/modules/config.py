@@ -151,6 +151,30 @@ DART_COMPANIES_FILE = os.path.join(DATA_DIR, 'dart_companies.json')
 DART_KEYWORDS_FILE = os.path.join(DATA_DIR, 'dart_keywords.json')
 DAILY_HISTORY_FILE = os.path.join(DATA_DIR, 'daily_history.json')
 
+# 종목 마스터 파일 경로
+TICKER_MASTER_FILE = os.path.join(DATA_DIR, 'ticker_master.json')
+
+# 틱 아카이브 디렉토리 (거래일별 틱 파일)
+TICK_ARCHIVE_DIR = os.path.join(DATA_DIR, 'ticks')
+
+# 일일 알림 저널 (거래일별 JSONL)
+ALERT_JOURNAL_DIR = os.path.join(DATA_DIR, 'alert_journal')
+
+# 알림 이력 저장소 (SQLite, 기간/종목/유형 인덱스)
+ALERT_HISTORY_DB = os.path.join(DATA_DIR, 'alert_history.db')
+
+# 알림 발송 상태 (거래일별 중복 발송 방지, SQLite)
+ALERT_STATE_DB = os.path.join(DATA_DIR, 'alert_state.db')
+
+# 백테스트용 봉 데이터 캐시 (주기별 종목 .npz)
+BACKTEST_BAR_DIR = os.path.join(DATA_DIR, 'bars')
+
+# 시장 스캐너 일별 전체 시장 스냅샷 (거래일별 .npz)
+SCANNER_DIR = os.path.join(DATA_DIR, 'scanner')
+
+# 시장 지수 대비 종목 베타 (야간 추정)
+INDEX_BETA_FILE = os.path.join(DATA_DIR, 'index_betas.json')
+
 # === 외부 API 설정 ===
 DART_API_URL = "https://opendart.fss.or.kr/api"
 NAVER_FINANCE_URL = "https://finance.naver.com"
@@ -158,6 +182,119 @@ NAVER_FINANCE_URL = "https://finance.naver.com"
 # 요청 타임아웃 (초)
 REQUEST_TIMEOUT = 30
 
+# === 주가 제공자(Provider) 라우팅 설정 ===
+PROVIDER_STATS_WINDOW = int(os.getenv('PROVIDER_STATS_WINDOW', '100'))            # 롤링 통계 표본 수
+PROVIDER_FAILURE_THRESHOLD = int(os.getenv('PROVIDER_FAILURE_THRESHOLD', '5'))     # 서킷 오픈 연속 실패 횟수
+PROVIDER_CIRCUIT_OPEN_SECONDS = float(os.getenv('PROVIDER_CIRCUIT_OPEN_SECONDS', '60'))  # 서킷 오픈 유지 시간 (초)
+PROVIDER_HEDGE_PERCENTILE = float(os.getenv('PROVIDER_HEDGE_PERCENTILE', '95'))    # 헤지 요청 기준 지연 백분위
+PROVIDER_HEDGE_DEFAULT_DELAY = float(os.getenv('PROVIDER_HEDGE_DEFAULT_DELAY', '3.0'))  # 표본 부족 시 헤지 대기 (초)
+PROVIDER_HEDGE_MIN_SAMPLES = int(os.getenv('PROVIDER_HEDGE_MIN_SAMPLES', '10'))    # 백분위 계산 최소 표본 수
+PROVIDER_MAX_WORKERS = int(os.getenv('PROVIDER_MAX_WORKERS', '8'))                 # 제공자 호출 스레드 수
+PROVIDER_ROUTING_LOG_SIZE = int(os.getenv('PROVIDER_ROUTING_LOG_SIZE', '200'))     # 라우팅 결정 보관 개수
+
+# === 시세 캐시 설정 ===
+QUOTE_CACHE_TTL_MARKET = float(os.getenv('QUOTE_CACHE_TTL_MARKET', '5'))          # 장중 시세 유효 시간 (초)
+QUOTE_CACHE_TTL_CLOSED = float(os.getenv('QUOTE_CACHE_TTL_CLOSED', '600'))        # 장외 시세 유효 시간 (초)
+QUOTE_CACHE_WAIT_TIMEOUT = float(os.getenv('QUOTE_CACHE_WAIT_TIMEOUT', '30'))     # 진행 중 조회 대기 한도 (초)
+QUOTE_NEGATIVE_BASE_SECONDS = float(os.getenv('QUOTE_NEGATIVE_BASE_SECONDS', '60'))  # 데이터 없음 종목 첫 재시도 대기 (초)
+QUOTE_NEGATIVE_MAX_SECONDS = float(os.getenv('QUOTE_NEGATIVE_MAX_SECONDS', '3600'))  # 재시도 대기 상한 (초)
+
+# === 장중 시계열 설정 ===
+PRICE_SERIES_CAPACITY = int(os.getenv('PRICE_SERIES_CAPACITY', '4096'))  # 종목별 링 버퍼 틱 수 (10초 간격 약 11시간)
+
+# === 실시간 폴링 우선순위 설정 ===
+POLL_CYCLE_SECONDS = int(os.getenv('POLL_CYCLE_SECONDS', '5'))                   # 실시간 모니터링 사이클 간격 (초)
+POLL_REQUEST_BUDGET = int(os.getenv('POLL_REQUEST_BUDGET', '8'))                 # 사이클당 최대 시세 조회 수
+POLL_TIER_HOT_PERCENT = float(os.getenv('POLL_TIER_HOT_PERCENT', '1.0'))         # 근접 구간: 알림 레벨까지 거리 (%)
+POLL_TIER_WARM_PERCENT = float(os.getenv('POLL_TIER_WARM_PERCENT', '5.0'))       # 주의 구간: 알림 레벨까지 거리 (%)
+POLL_TIER_HOT_SECONDS = float(os.getenv('POLL_TIER_HOT_SECONDS', '5'))           # 근접 구간 조회 주기 (초)
+POLL_TIER_WARM_SECONDS = float(os.getenv('POLL_TIER_WARM_SECONDS', '15'))        # 주의 구간 조회 주기 (초)
+POLL_TIER_COLD_SECONDS = float(os.getenv('POLL_TIER_COLD_SECONDS', '60'))        # 원거리 구간 조회 주기 (초)
+POLL_VOLATILITY_POINTS = int(os.getenv('POLL_VOLATILITY_POINTS', '30'))          # 변동성 계산 최근 틱 수
+POLL_VOLATILITY_MULTIPLIER = float(os.getenv('POLL_VOLATILITY_MULTIPLIER', '3')) # 거리에서 차감할 틱 변동성 배수
+
+# === 사이클 초과 대응 (적응형 조회 동시성) 설정 ===
+PRICE_FETCH_CONCURRENCY = int(os.getenv('PRICE_FETCH_CONCURRENCY', '1'))          # 시작 동시성 (기존 순차 조회)
+PRICE_FETCH_MAX_CONCURRENCY = int(os.getenv('PRICE_FETCH_MAX_CONCURRENCY', '4'))  # 동시성 상한 (제공자 호출 한도 고려)
+CYCLE_LOW_WATERMARK = float(os.getenv('CYCLE_LOW_WATERMARK', '0.5'))              # 소요 시간이 주기의 이 비율 미만이면 완화
+
+# === 모니터링 스케줄러 설정 ===
+MONITOR_SCHEDULER_TICK_SECONDS = float(os.getenv('MONITOR_SCHEDULER_TICK_SECONDS', '0.5'))  # 실행 시각 확인 간격 (초)
+MONITOR_SCHEDULER_WORKERS = int(os.getenv('MONITOR_SCHEDULER_WORKERS', '4'))                # 작업 실행 스레드 수
+
+# === 가격 래더 설정 ===
+PRICE_LADDER_MAX_LEVELS = int(os.getenv('PRICE_LADDER_MAX_LEVELS', '100'))  # 종목별 최대 래더 레벨 수
+
+# === 메자닌 (CB/BW/EB) 설정 ===
+MEZZANINE_PARITY_LEVELS = tuple(float(x) for x in os.getenv('MEZZANINE_PARITY_LEVELS', '80,100,120').split(','))  # 기본 패리티 알림 기준 (%)
+MEZZANINE_REFIX_FLOOR_PERCENT = float(os.getenv('MEZZANINE_REFIX_FLOOR_PERCENT', '70'))   # 리픽싱 하한 미지정 시 최초 전환가 대비 비율 (%)
+MEZZANINE_REFIX_NOTICE_DAYS = int(os.getenv('MEZZANINE_REFIX_NOTICE_DAYS', '7'))          # 리픽싱 예정 알림 시점 (일 전)
+
+# === 기술적 지표 알림 설정 ===
+INDICATOR_MA_TYPE = os.getenv('INDICATOR_MA_TYPE', 'sma')                           # 이동평균 종류 (sma | ema)
+INDICATOR_MA_FAST = int(os.getenv('INDICATOR_MA_FAST', '5'))                        # 단기 이동평균 기간 (일)
+INDICATOR_MA_SLOW = int(os.getenv('INDICATOR_MA_SLOW', '20'))                       # 장기 이동평균 기간 (일)
+INDICATOR_VOLUME_WINDOW = int(os.getenv('INDICATOR_VOLUME_WINDOW', '20'))           # 거래량 평균/표준편차 기간 (일)
+INDICATOR_VOLUME_SPIKE_Z = float(os.getenv('INDICATOR_VOLUME_SPIKE_Z', '3'))        # 거래량 급증 기준 (예상 거래량 z-점수)
+INDICATOR_VOLUME_MIN_FRACTION = float(os.getenv('INDICATOR_VOLUME_MIN_FRACTION', '0.1'))  # 예상 거래량 환산 시 최소 경과 비율
+INDICATOR_GAP_PERCENT = float(os.getenv('INDICATOR_GAP_PERCENT', '3'))              # 시가 갭 알림 기준 (%)
+INDICATOR_WARMUP_INTERVAL_SECONDS = int(os.getenv('INDICATOR_WARMUP_INTERVAL_SECONDS', '60'))  # 워밍업 작업 주기 (초)
+INDICATOR_WARMUP_BATCH = int(os.getenv('INDICATOR_WARMUP_BATCH', '10'))              # 워밍업 작업 1회당 최대 종목 수
+
+# === 시장 지수 대비 알림 설정 ===
+INDEX_BETA_DAYS = int(os.getenv('INDEX_BETA_DAYS', '120'))          # 베타 추정 일간 수익률 수 (거래일)
+INDEX_BETA_MIN_DAYS = int(os.getenv('INDEX_BETA_MIN_DAYS', '40'))   # 베타 추정 최소 수익률 수 (미달 시 베타 1)
+INDEX_BETA_MIN = float(os.getenv('INDEX_BETA_MIN', '0'))            # 추정 베타 하한
+INDEX_BETA_MAX = float(os.getenv('INDEX_BETA_MAX', '3'))            # 추정 베타 상한
+INDEX_MAX_AGE_SECONDS = int(os.getenv('INDEX_MAX_AGE_SECONDS', '60'))  # 지수 시세 유효 시간 (초, 초과 시 지수 대비 판정 생략)
+
+# === 조건식 알림 설정 ===
+ALERT_EXPR_MAX_PER_STOCK = int(os.getenv('ALERT_EXPR_MAX_PER_STOCK', '10'))     # 종목별 최대 조건식 수
+ALERT_EXPR_MAX_LENGTH = int(os.getenv('ALERT_EXPR_MAX_LENGTH', '200'))          # 조건식 최대 길이 (문자)
+ALERT_EXPR_MAX_DEPTH = int(os.getenv('ALERT_EXPR_MAX_DEPTH', '20'))             # 조건식 최대 중첩 깊이
+ALERT_EXPR_CACHE_SIZE = int(os.getenv('ALERT_EXPR_CACHE_SIZE', '512'))           # 컴파일 결과 캐시 최대 항목 수 (LRU)
+
+# === 시장 스캐너 설정 (관심 종목 외 전체 시장) ===
+SCANNER_ENABLED = os.getenv('SCANNER_ENABLED', 'True').lower() == 'true'          # 스캐너 작업 사용 여부
+SCANNER_INTERVAL_SECONDS = int(os.getenv('SCANNER_INTERVAL_SECONDS', '60'))        # 장중 스캔 주기 (초)
+SCANNER_MARKETS: List[str] = os.getenv('SCANNER_MARKETS', 'KOSPI,KOSDAQ').split(',')  # 스캔 시장 (시장당 1회 일괄 조회)
+SCANNER_MOVE_PERCENT = float(os.getenv('SCANNER_MOVE_PERCENT', '10'))             # 등락률 스크린 기준 (|%|)
+SCANNER_VOLUME_MULTIPLE = float(os.getenv('SCANNER_VOLUME_MULTIPLE', '5'))        # 거래량 스크린 기준 (예상 거래량 / 평균 배수)
+SCANNER_MIN_TURNOVER = float(os.getenv('SCANNER_MIN_TURNOVER', '1000000000'))     # 최소 거래대금 (원, 저유동성 종목 제외)
+SCANNER_LOOKBACK_DAYS = int(os.getenv('SCANNER_LOOKBACK_DAYS', '250'))            # 52주 고가/저가 기준 거래일 수
+SCANNER_VOLUME_DAYS = int(os.getenv('SCANNER_VOLUME_DAYS', '20'))                 # 평균 거래량 기준 거래일 수
+SCANNER_MIN_HISTORY_DAYS = int(os.getenv('SCANNER_MIN_HISTORY_DAYS', '60'))       # 52주 신고가/신저가 판정 최소 이력 (거래일)
+SCANNER_MAX_ALERTS = int(os.getenv('SCANNER_MAX_ALERTS', '10'))                   # 스캔 1회당 최대 알림 수 (등락률 절댓값 순)
+SCANNER_BACKFILL_DAYS_PER_RUN = int(os.getenv('SCANNER_BACKFILL_DAYS_PER_RUN', '10'))  # 장외 작업 1회당 과거 스냅샷 조회 일수
+SCANNER_BACKFILL_STOP_MINUTES = int(os.getenv('SCANNER_BACKFILL_STOP_MINUTES', '30'))  # 장 시작 전 스냅샷 채우기 중단 (분)
+SCANNER_FINAL_SNAPSHOT_TIME = os.getenv('SCANNER_FINAL_SNAPSHOT_TIME', '18:00')         # 당일 스냅샷 확정 시각 (이전 조회분은 다시 조회)
+
+# === 알림 규칙 백테스트 설정 ===
+BACKTEST_SAMPLE_TRIGGERS = int(os.getenv('BACKTEST_SAMPLE_TRIGGERS', '200'))   # 결과에 포함할 적중 예시 최대 건수
+BACKTEST_PYKRX_DELAY_SECONDS = float(os.getenv('BACKTEST_PYKRX_DELAY_SECONDS', '0.5'))  # pykrx 종목별 조회 간격 (API 부하 방지)
+
+# === 모니터링 종목 저장 설정 ===
+STOCK_SAVE_DELAY_SECONDS = float(os.getenv('STOCK_SAVE_DELAY_SECONDS', '2'))   # 변경 종목 기록 지연 (이 시간 동안 변경을 모아 한 번에 기록)
+
+# === 일일 알림 저널 설정 ===
+ALERT_JOURNAL_RETENTION_DAYS = int(os.getenv('ALERT_JOURNAL_RETENTION_DAYS', '7'))       # 일자 파일 보관 기간
+ALERT_JOURNAL_FSYNC_ENTRIES = int(os.getenv('ALERT_JOURNAL_FSYNC_ENTRIES', '16'))        # fsync 묶음 건수
+ALERT_JOURNAL_FSYNC_SECONDS = float(os.getenv('ALERT_JOURNAL_FSYNC_SECONDS', '5'))       # fsync 최대 간격 (초)
+
+# === 알림 이력 저장소 설정 ===
+ALERT_HISTORY_RETENTION_DAYS = int(os.getenv('ALERT_HISTORY_RETENTION_DAYS', '365'))    # 보관 기간 (0 이하: 무기한)
+ALERT_HISTORY_PAGE_LIMIT = int(os.getenv('ALERT_HISTORY_PAGE_LIMIT', '500'))            # 조회 API 페이지당 최대 건수
+
+# === 틱 아카이브 설정 ===
+TICK_ARCHIVE_FLUSH_TICKS = int(os.getenv('TICK_ARCHIVE_FLUSH_TICKS', '256'))        # 버퍼 기록 틱 수
+TICK_ARCHIVE_FLUSH_SECONDS = float(os.getenv('TICK_ARCHIVE_FLUSH_SECONDS', '10'))   # 버퍼 기록 최대 간격 (초)
+
+# === 종목 마스터 설정 ===
+TICKER_MASTER_MARKETS: List[str] = ['KOSPI', 'KOSDAQ', 'KONEX']                   # 주식 종목 목록 조회 시장
+TICKER_MASTER_INCLUDE_ETF = os.getenv('TICKER_MASTER_INCLUDE_ETF', 'True').lower() == 'true'  # ETF/ETN 포함 여부
+TICKER_MASTER_REFRESH_HOUR = int(os.getenv('TICKER_MASTER_REFRESH_HOUR', '8'))    # 일일 갱신 기준 시각 (시)
+TICKER_MASTER_RETRY_SECONDS = int(os.getenv('TICKER_MASTER_RETRY_SECONDS', '1800'))  # 갱신 실패 후 재시도 대기 (초)
+
 # === 기본 모니터링 주식 ===
 DEFAULT_MONITORING_STOCKS = [
     {
@@ -191,6 +328,7 @@ STOCK_DATA_SCHEMA = {
     "target_price": float,  # 목표가 (필수)
     "stop_loss": float,     # 손절가 (필수)
     "acquisition_price": float,  # 취득가 (선택, 수익률 계산용)
+    "quantity": float,           # 보유 수량 (선택, 포트폴리오 손익/노출 계산용)
     "alert_settings": dict,      # 알림 설정 (선택)
     "memo": str,                # 메모 (선택)
     "current_price": float,     # 현재가 (시스템 업데이트)
@@ -199,6 +337,8 @@ STOCK_DATA_SCHEMA = {
     "enabled": bool,            # 모니터링 활성화 (기본값: True)
     "triggered_alerts": list,   # 발생한 알림 기록 (시스템 관리)
     "alert_prices": list,       # 알림 가격 목록 (시스템 관리)
+    "ladder_levels": list,      # 가격 래더 레벨 목록 (선택, API로 추가/삭제)
+    "alert_expressions": list,  # 조건식 알림 규칙 목록 (선택, API로 추가/삭제)
     "error": str                # 오류 정보 (시스템 관리)
 }
 
@@ -218,7 +358,12 @@ DEFAULT_ALERT_SETTINGS = {
     "fall_threshold": 5.0,      # 하락률 알림 임계값 (%)
     "parity_percent": 80.0,     # 패리티 알림 임계값 (%)
     "target_alert": True,       # 목표가 도달 알림
-    "stop_loss_alert": True     # 손절가 도달 알림
+    "stop_loss_alert": True,    # 손절가 도달 알림
+    "indicator_alert": True,    # 기술적 지표 알림 (이평 교차/거래량 급증/갭)
+    "relative_alert": False,    # 급등/급락을 시장 지수 대비 초과 등락률로 판정
+    "relative_beta": False,     # 초과 등락률 계산 시 야간 추정 베타 사용 (미사용 시 베타 1)
+    "excess_rise_threshold": 5.0,   # 초과 상승률 알림 임계값 (%)
+    "excess_fall_threshold": 5.0    # 초과 하락률 알림 임계값 (%)
 }
 
 # === 데이터 마이그레이션 설정 ===
@@ -0,0 +1,119 @@
+"""
+주기 초과 감지 및 적응형 동시성 제어 모듈
+사이클 소요 시간을 주기와 비교하여 초과 시 조회 동시성을 올리고(제공자 호출 한도 내),
+상한에서도 초과하면 저우선 작업을 단계적으로 덜어냄
+"""
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, Optional
+
+from .logger_utils import get_logger
+
+logger = get_logger('stock')
+
+
+class CycleController:
+    """
+    사이클 초과 감지 + 동시성/작업 감축 제어
+
+    - 초과(소요 > 주기): 동시성 +1, 이미 상한이면 감축 단계 +1
+    - 여유(소요 < 주기 x low_watermark): 감축 단계부터 -1, 감축이 없으면 동시성 -1
+    감축 단계의 의미(어떤 작업을 덜어낼지)는 호출자가 정한다.
+    """
+
+    def __init__(self, name: str, interval: float, concurrency: int, min_concurrency: int,
+                 max_concurrency: int, max_shed_level: int, low_watermark: float = 0.5,
+                 history_size: int = 100):
+        self.name = name
+        self.interval = interval
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max(max_concurrency, min_concurrency)
+        self.concurrency = min(max(concurrency, min_concurrency), self.max_concurrency)
+        self.max_shed_level = max_shed_level
+        self.low_watermark = low_watermark
+
+        self.shed_level = 0
+        self.cycles = 0
+        self.overruns = 0
+        self.consecutive_overruns = 0
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+        self.last_duration: Optional[float] = None
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.last_cycle_at: Optional[str] = None
+        self.recent = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+
+    def record(self, duration: float, interval: Optional[float] = None) -> bool:
+        """
+        사이클 결과 반영 및 다음 사이클 동시성/감축 단계 조정
+
+        Returns:
+            bool: 주기 초과 여부
+        """
+        interval = interval or self.interval
+        overrun = duration > interval
+        lag = max(0.0, duration - interval)
+
+        with self._lock:
+            self.cycles += 1
+            self.total_duration += duration
+            self.max_duration = max(self.max_duration, duration)
+            self.last_duration = duration
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            self.last_cycle_at = datetime.now().isoformat()
+
+            if overrun:
+                self.overruns += 1
+                self.consecutive_overruns += 1
+                if self.concurrency < self.max_concurrency:
+                    self.concurrency += 1
+                    logger.warning(f"{self.name} 주기 초과 ({duration:.1f}초 > {interval}초) - 동시성 {self.concurrency}로 상향")
+                elif self.shed_level < self.max_shed_level:
+                    self.shed_level += 1
+                    logger.warning(f"{self.name} 주기 초과 ({duration:.1f}초 > {interval}초) - 동시성 상한, 감축 단계 {self.shed_level}")
+                else:
+                    logger.warning(f"{self.name} 주기 초과 ({duration:.1f}초 > {interval}초) - 동시성/감축 모두 상한")
+            else:
+                self.consecutive_overruns = 0
+                if duration < interval * self.low_watermark:
+                    if self.shed_level > 0:
+                        self.shed_level -= 1
+                    elif self.concurrency > self.min_concurrency:
+                        self.concurrency -= 1
+
+            self.recent.append({
+                'at': self.last_cycle_at,
+                'duration': round(duration, 3),
+                'lag': round(lag, 3),
+                'concurrency': self.concurrency,
+                'shed_level': self.shed_level
+            })
+        return overrun
+
+    def get_stats(self, recent: int = 20) -> Dict:
+        """사이클 지표 (소요 시간, 지연, 초과 횟수, 현재 동시성/감축 단계)"""
+        with self._lock:
+            history = list(self.recent)[-recent:] if recent else []
+            return {
+                'interval': self.interval,
+                'cycles': self.cycles,
+                'overruns': self.overruns,
+                'consecutive_overruns': self.consecutive_overruns,
+                'overrun_rate': round(self.overruns / self.cycles, 4) if self.cycles else 0.0,
+                'last_duration': round(self.last_duration, 3) if self.last_duration is not None else None,
+                'avg_duration': round(self.total_duration / self.cycles, 3) if self.cycles else None,
+                'max_duration': round(self.max_duration, 3),
+                'last_lag': round(self.last_lag, 3),
+                'max_lag': round(self.max_lag, 3),
+                'concurrency': self.concurrency,
+                'min_concurrency': self.min_concurrency,
+                'max_concurrency': self.max_concurrency,
+                'shed_level': self.shed_level,
+                'max_shed_level': self.max_shed_level,
+                'last_cycle_at': self.last_cycle_at,
+                'recent': history
+            }
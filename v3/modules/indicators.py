@@ -0,0 +1,379 @@
+"""
+기술적 지표 알림 모듈
+종목별 이동평균(SMA/EMA), 일 거래량 평균/표준편차, 전일 종가를 O(1) 갱신 상태로 유지하고
+틱마다 이동평균 교차/거래량 급증/시가 갭을 증분 판정 (과거 시세 재조회 없음)
+"""
+import math
+import threading
+from collections import deque
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .alert_engine import DIRECTION_DOWN, DIRECTION_UP, RULE_GAP, RULE_MA_CROSS, RULE_VOLUME_SPIKE
+from .config import (
+    INDICATOR_MA_TYPE,
+    INDICATOR_MA_FAST,
+    INDICATOR_MA_SLOW,
+    INDICATOR_VOLUME_WINDOW,
+    INDICATOR_VOLUME_SPIKE_Z,
+    INDICATOR_VOLUME_MIN_FRACTION,
+    INDICATOR_GAP_PERCENT,
+    STOCK_MARKET_OPEN_TIME,
+    STOCK_MARKET_CLOSE_TIME
+)
+from .logger_utils import get_logger
+
+logger = get_logger('stock')
+
+MA_TYPES = ('sma', 'ema')
+_OPEN_TIME = datetime.strptime(STOCK_MARKET_OPEN_TIME, '%H:%M').time()
+_CLOSE_TIME = datetime.strptime(STOCK_MARKET_CLOSE_TIME, '%H:%M').time()
+
+
+class RollingWindow:
+    """최근 size개 값의 합/제곱합 (추가/제거 O(1))"""
+
+    __slots__ = ('size', 'values', 'total', 'total_sq')
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = deque()
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def push(self, value: float):
+        self.values.append(value)
+        self.total += value
+        self.total_sq += value * value
+        if len(self.values) > self.size:
+            old = self.values.popleft()
+            self.total -= old
+            self.total_sq -= old * old
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) >= self.size
+
+    def mean(self) -> Optional[float]:
+        return self.total / len(self.values) if self.values else None
+
+    def std(self) -> Optional[float]:
+        count = len(self.values)
+        if count < 2:
+            return None
+        mean = self.total / count
+        return math.sqrt(max(self.total_sq / count - mean * mean, 0.0))
+
+
+def session_fraction(timestamp: float) -> float:
+    """장 시작 이후 경과 비율 (0~1)"""
+    now = datetime.fromtimestamp(timestamp)
+    opening = datetime.combine(now.date(), _OPEN_TIME)
+    closing = datetime.combine(now.date(), _CLOSE_TIME)
+    return min(max((now - opening).total_seconds() / (closing - opening).total_seconds(), 0.0), 1.0)
+
+
+class IndicatorState:
+    """
+    단일 종목 지표 상태
+
+    확정된 일봉(종가/거래량)은 기간-1 크기의 롤링 합으로 두고, 당일 값은 현재가를 잠정 종가로 써서
+    SMA = (최근 기간-1일 종가 합 + 현재가) / 기간, EMA = 전일 EMA + α(현재가 - 전일 EMA)로 계산한다.
+    거래일이 바뀌면 마지막 가격/누적 거래량을 전일 값으로 확정한다.
+    """
+
+    def __init__(self, fast: int, slow: int, volume_window: int, ma_type: str):
+        self.fast = fast
+        self.slow = slow
+        self.ma_type = ma_type
+        self.fast_closes = RollingWindow(fast - 1)
+        self.slow_closes = RollingWindow(slow - 1)
+        self.volumes = RollingWindow(volume_window)
+        self.ema_fast: Optional[float] = None
+        self.ema_slow: Optional[float] = None
+        self.closes = 0                          # 확정된 일봉 수
+        self.committed_day: Optional[date] = None
+        self.prev_close: Optional[float] = None
+
+        # 당일 상태
+        self.day: Optional[date] = None
+        self.open: Optional[float] = None
+        self.last_price: Optional[float] = None
+        self.last_volume: Optional[float] = None
+        self.trend = 0                           # 직전 틱의 부호(단기 - 장기)
+        self.fired: set = set()                  # 당일 발송 완료한 알림 ID
+        self.queued: set = set()                 # 대기열/발송 중인 알림 ID
+
+    def commit(self, day: date, close: float, volume: Optional[float]):
+        """일봉 확정"""
+        self.fast_closes.push(close)
+        self.slow_closes.push(close)
+        if volume is not None:
+            self.volumes.push(volume)
+        self.ema_fast = close if self.ema_fast is None else self.ema_fast + 2 / (self.fast + 1) * (close - self.ema_fast)
+        self.ema_slow = close if self.ema_slow is None else self.ema_slow + 2 / (self.slow + 1) * (close - self.ema_slow)
+        self.closes += 1
+        self.committed_day = day
+        self.prev_close = close
+
+    def moving_averages(self, price: float) -> Tuple[Optional[float], Optional[float]]:
+        """현재가를 잠정 종가로 한 (단기, 장기) 이동평균 (확정 일봉이 부족하면 None)"""
+        if self.closes < self.slow - 1:
+            return None, None
+        if self.ma_type == 'ema':
+            return (self.ema_fast + 2 / (self.fast + 1) * (price - self.ema_fast),
+                    self.ema_slow + 2 / (self.slow + 1) * (price - self.ema_slow))
+        return (self.fast_closes.total + price) / self.fast, (self.slow_closes.total + price) / self.slow
+
+    def roll(self, day: date):
+        """거래일 전환 (전일 마지막 가격을 종가로 확정)"""
+        if self.day is not None and self.last_price and (self.committed_day is None or self.day > self.committed_day):
+            self.commit(self.day, self.last_price, self.last_volume)
+        self.day = day
+        self.open = None
+        self.last_volume = None
+        self.fired = set()
+        self.queued = set()
+
+    def to_dict(self) -> Dict:
+        fast, slow = self.moving_averages(self.last_price) if self.last_price else (None, None)
+        volume_mean, volume_std = self.volumes.mean(), self.volumes.std()
+        return {
+            'ma_type': self.ma_type,
+            'fast_period': self.fast,
+            'slow_period': self.slow,
+            'fast_ma': round(fast, 2) if fast is not None else None,
+            'slow_ma': round(slow, 2) if slow is not None else None,
+            'trend': 'up' if self.trend > 0 else 'down' if self.trend < 0 else None,
+            'volume_mean': round(volume_mean, 0) if volume_mean is not None else None,
+            'volume_std': round(volume_std, 0) if volume_std is not None else None,
+            'prev_close': self.prev_close,
+            'open': self.open,
+            'gap_percent': round((self.open / self.prev_close - 1) * 100, 2) if self.open and self.prev_close else None,
+            'last_price': self.last_price,
+            'last_volume': self.last_volume,
+            'history_days': self.closes,
+            'day': self.day.isoformat() if self.day else None
+        }
+
+
+class IndicatorEngine:
+    """
+    종목별 기술적 지표 상태 + 증분 알림 판정
+
+    update()는 틱 1건을 O(1)로 반영하고 적중 항목을 대기열에 넣는다 (drain_hits()로 꺼냄).
+    꺼낸 항목은 발송 결과를 complete()로 알려야 하며, 발송에 실패한 항목은 당일 중 다시 대기열에 넣는다.
+    이동평균 교차는 직전 틱 대비 부호가 바뀐 경우, 거래량 급증은 장중 경과 비율로 환산한
+    예상 일 거래량의 z-점수가 기준 이상인 경우, 갭은 당일 첫 틱(또는 제공된 시가)에서 1회 판정한다.
+    warm_up()은 시작 시 과거 일봉을 한 번에 읽어 상태를 채운다.
+    """
+
+    def __init__(self, fast: int = INDICATOR_MA_FAST, slow: int = INDICATOR_MA_SLOW,
+                 volume_window: int = INDICATOR_VOLUME_WINDOW, ma_type: str = INDICATOR_MA_TYPE):
+        if not 1 < fast < slow:
+            raise ValueError("이동평균 기간은 1 < 단기 < 장기여야 합니다")
+        if ma_type not in MA_TYPES:
+            raise ValueError(f"이동평균 종류는 {', '.join(MA_TYPES)} 중 하나여야 합니다")
+        self.fast = fast
+        self.slow = slow
+        self.volume_window = volume_window
+        self.ma_type = ma_type
+        self.states: Dict[str, IndicatorState] = {}
+        self.warmed: set = set()
+        self._pending: List[Dict] = []
+        self.stats = {'ticks': 0, 'hits': 0, 'warmed': 0, 'warm_up_failed': 0}
+        self._lock = threading.Lock()
+
+    @property
+    def history_days(self) -> int:
+        """워밍업에 필요한 확정 일봉 수"""
+        return max(self.slow - 1, self.volume_window)
+
+    def _state(self, stock_code: str) -> IndicatorState:
+        state = self.states.get(stock_code)
+        if state is None:
+            state = IndicatorState(self.fast, self.slow, self.volume_window, self.ma_type)
+            self.states[stock_code] = state
+        return state
+
+    # === 워밍업 ===
+
+    def pending_codes(self, codes: Iterable[str]) -> List[str]:
+        """워밍업하지 않은 종목"""
+        with self._lock:
+            return [code for code in codes if code not in self.warmed]
+
+    def warm_up(self, stock_code: str, bars: Iterable[Tuple[date, float, Optional[float]]]):
+        """
+        과거 일봉으로 상태 채우기 (이미 확정된 일자 이후만 반영)
+
+        Args:
+            bars: (일자, 종가, 거래량) 일자 오름차순
+        """
+        with self._lock:
+            state = self._state(stock_code)
+            count = 0
+            for day, close, volume in bars:
+                if close and close > 0 and (state.committed_day is None or day > state.committed_day):
+                    state.commit(day, float(close), float(volume) if volume is not None else None)
+                    count += 1
+            self.warmed.add(stock_code)
+            self.stats['warmed'] += 1
+        logger.debug(f"지표 워밍업: {stock_code} - 일봉 {count}개")
+
+    def mark_warm_up_failed(self, stock_code: str):
+        """워밍업 실패 (재시도하지 않고 실시간 틱으로만 채움)"""
+        with self._lock:
+            self.warmed.add(stock_code)
+            self.stats['warm_up_failed'] += 1
+
+    # === 틱 반영 ===
+
+    def update(self, stock_code: str, timestamp: float, price: float, volume: Optional[float] = None,
+               change_percent: float = 0.0, open_price: Optional[float] = None, alerts: bool = True):
+        """틱 1건 반영 및 지표 알림 판정 (alerts=False면 상태만 갱신)"""
+        if not price or price <= 0:
+            return
+        day = datetime.fromtimestamp(timestamp).date()
+        day_key = day.strftime('%Y%m%d')
+
+        with self._lock:
+            state = self._state(stock_code)
+            if state.day is None or day > state.day:
+                state.roll(day)
+            elif day < state.day:
+                return  # 지난 거래일 틱은 무시
+            self.stats['ticks'] += 1
+
+            hits = []
+            previous_price = state.last_price or price
+
+            # 시가 갭 (당일 1회)
+            if state.open is None:
+                state.open = float(open_price) if open_price and open_price > 0 else price
+                if state.prev_close:
+                    gap = (state.open / state.prev_close - 1) * 100
+                    if abs(gap) >= INDICATOR_GAP_PERCENT:
+                        up = gap > 0
+                        hits.append(self._hit(
+                            stock_code, RULE_GAP, f"gap_{'up' if up else 'down'}_{day_key}",
+                            state.prev_close, DIRECTION_UP if up else DIRECTION_DOWN, price, previous_price,
+                            change_percent, {
+                                'label': '갭_상승' if up else '갭_하락',
+                                'gap_percent': round(gap, 2),
+                                'open': state.open,
+                                'prev_close': state.prev_close,
+                                'message': f"갭 {'상승' if up else '하락'} {gap:+.2f}% "
+                                           f"(시가 {state.open:,.0f}원 / 전일 종가 {state.prev_close:,.0f}원)"
+                            }))
+
+            # 이동평균 교차 (직전 틱 대비 부호 변화)
+            fast, slow = state.moving_averages(price)
+            if fast is not None:
+                trend = (fast > slow) - (fast < slow)
+                if trend and state.trend and trend != state.trend:
+                    golden = trend > 0
+                    name = self.ma_type.upper()
+                    hits.append(self._hit(
+                        stock_code, RULE_MA_CROSS, f"ma_cross_{'golden' if golden else 'dead'}_{day_key}",
+                        slow, DIRECTION_UP if golden else DIRECTION_DOWN, price, previous_price, change_percent, {
+                            'label': '이평_골든크로스' if golden else '이평_데드크로스',
+                            'fast_ma': round(fast, 2),
+                            'slow_ma': round(slow, 2),
+                            'message': f"{'골든' if golden else '데드'}크로스: {self.fast}일 {name} {fast:,.0f}원 "
+                                       f"{'>' if golden else '<'} {self.slow}일 {name} {slow:,.0f}원"
+                        }))
+                if trend:
+                    state.trend = trend
+
+            # 거래량 급증 (장중 경과 비율로 환산한 예상 일 거래량)
+            if volume is not None:
+                state.last_volume = float(volume)
+                mean, std = state.volumes.mean(), state.volumes.std()
+                if state.volumes.full and std:
+                    projected = volume / max(session_fraction(timestamp), INDICATOR_VOLUME_MIN_FRACTION)
+                    z_score = (projected - mean) / std
+                    if z_score >= INDICATOR_VOLUME_SPIKE_Z:
+                        hits.append(self._hit(
+                            stock_code, RULE_VOLUME_SPIKE, f"volume_spike_{day_key}",
+                            mean + INDICATOR_VOLUME_SPIKE_Z * std, DIRECTION_UP, price, previous_price,
+                            change_percent, {
+                                'label': '거래량_급증',
+                                'volume': float(volume),
+                                'projected_volume': round(projected, 0),
+                                'volume_mean': round(mean, 0),
+                                'z_score': round(z_score, 2),
+                                'message': f"거래량 급증: 예상 {projected:,.0f}주 "
+                                           f"({self.volume_window}일 평균 {mean:,.0f}주, z={z_score:.1f})"
+                            }))
+
+            state.last_price = price
+            if alerts:
+                # 같은 알림 ID는 발송 전까지 한 건만 대기열에 두고, 발송 후에는 당일 다시 넣지 않음
+                hits = [hit for hit in hits if hit['alert_id'] not in state.fired and hit['alert_id'] not in state.queued]
+                if hits:
+                    state.queued.update(hit['alert_id'] for hit in hits)
+                    self._pending.extend(hits)
+                    self.stats['hits'] += len(hits)
+
+    @staticmethod
+    def _hit(stock_code: str, rule: str, alert_id: str, level: float, direction: int, price: float,
+             previous_price: float, change_percent: float, meta: Dict) -> Dict:
+        return {
+            'stock_code': stock_code,
+            'rule': rule,
+            'alert_id': alert_id,
+            'level': float(level),
+            'direction': direction,
+            'price': float(price),
+            'previous_price': float(previous_price),
+            'change_percent': float(change_percent),
+            'meta': meta
+        }
+
+    def drain_hits(self) -> List[Dict]:
+        """대기 중인 지표 적중 항목을 꺼냄 (발송 결과는 complete()로 알림)"""
+        with self._lock:
+            hits, self._pending = self._pending, []
+            return hits
+
+    def complete(self, hit: Dict, sent: bool):
+        """
+        꺼낸 적중 항목의 발송 결과 반영
+
+        발송했으면 당일 발송 완료로 기록하고, 실패했으면 같은 거래일인 동안 대기열에 다시 넣어
+        다음 주기에 재시도한다 (거래일이 바뀐 항목은 버림).
+        """
+        with self._lock:
+            state = self.states.get(hit['stock_code'])
+            if state is None:
+                return
+            alert_id = hit['alert_id']
+            if sent:
+                state.queued.discard(alert_id)
+                state.fired.add(alert_id)
+            elif alert_id in state.queued and state.day and alert_id.endswith(state.day.strftime('%Y%m%d')):
+                self._pending.append(hit)
+
+    # === 조회 ===
+
+    def remove(self, stock_code: str):
+        with self._lock:
+            self.states.pop(stock_code, None)
+            self.warmed.discard(stock_code)
+
+    def get(self, stock_code: str) -> Optional[Dict]:
+        with self._lock:
+            state = self.states.get(stock_code)
+            return state.to_dict() if state else None
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'ma_type': self.ma_type,
+                'fast': self.fast,
+                'slow': self.slow,
+                'volume_window': self.volume_window,
+                'stocks': len(self.states),
+                **self.stats
+            }
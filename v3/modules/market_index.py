@@ -0,0 +1,286 @@
+"""
+시장 지수 추적 모듈
+KOSPI/KOSDAQ 지수 수준과 등락률을 가격 주기마다 한 번 조회하고, 종목별 시장 지수 대비
+초과 등락률 계산에 쓸 기대 등락률(베타 x 지수 등락률)과 야간 추정 베타를 제공
+"""
+import json
+import os
+import re
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import requests
+from bs4 import BeautifulSoup
+from filelock import FileLock
+
+from .config import (
+    NAVER_FINANCE_URL,
+    REQUEST_TIMEOUT,
+    INDEX_BETA_FILE,
+    INDEX_BETA_DAYS,
+    INDEX_BETA_MIN_DAYS,
+    INDEX_BETA_MIN,
+    INDEX_BETA_MAX,
+    INDEX_MAX_AGE_SECONDS,
+    STOCK_MARKET_OPEN_TIME
+)
+from .logger_utils import get_logger
+
+# PyKrx 가용성 확인
+try:
+    from pykrx import stock
+    PYKRX_AVAILABLE = True
+except ImportError:
+    PYKRX_AVAILABLE = False
+
+logger = get_logger('stock')
+
+INDEX_KOSPI = 'KOSPI'
+INDEX_KOSDAQ = 'KOSDAQ'
+INDEX_MARKETS = (INDEX_KOSPI, INDEX_KOSDAQ)
+PYKRX_INDEX_CODES = {INDEX_KOSPI: '1001', INDEX_KOSDAQ: '2001'}
+
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+def estimate_beta(stock_closes: Dict[date, float], index_closes: Dict[date, float],
+                  max_days: int = INDEX_BETA_DAYS) -> Tuple[Optional[float], int]:
+    """
+    일간 수익률 기준 베타 (cov(종목, 지수) / var(지수))
+
+    Returns:
+        Tuple: (베타, 사용한 수익률 수) - 공통 거래일이 INDEX_BETA_MIN_DAYS 미만이면 베타는 None
+    """
+    days = sorted(stock_closes.keys() & index_closes.keys())[-(max_days + 1):]
+    if len(days) - 1 < INDEX_BETA_MIN_DAYS:
+        return None, max(len(days) - 1, 0)
+    s = np.array([stock_closes[day] for day in days], dtype=np.float64)
+    m = np.array([index_closes[day] for day in days], dtype=np.float64)
+    valid = (s[1:] > 0) & (s[:-1] > 0) & (m[1:] > 0) & (m[:-1] > 0)
+    stock_returns = (s[1:] / s[:-1] - 1)[valid]
+    index_returns = (m[1:] / m[:-1] - 1)[valid]
+    if len(index_returns) < INDEX_BETA_MIN_DAYS:
+        return None, len(index_returns)
+    variance = index_returns.var()
+    if variance <= 0:
+        return None, len(index_returns)
+    beta = float(((stock_returns - stock_returns.mean()) * (index_returns - index_returns.mean())).mean() / variance)
+    return min(max(beta, INDEX_BETA_MIN), INDEX_BETA_MAX), len(index_returns)
+
+
+class MarketIndexTracker:
+    """
+    KOSPI/KOSDAQ 지수 추적
+
+    refresh()는 네이버 금융 시세 요약 페이지 1회 조회로 두 지수를 함께 갱신하고,
+    실패하면 pykrx 지수 일별 시세(지수당 1회)로 대체한다.
+    종목의 소속 시장은 종목 마스터에서 찾으며 KOSDAQ이 아니면 KOSPI 지수를 기준으로 한다.
+    기대 등락률은 당일 장 시작 이후 INDEX_MAX_AGE_SECONDS 안에 받은 지수 시세로만 계산한다
+    (조회 실패가 이어지거나 전일 시세만 있으면 None을 돌려 절대 등락률 기준으로 판정하게 한다).
+    베타는 장외에 하루 한 번 추정해 파일에 보관한다.
+    """
+
+    def __init__(self, ticker_master=None, beta_file: str = INDEX_BETA_FILE):
+        self.ticker_master = ticker_master
+        self.beta_file = beta_file
+        self.levels: Dict[str, Dict] = {}
+        self.betas: Dict[str, Dict] = {}
+        self.beta_date: Optional[str] = None
+        self.stats = {'fetches': 0, 'errors': 0, 'fallbacks': 0, 'last_fetch_ms': 0.0, 'last_error': None}
+        self._lock = threading.Lock()
+        self._load_betas()
+
+    # === 지수 수준 ===
+
+    def _fetch_naver(self) -> Dict[str, Tuple[float, float]]:
+        """네이버 시세 요약 페이지 (두 지수 1회 요청)"""
+        response = requests.get(f"{NAVER_FINANCE_URL}/sise/", headers=_HEADERS, timeout=REQUEST_TIMEOUT)
+        response.encoding = 'euc-kr'
+        response.raise_for_status()
+        soup = BeautifulSoup(response.text, 'html.parser')
+
+        result = {}
+        for name in INDEX_MARKETS:
+            level_element = soup.select_one(f'#{name}_now')
+            change_element = soup.select_one(f'#{name}_change')
+            if not level_element or not change_element:
+                continue
+            change_text = change_element.get_text(' ', strip=True)
+            change_match = re.search(r'([-+]?\d+\.?\d*)%', change_text)
+            if not change_match:
+                continue
+            change_percent = float(change_match.group(1))
+            if '하락' in change_text and change_percent > 0:
+                change_percent = -change_percent
+            result[name] = (float(level_element.text.replace(',', '')), change_percent)
+        if len(result) != len(INDEX_MARKETS):
+            raise ValueError("네이버 지수 시세를 찾을 수 없습니다")
+        return result
+
+    def _fetch_pykrx(self) -> Dict[str, Tuple[float, float]]:
+        """pykrx 지수 일별 시세 (지수당 1회 요청, 대체 경로, 당일 행이 아직 없으면 제외)"""
+        if not PYKRX_AVAILABLE:
+            raise RuntimeError("pykrx를 사용할 수 없습니다")
+        today = datetime.now()
+        start = (today - timedelta(days=10)).strftime('%Y%m%d')
+        result = {}
+        for name, code in PYKRX_INDEX_CODES.items():
+            df = stock.get_index_ohlcv_by_date(start, today.strftime('%Y%m%d'), code)
+            if df is None or len(df) < 2 or df.index[-1].date() != today.date():
+                continue
+            last, previous = float(df['종가'].iloc[-1]), float(df['종가'].iloc[-2])
+            result[name] = (last, (last / previous - 1) * 100 if previous else 0.0)
+        if not result:
+            raise ValueError("pykrx 지수 시세를 찾을 수 없습니다")
+        return result
+
+    def refresh(self) -> bool:
+        """지수 수준 갱신 (가격 주기당 1회 호출, 실패 시 이전 값 유지)"""
+        start = time.perf_counter()
+        try:
+            try:
+                values = self._fetch_naver()
+            except Exception as e:
+                logger.debug(f"네이버 지수 조회 실패, pykrx로 대체: {e}")
+                values = self._fetch_pykrx()
+                self.stats['fallbacks'] += 1
+        except Exception as e:
+            with self._lock:
+                self.stats['errors'] += 1
+                self.stats['last_error'] = str(e)
+            logger.warning(f"시장 지수 조회 실패: {e}")
+            return False
+
+        now = datetime.now()
+        with self._lock:
+            for name, (level, change_percent) in values.items():
+                self.levels[name] = {'level': level, 'change_percent': change_percent,
+                                     'updated_at': now.isoformat(), 'updated_ts': now.timestamp()}
+            self.stats['fetches'] += 1
+            self.stats['last_fetch_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        return True
+
+    def market_of(self, stock_code: str) -> str:
+        """종목 기준 지수 (KOSDAQ 종목이 아니면 KOSPI)"""
+        info = self.ticker_master.lookup(stock_code) if self.ticker_master else None
+        return INDEX_KOSDAQ if info and info.get('market') == INDEX_KOSDAQ else INDEX_KOSPI
+
+    def benchmark(self, stock_code: str, use_beta: bool = False) -> Optional[Tuple[float, str, float]]:
+        """
+        종목 기대 등락률 (베타 x 지수 등락률)
+
+        Returns:
+            Tuple: (기대 등락률 %, 기준 지수, 베타) - 지수 시세가 없거나 오래됐으면 None
+        """
+        index_name = self.market_of(stock_code)
+        now = datetime.now()
+        session_start = datetime.combine(now.date(), datetime.strptime(STOCK_MARKET_OPEN_TIME, '%H:%M').time())
+        with self._lock:
+            level = self.levels.get(index_name)
+            if (level is None or level['updated_ts'] < session_start.timestamp() or
+                    now.timestamp() - level['updated_ts'] > INDEX_MAX_AGE_SECONDS):
+                return None
+            beta = 1.0
+            if use_beta:
+                estimated = self.betas.get(stock_code)
+                if estimated and estimated.get('beta') is not None:
+                    beta = estimated['beta']
+            return beta * level['change_percent'], index_name, beta
+
+    # === 베타 추정 ===
+
+    def needs_beta_refresh(self, last_day: date) -> bool:
+        return self.beta_date != last_day.strftime('%Y%m%d')
+
+    def estimate_betas(self, codes: Iterable[str], load_closes: Callable[[str, int], List[Tuple[date, float]]],
+                       last_day: date) -> int:
+        """
+        종목별 베타 추정 및 저장 (장외 일 1회)
+
+        Args:
+            codes: 대상 종목
+            load_closes: (종목코드, 필요 일수) -> [(일자, 종가)] 확정 일봉
+            last_day: 마지막 확정 거래일
+
+        Returns:
+            int: 베타를 추정한 종목 수
+        """
+        if not PYKRX_AVAILABLE:
+            raise RuntimeError("pykrx를 사용할 수 없습니다")
+
+        start = (last_day - timedelta(days=INDEX_BETA_DAYS * 2 + 10)).strftime('%Y%m%d')
+        index_closes: Dict[str, Dict[date, float]] = {}
+        for name, code in PYKRX_INDEX_CODES.items():
+            df = stock.get_index_ohlcv_by_date(start, last_day.strftime('%Y%m%d'), code)
+            index_closes[name] = {ts.date(): float(close) for ts, close in zip(df.index, df['종가'])}
+
+        betas = {}
+        for stock_code in codes:
+            index_name = self.market_of(stock_code)
+            try:
+                closes = dict(load_closes(stock_code, INDEX_BETA_DAYS + 1))
+            except Exception as e:
+                logger.warning(f"베타 추정용 일봉 조회 실패: {stock_code} - {e}")
+                continue
+            beta, days = estimate_beta(closes, index_closes[index_name])
+            betas[stock_code] = {'beta': round(beta, 3) if beta is not None else None, 'index': index_name, 'days': days}
+
+        with self._lock:
+            self.betas = betas
+            self.beta_date = last_day.strftime('%Y%m%d')
+        self._save_betas()
+        estimated = sum(1 for value in betas.values() if value['beta'] is not None)
+        logger.info(f"지수 베타 추정 완료: {estimated}/{len(betas)}개 종목 (기준일 {self.beta_date})")
+        return estimated
+
+    def _load_betas(self):
+        if not os.path.exists(self.beta_file):
+            return
+        try:
+            with FileLock(self.beta_file + '.lock'):
+                with open(self.beta_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            self.betas = data.get('betas', {})
+            self.beta_date = data.get('date')
+        except Exception as e:
+            logger.warning(f"지수 베타 파일 로드 실패: {e}")
+
+    def _save_betas(self):
+        with self._lock:
+            data = {'date': self.beta_date, 'updated_at': datetime.now().isoformat(), 'betas': self.betas}
+        try:
+            with FileLock(self.beta_file + '.lock'):
+                temp_path = self.beta_file + '.tmp'
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                os.replace(temp_path, self.beta_file)
+        except Exception as e:
+            logger.error(f"지수 베타 파일 저장 실패: {e}")
+
+    # === 조회 ===
+
+    def get_status(self) -> Dict:
+        with self._lock:
+            return {
+                'indices': {
+                    name: {key: value for key, value in level.items() if key != 'updated_ts'}
+                    for name, level in self.levels.items()
+                },
+                'beta_date': self.beta_date,
+                'betas': {code: dict(value) for code, value in self.betas.items()},
+                **self.stats
+            }
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'indices': {name: level['change_percent'] for name, level in self.levels.items()},
+                'beta_date': self.beta_date,
+                'betas': len(self.betas),
+                **{key: value for key, value in self.stats.items() if key != 'last_error'}
+            }
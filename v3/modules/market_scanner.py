@@ -0,0 +1,413 @@
+"""
+시장 스캐너 모듈
+관심 종목 외 KOSPI/KOSDAQ 전체 종목을 시장당 1회 일괄 조회한 스냅샷으로 받아
+등락률/거래량 배수/52주 신고가·신저가 스크린을 numpy 벡터 연산으로 한 번에 판정
+"""
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .config import (
+    SCANNER_DIR,
+    SCANNER_MARKETS,
+    SCANNER_MOVE_PERCENT,
+    SCANNER_VOLUME_MULTIPLE,
+    SCANNER_MIN_TURNOVER,
+    SCANNER_LOOKBACK_DAYS,
+    SCANNER_VOLUME_DAYS,
+    SCANNER_MIN_HISTORY_DAYS,
+    SCANNER_MAX_ALERTS,
+    SCANNER_BACKFILL_DAYS_PER_RUN,
+    SCANNER_FINAL_SNAPSHOT_TIME,
+    INDICATOR_VOLUME_MIN_FRACTION,
+    BACKTEST_PYKRX_DELAY_SECONDS
+)
+from .indicators import session_fraction
+from .logger_utils import get_logger
+
+# PyKrx 가용성 확인
+try:
+    from pykrx import stock
+    PYKRX_AVAILABLE = True
+except ImportError:
+    PYKRX_AVAILABLE = False
+
+logger = get_logger('stock')
+
+# 스크린 종류
+SCREEN_MOVE = 'move'            # 등락률
+SCREEN_VOLUME = 'volume'        # 거래량 배수 (장중 경과 비율로 환산한 예상 거래량)
+SCREEN_HIGH_52W = 'high_52w'    # 52주 신고가
+SCREEN_LOW_52W = 'low_52w'      # 52주 신저가
+SCREEN_LABELS = {
+    SCREEN_MOVE: '급등락',
+    SCREEN_VOLUME: '거래량_급증',
+    SCREEN_HIGH_52W: '52주_신고가',
+    SCREEN_LOW_52W: '52주_신저가',
+}
+
+SNAPSHOT_COLUMNS = ('open', 'high', 'low', 'close', 'volume', 'turnover', 'change')
+_PYKRX_COLUMNS = {'시가': 'open', '고가': 'high', '저가': 'low', '종가': 'close',
+                  '거래량': 'volume', '거래대금': 'turnover', '등락률': 'change'}
+
+
+def fetch_market_snapshot(day: str, markets: Iterable[str] = SCANNER_MARKETS) -> Dict[str, np.ndarray]:
+    """
+    전체 시장 일괄 스냅샷 (시장당 pykrx 1회 호출)
+
+    Args:
+        day: 기준일 (YYYYMMDD, 당일이면 장중 시세)
+
+    Returns:
+        Dict: codes/market 및 SNAPSHOT_COLUMNS 배열 (종목코드 오름차순, 휴장일이면 빈 배열)
+
+    Raises:
+        RuntimeError: pykrx를 사용할 수 없는 경우
+    """
+    if not PYKRX_AVAILABLE:
+        raise RuntimeError("pykrx를 사용할 수 없습니다")
+
+    codes, market_names = [], []
+    columns: Dict[str, List[np.ndarray]] = {name: [] for name in SNAPSHOT_COLUMNS}
+    for market in markets:
+        df = stock.get_market_ohlcv_by_ticker(day, market=market)
+        if df is None or df.empty:
+            continue
+        codes.append(df.index.astype(str).to_numpy())
+        market_names.append(np.full(len(df), market))
+        for source, name in _PYKRX_COLUMNS.items():
+            values = df[source].to_numpy(dtype=np.float64) if source in df.columns else np.zeros(len(df))
+            columns[name].append(values)
+
+    if not codes:
+        return empty_snapshot()
+    snapshot = {'codes': np.concatenate(codes), 'market': np.concatenate(market_names)}
+    snapshot.update({name: np.concatenate(values) for name, values in columns.items()})
+
+    # 전 종목 거래량 0이면 휴장일
+    if not snapshot['volume'].any():
+        return empty_snapshot()
+    order = np.argsort(snapshot['codes'], kind='stable')
+    return {name: values[order] for name, values in snapshot.items()}
+
+
+def empty_snapshot() -> Dict[str, np.ndarray]:
+    snapshot = {'codes': np.empty(0, dtype='<U6'), 'market': np.empty(0, dtype='<U6')}
+    snapshot.update({name: np.empty(0) for name in SNAPSHOT_COLUMNS})
+    return snapshot
+
+
+class ScannerBaseline:
+    """
+    스캔 기준값 (종목별 52주 고가/저가, 평균 거래량, 이력 거래일 수)
+
+    거래일별 전체 시장 스냅샷을 {dir}/daily/YYYYMMDD.npz로 보관하고 (휴장일은 빈 파일),
+    장외에 빠진 거래일을 조금씩 채운다. 해당 거래일의 확정 시각(SCANNER_FINAL_SNAPSHOT_TIME) 전에
+    저장한 스냅샷은 KRX 집계가 끝나지 않았을 수 있으므로 빠진 것으로 보고 다시 조회한다. 기준값은 보관 파일 구성이 바뀐 경우에만
+    전체 스냅샷을 이어 붙인 뒤 np.unique 역인덱스로 종목별 최대/최소/평균을 한 번에 계산한다.
+    """
+
+    def __init__(self, base_dir: str = SCANNER_DIR, lookback_days: int = SCANNER_LOOKBACK_DAYS,
+                 volume_days: int = SCANNER_VOLUME_DAYS):
+        self.daily_dir = os.path.join(base_dir, 'daily')
+        self.lookback_days = lookback_days
+        self.volume_days = volume_days
+
+        self.codes = np.empty(0, dtype='<U6')
+        self.high_52w = np.empty(0)
+        self.low_52w = np.empty(0)
+        self.volume_mean = np.empty(0)
+        self.history_days = np.empty(0, dtype=np.int64)
+        self.trading_days: List[str] = []
+        self.built_at: Optional[str] = None
+        self._built_files: tuple = ()
+        self._lock = threading.Lock()
+
+    def _path(self, day: str) -> str:
+        return os.path.join(self.daily_dir, f"{day}.npz")
+
+    def stored_days(self) -> List[str]:
+        if not os.path.isdir(self.daily_dir):
+            return []
+        return sorted(name[:-4] for name in os.listdir(self.daily_dir) if name.endswith('.npz'))
+
+    def save_day(self, day: str, snapshot: Dict[str, np.ndarray]):
+        """거래일 스냅샷 저장 (임시 파일 기록 후 교체)"""
+        os.makedirs(self.daily_dir, exist_ok=True)
+        path = self._path(day)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            np.savez(f, codes=snapshot['codes'], high=snapshot['high'], low=snapshot['low'],
+                     close=snapshot['close'], volume=snapshot['volume'])
+        os.replace(temp_path, path)
+
+    def is_final(self, day: str) -> bool:
+        """저장된 스냅샷이 해당 거래일 확정 시각 이후에 조회한 것인지 여부"""
+        final_at = datetime.strptime(f"{day} {SCANNER_FINAL_SNAPSHOT_TIME}", '%Y%m%d %H:%M').timestamp()
+        return os.path.getmtime(self._path(day)) >= final_at
+
+    def missing_days(self, last_day: date) -> List[str]:
+        """보관 기간 내 아직 조회하지 않았거나 확정 전에 조회한 평일 (최근 일자부터)"""
+        stored = set(self.stored_days())
+        days = []
+        day = last_day
+        # 휴장일을 감안해 거래일 수의 1.5배 달력 기간을 확인
+        for _ in range(int(self.lookback_days * 1.5) + 10):
+            key = day.strftime('%Y%m%d')
+            if day.weekday() < 5 and (key not in stored or not self.is_final(key)):
+                days.append(key)
+            day -= timedelta(days=1)
+        return days
+
+    def backfill(self, last_day: date, limit: int = SCANNER_BACKFILL_DAYS_PER_RUN,
+                 deadline: Optional[float] = None) -> int:
+        """
+        빠진 거래일 스냅샷을 최근 일자부터 최대 limit일 조회 (조회한 일수 반환)
+
+        Args:
+            last_day: 확정된 마지막 거래일
+            deadline: 이 시각(time.time()) 이후에는 다음 일자를 조회하지 않음 (장 시작 전 중단용)
+        """
+        fetched = 0
+        for day in self.missing_days(last_day)[:limit]:
+            if deadline is not None and time.time() >= deadline:
+                break
+            try:
+                self.save_day(day, fetch_market_snapshot(day))
+                fetched += 1
+            except Exception as e:
+                logger.warning(f"시장 스냅샷 조회 실패: {day} - {e}")
+                break
+            time.sleep(BACKTEST_PYKRX_DELAY_SECONDS)
+        if fetched:
+            logger.info(f"시장 스캐너 스냅샷 채우기: {fetched}일")
+        return fetched
+
+    def prune(self):
+        """보관 기간을 넘긴 스냅샷 삭제"""
+        days = self.stored_days()
+        cutoff = (date.today() - timedelta(days=int(self.lookback_days * 1.5) + 10)).strftime('%Y%m%d')
+        for day in days:
+            if day < cutoff:
+                os.remove(self._path(day))
+
+    def build(self, before: Optional[str] = None) -> bool:
+        """
+        기준값 계산 (보관 파일 구성이 바뀐 경우에만, 재계산 시 True)
+
+        Args:
+            before: 이 일자(YYYYMMDD) 이전 스냅샷만 사용 (기본 오늘)
+        """
+        before = before or datetime.now().strftime('%Y%m%d')
+        files = tuple(day for day in self.stored_days() if day < before)
+        with self._lock:
+            if files == self._built_files:
+                return False
+
+        snapshots = []
+        for day in files:
+            with np.load(self._path(day)) as data:
+                if len(data['codes']):
+                    snapshots.append((day, {name: data[name] for name in ('codes', 'high', 'low', 'volume')}))
+        snapshots = snapshots[-self.lookback_days:]
+        volume_from = len(snapshots) - self.volume_days
+
+        if snapshots:
+            all_codes = np.concatenate([data['codes'] for _, data in snapshots])
+            highs = np.concatenate([data['high'] for _, data in snapshots])
+            lows = np.concatenate([data['low'] for _, data in snapshots])
+            volumes = np.concatenate([data['volume'] for _, data in snapshots])
+            recent = np.concatenate([np.full(len(data['codes']), i >= volume_from) for i, (_, data) in enumerate(snapshots)])
+
+            codes, inverse = np.unique(all_codes, return_inverse=True)
+            high_52w = np.full(len(codes), -np.inf)
+            low_52w = np.full(len(codes), np.inf)
+            traded = lows > 0   # 거래정지일(시/고/저가 0) 제외
+            np.maximum.at(high_52w, inverse[traded], highs[traded])
+            np.minimum.at(low_52w, inverse[traded], lows[traded])
+            volume_sum = np.bincount(inverse[recent], weights=volumes[recent], minlength=len(codes))
+            volume_count = np.bincount(inverse[recent], minlength=len(codes))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                volume_mean = np.where(volume_count > 0, volume_sum / volume_count, np.nan)
+            history_days = np.bincount(inverse[traded], minlength=len(codes))
+            high_52w[np.isinf(high_52w)] = np.nan
+            low_52w[np.isinf(low_52w)] = np.nan
+        else:
+            codes = np.empty(0, dtype='<U6')
+            high_52w = low_52w = volume_mean = np.empty(0)
+            history_days = np.empty(0, dtype=np.int64)
+
+        with self._lock:
+            self.codes = codes
+            self.high_52w = high_52w
+            self.low_52w = low_52w
+            self.volume_mean = volume_mean
+            self.history_days = history_days
+            self.trading_days = [day for day, _ in snapshots]
+            self.built_at = datetime.now().isoformat()
+            self._built_files = files
+        logger.info(f"시장 스캐너 기준값 계산: {len(codes)}개 종목, {len(snapshots)}거래일")
+        return True
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'stocks': len(self.codes),
+                'trading_days': len(self.trading_days),
+                'first_day': self.trading_days[0] if self.trading_days else None,
+                'last_day': self.trading_days[-1] if self.trading_days else None,
+                'built_at': self.built_at
+            }
+
+
+class MarketScanner:
+    """
+    전체 시장 스캐너
+
+    scan()은 시장별 일괄 스냅샷을 받아 기준값 배열에 searchsorted로 맞춘 뒤
+    네 가지 스크린을 불리언 마스크로 계산한다. 관심 종목은 기존 알림 경로가 담당하므로 제외하고,
+    최소 거래대금에 못 미치는 종목도 제외한다. 종목/스크린별 적중은 등락률 절댓값 순으로 정렬한다.
+    """
+
+    def __init__(self, baseline: Optional[ScannerBaseline] = None):
+        self.baseline = baseline or ScannerBaseline()
+        self.move_percent = SCANNER_MOVE_PERCENT
+        self.volume_multiple = SCANNER_VOLUME_MULTIPLE
+        self.min_turnover = SCANNER_MIN_TURNOVER
+        self.min_history_days = SCANNER_MIN_HISTORY_DAYS
+        self.max_alerts = SCANNER_MAX_ALERTS
+
+        self.last_result: Optional[Dict] = None
+        self.stats = {'scans': 0, 'errors': 0, 'hits': 0, 'last_scan_ms': 0.0, 'max_scan_ms': 0.0,
+                      'last_error': None}
+        self._lock = threading.Lock()
+
+    def scan(self, exclude: Iterable[str] = (), now: Optional[datetime] = None,
+             snapshot: Optional[Dict[str, np.ndarray]] = None) -> Dict:
+        """
+        전체 시장 스크린 판정
+
+        Args:
+            exclude: 제외할 종목코드 (관심 종목)
+            now: 기준 시각 (기본 현재)
+            snapshot: 미리 받은 스냅샷 (기본 fetch_market_snapshot 당일 조회)
+
+        Returns:
+            Dict: hits(종목별 적중 스크린 포함), 스크린별 건수, 단계별 소요 시간
+        """
+        now = now or datetime.now()
+        day = now.strftime('%Y%m%d')
+        start = time.perf_counter()
+        try:
+            self.baseline.build(before=day)
+            if snapshot is None:
+                snapshot = fetch_market_snapshot(day)
+            fetched = time.perf_counter()
+            result = self._screen(snapshot, set(exclude), now)
+        except Exception as e:
+            with self._lock:
+                self.stats['errors'] += 1
+                self.stats['last_error'] = str(e)
+            raise
+
+        finished = time.perf_counter()
+        result['timing_ms'] = {
+            'fetch': round((fetched - start) * 1000, 3),
+            'screen': round((finished - fetched) * 1000, 3),
+            'total': round((finished - start) * 1000, 3)
+        }
+        result['scanned_at'] = now.isoformat()
+        with self._lock:
+            self.last_result = result
+            self.stats['scans'] += 1
+            self.stats['hits'] += len(result['hits'])
+            self.stats['last_scan_ms'] = result['timing_ms']['total']
+            self.stats['max_scan_ms'] = max(self.stats['max_scan_ms'], result['timing_ms']['total'])
+        return result
+
+    def _screen(self, snapshot: Dict[str, np.ndarray], exclude: set, now: datetime) -> Dict:
+        codes = snapshot['codes']
+        baseline = self.baseline
+        with baseline._lock:
+            base_codes = baseline.codes
+            high_52w, low_52w = baseline.high_52w, baseline.low_52w
+            volume_mean, history_days = baseline.volume_mean, baseline.history_days
+
+        # 스냅샷 종목 -> 기준값 위치 (기준값에 없는 종목은 NaN/0)
+        count = len(codes)
+        if len(base_codes):
+            position = np.minimum(np.searchsorted(base_codes, codes), len(base_codes) - 1)
+            matched = base_codes[position] == codes
+        else:
+            position = np.zeros(count, dtype=np.int64)
+            matched = np.zeros(count, dtype=bool)
+            high_52w = low_52w = volume_mean = np.full(1, np.nan)
+            history_days = np.zeros(1, dtype=np.int64)
+        prior_high = np.where(matched, high_52w[position], np.nan)
+        prior_low = np.where(matched, low_52w[position], np.nan)
+        avg_volume = np.where(matched, volume_mean[position], np.nan)
+        days = np.where(matched, history_days[position], 0)
+
+        eligible = (snapshot['close'] > 0) & (snapshot['turnover'] >= self.min_turnover)
+        if exclude:
+            eligible &= ~np.isin(codes, list(exclude))
+
+        fraction = max(session_fraction(now.timestamp()), INDICATOR_VOLUME_MIN_FRACTION)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = np.where(avg_volume > 0, snapshot['volume'] / fraction / avg_volume, np.nan)
+        long_history = days >= self.min_history_days
+
+        masks = {
+            SCREEN_MOVE: np.abs(snapshot['change']) >= self.move_percent,
+            SCREEN_VOLUME: volume_ratio >= self.volume_multiple,
+            SCREEN_HIGH_52W: long_history & (snapshot['high'] > prior_high),
+            SCREEN_LOW_52W: long_history & (snapshot['low'] > 0) & (snapshot['low'] < prior_low),
+        }
+        for screen in masks:
+            masks[screen] &= eligible
+
+        any_hit = np.zeros(count, dtype=bool)
+        for mask in masks.values():
+            any_hit |= mask
+        rows = np.flatnonzero(any_hit)
+        rows = rows[np.argsort(-np.abs(snapshot['change'][rows]), kind='stable')]
+
+        hits = []
+        for i in rows:
+            hits.append({
+                'stock_code': str(codes[i]),
+                'market': str(snapshot['market'][i]),
+                'screens': [screen for screen, mask in masks.items() if mask[i]],
+                'price': float(snapshot['close'][i]),
+                'change_percent': round(float(snapshot['change'][i]), 2),
+                'volume': float(snapshot['volume'][i]),
+                'volume_ratio': None if np.isnan(volume_ratio[i]) else round(float(volume_ratio[i]), 2),
+                'turnover': float(snapshot['turnover'][i]),
+                'high': float(snapshot['high'][i]),
+                'low': float(snapshot['low'][i]),
+                'prior_high_52w': None if np.isnan(prior_high[i]) else float(prior_high[i]),
+                'prior_low_52w': None if np.isnan(prior_low[i]) else float(prior_low[i])
+            })
+
+        return {
+            'trading_date': now.strftime('%Y%m%d'),
+            'scanned': count,
+            'eligible': int(eligible.sum()),
+            'matched_baseline': int(matched.sum()),
+            'counts': {screen: int(mask.sum()) for screen, mask in masks.items()},
+            'hits': hits
+        }
+
+    def get_last_result(self) -> Optional[Dict]:
+        with self._lock:
+            return self.last_result
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+        stats['baseline'] = self.baseline.get_stats()
+        return stats
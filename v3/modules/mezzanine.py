@@ -0,0 +1,404 @@
+"""
+메자닌 (CB/BW/EB) 전환 엔진
+종목별 전환가/리픽싱 하한/리픽싱 일정/전환 청구 기간을 컬럼 배열로 두고, 가격 갱신마다
+리픽싱 적용 -> 유효 전환가/패리티 재계산 -> 패리티 레벨 교차/리픽싱 예정 판정을 한 번에 수행
+날짜(today)와 가격을 인자로 받으므로 합성 가격 경로로 단독 검증 가능
+"""
+import threading
+import time
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .alert_engine import DIRECTION_UP, RULE_PARITY, RULE_REFIX
+from .config import MEZZANINE_PARITY_LEVELS, MEZZANINE_REFIX_FLOOR_PERCENT, MEZZANINE_REFIX_NOTICE_DAYS
+from .logger_utils import get_logger
+
+logger = get_logger('stock')
+
+INSTRUMENT_TYPES = ('CB', 'BW', 'EB')   # 전환사채 / 신주인수권부사채 / 교환사채
+DATE_FORMAT = '%Y-%m-%d'
+NO_DATE = np.inf
+
+
+def _parse_date(value, field: str) -> Optional[str]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(str(value), DATE_FORMAT).strftime(DATE_FORMAT)
+    except ValueError:
+        raise ValueError(f"{field} 날짜 형식이 올바르지 않습니다 (YYYY-MM-DD): {value}")
+
+
+def _ordinal(day: Optional[str]) -> float:
+    return datetime.strptime(day, DATE_FORMAT).toordinal() if day else NO_DATE
+
+
+def _level_label(level: float):
+    """알림 ID/메시지용 레벨 표기 (정수면 정수로)"""
+    return int(level) if float(level).is_integer() else level
+
+
+def parse_terms(data: Dict) -> Dict:
+    """
+    메자닌 발행 조건 검증
+
+    Args:
+        data: {'type', 'conversion_price', 'refix_floor', 'refix_dates',
+               'conversion_start', 'conversion_end', 'parity_levels'}
+
+    Raises:
+        ValueError: 값이 유효하지 않은 경우
+    """
+    instrument_type = str(data.get('type', 'CB')).upper()
+    if instrument_type not in INSTRUMENT_TYPES:
+        raise ValueError(f"종류는 {', '.join(INSTRUMENT_TYPES)} 중 하나여야 합니다")
+
+    try:
+        conversion_price = float(data.get('conversion_price') or 0)
+        refix_floor = float(data.get('refix_floor') or 0)
+        parity_levels = sorted({float(level) for level in data.get('parity_levels') or MEZZANINE_PARITY_LEVELS})
+    except (TypeError, ValueError):
+        raise ValueError("전환가/리픽싱 하한/패리티 기준은 숫자여야 합니다")
+    if conversion_price <= 0:
+        raise ValueError("전환가는 0보다 커야 합니다")
+    if refix_floor < 0 or refix_floor > conversion_price:
+        raise ValueError("리픽싱 하한은 0 이상, 전환가 이하여야 합니다")
+    if not parity_levels or parity_levels[0] <= 0:
+        raise ValueError("패리티 기준은 0보다 커야 합니다")
+
+    refix_dates = sorted({_parse_date(day, '리픽싱') for day in data.get('refix_dates') or []})
+    conversion_start = _parse_date(data.get('conversion_start'), '전환 청구 시작')
+    conversion_end = _parse_date(data.get('conversion_end'), '전환 청구 종료')
+    if conversion_start and conversion_end and conversion_start > conversion_end:
+        raise ValueError("전환 청구 시작일이 종료일보다 늦습니다")
+
+    return {
+        'type': instrument_type,
+        'conversion_price': conversion_price,
+        'refix_floor': refix_floor,
+        'refix_dates': refix_dates,
+        'conversion_start': conversion_start,
+        'conversion_end': conversion_end,
+        'parity_levels': parity_levels
+    }
+
+
+def instrument_terms(stock_info: Dict) -> Optional[Dict]:
+    """
+    종목의 메자닌 발행 조건 (대상이 아니면 None)
+
+    발행 조건이 없는 기존 메자닌 종목은 conversion_price(없으면 취득가)를 전환가로 쓰고 리픽싱 일정은 없는 것으로 본다.
+    """
+    if not (stock_info.get('alert_settings') or {}).get('parity_enabled', True):
+        return None
+    terms = stock_info.get('mezzanine')
+    if terms:
+        return terms
+    if stock_info.get('category') != '메자닌':
+        return None
+    conversion_price = stock_info.get('conversion_price') or stock_info.get('acquisition_price') or 0
+    if conversion_price <= 0:
+        return None
+    return {
+        'type': 'CB',
+        'conversion_price': float(conversion_price),
+        'refix_floor': 0.0,
+        'refix_dates': [],
+        'conversion_start': None,
+        'conversion_end': None,
+        'parity_levels': list(MEZZANINE_PARITY_LEVELS)
+    }
+
+
+def terms_signature(stock_info: Dict) -> Optional[tuple]:
+    """발행 조건 요약 (변경 감지용, 리픽싱 적용 결과 등 상태 필드 제외)"""
+    terms = instrument_terms(stock_info)
+    if terms is None:
+        return None
+    return (
+        terms.get('type'), terms.get('conversion_price'), terms.get('refix_floor'),
+        tuple(terms.get('refix_dates') or ()), terms.get('conversion_start'), terms.get('conversion_end'),
+        tuple(terms.get('parity_levels') or ())
+    )
+
+
+class MezzanineEngine:
+    """
+    메자닌 전환 엔진
+
+    발행 조건이 바뀐 경우에만 배열을 다시 만든다. evaluate()는 갱신 가격을 반영한 뒤
+      1) 리픽싱일이 된 종목의 전환가를 max(하한, min(현재 전환가, 기준가))로 하향 조정하고
+      2) 전 종목 패리티(현재가 / 유효 전환가)를 한 번에 계산해 레벨 상향 교차를 찾고
+      3) MEZZANINE_REFIX_NOTICE_DAYS일 안에 든 리픽싱 예정을 알린다 (발송 후 mark_notified()로 제외).
+    리픽싱 기준가는 적용 시점의 최근 가격이다 (공시 산식의 가중평균가 대신 근사).
+    적용된 리픽싱은 drain_events()로 꺼내 호출자가 종목 데이터에 기록한다.
+    조회 결과(get_results)는 다음 틱 또는 리픽싱까지 캐시한다.
+    """
+
+    def __init__(self, notice_days: int = MEZZANINE_REFIX_NOTICE_DAYS):
+        self.notice_days = notice_days
+        self.codes: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.signatures: Dict[str, tuple] = {}
+        self.types: List[str] = []
+        self.pending_refix: List[List[str]] = []    # 종목별 미적용 리픽싱일 (오름차순)
+        self.notified: List[set] = []               # 종목별 예정 알림을 발송한 리픽싱일
+
+        # 종목별 배열
+        self.base_price = np.empty(0)
+        self.floor_price = np.empty(0)
+        self.conversion_price = np.empty(0)
+        self.window_start = np.empty(0)
+        self.window_end = np.empty(0)
+        self.next_refix = np.empty(0)
+        self.prices = np.empty(0)
+        self.parity = np.empty(0)
+
+        # 패리티 레벨 테이블
+        self.level_inst = np.empty(0, dtype=np.int32)
+        self.level_percent = np.empty(0)
+
+        self.today: Optional[int] = None
+        self.version = 0
+        self._results_version = -1
+        self._results: List[Dict] = []
+        self._events: List[Dict] = []
+        self.stats = {'rebuilds': 0, 'evaluations': 0, 'hits': 0, 'refixes': 0, 'last_evaluate_ms': 0.0}
+        self._lock = threading.RLock()
+
+    # === 종목 테이블 ===
+
+    def sync(self, stocks: Dict[str, Dict]) -> bool:
+        """발행 조건이 바뀐 종목이 있으면 배열 재구성 (재구성 시 True)"""
+        signatures = {}
+        for code, info in stocks.items():
+            signature = terms_signature(info)
+            if signature is not None:
+                signatures[code] = signature
+        with self._lock:
+            if signatures == self.signatures:
+                return False
+            self._rebuild(stocks, signatures)
+            return True
+
+    def _rebuild(self, stocks: Dict[str, Dict], signatures: Dict[str, tuple]):
+        previous_price = {code: self.prices[i] for code, i in self.index.items()}
+        previous_parity = {code: self.parity[i] for code, i in self.index.items()}
+
+        codes = list(signatures.keys())
+        count = len(codes)
+        base_price = np.zeros(count)
+        floor_price = np.zeros(count)
+        conversion_price = np.zeros(count)
+        window_start = np.full(count, -np.inf)
+        window_end = np.full(count, np.inf)
+        prices = np.full(count, np.nan)
+        parity = np.full(count, np.nan)
+        types, pending_refix, notified = [], [], []
+        level_inst, level_percent = [], []
+
+        for i, code in enumerate(codes):
+            info = stocks[code]
+            terms = instrument_terms(info)
+            state = info.get('mezzanine') or {}
+
+            base_price[i] = terms['conversion_price']
+            floor_price[i] = terms.get('refix_floor') or base_price[i] * MEZZANINE_REFIX_FLOOR_PERCENT / 100
+            conversion_price[i] = state.get('effective_conversion_price') or base_price[i]
+            if terms.get('conversion_start'):
+                window_start[i] = _ordinal(terms['conversion_start'])
+            if terms.get('conversion_end'):
+                window_end[i] = _ordinal(terms['conversion_end'])
+
+            applied = {event['date'] for event in state.get('refix_history') or []}
+            pending_refix.append([day for day in terms.get('refix_dates') or [] if day not in applied])
+            notified.append({alert_id[len('refix_'):] for alert_id in info.get('triggered_alerts') or []
+                             if alert_id.startswith('refix_')})
+            types.append(terms.get('type', 'CB'))
+
+            seed = previous_price.get(code, info.get('current_price') or np.nan)
+            prices[i] = seed if seed and seed > 0 else np.nan
+            parity[i] = previous_parity.get(code, np.nan)
+
+            for level in terms.get('parity_levels') or MEZZANINE_PARITY_LEVELS:
+                level_inst.append(i)
+                level_percent.append(float(level))
+
+        self.codes = codes
+        self.index = {code: i for i, code in enumerate(codes)}
+        self.signatures = signatures
+        self.types = types
+        self.pending_refix = pending_refix
+        self.notified = notified
+        self.base_price = base_price
+        self.floor_price = floor_price
+        self.conversion_price = conversion_price
+        self.window_start = window_start
+        self.window_end = window_end
+        self.next_refix = np.array([_ordinal(days[0]) if days else NO_DATE for days in pending_refix], dtype=np.float64)
+        self.prices = prices
+        self.parity = parity
+        self.level_inst = np.array(level_inst, dtype=np.int32)
+        self.level_percent = np.array(level_percent, dtype=np.float64)
+        self.version += 1
+        self.stats['rebuilds'] += 1
+        logger.debug(f"메자닌 엔진 재구성: {count}개 종목, {len(level_percent)}개 패리티 레벨")
+
+    # === 판정 ===
+
+    def evaluate(self, stocks: Dict[str, Dict], updates: Dict[str, Tuple[float, float]],
+                 today: Optional[date] = None) -> List[Dict]:
+        """
+        가격 갱신 반영 후 리픽싱/패리티/리픽싱 예정 판정
+
+        Args:
+            stocks: 모니터링 종목 (발행 조건 변경 감지용)
+            updates: 종목코드 -> (현재가, 등락률)
+            today: 판정 기준일 (기본 오늘)
+
+        Returns:
+            List[Dict]: 적중 항목 (알림 엔진과 같은 형식)
+        """
+        start = time.perf_counter()
+        today = (today or date.today()).toordinal()
+        self.sync(stocks)
+
+        with self._lock:
+            self.today = today
+            change = np.zeros(len(self.codes))
+            for code, (price, change_percent) in updates.items():
+                i = self.index.get(code)
+                if i is not None and price and price > 0:
+                    self.prices[i] = price
+                    change[i] = change_percent
+
+            # 1) 리픽싱 적용 (하향 조정만, 하한 이하로는 내리지 않음)
+            for i in np.flatnonzero((self.next_refix <= today) & (self.prices > 0)):
+                self._apply_refix(i, today)
+
+            # 2) 패리티 재계산 및 레벨 상향 교차 (NaN 비교는 항상 False)
+            previous = self.parity
+            with np.errstate(invalid='ignore', divide='ignore'):
+                parity = self.prices / self.conversion_price * 100
+            hits = []
+            if len(self.level_percent):
+                p0 = previous[self.level_inst]
+                p1 = parity[self.level_inst]
+                levels = self.level_percent
+                for l in np.flatnonzero((p0 < levels) & (p1 >= levels)):
+                    i = self.level_inst[l]
+                    hits.append(self._hit(i, RULE_PARITY, f"parity_{_level_label(levels[l])}", change[i], {
+                        'threshold': _level_label(levels[l]),
+                        'parity': round(float(parity[i]), 2),
+                        'previous_parity': round(float(p0[l]), 2)
+                    }))
+            self.parity = parity
+
+            # 3) 리픽싱 예정 (발송 전까지 판정마다 적중)
+            days_left = self.next_refix - today
+            for i in np.flatnonzero((days_left >= 0) & (days_left <= self.notice_days) & (self.prices > 0)):
+                refix_date = self.pending_refix[i][0]
+                if refix_date in self.notified[i]:
+                    continue
+                price = self.prices[i]
+                hits.append(self._hit(i, RULE_REFIX, f"refix_{refix_date}", change[i], {
+                    'refix_date': refix_date,
+                    'days_left': int(days_left[i]),
+                    'floor_price': float(self.floor_price[i]),
+                    'expected_conversion_price': float(max(self.floor_price[i], min(self.conversion_price[i], price)))
+                    if price > 0 else float(self.conversion_price[i])
+                }))
+
+            self.version += 1
+            self.stats['evaluations'] += 1
+            self.stats['hits'] += len(hits)
+            self.stats['last_evaluate_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        return hits
+
+    def _apply_refix(self, i: int, today: int):
+        """도래한 리픽싱일 처리 (기준가: 최근 가격)"""
+        reference = float(self.prices[i])
+        days = self.pending_refix[i]
+        while days and _ordinal(days[0]) <= today:
+            refix_date = days.pop(0)
+            before = float(self.conversion_price[i])
+            after = max(float(self.floor_price[i]), min(before, reference))
+            self.conversion_price[i] = after
+            self._events.append({
+                'stock_code': self.codes[i], 'date': refix_date,
+                'reference_price': reference, 'before': before, 'after': after
+            })
+            self.stats['refixes'] += 1
+            logger.info(f"메자닌 리픽싱 적용: {self.codes[i]} {refix_date} 전환가 {before:,.0f} -> {after:,.0f}원")
+        self.next_refix[i] = _ordinal(days[0]) if days else NO_DATE
+
+    def _hit(self, i: int, rule: str, alert_id: str, change_percent: float, meta: Dict) -> Dict:
+        meta.update({
+            'instrument_type': self.types[i],
+            'conversion_price': float(self.conversion_price[i]),
+            'convertible': bool(self.window_start[i] <= self.today <= self.window_end[i])
+        })
+        return {
+            'stock_code': self.codes[i],
+            'rule': rule,
+            'alert_id': alert_id,
+            'level': float(meta.get('threshold', 0)),
+            'direction': DIRECTION_UP,
+            'price': float(self.prices[i]),
+            'previous_price': float(self.prices[i]),
+            'change_percent': float(change_percent),
+            'meta': meta
+        }
+
+    def mark_notified(self, stock_code: str, refix_date: str):
+        """리픽싱 예정 알림 발송 기록 (같은 리픽싱일은 다시 알리지 않음)"""
+        with self._lock:
+            i = self.index.get(stock_code)
+            if i is not None:
+                self.notified[i].add(refix_date)
+
+    def drain_events(self) -> List[Dict]:
+        """적용된 리픽싱 목록을 꺼냄 (종목 데이터 기록용)"""
+        with self._lock:
+            events, self._events = self._events, []
+            return events
+
+    # === 조회 ===
+
+    def get_results(self) -> List[Dict]:
+        """종목별 유효 전환가/패리티/전환 가능 여부/다음 리픽싱 (다음 판정 전까지 캐시)"""
+        with self._lock:
+            if self._results_version == self.version:
+                return self._results
+
+            today = self.today if self.today is not None else date.today().toordinal()
+            results = []
+            for i, code in enumerate(self.codes):
+                levels = self.level_percent[self.level_inst == i]
+                parity = self.parity[i]
+                next_level = levels[levels > parity] if not np.isnan(parity) else levels
+                next_refix = self.pending_refix[i][0] if self.pending_refix[i] else None
+                results.append({
+                    'stock_code': code,
+                    'type': self.types[i],
+                    'conversion_price': float(self.base_price[i]),
+                    'effective_conversion_price': float(self.conversion_price[i]),
+                    'refix_floor': float(self.floor_price[i]),
+                    'current_price': None if np.isnan(self.prices[i]) else float(self.prices[i]),
+                    'parity': None if np.isnan(parity) else round(float(parity), 2),
+                    'next_parity_level': _level_label(float(next_level.min())) if len(next_level) else None,
+                    'convertible': bool(self.window_start[i] <= today <= self.window_end[i]),
+                    'next_refix_date': next_refix,
+                    'days_to_refix': int(self.next_refix[i] - today) if next_refix else None,
+                    'pending_refix_dates': list(self.pending_refix[i])
+                })
+            self._results = results
+            self._results_version = self.version
+            return results
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {'instruments': len(self.codes), 'levels': len(self.level_percent),
+                    'version': self.version, **self.stats}
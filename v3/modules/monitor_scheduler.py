@@ -0,0 +1,260 @@
+"""
+모니터링 스케줄러 모듈
+주기 작업(주가 갱신, 정기 저장, DART 확인 등)을 하나의 스케줄러 스레드에서 등록/실행/관리
+같은 그룹의 작업은 동시에 실행되지 않으며, 작업별 실행 지표를 집계
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from .config import MONITOR_SCHEDULER_TICK_SECONDS, MONITOR_SCHEDULER_WORKERS
+from .logger_utils import get_logger
+
+logger = get_logger('app')
+
+
+class ScheduledJob:
+    """등록된 주기 작업 (실행 함수, 주기, 그룹, 실행 지표)"""
+
+    def __init__(self, name: str, func: Callable[[], None], interval: float,
+                 group: Optional[str] = None, enabled: bool = True, description: str = ''):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.group = group or name
+        self.enabled = enabled
+        self.description = description
+
+        self.running = False
+        self.next_run = 0.0
+        self.metrics = {
+            'runs': 0,
+            'failures': 0,
+            'skipped': 0,          # 같은 그룹 작업 실행 중이라 미룬 예정 회차 수
+            'overruns': 0,         # 실행 시간이 주기를 넘긴 횟수
+            'last_lag': 0.0,       # 예정 시각 대비 실제 시작 지연 (초)
+            'max_lag': 0.0,
+            'last_started_at': None,
+            'last_finished_at': None,
+            'last_duration': None,
+            'avg_duration': None,
+            'max_duration': 0.0,
+            'last_error': None
+        }
+        self._duration_total = 0.0
+        self._skipped_run = None   # 미룸을 이미 집계한 예정 시각 (회차당 1회만 집계)
+
+    def record(self, started: float, duration: float, error: Optional[str]):
+        """실행 결과 집계 (주기 초과 포함)"""
+        self.metrics['runs'] += 1
+        if duration > self.interval:
+            self.metrics['overruns'] += 1
+            logger.warning(f"스케줄러 작업 주기 초과: {self.name} - {duration:.1f}초 > {self.interval}초")
+        if error:
+            self.metrics['failures'] += 1
+            self.metrics['last_error'] = error
+        self._duration_total += duration
+        self.metrics['last_started_at'] = datetime.fromtimestamp(started).isoformat()
+        self.metrics['last_finished_at'] = datetime.now().isoformat()
+        self.metrics['last_duration'] = round(duration, 3)
+        self.metrics['avg_duration'] = round(self._duration_total / self.metrics['runs'], 3)
+        self.metrics['max_duration'] = round(max(self.metrics['max_duration'], duration), 3)
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'description': self.description,
+            'interval': self.interval,
+            'group': self.group,
+            'enabled': self.enabled,
+            'running': self.running,
+            'next_run_at': datetime.fromtimestamp(self.next_run).isoformat() if self.enabled and self.next_run else None,
+            **self.metrics
+        }
+
+
+class MonitorScheduler:
+    """
+    단일 스케줄러 스레드 + 작업 실행 스레드 풀
+
+    스케줄러 스레드는 tick 간격으로 실행 시각이 된 작업을 풀에 넘긴다.
+    작업은 자기 자신과 겹쳐 실행되지 않고, 같은 그룹(예: 'stock')의 작업끼리도 순차 실행된다.
+    그룹이 비면 예정 시각이 가장 오래된 작업부터 실행하므로, 한 작업이 주기를 계속 넘겨도
+    같은 그룹의 다른 작업이 굶지 않는다.
+    다음 실행 시각은 시작 시각 + 주기이며, 실행이 주기보다 길면 종료 직후 다시 실행된다.
+    """
+
+    def __init__(self, tick: float = MONITOR_SCHEDULER_TICK_SECONDS, workers: int = MONITOR_SCHEDULER_WORKERS):
+        self.tick = tick
+        self.workers = workers
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self.started_at = None
+
+        self._running_groups = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._executor = None
+        self._futures = set()
+
+    # === 작업 등록 ===
+
+    def register(self, name: str, func: Callable[[], None], interval: float,
+                 group: Optional[str] = None, enabled: bool = True, description: str = '') -> ScheduledJob:
+        """작업 등록 (같은 이름이 있으면 실행 함수/주기만 교체)"""
+        with self._lock:
+            job = self.jobs.get(name)
+            if job is None:
+                job = ScheduledJob(name, func, interval, group, enabled, description)
+                self.jobs[name] = job
+            else:
+                job.func = func
+                job.interval = interval
+                job.group = group or name
+                job.enabled = enabled
+                job.description = description or job.description
+        logger.info(f"스케줄러 작업 등록: {name} ({interval}초 주기, 그룹 {job.group})")
+        return job
+
+    def get_job(self, name: str) -> Optional[ScheduledJob]:
+        return self.jobs.get(name)
+
+    def enable_job(self, name: str, run_now: bool = True) -> bool:
+        """작업 활성화 (없으면 False)"""
+        with self._lock:
+            job = self.jobs.get(name)
+            if job is None:
+                return False
+            job.enabled = True
+            if run_now:
+                job.next_run = 0.0
+        return True
+
+    def disable_job(self, name: str) -> bool:
+        """작업 비활성화 (실행 중인 회차는 끝까지 진행, 없으면 False)"""
+        with self._lock:
+            job = self.jobs.get(name)
+            if job is None:
+                return False
+            job.enabled = False
+        return True
+
+    def is_job_active(self, name: str) -> bool:
+        """작업 활성화 + 스케줄러 실행 여부"""
+        job = self.jobs.get(name)
+        return bool(job and job.enabled and self.is_running())
+
+    # === 스케줄러 실행 ===
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        """스케줄러 시작 (이미 실행 중이면 False)"""
+        with self._lock:
+            if self.is_running():
+                return False
+            self._stop_event.clear()
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='monitor-job')
+            self._thread = threading.Thread(target=self._loop, name='monitor-scheduler', daemon=True)
+            self.started_at = datetime.now().isoformat()
+            self._thread.start()
+        logger.info(f"모니터링 스케줄러 시작: {len(self.jobs)}개 작업")
+        return True
+
+    def stop(self, timeout: float = 10.0) -> bool:
+        """
+        스케줄러 중지 (실행 중이 아니면 False)
+
+        실행 중인 작업은 timeout초 안에서 종료를 기다리고, 넘기면 기다리지 않고 반환한다
+        (작업은 stopping()으로 중지 요청을 확인해 조기 종료).
+        """
+        if not self.is_running():
+            return False
+        deadline = time.time() + timeout
+        self._stop_event.set()
+        self._thread.join(timeout=timeout)
+        with self._lock:
+            pending = set(self._futures)
+        if pending:
+            _, not_done = wait(pending, timeout=max(0.0, deadline - time.time()))
+            if not_done:
+                logger.warning(f"스케줄러 중지 대기 시간 초과: 작업 {len(not_done)}개 실행 중")
+        self._executor.shutdown(wait=False)
+        self._thread = None
+        self._executor = None
+        logger.info("모니터링 스케줄러 중지")
+        return True
+
+    def stopping(self) -> bool:
+        """중지 요청 여부 (장시간 작업의 조기 종료 확인용)"""
+        return self._stop_event.is_set()
+
+    def _loop(self):
+        while not self._stop_event.is_set():
+            now = time.time()
+            with self._lock:
+                due = sorted(
+                    (job for job in self.jobs.values()
+                     if job.enabled and not job.running and now >= job.next_run),
+                    key=lambda job: job.next_run
+                )
+                for job in due:
+                    if job.group in self._running_groups:
+                        if job._skipped_run != job.next_run:
+                            job._skipped_run = job.next_run
+                            job.metrics['skipped'] += 1
+                        continue
+                    if job.next_run:
+                        lag = now - job.next_run
+                        job.metrics['last_lag'] = round(lag, 3)
+                        job.metrics['max_lag'] = round(max(job.metrics['max_lag'], lag), 3)
+                    job.running = True
+                    self._running_groups.add(job.group)
+                    job.next_run = now + job.interval
+                    future = self._executor.submit(self._run_job, job)
+                    self._futures.add(future)
+                    future.add_done_callback(self._futures.discard)
+            self._stop_event.wait(self.tick)
+
+    def _run_job(self, job: ScheduledJob):
+        started = time.time()
+        error = None
+        try:
+            job.func()
+        except Exception as e:
+            error = str(e)
+            logger.error(f"스케줄러 작업 오류: {job.name} - {e}")
+        finally:
+            duration = time.time() - started
+            with self._lock:
+                job.record(started, duration, error)
+                job.running = False
+                self._running_groups.discard(job.group)
+
+    def run_job_now(self, name: str) -> bool:
+        """작업 즉시 실행 예약 (없으면 False)"""
+        with self._lock:
+            job = self.jobs.get(name)
+            if job is None:
+                return False
+            job.next_run = 0.0
+        return True
+
+    def get_status(self) -> Dict:
+        """스케줄러 및 작업별 상태"""
+        with self._lock:
+            jobs: List[Dict] = [job.to_dict() for job in self.jobs.values()]
+        return {
+            'running': self.is_running(),
+            'started_at': self.started_at if self.is_running() else None,
+            'tick_seconds': self.tick,
+            'workers': self.workers,
+            'jobs': jobs
+        }
+
+
+# 전역 인스턴스
+monitor_scheduler = MonitorScheduler()
@@ -0,0 +1,179 @@
+"""
+실시간 폴링 우선순위 스케줄러
+알림 레벨까지의 거리와 최근 변동성으로 종목을 구간(tier)별로 나누고,
+구간별 조회 주기와 사이클당 요청 예산 안에서 조회할 종목을 선택
+"""
+import heapq
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .config import (
+    POLL_REQUEST_BUDGET,
+    POLL_TIER_HOT_PERCENT,
+    POLL_TIER_WARM_PERCENT,
+    POLL_TIER_HOT_SECONDS,
+    POLL_TIER_WARM_SECONDS,
+    POLL_TIER_COLD_SECONDS,
+    POLL_VOLATILITY_MULTIPLIER
+)
+
+# 폴링 구간
+TIER_HOT = 'hot'     # 알림 레벨 근접
+TIER_WARM = 'warm'   # 주의 구간
+TIER_COLD = 'cold'   # 원거리 (레벨 없음 포함)
+
+TIER_INTERVALS = {
+    TIER_HOT: POLL_TIER_HOT_SECONDS,
+    TIER_WARM: POLL_TIER_WARM_SECONDS,
+    TIER_COLD: POLL_TIER_COLD_SECONDS
+}
+
+# 사이클 초과 시 감축 순서 (감축 단계 n이면 앞에서 n개 구간을 조회하지 않음)
+SHED_ORDER = (TIER_COLD, TIER_WARM)
+
+
+def effective_distance(distance_percent: float, volatility_percent: Optional[float]) -> float:
+    """변동성을 반영한 유효 거리 (%) - 틱 변동성의 배수만큼 레벨에 더 가깝다고 본다"""
+    if volatility_percent:
+        distance_percent -= POLL_VOLATILITY_MULTIPLIER * volatility_percent
+    return max(distance_percent, 0.0)
+
+
+def classify(distance_percent: float) -> str:
+    """유효 거리로 폴링 구간 결정"""
+    if distance_percent <= POLL_TIER_HOT_PERCENT:
+        return TIER_HOT
+    if distance_percent <= POLL_TIER_WARM_PERCENT:
+        return TIER_WARM
+    return TIER_COLD
+
+
+class PollScheduler:
+    """
+    요청 예산 기반 폴링 스케줄러
+
+    plan()은 구간별 주기가 지난 종목 중 (미조회 종목, 초과 비율, 거리) 순으로 예산만큼 고르고,
+    조회가 끝나면 record()로 조회 시각을 기록한다.
+    """
+
+    def __init__(self, budget: int = POLL_REQUEST_BUDGET):
+        self.budget = budget
+        self.last_polled: Dict[str, float] = {}
+        self.tiers: Dict[str, str] = {}
+        self.distances: Dict[str, float] = {}
+        self.tier_stats = {
+            tier: {'polls': 0, 'deferred': 0, 'shed': 0, 'interval_total': 0.0, 'interval_count': 0, 'max_lag': 0.0}
+            for tier in TIER_INTERVALS
+        }
+        self.cycles = 0
+        self.last_plan = {'due': 0, 'selected': 0, 'deferred': 0}
+        self._lock = threading.Lock()
+
+    def plan(self, distances: Dict[str, float], volatilities: Optional[Dict[str, float]] = None,
+             now: Optional[float] = None, shed_level: int = 0) -> List[str]:
+        """
+        이번 사이클 조회 종목 선택
+
+        Args:
+            distances: 종목코드 -> 가장 가까운 알림 레벨까지 거리 (%)
+            volatilities: 종목코드 -> 최근 틱 수익률 표준편차 (%)
+            shed_level: 사이클 초과 감축 단계 (SHED_ORDER 앞에서부터 해당 구간 제외)
+
+        Returns:
+            List[str]: 우선순위 순 조회 종목 (최대 budget개)
+        """
+        now = time.time() if now is None else now
+        volatilities = volatilities or {}
+        shed_tiers = set(SHED_ORDER[:shed_level])
+
+        with self._lock:
+            self.cycles += 1
+            due = []
+            for code, distance in distances.items():
+                distance = effective_distance(distance, volatilities.get(code))
+                tier = classify(distance)
+                self.tiers[code] = tier
+                self.distances[code] = distance
+
+                if tier in shed_tiers:
+                    self.tier_stats[tier]['shed'] += 1
+                    continue
+
+                last = self.last_polled.get(code)
+                if last is None:
+                    due.append(((0, 0.0, distance), code))
+                    continue
+
+                elapsed = now - last
+                interval = TIER_INTERVALS[tier]
+                if elapsed >= interval:
+                    due.append(((1, -elapsed / interval, distance), code))
+
+            selected = [code for _, code in heapq.nsmallest(self.budget, due)]
+            selected_set = set(selected)
+
+            for _, code in due:
+                if code not in selected_set:
+                    self.tier_stats[self.tiers[code]]['deferred'] += 1
+
+            # 사라진 종목 정리
+            for code in list(self.tiers):
+                if code not in distances:
+                    self.tiers.pop(code, None)
+                    self.distances.pop(code, None)
+                    self.last_polled.pop(code, None)
+
+            self.last_plan = {'due': len(due), 'selected': len(selected), 'deferred': len(due) - len(selected)}
+            return selected
+
+    def record(self, stock_code: str, now: Optional[float] = None):
+        """조회 완료 기록 (구간별 실제 조회 간격/지연 집계)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            tier = self.tiers.get(stock_code, TIER_COLD)
+            stats = self.tier_stats[tier]
+            stats['polls'] += 1
+
+            last = self.last_polled.get(stock_code)
+            if last is not None:
+                interval = now - last
+                stats['interval_total'] += interval
+                stats['interval_count'] += 1
+                stats['max_lag'] = max(stats['max_lag'], interval - TIER_INTERVALS[tier])
+
+            self.last_polled[stock_code] = now
+
+    def get_stats(self) -> Dict:
+        """구간별 폴링 통계"""
+        with self._lock:
+            counts = {tier: 0 for tier in TIER_INTERVALS}
+            for tier in self.tiers.values():
+                counts[tier] += 1
+
+            tiers = {}
+            for tier, stats in self.tier_stats.items():
+                tiers[tier] = {
+                    'stocks': counts[tier],
+                    'target_interval': TIER_INTERVALS[tier],
+                    'polls': stats['polls'],
+                    'deferred': stats['deferred'],
+                    'shed': stats['shed'],
+                    'avg_interval': round(stats['interval_total'] / stats['interval_count'], 2) if stats['interval_count'] else None,
+                    'max_lag': round(stats['max_lag'], 2)
+                }
+
+            nearest = sorted(
+                ((code, distance) for code, distance in self.distances.items() if distance != float('inf')),
+                key=lambda item: item[1]
+            )[:10]
+            return {
+                'budget': self.budget,
+                'cycles': self.cycles,
+                'last_plan': dict(self.last_plan),
+                'tiers': tiers,
+                'nearest': [
+                    {'stock_code': code, 'distance_percent': round(distance, 3), 'tier': self.tiers[code]}
+                    for code, distance in nearest
+                ]
+            }
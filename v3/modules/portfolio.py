@@ -0,0 +1,222 @@
+"""
+포트폴리오 손익/노출 엔진
+보유 종목의 수량/취득가/카테고리를 컬럼 배열로 두고, 가격 갱신마다 평가손익/수익률/
+카테고리별 노출/고점 대비 낙폭을 한 번의 벡터 연산으로 다시 계산
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .logger_utils import get_logger
+
+logger = get_logger('stock')
+
+
+def position_signature(stock_info: Dict) -> tuple:
+    """보유 포지션 설정 요약 (변경 감지용)"""
+    return (
+        float(stock_info.get('quantity') or 0),
+        float(stock_info.get('acquisition_price') or 0),
+        stock_info.get('category'),
+        bool(stock_info.get('enabled', True))
+    )
+
+
+class PortfolioEngine:
+    """
+    벡터화 포트폴리오 엔진
+
+    수량이 있는 종목만 포지션으로 본다. 취득가가 없는 포지션은 평가금액/노출에는 포함하지만
+    손익/수익률/낙폭 합계에서는 빼고 따로 집계한다. 포지션 설정이 바뀐 경우에만 배열을 다시 만들고,
+    가격 갱신(update)마다 전체 포지션을 numpy로 재계산해 스냅샷 배열을 갱신한다.
+    get_snapshot()은 마지막 계산 결과를 돌려주며, 응답 딕셔너리는 계산 버전이 바뀐 경우에만 새로 만든다.
+    """
+
+    def __init__(self):
+        self.codes: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.signatures: Dict[str, tuple] = {}
+        self.categories: List[str] = []
+
+        # 포지션별 배열
+        self.quantity = np.empty(0)
+        self.cost = np.empty(0)
+        self.category_idx = np.empty(0, dtype=np.int32)
+        self.prices = np.empty(0)
+        self.peak_prices = np.empty(0)
+
+        # 계산 결과
+        self.market_value = np.empty(0)
+        self.pnl = np.empty(0)
+        self.return_percent = np.empty(0)
+        self.drawdown_percent = np.empty(0)
+        self.totals: Dict = {}
+        self.exposure: Dict[str, Dict] = {}
+        self.peak_pnl: Optional[float] = None
+
+        self.version = 0
+        self.computed_at: Optional[str] = None
+        self._snapshot_version = -1
+        self._snapshot: Dict = {}
+        self.stats = {'rebuilds': 0, 'updates': 0, 'last_update_ms': 0.0}
+        self._lock = threading.RLock()
+        self._recompute()
+
+    # === 포지션 테이블 ===
+
+    def sync(self, stocks: Dict[str, Dict]) -> bool:
+        """포지션 설정이 바뀐 종목이 있으면 배열 재구성 (재구성 시 True)"""
+        signatures = {
+            code: position_signature(info) for code, info in stocks.items()
+            if info.get('quantity') and info.get('enabled', True)
+        }
+        with self._lock:
+            if signatures == self.signatures:
+                return False
+            self._rebuild(stocks, signatures)
+            return True
+
+    def _rebuild(self, stocks: Dict[str, Dict], signatures: Dict[str, tuple]):
+        previous_price = {code: self.prices[i] for code, i in self.index.items()}
+        previous_peak = {code: self.peak_prices[i] for code, i in self.index.items()}
+
+        codes = list(signatures.keys())
+        categories = sorted({signatures[code][2] or 'other' for code in codes})
+        category_index = {category: i for i, category in enumerate(categories)}
+
+        count = len(codes)
+        self.quantity = np.array([signatures[code][0] for code in codes], dtype=np.float64)
+        self.cost = np.array([signatures[code][1] for code in codes], dtype=np.float64)
+        self.category_idx = np.array([category_index[signatures[code][2] or 'other'] for code in codes], dtype=np.int32)
+        self.prices = np.array(
+            [previous_price.get(code, stocks[code].get('current_price') or np.nan) for code in codes],
+            dtype=np.float64
+        )
+        self.prices[self.prices <= 0] = np.nan
+        self.peak_prices = np.array([previous_peak.get(code, np.nan) for code in codes], dtype=np.float64)
+
+        self.codes = codes
+        self.index = {code: i for i, code in enumerate(codes)}
+        self.categories = categories
+        self.signatures = signatures
+        self.peak_pnl = None  # 구성이 바뀌면 포트폴리오 고점 재설정
+        self.stats['rebuilds'] += 1
+        self._recompute()
+        logger.debug(f"포트폴리오 엔진 재구성: {count}개 포지션, {len(categories)}개 카테고리")
+
+    # === 가격 갱신 ===
+
+    def update(self, stocks: Dict[str, Dict], updates: Dict[str, Tuple[float, float]]):
+        """
+        가격 갱신 반영 후 전체 포지션 재계산
+
+        Args:
+            stocks: 모니터링 종목 (포지션 설정 변경 감지용)
+            updates: 종목코드 -> (현재가, 등락률)
+        """
+        start = time.perf_counter()
+        self.sync(stocks)
+        with self._lock:
+            for code, (price, _) in updates.items():
+                i = self.index.get(code)
+                if i is not None and price and price > 0:
+                    self.prices[i] = price
+            self._recompute()
+            self.stats['updates'] += 1
+            self.stats['last_update_ms'] = round((time.perf_counter() - start) * 1000, 3)
+
+    def _recompute(self):
+        """평가손익/수익률/노출/낙폭 벡터 계산 (취득가 미상 포지션의 손익/수익률은 NaN)"""
+        priced = ~np.isnan(self.prices)
+        known_cost = self.cost > 0
+        prices = np.where(priced, self.prices, self.cost)   # 시세가 없으면 취득가로 평가
+
+        self.peak_prices = np.fmax(self.peak_prices, self.prices)
+        cost_basis = self.quantity * self.cost
+        self.market_value = self.quantity * prices
+        self.pnl = np.where(known_cost, self.market_value - cost_basis, np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.return_percent = np.where(known_cost, self.pnl / cost_basis * 100, np.nan)
+            self.drawdown_percent = np.where(self.peak_prices > 0, (prices / self.peak_prices - 1) * 100, 0.0)
+
+        total_value = float(self.market_value.sum())
+        total_cost = float(cost_basis.sum())
+        known_pnl = np.where(known_cost, self.pnl, 0.0)
+        total_pnl = float(known_pnl.sum())
+        unknown_value = float(self.market_value[~known_cost].sum())
+        self.peak_pnl = total_pnl if self.peak_pnl is None else max(self.peak_pnl, total_pnl)
+        peak_equity = total_cost + self.peak_pnl
+
+        category_count = len(self.categories)
+        value_by_category = np.bincount(self.category_idx, weights=self.market_value, minlength=category_count)
+        cost_by_category = np.bincount(self.category_idx, weights=cost_basis, minlength=category_count)
+        pnl_by_category = np.bincount(self.category_idx, weights=known_pnl, minlength=category_count)
+        self.exposure = {
+            category: {
+                'market_value': round(float(value_by_category[i]), 0),
+                'cost_basis': round(float(cost_by_category[i]), 0),
+                'pnl': round(float(pnl_by_category[i]), 0),
+                'weight_percent': round(float(value_by_category[i]) / total_value * 100, 2) if total_value else 0.0
+            }
+            for i, category in enumerate(self.categories)
+        }
+        self.totals = {
+            'positions': len(self.codes),
+            'priced_positions': int(priced.sum()),
+            'unknown_cost_positions': int((~known_cost).sum()),
+            'unknown_cost_market_value': round(unknown_value, 0),
+            'market_value': round(total_value, 0),
+            'cost_basis': round(total_cost, 0),
+            'unrealized_pnl': round(total_pnl, 0),
+            'return_percent': round(total_pnl / total_cost * 100, 2) if total_cost else 0.0,
+            'peak_pnl': round(self.peak_pnl, 0),
+            'drawdown_amount': round(total_pnl - self.peak_pnl, 0),
+            'drawdown_percent': round((total_pnl - self.peak_pnl) / peak_equity * 100, 2) if peak_equity > 0 else 0.0
+        }
+        self.version += 1
+        self.computed_at = datetime.now().isoformat()
+
+    # === 조회 ===
+
+    def get_snapshot(self, names: Optional[Dict[str, str]] = None) -> Dict:
+        """마지막 계산 결과 (계산 버전이 같으면 이전 계산 재사용, 호출자에게는 복사본 반환)"""
+        with self._lock:
+            if self._snapshot_version != self.version:
+                categories = self.categories
+                positions = [
+                    {
+                        'stock_code': code,
+                        'category': categories[self.category_idx[i]],
+                        'quantity': float(self.quantity[i]),
+                        'acquisition_price': float(self.cost[i]) if self.cost[i] > 0 else None,
+                        'current_price': None if np.isnan(self.prices[i]) else float(self.prices[i]),
+                        'market_value': round(float(self.market_value[i]), 0),
+                        'unrealized_pnl': None if np.isnan(self.pnl[i]) else round(float(self.pnl[i]), 0),
+                        'return_percent': None if np.isnan(self.return_percent[i]) else round(float(self.return_percent[i]), 2),
+                        'peak_price': None if np.isnan(self.peak_prices[i]) else float(self.peak_prices[i]),
+                        'drawdown_percent': round(float(self.drawdown_percent[i]), 2)
+                    }
+                    for i, code in enumerate(self.codes)
+                ]
+                positions.sort(key=lambda position: position['market_value'], reverse=True)
+                self._snapshot = {
+                    'totals': dict(self.totals),
+                    'exposure': dict(self.exposure),
+                    'positions': positions,
+                    'computed_at': self.computed_at,
+                    'version': self.version
+                }
+                self._snapshot_version = self.version
+
+            snapshot = {**self._snapshot, 'positions': [dict(position) for position in self._snapshot['positions']]}
+        if names:
+            for position in snapshot['positions']:
+                position['name'] = names.get(position['stock_code'], position['stock_code'])
+        return snapshot
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {'positions': len(self.codes), 'version': self.version, **self.stats}
@@ -0,0 +1,180 @@
+"""
+가격 래더 모듈
+종목별 다수의 알림 가격대(분할 매수/매도 지점)를 정렬된 인덱스로 유지하고,
+이전가→현재가 구간을 이분 탐색하여 교차한 레벨을 O(log n + k)로 반환
+"""
+import bisect
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .config import PRICE_LADDER_MAX_LEVELS
+
+# 레벨 방향
+LADDER_UP = 'up'       # 상향 돌파 시 알림
+LADDER_DOWN = 'down'   # 하향 돌파 시 알림
+LADDER_BOTH = 'both'   # 양방향
+LADDER_DIRECTIONS = (LADDER_UP, LADDER_DOWN, LADDER_BOTH)
+
+
+class PriceLadder:
+    """
+    단일 종목 래더
+
+    prices와 levels는 가격 오름차순으로 정렬된 평행 리스트이다.
+    상승 구간 (이전가, 현재가]와 하락 구간 [현재가, 이전가)를 각각 bisect로 잘라낸다.
+    """
+
+    def __init__(self, levels: Optional[List[Dict]] = None):
+        self.prices: List[float] = []
+        self.levels: List[Dict] = []
+        for level in levels or []:
+            self._insert(level)
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def _insert(self, level: Dict):
+        i = bisect.bisect_right(self.prices, level['price'])
+        self.prices.insert(i, level['price'])
+        self.levels.insert(i, level)
+
+    def add(self, level: Dict):
+        """레벨 추가 (정렬 위치에 삽입)"""
+        self._insert(level)
+
+    def remove(self, level_id: str) -> Optional[Dict]:
+        """레벨 제거 (없으면 None)"""
+        for i, level in enumerate(self.levels):
+            if level['id'] == level_id:
+                del self.prices[i]
+                return self.levels.pop(i)
+        return None
+
+    def crossed(self, previous_price: float, current_price: float) -> List[Dict]:
+        """
+        이전가→현재가 사이에서 교차한 레벨
+
+        Returns:
+            List[Dict]: 교차 순서대로 정렬된 레벨 (방향 필터 적용)
+        """
+        if current_price > previous_price:
+            lo = bisect.bisect_right(self.prices, previous_price)
+            hi = bisect.bisect_right(self.prices, current_price)
+            return [level for level in self.levels[lo:hi] if level['direction'] != LADDER_DOWN]
+
+        if current_price < previous_price:
+            lo = bisect.bisect_left(self.prices, current_price)
+            hi = bisect.bisect_left(self.prices, previous_price)
+            return [level for level in reversed(self.levels[lo:hi]) if level['direction'] != LADDER_UP]
+
+        return []
+
+    def nearest(self, price: float) -> Optional[float]:
+        """가격에 가장 가까운 레벨 가격 (레벨이 없으면 None)"""
+        if not self.prices:
+            return None
+        i = bisect.bisect_left(self.prices, price)
+        candidates = self.prices[max(i - 1, 0):i + 1]
+        return min(candidates, key=lambda level_price: abs(level_price - price))
+
+
+class LadderIndex:
+    """종목코드별 래더 모음 (종목 데이터의 ladder_levels와 동기화)"""
+
+    def __init__(self, max_levels: int = PRICE_LADDER_MAX_LEVELS):
+        self.max_levels = max_levels
+        self.ladders: Dict[str, PriceLadder] = {}
+        self._lock = threading.Lock()
+
+    def load(self, stocks: Dict[str, Dict]):
+        """모니터링 종목 데이터에서 전체 인덱스 구성"""
+        with self._lock:
+            self.ladders = {
+                code: PriceLadder(info.get('ladder_levels'))
+                for code, info in stocks.items() if info.get('ladder_levels')
+            }
+
+    @staticmethod
+    def make_level(price: float, direction: str = LADDER_BOTH, label: str = '') -> Dict:
+        """
+        레벨 생성 (입력 검증 포함)
+
+        Raises:
+            ValueError: 가격 또는 방향이 유효하지 않은 경우
+        """
+        try:
+            price = float(price)
+        except (TypeError, ValueError):
+            raise ValueError(f"유효하지 않은 가격입니다: {price}")
+        if price <= 0:
+            raise ValueError("가격은 0보다 커야 합니다")
+        if direction not in LADDER_DIRECTIONS:
+            raise ValueError(f"방향은 {', '.join(LADDER_DIRECTIONS)} 중 하나여야 합니다")
+
+        return {
+            'id': uuid.uuid4().hex[:8],
+            'price': price,
+            'direction': direction,
+            'label': str(label or ''),
+            'created_at': datetime.now().isoformat()
+        }
+
+    def add(self, stock_code: str, level: Dict):
+        """
+        종목 래더에 레벨 추가
+
+        Raises:
+            ValueError: 종목별 최대 레벨 수를 초과한 경우
+        """
+        with self._lock:
+            ladder = self.ladders.setdefault(stock_code, PriceLadder())
+            if len(ladder) >= self.max_levels:
+                raise ValueError(f"종목별 래더 레벨은 최대 {self.max_levels}개입니다")
+            ladder.add(level)
+
+    def remove(self, stock_code: str, level_id: str) -> Optional[Dict]:
+        """종목 래더에서 레벨 제거 (없으면 None)"""
+        with self._lock:
+            ladder = self.ladders.get(stock_code)
+            if ladder is None:
+                return None
+            level = ladder.remove(level_id)
+            if not ladder:
+                del self.ladders[stock_code]
+            return level
+
+    def drop(self, stock_code: str):
+        """종목 래더 전체 제거"""
+        with self._lock:
+            self.ladders.pop(stock_code, None)
+
+    def crossed(self, stock_code: str, previous_price: float, current_price: float) -> List[Dict]:
+        """종목의 교차 레벨 (래더가 없으면 빈 목록)"""
+        ladder = self.ladders.get(stock_code)
+        if ladder is None:
+            return []
+        with self._lock:
+            return ladder.crossed(previous_price, current_price)
+
+    def nearest(self, stock_code: str, price: float) -> Optional[float]:
+        """종목 래더에서 가격에 가장 가까운 레벨 (래더가 없으면 None)"""
+        with self._lock:
+            ladder = self.ladders.get(stock_code)
+            return ladder.nearest(price) if ladder else None
+
+    def get_levels(self, stock_code: str) -> List[Dict]:
+        """종목 래더 레벨 (가격 오름차순)"""
+        with self._lock:
+            ladder = self.ladders.get(stock_code)
+            return [dict(level) for level in ladder.levels] if ladder else []
+
+    def get_stats(self) -> Dict:
+        """인덱스 상태"""
+        with self._lock:
+            return {
+                'stocks': len(self.ladders),
+                'levels': sum(len(ladder) for ladder in self.ladders.values()),
+                'max_levels_per_stock': self.max_levels
+            }
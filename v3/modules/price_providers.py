@@ -0,0 +1,335 @@
+"""
+주가 제공자(Provider) 레지스트리 모듈
+제공자별 지연시간/오류율 추적, 서킷 브레이커, 헤지 요청(hedged request) 라우팅 제공
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .config import (
+    PROVIDER_STATS_WINDOW,
+    PROVIDER_FAILURE_THRESHOLD,
+    PROVIDER_CIRCUIT_OPEN_SECONDS,
+    PROVIDER_HEDGE_PERCENTILE,
+    PROVIDER_HEDGE_DEFAULT_DELAY,
+    PROVIDER_HEDGE_MIN_SAMPLES,
+    PROVIDER_MAX_WORKERS,
+    PROVIDER_ROUTING_LOG_SIZE
+)
+from .logger_utils import get_logger
+
+logger = get_logger('stock')
+
+# 서킷 상태
+CIRCUIT_CLOSED = 'closed'
+CIRCUIT_OPEN = 'open'
+CIRCUIT_HALF_OPEN = 'half_open'
+
+
+class PriceProvider:
+    """
+    개별 주가 제공자
+
+    fetch_func(stock_code)는 시세 dict({'price', 'change_percent', 'volume'})를 반환하고,
+    데이터가 없으면 None을 반환하며, 제공자 자체 장애(네트워크 등)는 예외로 알린다.
+    """
+
+    def __init__(self, name: str, fetch_func: Callable[[str], Optional[Dict]], available: bool = True):
+        self.name = name
+        self.fetch_func = fetch_func
+        self.available = available
+
+        # 롤링 통계
+        self.latencies = deque(maxlen=PROVIDER_STATS_WINDOW)
+        self.outcomes = deque(maxlen=PROVIDER_STATS_WINDOW)  # True: 성공, False: 실패
+        self.total_calls = 0
+        self.total_failures = 0
+        self.total_empty = 0
+        self.last_error = None
+        self.last_success_at = None
+
+        # 서킷 브레이커 상태
+        self.circuit_state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.open_count = 0
+        self._probe_in_flight = False
+
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """요청 허용 여부 (서킷 오픈 시 쿨다운 경과 후 1회 복구 탐침 허용)"""
+        if not self.available:
+            return False
+
+        with self._lock:
+            if self.circuit_state == CIRCUIT_CLOSED:
+                return True
+
+            if self.circuit_state == CIRCUIT_OPEN:
+                if time.time() - self.opened_at < PROVIDER_CIRCUIT_OPEN_SECONDS:
+                    return False
+                self.circuit_state = CIRCUIT_HALF_OPEN
+                self._probe_in_flight = False
+                logger.info(f"주가 제공자 복구 탐침 시작: {self.name}")
+
+            # HALF_OPEN: 동시에 하나의 탐침만 허용
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self, latency: float, empty: bool = False):
+        """성공 기록 (데이터 없음도 제공자는 정상 응답한 것으로 간주)"""
+        with self._lock:
+            self.total_calls += 1
+            self.latencies.append(latency)
+            self.outcomes.append(True)
+            self.consecutive_failures = 0
+            self.last_success_at = datetime.now().isoformat()
+            if empty:
+                self.total_empty += 1
+
+            if self.circuit_state != CIRCUIT_CLOSED:
+                logger.info(f"주가 제공자 서킷 복구: {self.name}")
+            self.circuit_state = CIRCUIT_CLOSED
+            self._probe_in_flight = False
+
+    def record_failure(self, latency: float, error: str):
+        """실패 기록 및 서킷 오픈 판단"""
+        with self._lock:
+            self.total_calls += 1
+            self.total_failures += 1
+            self.latencies.append(latency)
+            self.outcomes.append(False)
+            self.consecutive_failures += 1
+            self.last_error = error
+
+            should_open = (
+                self.circuit_state == CIRCUIT_HALF_OPEN or
+                self.consecutive_failures >= PROVIDER_FAILURE_THRESHOLD
+            )
+            if should_open and self.circuit_state != CIRCUIT_OPEN:
+                self.circuit_state = CIRCUIT_OPEN
+                self.opened_at = time.time()
+                self.open_count += 1
+                logger.warning(f"주가 제공자 서킷 오픈: {self.name} (연속 실패 {self.consecutive_failures}회) - {error}")
+            self._probe_in_flight = False
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """롤링 지연시간 백분위 (표본 부족 시 None)"""
+        with self._lock:
+            samples = sorted(self.latencies)
+
+        if len(samples) < PROVIDER_HEDGE_MIN_SAMPLES:
+            return None
+
+        index = min(len(samples) - 1, int(round(percentile / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def error_rate(self) -> float:
+        """롤링 오류율 (0.0 ~ 1.0)"""
+        with self._lock:
+            if not self.outcomes:
+                return 0.0
+            return self.outcomes.count(False) / len(self.outcomes)
+
+    def get_stats(self) -> Dict:
+        """제공자 통계 반환"""
+        p50 = self.latency_percentile(50)
+        p95 = self.latency_percentile(PROVIDER_HEDGE_PERCENTILE)
+
+        with self._lock:
+            avg_latency = sum(self.latencies) / len(self.latencies) if self.latencies else None
+            return {
+                'name': self.name,
+                'available': self.available,
+                'circuit_state': self.circuit_state,
+                'consecutive_failures': self.consecutive_failures,
+                'circuit_open_count': self.open_count,
+                'total_calls': self.total_calls,
+                'total_failures': self.total_failures,
+                'total_empty': self.total_empty,
+                'error_rate': round(self.outcomes.count(False) / len(self.outcomes), 4) if self.outcomes else 0.0,
+                'avg_latency': round(avg_latency, 3) if avg_latency is not None else None,
+                'p50_latency': round(p50, 3) if p50 is not None else None,
+                'p95_latency': round(p95, 3) if p95 is not None else None,
+                'last_error': self.last_error,
+                'last_success_at': self.last_success_at
+            }
+
+
+class ProviderRegistry:
+    """주가 제공자 레지스트리 (등록 순서 = 우선순위)"""
+
+    def __init__(self):
+        self.providers: List[PriceProvider] = []
+        self.executor = ThreadPoolExecutor(max_workers=PROVIDER_MAX_WORKERS, thread_name_prefix='price-provider')
+        self.routing_log = deque(maxlen=PROVIDER_ROUTING_LOG_SIZE)
+        self.counters = {
+            'requests': 0,
+            'hedged': 0,
+            'hedge_wins': 0,
+            'fallbacks': 0,
+            'failures': 0
+        }
+        self._lock = threading.Lock()
+
+    def register(self, provider: PriceProvider):
+        """제공자 등록"""
+        self.providers.append(provider)
+        logger.info(f"주가 제공자 등록: {provider.name} (사용 가능: {provider.available})")
+
+    def get_provider(self, name: str) -> Optional[PriceProvider]:
+        """이름으로 제공자 조회"""
+        for provider in self.providers:
+            if provider.name == name:
+                return provider
+        return None
+
+    def _call_provider(self, provider: PriceProvider, stock_code: str) -> Tuple[Optional[Dict], Optional[str], bool]:
+        """제공자 호출 및 통계 기록 (시세, 오류, 데이터 없음 여부)"""
+        start_time = time.time()
+        try:
+            quote = provider.fetch_func(stock_code)
+            latency = time.time() - start_time
+
+            if quote is None or quote.get('price') is None:
+                provider.record_success(latency, empty=True)
+                return None, f"{provider.name}: 데이터 없음", True
+
+            provider.record_success(latency)
+            quote['source'] = provider.name
+            quote['latency'] = round(latency, 3)
+            return quote, None, False
+
+        except Exception as e:
+            latency = time.time() - start_time
+            provider.record_failure(latency, str(e))
+            return None, f"{provider.name}: {e}", False
+
+    def fetch(self, stock_code: str) -> Tuple[Optional[Dict], Optional[str]]:
+        """시세 조회 라우팅 (시세, 오류)"""
+        quote, error, _ = self.fetch_with_status(stock_code)
+        return quote, error
+
+    def fetch_with_status(self, stock_code: str) -> Tuple[Optional[Dict], Optional[str], bool]:
+        """
+        시세 조회 라우팅
+
+        1) 서킷이 열린 제공자는 건너뛴다 (복구 탐침은 실제로 호출하기 직전에만 점유)
+        2) 1순위 제공자가 p95 지연을 넘기면 2순위 제공자에 헤지 요청을 보낸다
+        3) 먼저 도착한 유효 응답을 사용하고, 둘 다 실패하면 나머지 제공자로 순차 폴백한다
+
+        Returns:
+            Tuple: (시세, 오류, 데이터 없음 여부) - 호출한 모든 제공자가 정상 응답했지만
+                   데이터가 없으면 True (거래정지/상장폐지/잘못된 종목코드 등)
+        """
+        start_time = time.time()
+        decision = {
+            'time': datetime.now().isoformat(),
+            'stock_code': stock_code,
+            'candidates': [],
+            'skipped': [],
+            'hedged': False,
+            'served_by': None,
+            'errors': [],
+            'empty': []
+        }
+
+        with self._lock:
+            self.counters['requests'] += 1
+
+        quote = None
+        remaining = list(self.providers)
+
+        def next_allowed() -> Optional[PriceProvider]:
+            # 호출 직전에 허용 여부를 확인해 쓰지 않을 제공자의 복구 탐침을 점유하지 않는다
+            while remaining:
+                provider = remaining.pop(0)
+                if provider.allow_request():
+                    decision['candidates'].append(provider.name)
+                    return provider
+                decision['skipped'].append(provider.name)
+            return None
+
+        primary = next_allowed()
+        if primary is not None:
+            decision['primary'] = primary.name
+            primary_future = self.executor.submit(self._call_provider, primary, stock_code)
+
+            hedge_delay = primary.latency_percentile(PROVIDER_HEDGE_PERCENTILE)
+            if hedge_delay is None:
+                hedge_delay = PROVIDER_HEDGE_DEFAULT_DELAY
+            decision['hedge_delay'] = round(hedge_delay, 3)
+
+            done, _ = wait([primary_future], timeout=hedge_delay)
+            pending = {primary_future: primary}
+
+            # 1순위 지연 시 헤지 요청
+            secondary = next_allowed() if not done else None
+            if secondary is not None:
+                pending[self.executor.submit(self._call_provider, secondary, stock_code)] = secondary
+                decision['hedged'] = True
+                with self._lock:
+                    self.counters['hedged'] += 1
+
+            while pending and quote is None:
+                done, _ = wait(list(pending.keys()), return_when=FIRST_COMPLETED)
+                for future in done:
+                    provider = pending.pop(future)
+                    result, error, empty = future.result()
+                    if result is not None and quote is None:
+                        quote = result
+                        decision['served_by'] = provider.name
+                    elif error:
+                        decision['errors'].append(error)
+                        if empty:
+                            decision['empty'].append(provider.name)
+
+            if decision['hedged'] and decision['served_by'] and decision['served_by'] != primary.name:
+                with self._lock:
+                    self.counters['hedge_wins'] += 1
+
+        # 순차 폴백
+        while quote is None:
+            provider = next_allowed()
+            if provider is None:
+                break
+            with self._lock:
+                self.counters['fallbacks'] += 1
+            result, error, empty = self._call_provider(provider, stock_code)
+            if result is not None:
+                quote = result
+                decision['served_by'] = provider.name
+            elif error:
+                decision['errors'].append(error)
+                if empty:
+                    decision['empty'].append(provider.name)
+
+        decision['elapsed'] = round(time.time() - start_time, 3)
+        self.routing_log.append(decision)
+
+        if quote is None:
+            with self._lock:
+                self.counters['failures'] += 1
+            if not decision['candidates']:
+                return None, "사용 가능한 주가 제공자가 없습니다 (서킷 오픈)", False
+            no_data = len(decision['empty']) == len(decision['errors']) > 0
+            return None, '; '.join(decision['errors']) or "주가 정보를 가져올 수 없습니다", no_data
+
+        return quote, None, False
+
+    def get_stats(self, recent: int = 20) -> Dict:
+        """제공자별 통계 및 최근 라우팅 결정 반환"""
+        with self._lock:
+            counters = dict(self.counters)
+
+        return {
+            'providers': [p.get_stats() for p in self.providers],
+            'counters': counters,
+            'recent_decisions': list(self.routing_log)[-recent:] if recent > 0 else []
+        }
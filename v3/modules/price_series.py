@@ -0,0 +1,193 @@
+"""
+장중 시세 시계열 모듈
+종목별 고정 용량 링 버퍼 (NumPy 사전 할당 배열, O(1) 추가, 복사 없는 구간 뷰, 벡터화 롤링 통계)
+"""
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .config import PRICE_SERIES_CAPACITY
+
+
+class PriceSeries:
+    """
+    단일 종목 링 버퍼
+
+    각 배열은 용량의 2배로 할당하고 모든 값을 i와 i + capacity 두 위치에 기록한다.
+    따라서 최근 n개 구간은 항상 연속된 슬라이스 [pos + capacity - n, pos + capacity)로
+    복사 없이 얻을 수 있다.
+    """
+
+    def __init__(self, capacity: int = PRICE_SERIES_CAPACITY):
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity * 2, dtype=np.float64)  # epoch 초
+        self.prices = np.zeros(capacity * 2, dtype=np.float64)
+        self.volumes = np.zeros(capacity * 2, dtype=np.float64)     # 누적 거래량
+        self.pos = 0
+        self.count = 0
+        self.trading_date = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def clear(self):
+        """버퍼 초기화 (배열은 재사용)"""
+        with self._lock:
+            self.pos = 0
+            self.count = 0
+            self.trading_date = None
+
+    def append(self, timestamp: float, price: float, volume: Optional[float] = None) -> bool:
+        """
+        틱 추가 (O(1))
+
+        같은 시각의 틱(캐시 재사용 등)은 무시하고, 날짜가 바뀌면 새 거래일로 버퍼를 비운다.
+
+        Returns:
+            bool: 추가되었으면 True
+        """
+        trading_date = datetime.fromtimestamp(timestamp).date()
+
+        with self._lock:
+            if self.trading_date != trading_date:
+                self.pos = 0
+                self.count = 0
+                self.trading_date = trading_date
+
+            if self.count:
+                last_index = self.pos + self.capacity - 1
+                if timestamp <= self.timestamps[last_index]:
+                    return False
+                if volume is None:
+                    volume = self.volumes[last_index]
+
+            if volume is None:
+                volume = 0.0
+
+            for array, value in ((self.timestamps, timestamp), (self.prices, price), (self.volumes, volume)):
+                array[self.pos] = value
+                array[self.pos + self.capacity] = value
+
+            self.pos = (self.pos + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+            return True
+
+    def window(self, points: Optional[int] = None, seconds: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        최근 구간 뷰 (복사 없음)
+
+        Args:
+            points: 최근 틱 개수 (생략 시 전체)
+            seconds: 마지막 틱 기준 최근 N초 (points와 함께 주면 더 짧은 구간)
+
+        Returns:
+            Tuple: (timestamps, prices, volumes) 읽기 전용 뷰 - 이후 추가되는 틱에 덮어써질 수 있다
+        """
+        with self._lock:
+            n = self.count if points is None else max(0, min(points, self.count))
+            end = self.pos + self.capacity
+            start = end - n
+
+            if seconds is not None and n:
+                ts = self.timestamps[start:end]
+                start += int(np.searchsorted(ts, ts[-1] - seconds, side='left'))
+
+            views = (self.timestamps[start:end], self.prices[start:end], self.volumes[start:end])
+
+        for view in views:
+            view.flags.writeable = False
+        return views
+
+    def rolling_mean(self, window: int, points: Optional[int] = None) -> np.ndarray:
+        """이동평균 (누적합 기반 벡터 연산, 길이 = 구간 길이 - window + 1)"""
+        _, prices, _ = self.window(points)
+        if window <= 0 or len(prices) < window:
+            return np.empty(0)
+        cumsum = np.cumsum(np.concatenate(([0.0], prices)))
+        return (cumsum[window:] - cumsum[:-window]) / window
+
+    def rolling_std(self, window: int, points: Optional[int] = None) -> np.ndarray:
+        """이동 표준편차 (모집단 기준)"""
+        _, prices, _ = self.window(points)
+        if window <= 0 or len(prices) < window:
+            return np.empty(0)
+        cumsum = np.cumsum(np.concatenate(([0.0], prices)))
+        cumsum_sq = np.cumsum(np.concatenate(([0.0], prices * prices)))
+        mean = (cumsum[window:] - cumsum[:-window]) / window
+        mean_sq = (cumsum_sq[window:] - cumsum_sq[:-window]) / window
+        return np.sqrt(np.maximum(mean_sq - mean * mean, 0.0))
+
+    def return_volatility(self, points: Optional[int] = None) -> Optional[float]:
+        """최근 틱 수익률 표준편차 (%, 틱이 3개 미만이면 None)"""
+        _, prices, _ = self.window(points)
+        if len(prices) < 3:
+            return None
+        returns = np.diff(prices) / prices[:-1]
+        return float(returns.std() * 100)
+
+    def stats(self, points: Optional[int] = None, seconds: Optional[float] = None) -> Dict:
+        """구간 통계 (시가/고가/저가/종가, 평균, 표준편차, 수익률, VWAP)"""
+        timestamps, prices, volumes = self.window(points=points, seconds=seconds)
+        if not len(prices):
+            return {'count': 0}
+
+        # 누적 거래량의 증가분을 틱별 체결량으로 사용
+        traded = np.maximum(np.diff(volumes), 0.0)
+        traded_total = float(traded.sum())
+        vwap = float(np.dot(prices[1:], traded) / traded_total) if traded_total > 0 else None
+
+        first = float(prices[0])
+        last = float(prices[-1])
+        return {
+            'count': int(len(prices)),
+            'start': datetime.fromtimestamp(timestamps[0]).isoformat(),
+            'end': datetime.fromtimestamp(timestamps[-1]).isoformat(),
+            'open': first,
+            'high': float(prices.max()),
+            'low': float(prices.min()),
+            'last': last,
+            'mean': round(float(prices.mean()), 2),
+            'std': round(float(prices.std()), 4),
+            'return_percent': round((last - first) / first * 100, 4) if first else 0.0,
+            'vwap': round(vwap, 2) if vwap is not None else None,
+            'traded_volume': traded_total
+        }
+
+
+class PriceSeriesStore:
+    """종목코드별 링 버퍼 모음"""
+
+    def __init__(self, capacity: int = PRICE_SERIES_CAPACITY):
+        self.capacity = capacity
+        self.series: Dict[str, PriceSeries] = {}
+        self._lock = threading.Lock()
+
+    def get(self, stock_code: str) -> Optional[PriceSeries]:
+        """종목 버퍼 조회 (없으면 None)"""
+        return self.series.get(stock_code)
+
+    def append(self, stock_code: str, timestamp: float, price: float, volume: Optional[float] = None) -> bool:
+        """종목 틱 추가 (버퍼가 없으면 생성)"""
+        series = self.series.get(stock_code)
+        if series is None:
+            with self._lock:
+                series = self.series.setdefault(stock_code, PriceSeries(self.capacity))
+        return series.append(timestamp, price, volume)
+
+    def remove(self, stock_code: str):
+        """종목 버퍼 제거"""
+        with self._lock:
+            self.series.pop(stock_code, None)
+
+    def get_stats(self) -> Dict:
+        """저장소 상태 (종목 수, 총 틱 수, 메모리 사용량)"""
+        series = list(self.series.values())
+        return {
+            'stocks': len(series),
+            'capacity': self.capacity,
+            'total_ticks': sum(len(s) for s in series),
+            'memory_bytes': sum(s.timestamps.nbytes + s.prices.nbytes + s.volumes.nbytes for s in series)
+        }
@@ -0,0 +1,218 @@
+"""
+시세 캐시 모듈
+종목코드별 프로세스 공용 캐시 (장 운영 시간 기반 TTL, 진행 중 조회 단일화(single-flight), 갱신 중 이전 값 제공,
+데이터 없는 종목의 네거티브 캐시 + 지수 백오프)
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+from .config import (
+    STOCK_MARKET_OPEN_TIME,
+    STOCK_MARKET_CLOSE_TIME,
+    QUOTE_CACHE_TTL_MARKET,
+    QUOTE_CACHE_TTL_CLOSED,
+    QUOTE_CACHE_WAIT_TIMEOUT,
+    QUOTE_NEGATIVE_BASE_SECONDS,
+    QUOTE_NEGATIVE_MAX_SECONDS
+)
+from .logger_utils import get_logger
+
+logger = get_logger('stock')
+
+# 조회 결과 구분
+CACHE_HIT = 'hit'              # 유효 시간 내 캐시
+CACHE_STALE = 'stale'          # 다른 요청이 갱신 중이라 이전 값 제공
+CACHE_COALESCED = 'coalesced'  # 진행 중 조회 결과를 함께 수신
+CACHE_MISS = 'miss'            # 직접 조회
+
+
+class _InFlight:
+    """진행 중 조회 (완료 이벤트 + 결과)"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.quote = None
+        self.error = None
+
+
+class QuoteCache:
+    """
+    종목 시세 캐시
+
+    fetch_func(stock_code)는 (quote_dict | None, error, no_data) 튜플을 반환한다.
+    제공자 장애로 인한 실패는 캐시하지 않으며 대기 중인 요청에만 전달된다.
+    no_data(제공자는 정상 응답했지만 데이터 없음)인 종목은 연속 횟수에 따라
+    지수적으로 늘어나는 기간 동안 조회 없이 즉시 실패를 반환한다.
+    """
+
+    def __init__(self, fetch_func: Callable[[str], Tuple[Optional[Dict], Optional[str], bool]]):
+        self.fetch_func = fetch_func
+        self.entries: Dict[str, Dict] = {}        # stock_code -> {'quote', 'fetched_at'}
+        self.negative: Dict[str, Dict] = {}       # stock_code -> {'count', 'retry_at', 'error', 'since'}
+        self.in_flight: Dict[str, _InFlight] = {}
+        self.counters = {
+            'requests': 0,
+            'hits': 0,
+            'stale_hits': 0,
+            'coalesced': 0,
+            'misses': 0,
+            'fetch_errors': 0,
+            'negative_hits': 0
+        }
+        self._lock = threading.Lock()
+
+    def is_market_hours(self) -> bool:
+        """장 운영 시간 여부 (평일 개장~마감)"""
+        now = datetime.now()
+        if now.weekday() >= 5:
+            return False
+        return STOCK_MARKET_OPEN_TIME <= now.strftime("%H:%M") <= STOCK_MARKET_CLOSE_TIME
+
+    def current_ttl(self) -> float:
+        """현재 적용 TTL (장중에는 짧게, 장외에는 길게)"""
+        return QUOTE_CACHE_TTL_MARKET if self.is_market_hours() else QUOTE_CACHE_TTL_CLOSED
+
+    def _entry_ttl(self, entry: Dict) -> float:
+        """항목별 TTL (거래정지 종목은 가격이 움직이지 않으므로 장외 TTL 적용)"""
+        if entry['quote'].get('trading_status') == 'halted':
+            return QUOTE_CACHE_TTL_CLOSED
+        return self.current_ttl()
+
+    def _result(self, entry: Dict, status: str) -> Dict:
+        """캐시 항목을 호출자용 사본으로 변환 (캐시 상태/경과 시간 포함)"""
+        quote = dict(entry['quote'])
+        quote['cache'] = status
+        quote['age'] = round(time.time() - entry['fetched_at'], 3)
+        return quote
+
+    def get(self, stock_code: str, force: bool = False) -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        시세 조회
+
+        1) 유효 시간 내 캐시가 있으면 즉시 반환 (force 시 생략)
+        2) 데이터 없음으로 백오프 중인 종목은 조회 없이 실패 반환 (force 시 생략)
+        3) 다른 요청이 갱신 중이면 이전 값을 경과 시간과 함께 반환, 이전 값이 없으면 결과를 기다린다
+        4) 그 외에는 직접 조회하여 캐시를 갱신한다
+        """
+        with self._lock:
+            self.counters['requests'] += 1
+            entry = self.entries.get(stock_code)
+
+            negative = self.negative.get(stock_code)
+            if negative and not force and time.time() < negative['retry_at']:
+                self.counters['negative_hits'] += 1
+                return None, negative['error']
+
+            if entry and not force and time.time() - entry['fetched_at'] < self._entry_ttl(entry):
+                self.counters['hits'] += 1
+                return self._result(entry, CACHE_HIT), None
+
+            flight = self.in_flight.get(stock_code)
+            if flight is not None:
+                if entry and not force:
+                    self.counters['stale_hits'] += 1
+                    return self._result(entry, CACHE_STALE), None
+                self.counters['coalesced'] += 1
+                leader = False
+            else:
+                flight = _InFlight()
+                self.in_flight[stock_code] = flight
+                self.counters['misses'] += 1
+                leader = True
+
+        if not leader:
+            if not flight.event.wait(QUOTE_CACHE_WAIT_TIMEOUT):
+                return None, "진행 중인 시세 조회 대기 시간 초과"
+            if flight.quote is None:
+                return None, flight.error
+            quote = dict(flight.quote)
+            quote['cache'] = CACHE_COALESCED
+            quote['age'] = 0.0
+            return quote, None
+
+        quote, error, no_data = None, None, False
+        try:
+            quote, error, no_data = self.fetch_func(stock_code)
+        except Exception as e:
+            error = f"시세 조회 오류: {e}"
+        finally:
+            with self._lock:
+                if quote is not None:
+                    self.entries[stock_code] = {'quote': dict(quote), 'fetched_at': time.time()}
+                    if self.negative.pop(stock_code, None):
+                        logger.info(f"데이터 없음 백오프 해제: {stock_code}")
+                else:
+                    self.counters['fetch_errors'] += 1
+                    if no_data:
+                        self._mark_no_data(stock_code, error)
+                flight.quote = quote
+                flight.error = error
+                del self.in_flight[stock_code]
+            flight.event.set()
+
+        if quote is None:
+            return None, error
+
+        quote = dict(quote)
+        quote['cache'] = CACHE_MISS
+        quote['age'] = 0.0
+        return quote, None
+
+    def _mark_no_data(self, stock_code: str, error: Optional[str]):
+        """데이터 없음 기록 및 다음 재시도 시각 계산 (락 보유 상태에서 호출)"""
+        now = time.time()
+        negative = self.negative.get(stock_code) or {'count': 0, 'since': datetime.now().isoformat()}
+        negative['count'] += 1
+        backoff = min(QUOTE_NEGATIVE_BASE_SECONDS * (2 ** (negative['count'] - 1)), QUOTE_NEGATIVE_MAX_SECONDS)
+        negative['retry_at'] = now + backoff
+        negative['error'] = error or "주가 데이터가 없습니다"
+        self.negative[stock_code] = negative
+        logger.warning(f"데이터 없음 백오프: {stock_code} - {negative['count']}회 연속, {backoff:.0f}초 후 재시도")
+
+    def get_negative_status(self, stock_code: str) -> Optional[Dict]:
+        """종목의 데이터 없음 백오프 상태 (백오프 기록이 없으면 None)"""
+        with self._lock:
+            negative = self.negative.get(stock_code)
+            if not negative:
+                return None
+            return {
+                'count': negative['count'],
+                'since': negative['since'],
+                'error': negative['error'],
+                'retry_in': round(max(0.0, negative['retry_at'] - time.time()), 1),
+                'retry_at': datetime.fromtimestamp(negative['retry_at']).isoformat()
+            }
+
+    def invalidate(self, stock_code: Optional[str] = None):
+        """캐시 무효화 (종목코드 생략 시 전체, 백오프 기록 포함)"""
+        with self._lock:
+            if stock_code is None:
+                self.entries.clear()
+                self.negative.clear()
+            else:
+                self.entries.pop(stock_code, None)
+                self.negative.pop(stock_code, None)
+
+    def get_stats(self) -> Dict:
+        """캐시 적중률 및 상태 통계"""
+        with self._lock:
+            counters = dict(self.counters)
+            cached = len(self.entries)
+            in_flight = len(self.in_flight)
+            backed_off = sorted(self.negative.keys())
+
+        served_from_cache = counters['hits'] + counters['stale_hits'] + counters['coalesced']
+        requests = counters['requests']
+
+        return {
+            **counters,
+            'hit_rate': round(served_from_cache / requests, 4) if requests else 0.0,
+            'fresh_hit_rate': round(counters['hits'] / requests, 4) if requests else 0.0,
+            'cached_stocks': cached,
+            'in_flight': in_flight,
+            'backed_off_stocks': backed_off,
+            'ttl_seconds': self.current_ttl(),
+            'market_hours': self.is_market_hours()
+        }
@@ -0,0 +1,193 @@
+"""
+장중 세션 집계 모듈
+틱마다 O(1)로 종목별 시가/고가/저가/현재가/VWAP/틱 수를 갱신하고,
+등락률 상/하위 종목은 지연 삭제 힙으로 증분 유지
+"""
+import heapq
+import threading
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from .logger_utils import get_logger
+
+logger = get_logger('stock')
+
+
+class SessionAggregate:
+    """단일 종목 당일 세션 집계"""
+
+    __slots__ = ('open', 'high', 'low', 'last', 'change_percent', 'ticks',
+                 'first_ts', 'last_ts', 'high_ts', 'low_ts',
+                 'last_volume', 'volume', 'turnover')
+
+    def __init__(self, timestamp: float, price: float, volume: Optional[float], change_percent: float):
+        self.open = self.high = self.low = self.last = price
+        self.change_percent = change_percent
+        self.ticks = 1
+        self.first_ts = self.last_ts = self.high_ts = self.low_ts = timestamp
+        self.last_volume = volume      # 제공자 누적 거래량 (직전 틱)
+        self.volume = 0.0              # 집계 시작 이후 거래량
+        self.turnover = 0.0            # sum(가격 x 거래량 증분)
+
+    def update(self, timestamp: float, price: float, volume: Optional[float], change_percent: float):
+        """틱 반영 (O(1))"""
+        if price > self.high:
+            self.high, self.high_ts = price, timestamp
+        if price < self.low:
+            self.low, self.low_ts = price, timestamp
+        self.last = price
+        self.last_ts = timestamp
+        self.change_percent = change_percent
+        self.ticks += 1
+
+        # 누적 거래량 증분으로 VWAP 계산 (증분은 현재 틱 가격으로 체결된 것으로 근사)
+        if volume is not None:
+            if self.last_volume is not None and volume > self.last_volume:
+                delta = volume - self.last_volume
+                self.volume += delta
+                self.turnover += price * delta
+            self.last_volume = volume
+
+    @property
+    def vwap(self) -> Optional[float]:
+        return self.turnover / self.volume if self.volume else None
+
+    def to_dict(self) -> Dict:
+        vwap = self.vwap
+        return {
+            'open': self.open,
+            'high': self.high,
+            'low': self.low,
+            'last': self.last,
+            'change_percent': self.change_percent,
+            'vwap': round(vwap, 2) if vwap is not None else None,
+            'last_vs_vwap_percent': round((self.last - vwap) / vwap * 100, 3) if vwap else None,
+            'range_percent': round((self.high - self.low) / self.low * 100, 3) if self.low else 0.0,
+            'volume': self.volume,
+            'ticks': self.ticks,
+            'first_at': datetime.fromtimestamp(self.first_ts).isoformat(),
+            'last_at': datetime.fromtimestamp(self.last_ts).isoformat(),
+            'high_at': datetime.fromtimestamp(self.high_ts).isoformat(),
+            'low_at': datetime.fromtimestamp(self.low_ts).isoformat()
+        }
+
+
+class TopMovers:
+    """
+    등락률 상/하위 종목 (지연 삭제 힙)
+
+    값이 바뀔 때마다 두 힙에 새 항목을 넣고 종목별 버전을 올린다.
+    top()은 버전이 맞지 않는 항목을 버리며 k개를 꺼낸 뒤 유효 항목만 되돌려 넣는다.
+    오래된 항목이 쌓이면 현재 값으로 힙을 다시 만든다.
+    """
+
+    def __init__(self):
+        self.values: Dict[str, float] = {}
+        self._versions: Dict[str, int] = {}
+        self._gainers: List[Tuple[float, int, str]] = []   # (-등락률, 버전, 종목)
+        self._losers: List[Tuple[float, int, str]] = []    # (등락률, 버전, 종목)
+
+    def update(self, stock_code: str, value: float):
+        if self.values.get(stock_code) == value:
+            return
+        version = self._versions.get(stock_code, 0) + 1
+        self._versions[stock_code] = version
+        self.values[stock_code] = value
+        heapq.heappush(self._gainers, (-value, version, stock_code))
+        heapq.heappush(self._losers, (value, version, stock_code))
+        if len(self._gainers) > 4 * len(self.values) + 64:
+            self._rebuild()
+
+    def remove(self, stock_code: str):
+        self.values.pop(stock_code, None)
+        self._versions.pop(stock_code, None)
+
+    def clear(self):
+        self.values.clear()
+        self._versions.clear()
+        self._gainers = []
+        self._losers = []
+
+    def _rebuild(self):
+        self._gainers = [(-value, self._versions[code], code) for code, value in self.values.items()]
+        self._losers = [(value, self._versions[code], code) for code, value in self.values.items()]
+        heapq.heapify(self._gainers)
+        heapq.heapify(self._losers)
+
+    def _top(self, heap: List[Tuple[float, int, str]], k: int) -> List[Tuple[float, int, str]]:
+        taken = []
+        while heap and len(taken) < k:
+            entry = heapq.heappop(heap)
+            if self._versions.get(entry[2]) == entry[1]:
+                taken.append(entry)
+        for entry in taken:
+            heapq.heappush(heap, entry)
+        return taken
+
+    def top_gainers(self, k: int) -> List[Tuple[str, float]]:
+        return [(code, -key) for key, _, code in self._top(self._gainers, k) if -key > 0]
+
+    def top_losers(self, k: int) -> List[Tuple[str, float]]:
+        return [(code, key) for key, _, code in self._top(self._losers, k) if key < 0]
+
+
+class SessionStats:
+    """종목별 당일 세션 집계 + 상/하위 등락 종목 (거래일이 바뀌면 초기화)"""
+
+    def __init__(self):
+        self.trading_date: Optional[date] = None
+        self.aggregates: Dict[str, SessionAggregate] = {}
+        self.movers = TopMovers()
+        self._lock = threading.Lock()
+
+    def update(self, stock_code: str, timestamp: float, price: float,
+               volume: Optional[float] = None, change_percent: float = 0.0):
+        """틱 반영 (O(1) 집계 + O(log n) 힙 갱신)"""
+        trading_date = datetime.fromtimestamp(timestamp).date()
+        with self._lock:
+            if trading_date != self.trading_date:
+                if self.trading_date is not None and trading_date < self.trading_date:
+                    return  # 지난 거래일 틱은 무시
+                self.trading_date = trading_date
+                self.aggregates = {}
+                self.movers.clear()
+
+            aggregate = self.aggregates.get(stock_code)
+            if aggregate is None:
+                self.aggregates[stock_code] = SessionAggregate(timestamp, price, volume, change_percent)
+            else:
+                aggregate.update(timestamp, price, volume, change_percent)
+            self.movers.update(stock_code, change_percent)
+
+    def remove(self, stock_code: str):
+        with self._lock:
+            self.aggregates.pop(stock_code, None)
+            self.movers.remove(stock_code)
+
+    def get(self, stock_code: str) -> Optional[Dict]:
+        with self._lock:
+            aggregate = self.aggregates.get(stock_code)
+            return aggregate.to_dict() if aggregate else None
+
+    def get_all(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {code: aggregate.to_dict() for code, aggregate in self.aggregates.items()}
+
+    def top_movers(self, k: int = 10) -> Dict[str, List[Dict]]:
+        """등락률 상/하위 k개 (세션 집계 포함)"""
+        with self._lock:
+            def rows(items):
+                return [{'stock_code': code, 'change_percent': value, **self.aggregates[code].to_dict()}
+                        for code, value in items if code in self.aggregates]
+            return {
+                'gainers': rows(self.movers.top_gainers(k)),
+                'losers': rows(self.movers.top_losers(k))
+            }
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'trading_date': self.trading_date.isoformat() if self.trading_date else None,
+                'stocks': len(self.aggregates),
+                'ticks': sum(aggregate.ticks for aggregate in self.aggregates.values())
+            }
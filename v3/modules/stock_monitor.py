@@ -8,8 +8,9 @@ import os
 import requests
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from filelock import FileLock
 from bs4 import BeautifulSoup
 import re
@@ -27,7 +28,45 @@ from .config import (
     DEFAULT_STOCK_CATEGORY,
     DEFAULT_ALERT_SETTINGS,
     MIGRATION_VERSION,
-    BACKUP_ENABLED
+    BACKUP_ENABLED,
+    POLL_CYCLE_SECONDS,
+    POLL_VOLATILITY_POINTS,
+    PRICE_FETCH_CONCURRENCY,
+    PRICE_FETCH_MAX_CONCURRENCY,
+    CYCLE_LOW_WATERMARK,
+    SCANNER_ENABLED,
+    SCANNER_INTERVAL_SECONDS,
+    SCANNER_BACKFILL_STOP_MINUTES,
+    SCANNER_FINAL_SNAPSHOT_TIME,
+    INDICATOR_WARMUP_INTERVAL_SECONDS,
+    INDICATOR_WARMUP_BATCH
+)
+from .price_providers import PriceProvider, ProviderRegistry
+from .quote_cache import QuoteCache
+from .ticker_master import ticker_master, STATUS_DELISTED
+from .price_series import PriceSeriesStore
+from .tick_archive import TickArchive
+from .price_ladder import LadderIndex, LADDER_BOTH
+from .poll_scheduler import PollScheduler, SHED_ORDER
+from .cycle_control import CycleController
+from .stock_store import StockStore
+from .alert_journal import AlertJournal
+from .alert_history import AlertHistoryStore
+from .alert_state import AlertStateStore, SYSTEM_KEY
+from .session_stats import SessionStats
+from .portfolio import PortfolioEngine
+from .mezzanine import MezzanineEngine, parse_terms
+from .indicators import IndicatorEngine
+from .alert_expr import ExpressionEngine, make_rule
+from .market_index import MarketIndexTracker
+from .market_scanner import MarketScanner, SCREEN_LABELS, SCREEN_MOVE, SCREEN_VOLUME, SCREEN_HIGH_52W, SCREEN_LOW_52W
+from .backtest import bar_cache
+from .monitor_scheduler import monitor_scheduler
+from .alert_engine import (
+    AlertEngine,
+    RULE_PARITY, RULE_REFIX, RULE_TARGET, RULE_STOP, RULE_LEVEL, RULE_SURGE, RULE_DROP, RULE_LADDER,
+    RULE_MA_CROSS, RULE_VOLUME_SPIKE, RULE_GAP, RULE_EXPR,
+    DIRECTION_UP
 )
 from .email_utils import (
     send_stock_alert, 
@@ -43,6 +82,24 @@ try:
 except ImportError:
     PYKRX_AVAILABLE = False
 
+# 종목별 거래 상태
+TRADING_STATUS_NORMAL = 'normal'      # 정상 거래
+TRADING_STATUS_HALTED = 'halted'      # 거래정지 (시세는 마지막 종가)
+TRADING_STATUS_NO_DATA = 'no_data'    # 데이터 없음 (백오프 중)
+TRADING_STATUS_DELISTED = 'delisted'  # 상장폐지 (종목 마스터 기준)
+TRADING_STATUS_UNKNOWN = 'unknown'    # 제공자 장애 등으로 확인 불가
+
+# 통합 모니터링 스케줄러 작업 이름 (같은 'stock' 그룹으로 순차 실행,
+# 과거 데이터를 느리게 조회하는 작업과 전체 시장 스캔은 주가 갱신을 막지 않도록 별도 그룹에서 실행)
+JOB_STOCK_PRICES = 'stock_prices'            # 주가 갱신
+JOB_STOCK_MAINTENANCE = 'stock_maintenance'  # 일일 보고서/틱 압축
+JOB_STOCK_SAVE = 'stock_save'                # 메타데이터 포함 정기 저장
+JOB_MARKET_SCAN = 'market_scan'              # 관심 종목 외 전체 시장 스캔
+JOB_INDICATOR_WARMUP = 'indicator_warmup'    # 지표 워밍업용 과거 일봉 조회
+JOB_INDEX_BETA = 'index_beta'                # 시장 지수 베타 추정 (장외 일 1회)
+STOCK_JOBS = (JOB_STOCK_PRICES, JOB_STOCK_MAINTENANCE, JOB_STOCK_SAVE, JOB_MARKET_SCAN, JOB_INDICATOR_WARMUP,
+              JOB_INDEX_BETA)
+
 # 개선된 로깅 시스템 적용
 from .logger_utils import get_logger, performance_monitor, log_exception
 
@@ -56,26 +113,126 @@ class StockMonitor:
         self.monitoring_stocks_file = MONITORING_STOCKS_FILE
         self.lock_file = self.monitoring_stocks_file + '.lock'
         
-        # 일일 내역 파일 경로
-        self.daily_history_file = os.path.join(os.path.dirname(MONITORING_STOCKS_FILE), 'daily_history.json')
-        self.daily_history_lock_file = self.daily_history_file + '.lock'
-        
         # 데이터 디렉토리 생성
         os.makedirs(os.path.dirname(self.monitoring_stocks_file), exist_ok=True)
         
+        # 종목 저장소 (변경 종목만 지연 병합 기록, 원자적 파일 교체)
+        self.stock_store = StockStore(self.monitoring_stocks_file)
+        
         # 초기 데이터 로드
         self.monitoring_stocks = self.load_monitoring_stocks()
         
+        # 주가 제공자 레지스트리 (등록 순서 = 우선순위)
+        self.price_registry = ProviderRegistry()
+        self.price_registry.register(PriceProvider('pykrx', self._fetch_quote_pykrx, available=PYKRX_AVAILABLE))
+        self.price_registry.register(PriceProvider('naver', self._fetch_quote_naver))
+        
+        # 종목별 시세 캐시 (API/모니터링 공용, 진행 중 조회 단일화)
+        self.quote_cache = QuoteCache(self.price_registry.fetch_with_status)
+        
+        # 종목별 장중 시계열 (모니터링 틱마다 추가)
+        self.price_series = PriceSeriesStore()
+        
+        # 거래일별 틱 아카이브 (장 마감 후 컬럼형 압축)
+        self.tick_archive = TickArchive()
+        
+        # 장중 세션 집계 (시/고/저/VWAP, 등락률 상/하위 힙)
+        self.session_stats = SessionStats()
+        
+        # 보유 포지션 손익/노출 (가격 갱신마다 벡터 재계산)
+        self.portfolio = PortfolioEngine()
+        
+        # 메자닌 전환 엔진 (유효 전환가/패리티 일괄 계산, 리픽싱 일정)
+        self.mezzanine = MezzanineEngine()
+        
+        # 기술적 지표 (이동평균/거래량 통계/전일 종가, 틱마다 O(1) 갱신, 정기 작업에서 1회 워밍업)
+        self.indicators = IndicatorEngine()
+        
+        # 거래일별 일일 알림 저널 (추가 전용 JSONL, 일자 파일 단위 보관)
+        self.alert_journal = AlertJournal()
+        
+        # 알림 이력 저장소 (SQLite 인덱스 조회, 보관 기간 설정 가능)
+        self.alert_history = AlertHistoryStore()
+        if self.alert_history.is_empty():
+            self._import_journal_history()
+        self.last_history_prune_date = None
+        
+        # 당일 알림 발송 상태 (재시작 후 중복 발송 방지, 거래일 전환 시 만료)
+        self.alert_state = AlertStateStore()
+        
+        # 종목별 가격 래더 정렬 인덱스 (API로 레벨 추가/삭제)
+        self.ladder_index = LadderIndex()
+        self.ladder_index.load(self.monitoring_stocks)
+        
+        # 벡터화 알림 엔진 (종목 설정 변경 시에만 임계값 테이블 재구성)
+        self.alert_engine = AlertEngine(ladders=self.ladder_index)
+        self.alert_engine.sync(self.monitoring_stocks)
+        
+        # 종목별 조건식 알림 (저장 시 컴파일, 매 주기 전체 종목 평가, 규칙별 소요 시간 집계)
+        self.expressions = ExpressionEngine()
+        self.expressions.sync(self.monitoring_stocks)
+        
+        # 전체 시장 스캐너 (시장당 1회 일괄 스냅샷, 벡터 스크린, 장외 기준값 스냅샷 채우기)
+        self.market_scanner = MarketScanner()
+        
+        # 실시간 폴링 우선순위 스케줄러 (알림 레벨 근접도/변동성 기반, 사이클당 요청 예산)
+        self.poll_scheduler = PollScheduler()
+        
+        # 종목 마스터 (종목명/유효성 메모리 조회, 일일 갱신)
+        self.ticker_master = ticker_master
+        self.ticker_master.ensure_fresh()
+        
+        # KOSPI/KOSDAQ 지수 (가격 주기당 1회 조회, 지수 대비 초과 등락률 판정, 야간 베타 추정)
+        self.market_index = MarketIndexTracker(self.ticker_master)
+        
         # 실시간 모니터링 관련 변수
-        self.is_monitoring = False
-        self.monitoring_thread = None
-        self.monitor_interval = 10  # 10초 간격
+        self.monitor_interval = POLL_CYCLE_SECONDS  # 사이클 간격 (종목별 조회 주기는 폴링 스케줄러가 결정)
         self.last_daily_report_date = None
         
         # 주기적 데이터 저장 관련 변수
         self.last_save_time = datetime.now()
         self.save_interval = 60  # 60초 간격으로 데이터 저장
         self.save_counter = 0
+        
+        # 장중 주가 갱신 사이클 초과 감지 (초과 시 조회 동시성 상향 → 원거리/주의 구간 감축)
+        self.price_cycle = CycleController(
+            'stock_prices', self.monitor_interval,
+            concurrency=PRICE_FETCH_CONCURRENCY,
+            min_concurrency=1,
+            max_concurrency=PRICE_FETCH_MAX_CONCURRENCY,
+            max_shed_level=len(SHED_ORDER),
+            low_watermark=CYCLE_LOW_WATERMARK
+        )
+        
+        # 알림 발송 리스너 (앱 알림 히스토리 등)
+        self.alert_listeners: List[Callable[[Dict, Dict], None]] = []
+        
+        # 통합 모니터링 스케줄러 작업 (모니터링 시작 전까지 비활성)
+        self.closed_refresh_key = None
+        self._force_price_refresh = False
+        self.scheduler = monitor_scheduler
+        self.scheduler.register(JOB_STOCK_PRICES, self._price_job, self.monitor_interval, group='stock',
+                                enabled=False, description='주가 갱신 (장중 폴링 스케줄, 장외 세션당 1회 전체 갱신)')
+        self.scheduler.register(JOB_STOCK_MAINTENANCE, self._maintenance_job, 30, group='stock',
+                                enabled=False, description='장 마감 일일 보고서, 장외 틱 압축')
+        self.scheduler.register(JOB_STOCK_SAVE, self._save_job, self.save_interval, group='stock',
+                                enabled=False, description='모니터링 종목 미기록 변경 정기 기록')
+        self.scheduler.register(JOB_MARKET_SCAN, self._scan_job, SCANNER_INTERVAL_SECONDS,
+                                enabled=False, description='전체 시장 스캔 (장중 스크린 알림, 장외 기준값 스냅샷 채우기)')
+        self.scheduler.register(JOB_INDICATOR_WARMUP, self._warm_up_indicators, INDICATOR_WARMUP_INTERVAL_SECONDS,
+                                group='stock_history', enabled=False,
+                                description=f'지표 워밍업 (과거 일봉 조회, 회당 최대 {INDICATOR_WARMUP_BATCH}종목)')
+        self.scheduler.register(JOB_INDEX_BETA, self._estimate_index_betas, 300, group='stock_history',
+                                enabled=False, description='장외 일 1회 시장 지수 베타 추정 (과거 일봉 조회)')
+    
+    @property
+    def is_monitoring(self) -> bool:
+        """실시간 모니터링 실행 여부 (스케줄러 주가 갱신 작업 활성 상태)"""
+        return self.scheduler.is_job_active(JOB_STOCK_PRICES)
+    
+    def add_alert_listener(self, listener: Callable[[Dict, Dict], None]):
+        """알림 발송 리스너 등록 (listener(hit, stock_info))"""
+        self.alert_listeners.append(listener)
     
     def calculate_return_rate(self, current_price: float, acquisition_price: float) -> float:
         """
@@ -170,7 +327,7 @@ class StockMonitor:
             stock_info['stop_loss'] = new_stop_loss
             
             # 변경사항 저장
-            self.save_monitoring_stocks(self.monitoring_stocks)
+            self.save_monitoring_stocks(codes=[stock_code])
             
             stock_name = stock_info.get('name', stock_code)
             logger.info(f"손절가 설정 적용: {stock_name} ({stock_code}) - {new_stop_loss:,.0f}원")
@@ -226,18 +383,10 @@ class StockMonitor:
             logger.debug(f"시장 시간 외로 인한 알림 제한: {stock_code}_{alert_type}")
             return False
             
-        # 2. 당일 중복 알림 체크
-        today = datetime.now().date()
-        alert_key = f"{stock_code}_{alert_type}_{today}"
-        
-        # 당일 발송된 알림 목록에서 확인
-        if hasattr(self, 'sent_alerts_today'):
-            if alert_key in self.sent_alerts_today:
-                logger.debug(f"당일 중복 알림 방지: {alert_key}")
-                return False
-        else:
-            # 당일 알림 추적 세트 초기화
-            self.sent_alerts_today = set()
+        # 2. 당일 중복 알림 체크 (발송 상태 저장소)
+        if self.alert_state.was_sent(stock_code, alert_type):
+            logger.debug(f"당일 중복 알림 방지: {stock_code}_{alert_type}")
+            return False
             
         return True
     
@@ -249,57 +398,49 @@ class StockMonitor:
             stock_code (str): 종목 코드
             alert_type (str): 알림 유형
         """
-        today = datetime.now().date()
-        alert_key = f"{stock_code}_{alert_type}_{today}"
-        
-        if not hasattr(self, 'sent_alerts_today'):
-            self.sent_alerts_today = set()
-            
-        self.sent_alerts_today.add(alert_key)
-        logger.info(f"알림 발송 마킹: {alert_key}")
+        self.alert_state.mark_sent(stock_code, alert_type)
+        logger.info(f"알림 발송 마킹: {stock_code}_{alert_type}")
     
     def reset_daily_alerts_if_needed(self):
         """
-        새로운 날이 시작되면 당일 알림 목록 초기화
+        새로운 거래일이 시작되면 지난 발송 상태 만료 (조회/기록 시에도 자동 처리)
         """
-        today = datetime.now().date()
-        
-        if not hasattr(self, 'last_alert_reset_date'):
-            self.last_alert_reset_date = today
-            self.sent_alerts_today = set()
-        elif self.last_alert_reset_date != today:
-            logger.info(f"새로운 날이 시작: {today}, 당일 알림 목록 초기화") 
-            self.sent_alerts_today = set()
-            self.last_alert_reset_date = today
+        self.alert_state.roll()
     
     def load_monitoring_stocks(self) -> Dict:
-        """모니터링 주식 데이터 로드 (확장된 스키마 지원)"""
+        """모니터링 주식 데이터 로드 (확장된 스키마 지원, 로드한 데이터를 저장소에 연결)"""
         try:
-            if os.path.exists(self.monitoring_stocks_file):
-                with FileLock(self.lock_file):
-                    with open(self.monitoring_stocks_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        
-                        # 데이터 마이그레이션 및 검증
-                        migrated_data = self._migrate_stock_data(data)
-                        
-                        # triggered_alerts를 set으로 변환
-                        for code, info in migrated_data.items():
-                            if "triggered_alerts" in info and isinstance(info["triggered_alerts"], list):
-                                info["triggered_alerts"] = set(info["triggered_alerts"])
-                        
-                        logger.info(f"모니터링 주식 데이터 로드: {len(migrated_data)}개 종목")
-                        return migrated_data
+            data, canonical = self.stock_store.load()
+            if data is not None:
+                # 데이터 마이그레이션 및 검증
+                migrated_data = self._migrate_stock_data(data)
+                
+                # triggered_alerts를 set으로 변환
+                for code, info in migrated_data.items():
+                    if "triggered_alerts" in info and isinstance(info["triggered_alerts"], list):
+                        info["triggered_alerts"] = set(info["triggered_alerts"])
+                
+                self.stock_store.attach(migrated_data)
+                if not canonical:
+                    # 이전 메타데이터 포함 형식은 표준 형식으로 다시 기록
+                    logger.info("모니터링 주식 파일을 표준 형식으로 변환")
+                    self.stock_store.mark_dirty()
+                
+                logger.info(f"모니터링 주식 데이터 로드: {len(migrated_data)}개 종목")
+                return migrated_data
             else:
                 # 기본 데이터로 초기화
                 logger.info("모니터링 주식 파일이 없어 기본 데이터로 초기화")
                 default_data = self._create_default_stocks_data()
-                self.save_monitoring_stocks(default_data)
+                self.stock_store.write_all(default_data)
+                self.stock_store.attach(default_data)
                 return default_data
                 
         except Exception as e:
             logger.error(f"모니터링 주식 데이터 로드 실패: {e}")
-            return {}
+            data = {}
+            self.stock_store.attach(data)
+            return data
     
     def _migrate_stock_data(self, data: Dict) -> Dict:
         """기존 데이터를 새 스키마로 마이그레이션"""
@@ -342,6 +483,10 @@ class StockMonitor:
         # 새로운 필드들 (기본값 설정)
         migrated_info['category'] = self._validate_category(info.get('category', DEFAULT_STOCK_CATEGORY))
         migrated_info['acquisition_price'] = float(info.get('acquisition_price', 0))
+        migrated_info['quantity'] = float(info.get('quantity', 0))
+        migrated_info['conversion_price'] = float(info.get('conversion_price', 0))
+        if info.get('mezzanine'):
+            migrated_info['mezzanine'] = info['mezzanine']
         migrated_info['alert_settings'] = self._validate_alert_settings(info.get('alert_settings', {}))
         migrated_info['memo'] = str(info.get('memo', ''))
         
@@ -351,6 +496,8 @@ class StockMonitor:
         migrated_info['last_updated'] = info.get('last_updated')
         migrated_info['triggered_alerts'] = info.get('triggered_alerts', [])
         migrated_info['alert_prices'] = info.get('alert_prices', [])
+        migrated_info['ladder_levels'] = info.get('ladder_levels', [])
+        migrated_info['alert_expressions'] = info.get('alert_expressions', [])
         migrated_info['error'] = info.get('error')
         
         # 추가 필드들
@@ -360,6 +507,10 @@ class StockMonitor:
     
     def _validate_category(self, category: str) -> str:
         """카테고리 유효성 검증"""
+        # 메자닌 (한글 명칭 또는 키)
+        if category in ('메자닌', 'mezzanine'):
+            return '메자닌'
+        
         if category in STOCK_CATEGORIES:
             return category
         
@@ -409,6 +560,7 @@ class StockMonitor:
                 'enabled': bool(stock['enabled']),
                 'category': DEFAULT_STOCK_CATEGORY,
                 'acquisition_price': 0.0,
+                'quantity': 0.0,
                 'alert_settings': DEFAULT_ALERT_SETTINGS.copy(),
                 'memo': '',
                 'current_price': 0.0,
@@ -416,6 +568,8 @@ class StockMonitor:
                 'last_updated': None,
                 'triggered_alerts': set(),
                 'alert_prices': [],
+                'ladder_levels': [],
+                'alert_expressions': [],
                 'error': None,
                 'daily_alert_enabled': True
             }
@@ -433,57 +587,90 @@ class StockMonitor:
         except Exception as e:
             logger.error(f"백업 생성 실패: {e}")
     
-    def save_monitoring_stocks(self, data: Dict):
-        """모니터링 주식 데이터 저장"""
-        try:
-            # set을 list로 변환하여 JSON 직렬화 가능하게 만듦
-            serializable_data = {}
-            for code, info in data.items():
-                serializable_info = info.copy()
-                if 'triggered_alerts' in serializable_info and isinstance(serializable_info['triggered_alerts'], set):
-                    serializable_info['triggered_alerts'] = list(serializable_info['triggered_alerts'])
-                serializable_data[code] = serializable_info
-            
-            with FileLock(self.lock_file):
-                with open(self.monitoring_stocks_file, 'w', encoding='utf-8') as f:
-                    json.dump(serializable_data, f, ensure_ascii=False, indent=2)
-                    
-            logger.debug(f"모니터링 주식 데이터 저장: {len(data)}개 종목")
-            
-        except Exception as e:
-            logger.error(f"모니터링 주식 데이터 저장 실패: {e}")
+    def save_monitoring_stocks(self, data: Optional[Dict] = None, codes: Optional[Iterable[str]] = None):
+        """
+        모니터링 주식 데이터 저장 예약 (변경 종목만 지연 병합 기록)
+        
+        Args:
+            data: 이전 호출 호환용 (항상 self.monitoring_stocks 기준으로 기록)
+            codes: 변경된 종목코드 (생략 시 전체 종목)
+        """
+        if data is not None and data is not self.monitoring_stocks:
+            logger.warning("연결되지 않은 종목 데이터 저장 요청 - 전체 즉시 기록")
+            self.stock_store.write_all(data)
+            return
+        self.stock_store.mark_dirty(codes)
     
-    def save_monitoring_stocks_with_metadata(self, data: Dict):
-        """메타데이터를 포함한 모니터링 주식 데이터 저장"""
-        try:
-            # set을 list로 변환하여 JSON 직렬화 가능하게 만듦
-            serializable_data = {}
-            for code, info in data.items():
-                serializable_info = info.copy()
-                if 'triggered_alerts' in serializable_info and isinstance(serializable_info['triggered_alerts'], set):
-                    serializable_info['triggered_alerts'] = list(serializable_info['triggered_alerts'])
-                serializable_data[code] = serializable_info
-            
-            # 메타데이터 추가
-            output_data = {
-                '_metadata': {
-                    'last_updated': datetime.now().isoformat(),
-                    'update_count': getattr(self, 'save_counter', 0),
-                    'total_stocks': len(data),
-                    'enabled_stocks': len([code for code, info in data.items() if info.get('enabled', True)]),
-                    'data_version': '1.0'
-                },
-                'stocks': serializable_data
-            }
-            
-            with FileLock(self.lock_file):
-                with open(self.monitoring_stocks_file, 'w', encoding='utf-8') as f:
-                    json.dump(output_data, f, ensure_ascii=False, indent=2)
-                    
-            logger.debug(f"메타데이터 포함 모니터링 주식 데이터 저장: {len(data)}개 종목")
-            
-        except Exception as e:
-            logger.error(f"메타데이터 포함 모니터링 주식 데이터 저장 실패: {e}")
+    def flush_monitoring_stocks(self) -> int:
+        """미기록 변경 즉시 기록 (기록한 종목 수 반환)"""
+        return self.stock_store.flush()
+    
+    def _fetch_quote_pykrx(self, stock_code: str) -> Optional[Dict]:
+        """PyKrx 시세 조회 (제공자 레지스트리용, 장애 시 예외 발생)"""
+        today = datetime.now()
+        start_date = (today - timedelta(days=10)).strftime("%Y%m%d")
+        end_date = today.strftime("%Y%m%d")
+        
+        # 최근 10일 구간을 한 번에 조회하여 마지막 거래일 데이터 사용
+        df = stock.get_market_ohlcv_by_date(start_date, end_date, stock_code)
+        
+        if df is None or df.empty:
+            logger.warning(f"PyKrx: 최근 10일간 {stock_code}의 거래 데이터를 찾을 수 없음")
+            return None
+        
+        row = df.iloc[-1]
+        current_price = int(row['종가'])
+        change_percent = float(row['등락률']) if '등락률' in df.columns else 0.0
+        volume = int(row['거래량']) if '거래량' in df.columns else None
+        open_price = int(row['시가']) if '시가' in df.columns else None
+        
+        # 거래정지 종목은 시가/거래량이 0으로 내려옴
+        halted = volume == 0 and '시가' in df.columns and int(row['시가']) == 0
+        
+        logger.debug(f"PyKrx 조회 성공: {stock_code} - {current_price}원 ({change_percent:+.2f}%)")
+        return {
+            'price': current_price,
+            'change_percent': change_percent,
+            'volume': volume,
+            'open': open_price,
+            'trading_status': TRADING_STATUS_HALTED if halted else TRADING_STATUS_NORMAL
+        }
+    
+    def _fetch_quote_naver(self, stock_code: str) -> Optional[Dict]:
+        """네이버 금융 시세 조회 (제공자 레지스트리용, 장애 시 예외 발생)"""
+        url = f"https://finance.naver.com/item/main.naver?code={stock_code}"
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        }
+        
+        response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        response.encoding = 'euc-kr'
+        response.raise_for_status()
+        
+        soup = BeautifulSoup(response.text, 'html.parser')
+        
+        # 현재가 추출
+        price_element = soup.select_one('p.no_today .blind')
+        if not price_element:
+            return None
+        
+        current_price = int(price_element.text.replace(',', ''))
+        
+        # 등락률 추출
+        change_element = soup.select_one('p.no_exday .blind')
+        change_percent = 0.0
+        if change_element:
+            change_text = change_element.text.strip()
+            change_match = re.search(r'([-+]?\d+\.?\d*)%', change_text)
+            if change_match:
+                change_percent = float(change_match.group(1))
+        
+        logger.debug(f"네이버 크롤링 성공: {stock_code} - {current_price}원 ({change_percent:+.2f}%)")
+        return {
+            'price': current_price,
+            'change_percent': change_percent,
+            'volume': None
+        }
     
     def get_stock_price_pykrx(self, stock_code: str) -> Tuple[Optional[int], float, Optional[str]]:
         """PyKrx를 사용한 주가 정보 조회"""
@@ -491,27 +678,10 @@ class StockMonitor:
             return None, 0.0, "PyKrx 라이브러리가 설치되지 않았습니다"
         
         try:
-            today = datetime.now()
-            
-            # 최근 10일간 거래 데이터 찾기
-            for i in range(10):
-                date_str = (today - timedelta(days=i)).strftime("%Y%m%d")
-                try:
-                    df = stock.get_market_ohlcv_by_date(date_str, date_str, stock_code)
-                    
-                    if df is not None and not df.empty:
-                        current_price = int(df.iloc[0]['종가'])
-                        change_percent = float(df.iloc[0]['등락률']) if '등락률' in df.columns else 0.0
-                        
-                        logger.debug(f"PyKrx 조회 성공: {stock_code} - {current_price}원 ({change_percent:+.2f}%)")
-                        return current_price, change_percent, None
-                        
-                except Exception as e:
-                    logger.debug(f"PyKrx 조회 실패: {stock_code}, {date_str} - {e}")
-                    continue
-            
-            logger.warning(f"PyKrx: 최근 10일간 {stock_code}의 거래 데이터를 찾을 수 없음")
-            return None, 0.0, "거래 데이터를 찾을 수 없습니다"
+            quote = self._fetch_quote_pykrx(stock_code)
+            if quote is None:
+                return None, 0.0, "거래 데이터를 찾을 수 없습니다"
+            return quote['price'], quote['change_percent'], None
             
         except Exception as e:
             logger.error(f"PyKrx 사용 중 오류: {e}")
@@ -520,58 +690,98 @@ class StockMonitor:
     def get_stock_price_naver(self, stock_code: str) -> Tuple[Optional[int], float, Optional[str]]:
         """네이버 금융 크롤링을 통한 주가 정보 조회"""
         try:
-            url = f"https://finance.naver.com/item/main.naver?code={stock_code}"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-            response.encoding = 'euc-kr'
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # 현재가 추출
-                price_element = soup.select_one('p.no_today .blind')
-                if price_element:
-                    current_price = int(price_element.text.replace(',', ''))
-                    
-                    # 등락률 추출
-                    change_element = soup.select_one('p.no_exday .blind')
-                    change_percent = 0.0
-                    if change_element:
-                        change_text = change_element.text.strip()
-                        change_match = re.search(r'([-+]?\d+\.?\d*)%', change_text)
-                        if change_match:
-                            change_percent = float(change_match.group(1))
-                    
-                    logger.debug(f"네이버 크롤링 성공: {stock_code} - {current_price}원 ({change_percent:+.2f}%)")
-                    return current_price, change_percent, None
-            
-            return None, 0.0, "네이버 금융에서 데이터를 찾을 수 없습니다"
+            quote = self._fetch_quote_naver(stock_code)
+            if quote is None:
+                return None, 0.0, "네이버 금융에서 데이터를 찾을 수 없습니다"
+            return quote['price'], quote['change_percent'], None
             
         except Exception as e:
             logger.error(f"네이버 크롤링 오류: {e}")
             return None, 0.0, f"크롤링 오류: {e}"
     
-    def get_stock_price(self, stock_code: str) -> Tuple[Optional[int], float, Optional[str]]:
-        """통합 주가 정보 조회 (PyKrx 우선, 실패 시 네이버 크롤링)"""
-        # PyKrx 시도
-        if PYKRX_AVAILABLE:
-            current_price, change_percent, error = self.get_stock_price_pykrx(stock_code)
-            if current_price is not None:
-                return current_price, change_percent, None
-            logger.debug(f"PyKrx 실패, 네이버 크롤링으로 시도: {stock_code}")
+    def get_stock_quote(self, stock_code: str, force: bool = False) -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        시세 캐시를 거친 시세 조회 (미스 시 제공자 레지스트리 라우팅)
         
-        # 네이버 크롤링 시도
-        current_price, change_percent, error = self.get_stock_price_naver(stock_code)
-        if current_price is not None:
-            return current_price, change_percent, None
+        Args:
+            stock_code (str): 종목 코드
+            force (bool): TTL을 무시하고 새로 조회 (진행 중 조회가 있으면 그 결과를 공유)
+        """
+        return self.quote_cache.get(stock_code, force=force)
+    
+    def get_stock_price(self, stock_code: str, force: bool = False) -> Tuple[Optional[int], float, Optional[str]]:
+        """통합 주가 정보 조회 (시세 캐시 + 제공자 레지스트리 라우팅)"""
+        quote, error = self.get_stock_quote(stock_code, force=force)
+        if quote is not None:
+            return quote['price'], quote['change_percent'], None
         
         return None, 0.0, error or "주가 정보를 가져올 수 없습니다"
     
+    def get_provider_stats(self, recent: int = 20) -> Dict:
+        """주가 제공자별 통계 및 라우팅 결정 조회"""
+        return self.price_registry.get_stats(recent)
+    
+    def get_tick_history(self, stock_code: str, start_date, end_date=None, step: int = 1) -> Dict:
+        """틱 아카이브 기간 시계열 조회 (차트용)"""
+        return self.tick_archive.get_series(stock_code, start_date, end_date, step)
+    
+    def get_intraday_series(self, stock_code: str, seconds: float = None, points: int = None,
+                            ma_window: int = 0) -> Optional[Dict]:
+        """
+        종목 장중 시계열 조회 (외부 호출 없음)
+        
+        Args:
+            stock_code (str): 종목 코드
+            seconds (float): 최근 N초 구간
+            points (int): 최근 N틱 구간
+            ma_window (int): 이동평균 기간 (0이면 생략)
+        
+        Returns:
+            Optional[Dict]: 시계열/통계, 기록이 없으면 None
+        """
+        series = self.price_series.get(stock_code)
+        if series is None or not len(series):
+            return None
+        
+        timestamps, prices, volumes = series.window(points=points, seconds=seconds)
+        result = {
+            'stock_code': stock_code,
+            'trading_date': series.trading_date.isoformat() if series.trading_date else None,
+            'timestamps': [datetime.fromtimestamp(ts).isoformat() for ts in timestamps],
+            'prices': prices.tolist(),
+            'volumes': volumes.tolist(),
+            'stats': series.stats(points=points, seconds=seconds)
+        }
+        
+        if ma_window > 0:
+            result['moving_average'] = {
+                'window': ma_window,
+                'values': series.rolling_mean(ma_window, points=len(prices)).round(2).tolist()
+            }
+        
+        return result
+    
+    def get_quote_cache_stats(self) -> Dict:
+        """시세 캐시 적중률 및 상태 조회"""
+        return self.quote_cache.get_stats()
+    
+    def get_ticker_info(self, stock_code: str) -> Optional[Dict]:
+        """종목 마스터 정보 조회 (종목명, 시장, 상장 상태)"""
+        return self.ticker_master.lookup(stock_code)
+    
+    def is_listed_stock(self, stock_code: str) -> Optional[bool]:
+        """상장 종목 여부 (상장폐지/미등록이면 False, 종목 마스터 미구축 시 None)"""
+        return self.ticker_master.is_valid(stock_code)
+    
     def get_stock_name(self, stock_code: str) -> str:
-        """종목명 조회"""
+        """종목명 조회 (종목 마스터 우선, 마스터 미구축 시에만 네이버 조회)"""
+        stock_name = self.ticker_master.get_name(stock_code)
+        if stock_name:
+            return stock_name
+        
+        if self.ticker_master.is_ready():
+            return f"종목 {stock_code}"
+        
         try:
             url = f"https://finance.naver.com/item/main.naver?code={stock_code}"
             headers = {
@@ -680,68 +890,370 @@ class StockMonitor:
         stock_info['alert_prices'] = alert_prices
         return alert_prices
     
-    def check_price_alerts(self, stock_code: str, stock_name: str, current_price: int, previous_price: int, stock_info: Dict) -> bool:
-        """가격 알림 조건 확인 (확장된 알림 시스템)"""
-        alert_triggered = False
+    def get_ladder_levels(self, stock_code: str) -> Optional[List[Dict]]:
+        """종목 가격 래더 레벨 조회 (가격 오름차순, 모니터링 종목이 아니면 None)"""
+        if stock_code not in self.monitoring_stocks:
+            return None
+        return self.ladder_index.get_levels(stock_code)
+    
+    def add_ladder_levels(self, stock_code: str, levels: List[Dict]) -> List[Dict]:
+        """
+        종목 가격 래더에 레벨 추가
+        
+        Args:
+            stock_code (str): 종목 코드
+            levels (List[Dict]): {'price', 'direction'(up|down|both), 'label'} 목록
+        
+        Returns:
+            List[Dict]: 추가된 레벨 (ID 포함)
+        
+        Raises:
+            KeyError: 모니터링 종목이 아닌 경우
+            ValueError: 레벨 값이 유효하지 않거나 최대 개수를 초과한 경우
+        """
+        stock_info = self.monitoring_stocks.get(stock_code)
+        if stock_info is None:
+            raise KeyError(stock_code)
+        
+        # 전체 검증 후 일괄 반영
+        new_levels = [
+            LadderIndex.make_level(level.get('price'), level.get('direction', LADDER_BOTH), level.get('label', ''))
+            for level in levels
+        ]
+        if len(self.ladder_index.get_levels(stock_code)) + len(new_levels) > self.ladder_index.max_levels:
+            raise ValueError(f"종목별 래더 레벨은 최대 {self.ladder_index.max_levels}개입니다")
+        
+        for level in new_levels:
+            self.ladder_index.add(stock_code, level)
+        stock_info['ladder_levels'] = self.ladder_index.get_levels(stock_code)
+        
+        self.save_monitoring_stocks(codes=[stock_code])
+        logger.info(f"래더 레벨 추가: {stock_info.get('name', stock_code)} ({stock_code}) - {len(new_levels)}개")
+        return new_levels
+    
+    def remove_ladder_level(self, stock_code: str, level_id: str) -> Optional[Dict]:
+        """종목 가격 래더에서 레벨 제거 (없으면 None)"""
+        stock_info = self.monitoring_stocks.get(stock_code)
+        if stock_info is None:
+            return None
+        
+        level = self.ladder_index.remove(stock_code, level_id)
+        if level is None:
+            return None
+        stock_info['ladder_levels'] = self.ladder_index.get_levels(stock_code)
+        
+        self.save_monitoring_stocks(codes=[stock_code])
+        logger.info(f"래더 레벨 제거: {stock_info.get('name', stock_code)} ({stock_code}) - {level['price']:,.0f}원")
+        return level
+    
+    def get_alert_expressions(self, stock_code: str) -> Optional[List[Dict]]:
+        """종목 조건식 규칙 조회 (규칙별 평가 통계 포함, 모니터링 종목이 아니면 None)"""
+        stock_info = self.monitoring_stocks.get(stock_code)
+        if stock_info is None:
+            return None
+        rule_stats = self.expressions.get_rule_stats(stock_code)
+        return [
+            {**rule, 'stats': rule_stats.get(rule['id'])}
+            for rule in stock_info.get('alert_expressions') or []
+        ]
+    
+    def add_alert_expressions(self, stock_code: str, rules: List[Dict]) -> List[Dict]:
+        """
+        종목 조건식 규칙 추가 (저장 전 전체 컴파일)
+        
+        Args:
+            stock_code (str): 종목 코드
+            rules (List[Dict]): {'expression', 'message', 'enabled'} 목록
+        
+        Returns:
+            List[Dict]: 추가된 규칙 (ID 포함)
+        
+        Raises:
+            KeyError: 모니터링 종목이 아닌 경우
+            ValueError: 조건식이 유효하지 않거나 최대 개수를 초과한 경우 (ExpressionError)
+        """
+        stock_info = self.monitoring_stocks.get(stock_code)
+        if stock_info is None:
+            raise KeyError(stock_code)
+        
+        # 전체 검증 후 일괄 반영
+        new_rules = [
+            make_rule(rule.get('expression'), rule.get('message', ''), rule.get('enabled', True))
+            for rule in rules
+        ]
+        existing = list(stock_info.get('alert_expressions') or [])
+        if len(existing) + len(new_rules) > self.expressions.max_rules:
+            raise ValueError(f"종목별 조건식은 최대 {self.expressions.max_rules}개입니다")
+        
+        stock_info['alert_expressions'] = existing + new_rules
+        self.expressions.sync(self.monitoring_stocks)
+        
+        self.save_monitoring_stocks(codes=[stock_code])
+        logger.info(f"조건식 추가: {stock_info.get('name', stock_code)} ({stock_code}) - {len(new_rules)}개")
+        return new_rules
+    
+    def remove_alert_expression(self, stock_code: str, rule_id: str) -> Optional[Dict]:
+        """종목 조건식 규칙 제거 (없으면 None)"""
+        stock_info = self.monitoring_stocks.get(stock_code)
+        if stock_info is None:
+            return None
+        
+        rules = list(stock_info.get('alert_expressions') or [])
+        for i, rule in enumerate(rules):
+            if rule.get('id') == rule_id:
+                removed = rules.pop(i)
+                break
+        else:
+            return None
+        stock_info['alert_expressions'] = rules
+        self.expressions.sync(self.monitoring_stocks)
         
-        # 시장 시간 체크 (09:00-15:30)
+        self.save_monitoring_stocks(codes=[stock_code])
+        logger.info(f"조건식 제거: {stock_info.get('name', stock_code)} ({stock_code}) - {removed['expression']}")
+        return removed
+    
+    def evaluate_alerts(self, updates: Dict[str, Tuple[float, float]]) -> int:
+        """
+        가격 갱신 묶음에 대한 알림 판정 및 발송 (알림 엔진 1회 벡터 연산)
+        
+        Args:
+            updates: 종목코드 -> (현재가, 등락률)
+        
+        Returns:
+            int: 발송된 알림 수
+        """
+        if not updates:
+            return 0
+        
+        # 포트폴리오 손익/노출 재계산 (포지션 전체 1회 벡터 연산)
+        try:
+            self.portfolio.update(self.monitoring_stocks, updates)
+        except Exception as e:
+            logger.error(f"포트폴리오 재계산 실패: {e}")
+        
+        # 장 시간 외에도 엔진의 이전가/패리티는 갱신해 둔다
+        hits = self.alert_engine.evaluate(self.monitoring_stocks, updates, self._relative_benchmarks(updates))
+        hits += self.mezzanine.evaluate(self.monitoring_stocks, updates)
+        hits += self.indicators.drain_hits()
+        hits += self.expressions.evaluate(
+            self.monitoring_stocks, updates, self.session_stats.get, self.indicators.get
+        )
+        self._record_refix_events()
+        if not hits:
+            return 0
         if not self.is_market_open():
-            return False
+            for hit in hits:
+                self._complete_alert_hit(hit, False)
+            return 0
         
-        # 1. 패리티 알림 체크 (메자닌 전용)
-        parity_alert = self.check_parity_alerts(stock_code, stock_info, current_price, previous_price)
-        if parity_alert:
-            alert_triggered = True
-        
-        # 2. 목표가/손절가 알림 체크
-        target_stop_alert = self.check_target_stop_alerts(stock_code, stock_info, current_price, previous_price)
-        if target_stop_alert:
-            alert_triggered = True
-        
-        # 3. 급등급락 알림 체크
-        volatility_alert = self.check_volatility_alerts(stock_code, stock_info, current_price)
-        if volatility_alert:
-            alert_triggered = True
-        
-        # 4. 기존 alert_prices 시스템 호환성 유지
-        alert_prices = stock_info.get("alert_prices", [])
-        if alert_prices:
-            legacy_alert = self._check_legacy_alerts(stock_code, stock_name, current_price, previous_price, stock_info)
-            if legacy_alert:
-                alert_triggered = True
-        
-        return alert_triggered
-    
-    def _check_legacy_alerts(self, stock_code: str, stock_name: str, current_price: int, previous_price: int, stock_info: Dict) -> bool:
-        """기존 alert_prices 시스템 체크 (호환성 유지)"""
-        alert_prices = stock_info.get("alert_prices", [])
-        triggered_alerts = stock_info.get("triggered_alerts", set())
-        alert_triggered = False
-        
-        for alert in alert_prices:
-            alert_id = alert.get("id", "")
-            target_price = alert.get("price", 0)
-            alert_type = alert.get("type", "")
-            
-            if alert_id in triggered_alerts:
+        sent = 0
+        for hit in hits:
+            success = False
+            try:
+                success = self._dispatch_alert_hit(hit)
+                if success:
+                    sent += 1
+                    self.save_monitoring_stocks(codes=[hit['stock_code']])  # triggered_alerts 변경
+                    for listener in self.alert_listeners:
+                        listener(hit, self.monitoring_stocks.get(hit['stock_code'], {}))
+            except Exception as e:
+                logger.error(f"알림 발송 처리 오류: {hit['stock_code']} {hit['alert_id']} - {e}")
+            finally:
+                self._complete_alert_hit(hit, success)
+        return sent
+    
+    def _complete_alert_hit(self, hit: Dict, sent: bool):
+        """발송 결과를 적중 항목을 만든 엔진에 알림 (이미 발송된 알림은 발송 완료로, 실패한 지표/조건식 알림은 다음 주기 재시도)"""
+        if hit['rule'] in (RULE_MA_CROSS, RULE_VOLUME_SPIKE, RULE_GAP):
+            self.indicators.complete(hit, sent or self._was_hit_sent(hit))
+        elif hit['rule'] == RULE_EXPR:
+            self.expressions.complete(hit, sent or self._was_hit_sent(hit))
+    
+    def _was_hit_sent(self, hit: Dict) -> bool:
+        """적중 항목 알림 ID의 발송 기록 여부 (종목 triggered_alerts 또는 당일 발송 상태)"""
+        stock_info = self.monitoring_stocks.get(hit['stock_code']) or {}
+        return (hit['alert_id'] in (stock_info.get('triggered_alerts') or ()) or
+                self.alert_state.was_sent(hit['stock_code'], hit['alert_id']))
+    
+    def _relative_benchmarks(self, updates: Dict[str, Tuple[float, float]]) -> Dict[str, float]:
+        """지수 대비 판정 종목의 기대 등락률 (베타 x 소속 시장 지수 등락률, 지수 시세가 없으면 제외)"""
+        benchmark = {}
+        for stock_code in updates:
+            alert_settings = self.monitoring_stocks.get(stock_code, {}).get('alert_settings') or {}
+            if not alert_settings.get('relative_alert', False):
                 continue
-            
-            # TP/상승 알림
-            if alert_type in ["TP Alert", "Up Alert"]:
-                if current_price >= target_price and previous_price < target_price:
-                    self.send_price_alert(stock_code, stock_name, current_price, target_price, "TARGET_UP", alert_type)
-                    triggered_alerts.add(alert_id)
-                    alert_triggered = True
-            
-            # SL/하락 알림  
-            elif alert_type in ["SL Alert", "Down Alert"]:
-                if current_price <= target_price and previous_price > target_price:
-                    alert_msg_type = "STOP_LOSS" if alert_type == "SL Alert" else "TARGET_DOWN"
-                    self.send_price_alert(stock_code, stock_name, current_price, target_price, alert_msg_type, alert_type)
-                    triggered_alerts.add(alert_id)
-                    alert_triggered = True
+            result = self.market_index.benchmark(stock_code, alert_settings.get('relative_beta', False))
+            if result is not None:
+                benchmark[stock_code] = result[0]
+        return benchmark
+    
+    def _dispatch_alert_hit(self, hit: Dict) -> bool:
+        """알림 엔진 적중 항목 발송 (당일 중복 제외)"""
+        stock_code = hit['stock_code']
+        stock_info = self.monitoring_stocks.get(stock_code)
+        if stock_info is None:
+            return False
+        
+        triggered_alerts = stock_info.get('triggered_alerts')
+        if not isinstance(triggered_alerts, set):
+            triggered_alerts = set(triggered_alerts or [])
+            stock_info['triggered_alerts'] = triggered_alerts
+        
+        alert_id = hit['alert_id']
+        if alert_id in triggered_alerts or self.alert_state.was_sent(stock_code, alert_id):
+            return False
+        
+        stock_name = stock_info.get('name', stock_code)
+        current_price = int(hit['price'])
+        rule = hit['rule']
+        
+        if rule == RULE_PARITY:
+            threshold = hit['meta']['threshold']
+            success = send_parity_alert_enhanced(
+                stock_name, stock_code, current_price, threshold, int(round(hit['meta']['conversion_price']))
+            )
+            if success:
+                self._mark_hit_sent(stock_code, triggered_alerts, alert_id)
+                self.save_daily_alert(
+                    stock_code, stock_name, f"패리티_{threshold}%", 
+                    f"패리티 {threshold}% 도달", current_price, 0.0
+                )
+                logger.info(f"패리티 알림 발송: {stock_name} - {threshold}%")
+            return success
+        
+        if rule == RULE_REFIX:
+            meta = hit['meta']
+            message = (f"리픽싱 예정 {meta['refix_date']} (D-{meta['days_left']}): 전환가 "
+                       f"{meta['conversion_price']:,.0f}원 -> 예상 {meta['expected_conversion_price']:,.0f}원 "
+                       f"(하한 {meta['floor_price']:,.0f}원)")
+            success = send_stock_alert(stock_name, current_price, hit['change_percent'], "refix", message)
+            if success:
+                self._mark_hit_sent(stock_code, triggered_alerts, alert_id)
+                self.mezzanine.mark_notified(stock_code, meta['refix_date'])
+                self.save_daily_alert(stock_code, stock_name, "리픽싱_예정", message, current_price, hit['change_percent'])
+                logger.info(f"리픽싱 예정 알림 발송: {stock_name} - {meta['refix_date']}")
+            return success
+        
+        if rule == RULE_EXPR:
+            meta = hit['meta']
+            success = send_stock_alert(stock_name, current_price, hit['change_percent'], rule, meta['message'])
+            if success:
+                self._mark_hit_sent(stock_code, triggered_alerts, alert_id)
+                self.save_daily_alert(stock_code, stock_name, "조건식", meta['message'], current_price, hit['change_percent'])
+                logger.info(f"조건식 알림 발송: {stock_name} - {meta['expression']}")
+            return success
+        
+        if rule in (RULE_MA_CROSS, RULE_VOLUME_SPIKE, RULE_GAP):
+            meta = hit['meta']
+            success = send_stock_alert(stock_name, current_price, hit['change_percent'], rule, meta['message'])
+            if success:
+                self._mark_hit_sent(stock_code, triggered_alerts, alert_id)
+                self.save_daily_alert(stock_code, stock_name, meta['label'], meta['message'], current_price, hit['change_percent'])
+                logger.info(f"지표 알림 발송: {stock_name} - {meta['message']}")
+            return success
+        
+        if rule in (RULE_TARGET, RULE_STOP):
+            level = stock_info.get('target_price' if rule == RULE_TARGET else 'stop_loss', 0)
+            success = send_target_stop_alert_enhanced(
+                stock_name, stock_code, current_price, level, 
+                "target_price" if rule == RULE_TARGET else "stop_loss", hit['meta']['acquisition_price']
+            )
+            if success:
+                self._mark_hit_sent(stock_code, triggered_alerts, alert_id)
+                if rule == RULE_TARGET:
+                    self.save_daily_alert(
+                        stock_code, stock_name, "목표가_달성", 
+                        f"목표가 {level:,}원 달성", current_price
+                    )
+                    logger.info(f"목표가 알림 발송: {stock_name} - {level:,}원")
+                else:
+                    self.save_daily_alert(
+                        stock_code, stock_name, "손절가_도달", 
+                        f"손절가 {level:,}원 도달", current_price
+                    )
+                    logger.info(f"손절가 알림 발송: {stock_name} - {level:,}원")
+            return success
+        
+        if rule in (RULE_SURGE, RULE_DROP) and hit['meta'].get('relative'):
+            meta = hit['meta']
+            change_percent = hit['change_percent']
+            label = "지수대비_급등" if rule == RULE_SURGE else "지수대비_급락"
+            index_name = self.market_index.market_of(stock_code)
+            message = (f"{index_name} 대비 초과 {meta['excess_percent']:+.2f}% "
+                       f"(등락률 {change_percent:+.2f}%, 기대 {meta['benchmark_percent']:+.2f}%, 임계값 {hit['level']:+.1f}%)")
+            success = send_stock_alert(stock_name, current_price, change_percent, rule, message)
+            if success:
+                self._mark_hit_sent(stock_code, triggered_alerts, alert_id)
+                self.save_daily_alert(stock_code, stock_name, label, message, current_price, change_percent)
+                logger.info(f"{label} 알림 발송: {stock_name} - {message}")
+            return success
         
-        return alert_triggered
+        if rule in (RULE_SURGE, RULE_DROP):
+            change_percent = hit['change_percent']
+            success = send_volatility_alert(
+                stock_name, stock_code, current_price, change_percent, 
+                rule, hit['level']
+            )
+            if success:
+                self._mark_hit_sent(stock_code, triggered_alerts, alert_id)
+                label = "급등" if rule == RULE_SURGE else "급락"
+                self.save_daily_alert(
+                    stock_code, stock_name, label, 
+                    f"일일 {label} {change_percent:+.2f}%", current_price, change_percent
+                )
+                logger.info(f"{label} 알림 발송: {stock_name} - {change_percent:+.2f}%")
+            return success
+        
+        if rule == RULE_LADDER:
+            # 래더 레벨은 발송 결과와 무관하게 방향별 당일 1회만 시도 (발송 전에 기록)
+            self._mark_hit_sent(stock_code, triggered_alerts, alert_id)
+            level = int(hit['level'])
+            label = hit['meta']['label'] or "Ladder Alert"
+            if hit['direction'] == DIRECTION_UP:
+                self.send_price_alert(stock_code, stock_name, current_price, level, "TARGET_UP", label)
+                message = f"래더 {level:,}원 상향 돌파"
+            else:
+                self.send_price_alert(stock_code, stock_name, current_price, level, "TARGET_DOWN", label)
+                message = f"래더 {level:,}원 하향 돌파"
+            self.save_daily_alert(stock_code, stock_name, "래더_레벨", message, current_price, hit['change_percent'])
+            logger.info(f"래더 알림 발송: {stock_name} - {message}")
+            return True
+        
+        if rule == RULE_LEVEL:
+            # 기존 alert_prices 시스템 호환 (발송 결과와 무관하게 1회만 시도, 발송 전에 기록)
+            self._mark_hit_sent(stock_code, triggered_alerts, alert_id)
+            alert_type = hit['meta']['type']
+            level = int(hit['level'])
+            if hit['direction'] == DIRECTION_UP:
+                self.send_price_alert(stock_code, stock_name, current_price, level, "TARGET_UP", alert_type)
+            else:
+                alert_msg_type = "STOP_LOSS" if alert_type == "SL Alert" else "TARGET_DOWN"
+                self.send_price_alert(stock_code, stock_name, current_price, level, alert_msg_type, alert_type)
+            return True
+        
+        return False
+    
+    def _record_refix_events(self):
+        """메자닌 엔진이 적용한 리픽싱을 종목 데이터에 기록 (재시작 후에도 유효 전환가 유지)"""
+        for event in self.mezzanine.drain_events():
+            stock_code = event['stock_code']
+            stock_info = self.monitoring_stocks.get(stock_code)
+            if stock_info is None or not stock_info.get('mezzanine'):
+                continue
+            terms = stock_info['mezzanine']
+            terms['effective_conversion_price'] = event['after']
+            terms.setdefault('refix_history', []).append(event)
+            self.save_monitoring_stocks(codes=[stock_code])
+            self.save_daily_alert(
+                stock_code, stock_info.get('name', stock_code), "리픽싱_적용",
+                f"리픽싱 {event['date']}: 전환가 {event['before']:,.0f}원 -> {event['after']:,.0f}원",
+                int(event['reference_price'])
+            )
+    
+    def _mark_hit_sent(self, stock_code: str, triggered_alerts: set, alert_id: str):
+        """알림 발송 기록 (종목 triggered_alerts + 당일 발송 상태 저장소 즉시 기록)"""
+        triggered_alerts.add(alert_id)
+        self.alert_state.mark_sent(stock_code, alert_id)
     
     def send_price_alert(self, stock_code: str, stock_name: str, current_price: int, target_price: int, alert_type: str, alert_category: str):
         """가격 알림 발송"""
@@ -786,59 +1298,109 @@ class StockMonitor:
         else:
             logger.error(f"일간 알림 발송 실패: {stock_name}")
     
-    def update_stock_price(self, stock_code: str) -> Dict:
-        """개별 종목 가격 업데이트"""
+    def update_stock_price(self, stock_code: str, force: bool = False,
+                           alert_updates: Optional[Dict[str, Tuple[float, float]]] = None) -> Dict:
+        """
+        개별 종목 가격 업데이트
+        
+        Args:
+            stock_code (str): 종목 코드
+            force (bool): 시세 캐시 TTL 무시
+            alert_updates (Dict): 주어지면 알림 판정을 미루고 (현재가, 등락률)을 모아 둔다 (사이클 일괄 판정용)
+        """
         stock_info = self.monitoring_stocks.get(stock_code, {})
         if not stock_info.get('enabled', True):
             return stock_info
         
-        stock_name = stock_info.get('name', self.get_stock_name(stock_code))
+        stock_name = stock_info.get('name') or self.get_stock_name(stock_code)
         previous_price = stock_info.get('current_price', 0)
         
-        # 주가 조회
-        current_price, change_percent, error = self.get_stock_price(stock_code)
+        # 상장폐지 종목은 조회 생략
+        ticker_info = self.ticker_master.lookup(stock_code)
+        if ticker_info and ticker_info['status'] == STATUS_DELISTED:
+            stock_info.update({
+                'trading_status': TRADING_STATUS_DELISTED,
+                'trading_status_detail': None,
+                'error': "상장폐지 종목입니다"
+            })
+            self.monitoring_stocks[stock_code] = stock_info
+            return stock_info
+        
+        # 주가 조회 (데이터 없음 종목은 백오프 기간 동안 시세 캐시가 즉시 실패 반환)
+        quote, error = self.get_stock_quote(stock_code, force=force)
         
-        if current_price is not None:
+        if quote is not None:
+            current_price = quote['price']
+            change_percent = quote['change_percent']
+            
             # 정보 업데이트
             stock_info.update({
                 'current_price': current_price,
                 'change_percent': change_percent,
                 'last_updated': datetime.now().isoformat(),
+                'trading_status': quote.get('trading_status', TRADING_STATUS_NORMAL),
+                'trading_status_detail': None,
                 'error': None
             })
             
+            # 장중 시계열/아카이브 기록 (조회 시각 기준, 캐시 재사용 틱은 무시)
+            tick_time = time.time() - quote.get('age', 0.0)
+            if self.price_series.append(stock_code, tick_time, current_price, quote.get('volume')):
+                self.tick_archive.append(stock_code, tick_time, current_price, quote.get('volume'))
+                if self.is_market_open():
+                    # 장외 조회는 전일 봉이므로 세션 집계/지표에 반영하지 않음
+                    self.session_stats.update(stock_code, tick_time, current_price, quote.get('volume'), change_percent)
+                    self.indicators.update(
+                        stock_code, tick_time, current_price, quote.get('volume'), change_percent, quote.get('open'),
+                        alerts=(stock_info.get('alert_settings') or {}).get('indicator_alert', True)
+                    )
+            
             # 알림 가격 설정 (없는 경우)
             if not stock_info.get('alert_prices'):
                 self.setup_alert_prices(stock_info, current_price)
             
-            # 알림 체크
-            if previous_price > 0:
-                self.check_price_alerts(stock_code, stock_name, current_price, previous_price, stock_info)
+            # 알림 체크 (사이클 처리 시에는 일괄 판정)
+            if alert_updates is not None:
+                alert_updates[stock_code] = (current_price, change_percent)
+            else:
+                self.evaluate_alerts({stock_code: (current_price, change_percent)})
             
         else:
-            stock_info['error'] = error
-            logger.warning(f"주가 조회 실패: {stock_name} ({stock_code}) - {error}")
+            negative = self.quote_cache.get_negative_status(stock_code)
+            stock_info.update({
+                'trading_status': TRADING_STATUS_NO_DATA if negative else TRADING_STATUS_UNKNOWN,
+                'trading_status_detail': negative,
+                'error': error
+            })
+            if negative is None or negative['count'] == 1:
+                logger.warning(f"주가 조회 실패: {stock_name} ({stock_code}) - {error}")
         
         self.monitoring_stocks[stock_code] = stock_info
         return stock_info
     
-    def update_all_stocks(self) -> Dict[str, Dict]:
-        """모든 종목 가격 업데이트"""
+    def update_all_stocks(self, force: bool = False) -> Dict[str, Dict]:
+        """모든 종목 가격 업데이트 (force: 시세 캐시 TTL 무시)"""
         logger.info("모든 모니터링 종목 가격 업데이트 시작")
         
         updated_stocks = {}
+        alert_updates = {}
         enabled_stocks = [code for code, info in self.monitoring_stocks.items() if info.get('enabled', True)]
         
         for stock_code in enabled_stocks:
             try:
-                updated_info = self.update_stock_price(stock_code)
+                updated_info = self.update_stock_price(stock_code, force=force, alert_updates=alert_updates)
                 updated_stocks[stock_code] = updated_info
-                time.sleep(0.5)  # API 부하 방지
+                # 조회를 생략한 종목(백오프/상장폐지)은 대기 없이 진행
+                if updated_info.get('trading_status') not in (TRADING_STATUS_NO_DATA, TRADING_STATUS_DELISTED):
+                    time.sleep(0.5)  # API 부하 방지
             except Exception as e:
                 logger.error(f"종목 {stock_code} 업데이트 실패: {e}")
         
-        # 업데이트된 데이터 저장
-        self.save_monitoring_stocks(self.monitoring_stocks)
+        # 사이클 알림 일괄 판정
+        self.evaluate_alerts(alert_updates)
+        
+        # 업데이트된 종목만 저장 예약
+        self.save_monitoring_stocks(codes=updated_stocks)
         
         logger.info(f"가격 업데이트 완료: {len(updated_stocks)}개 종목")
         return updated_stocks
@@ -856,7 +1418,8 @@ class StockMonitor:
                   acquisition_price: float = 0,
                   alert_settings: Dict = None,
                   memo: str = '',
-                  conversion_price: float = 0) -> bool:
+                  conversion_price: float = 0,
+                  quantity: float = 0) -> bool:
         """모니터링 종목 추가 (확장된 스키마 지원)"""
         try:
             if stock_name is None:
@@ -878,6 +1441,7 @@ class StockMonitor:
                 'stop_loss': float(stop_loss),
                 'category': validated_category,
                 'acquisition_price': float(acquisition_price),
+                'quantity': float(quantity),
                 'alert_settings': validated_alert_settings,
                 'memo': str(memo),
                 'conversion_price': float(conversion_price),
@@ -887,11 +1451,13 @@ class StockMonitor:
                 'last_updated': None,
                 'triggered_alerts': set(),
                 'alert_prices': [],
+                'ladder_levels': [],
+                'alert_expressions': [],
                 'error': None,
                 'daily_alert_enabled': True
             }
             
-            self.save_monitoring_stocks(self.monitoring_stocks)
+            self.save_monitoring_stocks(codes=[stock_code])
             logger.info(f"모니터링 종목 추가: {stock_name} ({stock_code}) - 카테고리: {validated_category}")
             return True
             
@@ -908,7 +1474,8 @@ class StockMonitor:
                          acquisition_price: float = None,
                          alert_settings: Dict = None,
                          memo: str = None,
-                         enabled: bool = None) -> bool:
+                         enabled: bool = None,
+                         quantity: float = None) -> bool:
         """종목 정보 업데이트"""
         try:
             if stock_code not in self.monitoring_stocks:
@@ -928,6 +1495,8 @@ class StockMonitor:
                 stock_info['category'] = self._validate_category(category)
             if acquisition_price is not None:
                 stock_info['acquisition_price'] = float(acquisition_price)
+            if quantity is not None:
+                stock_info['quantity'] = float(quantity)
             if alert_settings is not None:
                 stock_info['alert_settings'] = self._validate_alert_settings(alert_settings)
             if memo is not None:
@@ -935,7 +1504,7 @@ class StockMonitor:
             if enabled is not None:
                 stock_info['enabled'] = bool(enabled)
             
-            self.save_monitoring_stocks(self.monitoring_stocks)
+            self.save_monitoring_stocks(codes=[stock_code])
             logger.info(f"종목 정보 업데이트: {stock_info['name']} ({stock_code})")
             return True
             
@@ -972,7 +1541,7 @@ class StockMonitor:
                     validation_result['valid'] = False
             
             # 숫자 필드 검증
-            numeric_fields = ['target_price', 'stop_loss', 'acquisition_price', 'current_price', 'change_percent']
+            numeric_fields = ['target_price', 'stop_loss', 'acquisition_price', 'quantity', 'current_price', 'change_percent']
             for field in numeric_fields:
                 if field in stock_data:
                     try:
@@ -1008,7 +1577,12 @@ class StockMonitor:
             if stock_code in self.monitoring_stocks:
                 stock_name = self.monitoring_stocks[stock_code].get('name', stock_code)
                 del self.monitoring_stocks[stock_code]
-                self.save_monitoring_stocks(self.monitoring_stocks)
+                self.save_monitoring_stocks(codes=[stock_code])
+                self.price_series.remove(stock_code)
+                self.session_stats.remove(stock_code)
+                self.indicators.remove(stock_code)
+                self.expressions.remove(stock_code)
+                self.ladder_index.drop(stock_code)
                 logger.info(f"모니터링 종목 제거: {stock_name} ({stock_code})")
                 return True
             return False
@@ -1018,85 +1592,290 @@ class StockMonitor:
             return False
     
     def start_real_time_monitoring(self):
-        """실시간 모니터링 시작"""
+        """실시간 모니터링 시작 (통합 스케줄러의 주식 작업 활성화)"""
         if self.is_monitoring:
             logger.warning("실시간 모니터링이 이미 실행 중입니다")
             return False
         
-        self.is_monitoring = True
-        self.monitoring_thread = threading.Thread(target=self._monitoring_loop, daemon=True)
-        self.monitoring_thread.start()
+        for job_name in STOCK_JOBS:
+            self.scheduler.enable_job(job_name)
+        self.scheduler.start()
         logger.info("실시간 주식 모니터링 시작")
         return True
     
     def stop_real_time_monitoring(self):
-        """실시간 모니터링 중지"""
+        """실시간 모니터링 중지 (주식 작업만 비활성화, 스케줄러의 다른 작업은 유지)"""
         if not self.is_monitoring:
             logger.warning("실시간 모니터링이 실행되지 않고 있습니다")
             return False
         
-        self.is_monitoring = False
-        if self.monitoring_thread:
-            self.monitoring_thread.join(timeout=5)
+        for job_name in STOCK_JOBS:
+            self.scheduler.disable_job(job_name)
+        self.flush_monitoring_stocks()
+        self.alert_journal.sync()
         logger.info("실시간 주식 모니터링 중지")
         return True
     
-    def _monitoring_loop(self):
-        """모니터링 루프 (별도 스레드에서 실행)"""
-        logger.info("모니터링 루프 시작")
+    def _price_job(self):
+        """
+        주가 갱신 작업
+        
+        장중에는 폴링 스케줄러가 고른 종목만 조회하고,
+        장외에는 세션(개장 전/마감 후)당 1회 전체 종목을 갱신한다.
+        """
+        if self.is_market_open():
+            logger.debug("시장 개장 중 - 주가 업데이트 실행")
+            cycle_start = time.perf_counter()
+            self.market_index.refresh()
+            self._update_all_stocks_realtime()
+            self.price_cycle.record(time.perf_counter() - cycle_start, self.monitor_interval)
+            return
+        
+        now = datetime.now()
+        session = 'pre' if now.weekday() < 5 and now.strftime("%H:%M") < STOCK_MARKET_OPEN_TIME else 'post'
+        refresh_key = f"{now.strftime('%Y%m%d')}_{session}"
+        if self.closed_refresh_key != refresh_key or self._force_price_refresh:
+            force = self._force_price_refresh
+            self._force_price_refresh = False
+            logger.info(f"장외 전체 주가 갱신: {refresh_key}{' (강제)' if force else ''}")
+            self.market_index.refresh()
+            self.update_all_stocks(force=force)
+            self.closed_refresh_key = refresh_key
+    
+    def request_price_refresh(self) -> bool:
+        """
+        주가 갱신 작업 즉시 실행 예약 (요청 스레드에서 조회하지 않음)
+        
+        장외에는 세션 1회 제한과 시세 캐시 TTL을 무시하고 전체 종목을 다시 조회한다.
+        주가 갱신 작업이 비활성(모니터링 중지) 상태면 False.
+        """
+        if not self.scheduler.is_job_active(JOB_STOCK_PRICES):
+            return False
+        self._force_price_refresh = True
+        return self.scheduler.run_job_now(JOB_STOCK_PRICES)
+    
+    def _maintenance_job(self):
+        """장 마감 일일 보고서 발송, 장외 당일 틱 압축, 일 1회 알림 이력 보관 기간 정리"""
+        today = datetime.now().date()
+        if self.last_history_prune_date != today:
+            self.alert_history.prune()
+            self.last_history_prune_date = today
+        
+        if self.is_market_open():
+            if self.is_market_closing_time():
+                self._send_daily_report()
+        else:
+            self.tick_archive.compact_pending()
+    
+    def _estimate_index_betas(self):
+        """장외 일 1회 베타 사용 종목의 시장 지수 베타 추정 ('stock_history' 그룹, 주가 갱신을 막지 않음)"""
+        if self.is_market_open():
+            return
+        now = datetime.now()
+        last_day = now.date() if now.weekday() < 5 and now.strftime("%H:%M") > STOCK_MARKET_CLOSE_TIME else now.date() - timedelta(days=1)
+        if not PYKRX_AVAILABLE or not self.market_index.needs_beta_refresh(last_day):
+            return
         
-        while self.is_monitoring:
+        codes = [
+            code for code, info in self.monitoring_stocks.items()
+            if (info.get('alert_settings') or {}).get('relative_beta', False)
+        ]
+        try:
+            self.market_index.estimate_betas(
+                codes, lambda code, needed: [(day, close) for day, close, _ in self._load_daily_bars(code, last_day, needed)],
+                last_day
+            )
+        except Exception as e:
+            logger.warning(f"지수 베타 추정 실패: {e}")
+    
+    def _warm_up_indicators(self):
+        """
+        지표 워밍업 작업 ('stock_history' 그룹)
+        
+        워밍업하지 않은 종목의 과거 일봉을 읽어 지표 상태를 채운다 (종목당 1회).
+        종목별 pykrx 조회가 느리므로 회당 INDICATOR_WARMUP_BATCH 종목까지만 처리하고 나머지는 다음 회차로 넘긴다.
+        """
+        codes = self.indicators.pending_codes(list(self.monitoring_stocks.keys()))[:INDICATOR_WARMUP_BATCH]
+        if not codes:
+            return
+        
+        now = datetime.now()
+        # 장 마감 후에는 당일 봉도 확정된 것으로 본다
+        last_day = now.date() if now.weekday() < 5 and now.strftime("%H:%M") > STOCK_MARKET_CLOSE_TIME else now.date() - timedelta(days=1)
+        loaded = 0
+        for code in codes:
+            if self.scheduler.stopping():
+                break
             try:
-                current_time = datetime.now()
-                
-                # 시장 시간 체크
-                if self.is_market_open():
-                    logger.debug("시장 개장 중 - 주가 업데이트 실행")
-                    self._update_all_stocks_realtime()
-                    
-                    # 장 종료 시간에 일일 보고서 발송
-                    if self.is_market_closing_time():
-                        self._send_daily_report()
-                else:
-                    logger.debug("시장 폐장 중 - 대기")
-                
-                # 주기적 데이터 저장 체크 (60초마다)
-                if (current_time - self.last_save_time).total_seconds() >= self.save_interval:
-                    logger.debug("주기적 데이터 저장 실행")
-                    self.save_monitoring_stocks_with_metadata(self.monitoring_stocks)
-                    self.last_save_time = current_time
-                    self.save_counter += 1
-                    logger.info(f"데이터 주기 저장 완료: {self.save_counter}번째")
-                
-                # 10초 대기
-                for _ in range(self.monitor_interval):
-                    if not self.is_monitoring:
-                        break
-                    time.sleep(1)
-                    
+                bars = self._load_daily_bars(code, last_day)
+                self.indicators.warm_up(code, bars)
+                loaded += bool(bars)
             except Exception as e:
-                logger.error(f"모니터링 루프 오류: {e}")
-                time.sleep(self.monitor_interval)
+                logger.warning(f"지표 워밍업 실패: {code} - {e}")
+                self.indicators.mark_warm_up_failed(code)
+        logger.info(f"지표 워밍업 완료: {loaded}/{len(codes)}개 종목")
+    
+    def _load_daily_bars(self, stock_code: str, last_day, needed: Optional[int] = None) -> List[Tuple]:
+        """
+        지표 워밍업/베타 추정용 확정 일봉 (일자, 종가, 거래량), 최근 needed개 (기본 지표 워밍업 일수)
         
-        logger.info("모니터링 루프 종료")
+        백테스트 봉 캐시가 충분히 최신이면 그대로 쓰고, 아니면 pykrx로 한 번 조회해 캐시에 병합한다.
+        """
+        needed = needed or self.indicators.history_days
+        bars = bar_cache.load(stock_code, '1d')
+        fresh = (bars is not None and len(bars['ts']) >= needed and
+                 datetime.fromtimestamp(bars['ts'][-1]).date() >= last_day - timedelta(days=5))
+        if not fresh and PYKRX_AVAILABLE:
+            start = last_day - timedelta(days=needed * 2 + 10)   # 휴장일 여유
+            bar_cache.populate_pykrx([stock_code], start, last_day)
+            bars = bar_cache.load(stock_code, '1d')
+        if bars is None:
+            return []
+        
+        result = []
+        for ts, close, volume in zip(bars['ts'], bars['close'], bars['volume']):
+            day = datetime.fromtimestamp(ts).date()
+            if day <= last_day:
+                result.append((day, float(close), float(volume)))
+        return result[-needed:]
+    
+    def _scan_job(self):
+        """
+        전체 시장 스캔 작업
+        
+        장중에는 관심 종목을 제외한 전체 시장을 스크린해 적중 종목 알림을 발송하고,
+        장외에는 52주/평균 거래량 기준값용 과거 스냅샷을 조금씩 채운다 (자체 스케줄러 그룹).
+        장 시작 SCANNER_BACKFILL_STOP_MINUTES분 전부터는 채우지 않고, 당일 스냅샷은
+        확정 시각(SCANNER_FINAL_SNAPSHOT_TIME) 이후에만 조회한다.
+        """
+        if not SCANNER_ENABLED:
+            return
+        
+        if self.is_market_open():
+            result = self.market_scanner.scan(exclude=list(self.monitoring_stocks.keys()))
+            elapsed = result['timing_ms']['total'] / 1000
+            if elapsed > self.monitor_interval:
+                logger.warning(f"시장 스캔 지연: {elapsed:.2f}초 (모니터링 주기 {self.monitor_interval}초)")
+            self._publish_scan_hits(result['hits'], result['trading_date'])
+            return
+        
+        now = datetime.now()
+        next_open = datetime.combine(now.date(), datetime.strptime(STOCK_MARKET_OPEN_TIME, "%H:%M").time())
+        if now >= next_open:
+            next_open += timedelta(days=1)
+        while next_open.weekday() >= 5:
+            next_open += timedelta(days=1)
+        deadline = next_open - timedelta(minutes=SCANNER_BACKFILL_STOP_MINUTES)
+        if now >= deadline:
+            return
+        
+        last_day = now.date() if now.weekday() < 5 and now.strftime("%H:%M") >= SCANNER_FINAL_SNAPSHOT_TIME else now.date() - timedelta(days=1)
+        if self.market_scanner.baseline.backfill(last_day, deadline=deadline.timestamp()):
+            self.market_scanner.baseline.prune()
+    
+    def _publish_scan_hits(self, hits: List[Dict], day_key: str) -> int:
+        """스캐너 적중 종목 알림 발송 (종목/스크린별 당일 1회, 스캔당 최대 건수 제한)"""
+        sent = 0
+        for hit in hits:
+            if sent >= self.market_scanner.max_alerts:
+                break
+            stock_code = hit['stock_code']
+            screens = [
+                screen for screen in hit['screens']
+                if not self.alert_state.was_sent(stock_code, f"scan_{screen}_{day_key}")
+            ]
+            if not screens:
+                continue
+            
+            stock_name = self.ticker_master.get_name(stock_code) or stock_code
+            details = []
+            for screen in screens:
+                if screen == SCREEN_MOVE:
+                    details.append(f"등락률 {hit['change_percent']:+.2f}%")
+                elif screen == SCREEN_VOLUME:
+                    details.append(f"거래량 평균 대비 {hit['volume_ratio']:.1f}배")
+                elif screen == SCREEN_HIGH_52W:
+                    details.append(f"52주 신고가 (이전 {hit['prior_high_52w']:,.0f}원)")
+                elif screen == SCREEN_LOW_52W:
+                    details.append(f"52주 신저가 (이전 {hit['prior_low_52w']:,.0f}원)")
+            message = f"[{hit['market']} 스캐너] " + ", ".join(details)
+            price = int(hit['price'])
+            
+            if not send_stock_alert(stock_name, price, hit['change_percent'], "scanner", message):
+                continue
+            for screen in screens:
+                self.alert_state.mark_sent(stock_code, f"scan_{screen}_{day_key}")
+            self.save_daily_alert(
+                stock_code, stock_name, "스캐너_" + "_".join(SCREEN_LABELS[screen] for screen in screens),
+                message, price, hit['change_percent']
+            )
+            for listener in self.alert_listeners:
+                listener({**hit, 'rule': 'scanner'}, {'name': stock_name})
+            sent += 1
+            logger.info(f"스캐너 알림 발송: {stock_name} ({stock_code}) - {message}")
+        return sent
+    
+    def _save_job(self):
+        """미기록 변경 정기 기록 (지연 기록 스레드 보조, 변경이 없으면 파일을 건드리지 않음)"""
+        written = self.flush_monitoring_stocks()
+        self.alert_journal.sync()
+        self.last_save_time = datetime.now()
+        if written:
+            self.save_counter += 1
+            logger.info(f"데이터 주기 저장 완료: {self.save_counter}번째 ({written}개 종목)")
+    
+    def get_poll_priorities(self) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """
+        활성 종목의 폴링 우선순위 입력값
+        
+        Returns:
+            Tuple: (알림 레벨까지 거리 %, 최근 틱 수익률 표준편차 %)
+        """
+        all_distances = self.alert_engine.nearest_level_distances()
+        distances = {}
+        volatilities = {}
+        for code, info in self.monitoring_stocks.items():
+            if not info.get('enabled', True):
+                continue
+            distances[code] = all_distances.get(code, float('inf'))
+            series = self.price_series.get(code)
+            if series is not None:
+                volatility = series.return_volatility(POLL_VOLATILITY_POINTS)
+                if volatility is not None:
+                    volatilities[code] = volatility
+        return distances, volatilities
     
     def _update_all_stocks_realtime(self):
-        """실시간 모든 종목 업데이트 (모니터링 스레드용)"""
+        """
+        실시간 종목 업데이트 (모니터링 스레드용)
+        
+        폴링 스케줄러가 고른 종목만 사이클 제어기의 현재 동시성으로 조회한다.
+        """
         try:
-            enabled_stocks = [code for code, info in self.monitoring_stocks.items() if info.get('enabled', True)]
+            distances, volatilities = self.get_poll_priorities()
+            scheduled_stocks = self.poll_scheduler.plan(distances, volatilities, shed_level=self.price_cycle.shed_level)
+            alert_updates = {}
             
-            for stock_code in enabled_stocks:
-                if not self.is_monitoring:  # 모니터링 중지 시 즉시 종료
-                    break
+            def fetch(stock_code: str):
+                if not self.is_monitoring or self.scheduler.stopping():  # 모니터링 중지 시 즉시 종료
+                    return
                 
                 try:
-                    self.update_stock_price(stock_code)
-                    time.sleep(0.5)  # API 부하 방지
+                    self.update_stock_price(stock_code, alert_updates=alert_updates)
+                    self.poll_scheduler.record(stock_code)
+                    time.sleep(0.5)  # API 부하 방지 (워커별 호출 간격)
                 except Exception as e:
                     logger.error(f"실시간 업데이트 중 오류 - {stock_code}: {e}")
             
-            # 업데이트된 데이터 저장
-            self.save_monitoring_stocks(self.monitoring_stocks)
+            if scheduled_stocks:
+                with ThreadPoolExecutor(max_workers=self.price_cycle.concurrency, thread_name_prefix='price-fetch') as pool:
+                    list(pool.map(fetch, scheduled_stocks))
+            
+            # 사이클 알림 일괄 판정
+            self.evaluate_alerts(alert_updates)
+            
+            # 조회한 종목만 저장 예약
+            self.save_monitoring_stocks(codes=scheduled_stocks)
             
         except Exception as e:
             logger.error(f"실시간 전체 업데이트 실패: {e}")
@@ -1106,8 +1885,9 @@ class StockMonitor:
         try:
             today = datetime.now().date()
             
-            # 이미 오늘 보고서를 발송했다면 스킵
-            if self.last_daily_report_date == today:
+            # 이미 오늘 보고서를 발송했다면 스킵 (재시작 후에도 발송 상태 저장소로 확인)
+            if self.alert_state.was_sent(SYSTEM_KEY, 'daily_report'):
+                self.last_daily_report_date = today
                 return
             
             logger.info("일일 주식 모니터링 보고서 생성 시작")
@@ -1119,6 +1899,7 @@ class StockMonitor:
             success = self._send_daily_report_email(report_data)
             
             if success:
+                self.alert_state.mark_sent(SYSTEM_KEY, 'daily_report')
                 self.last_daily_report_date = today
                 logger.info("일일 보고서 발송 완료")
             else:
@@ -1140,6 +1921,15 @@ class StockMonitor:
             'summary': {}
         }
         
+        # 장중 요약 (세션 집계 우선, 재시작 등으로 집계가 없으면 틱 아카이브 요약)
+        session = self.session_stats.get_all() if self.session_stats.trading_date == today else {}
+        intraday_summary = {}
+        if not session:
+            try:
+                intraday_summary = self.tick_archive.daily_summary(today)
+            except Exception as e:
+                logger.error(f"장중 틱 요약 조회 실패: {e}")
+        
         # 각 종목별 분석
         for code, info in self.monitoring_stocks.items():
             if not info.get('enabled', True):
@@ -1156,6 +1946,17 @@ class StockMonitor:
                 'category': info.get('category', '주식')
             }
             
+            intraday = session.get(code) or intraday_summary.get(code)
+            if intraday:
+                stock_data.update({
+                    'day_high': intraday['high'],
+                    'day_low': intraday['low'],
+                    'intraday_range_percent': round((intraday['high'] - intraday['low']) / intraday['low'] * 100, 2) if intraday['low'] else 0.0,
+                    'ticks': intraday['ticks']
+                })
+                if intraday.get('vwap') is not None:
+                    stock_data['vwap'] = intraday['vwap']
+            
             # 상승/하락 분류 (3% 이상)
             if change_percent >= 3.0:
                 report_data['gainers'].append(stock_data)
@@ -1175,7 +1976,8 @@ class StockMonitor:
         report_data['summary'] = {
             'gainers_count': len(report_data['gainers']),
             'losers_count': len(report_data['losers']),
-            'alerts_count': len(report_data['alert_triggered'])
+            'alerts_count': len(report_data['alert_triggered']),
+            'archived_ticks': sum(s['ticks'] for s in (session or intraday_summary).values())
         }
         
         return report_data
@@ -1210,7 +2012,7 @@ class StockMonitor:
         """
         
         for stock in report_data['gainers']:
-            html += f"<li><strong>{stock['name']} ({stock['code']})</strong>: {stock['current_price']:,}원 (+{stock['change_percent']:.2f}%)</li>"
+            html += f"<li><strong>{stock['name']} ({stock['code']})</strong>: {stock['current_price']:,}원 (+{stock['change_percent']:.2f}%){self._report_range_text(stock)}</li>"
         
         if not report_data['gainers']:
             html += "<li>3% 이상 상승한 종목이 없습니다.</li>"
@@ -1223,7 +2025,7 @@ class StockMonitor:
         """
         
         for stock in report_data['losers']:
-            html += f"<li><strong>{stock['name']} ({stock['code']})</strong>: {stock['current_price']:,}원 ({stock['change_percent']:.2f}%)</li>"
+            html += f"<li><strong>{stock['name']} ({stock['code']})</strong>: {stock['current_price']:,}원 ({stock['change_percent']:.2f}%){self._report_range_text(stock)}</li>"
         
         if not report_data['losers']:
             html += "<li>3% 이상 하락한 종목이 없습니다.</li>"
@@ -1251,278 +2053,157 @@ class StockMonitor:
         
         return html
     
+    @staticmethod
+    def _report_range_text(stock: Dict) -> str:
+        """보고서 종목 줄의 장중 고가/저가/VWAP 표시"""
+        if 'day_high' not in stock:
+            return ""
+        text = f" - 고가 {stock['day_high']:,.0f} / 저가 {stock['day_low']:,.0f}"
+        if stock.get('vwap') is not None:
+            text += f" / VWAP {stock['vwap']:,.0f}"
+        return text
+    
+    def get_session_stats(self, stock_code: str = None) -> Dict:
+        """당일 세션 집계 (stock_code 지정 시 해당 종목만)"""
+        if stock_code:
+            aggregate = self.session_stats.get(stock_code)
+            return {stock_code: aggregate} if aggregate else {}
+        return self.session_stats.get_all()
+    
+    def get_top_movers(self, k: int = 10) -> Dict:
+        """당일 등락률 상/하위 k개 종목 (종목명 포함)"""
+        movers = self.session_stats.top_movers(k)
+        for rows in movers.values():
+            for row in rows:
+                row['name'] = self.monitoring_stocks.get(row['stock_code'], {}).get('name', row['stock_code'])
+        return movers
+    
+    def get_market_index_status(self) -> Dict:
+        """KOSPI/KOSDAQ 지수 수준/등락률과 종목별 추정 베타"""
+        return self.market_index.get_status()
+    
+    def get_scanner_results(self) -> Optional[Dict]:
+        """마지막 전체 시장 스캔 결과 (종목명 포함, 스캔 전이면 None)"""
+        result = self.market_scanner.get_last_result()
+        if result is None:
+            return None
+        hits = [{**hit, 'name': self.ticker_master.get_name(hit['stock_code']) or hit['stock_code']}
+                for hit in result['hits']]
+        return {**result, 'hits': hits}
+    
+    def get_portfolio_snapshot(self) -> Dict:
+        """보유 포지션 손익/노출 스냅샷 (마지막 가격 갱신 시 계산된 결과, 포지션 변경 시에만 재구성)"""
+        self.portfolio.sync(self.monitoring_stocks)
+        names = {code: info.get('name', code) for code, info in self.monitoring_stocks.items()}
+        return self.portfolio.get_snapshot(names)
+    
+    def set_mezzanine_terms(self, stock_code: str, data: Dict) -> Dict:
+        """
+        종목 메자닌 발행 조건 설정 (리픽싱 적용 이력은 초기화)
+        
+        Raises:
+            KeyError: 모니터링 종목이 아닌 경우
+            ValueError: 발행 조건이 유효하지 않은 경우
+        """
+        stock_info = self.monitoring_stocks.get(stock_code)
+        if stock_info is None:
+            raise KeyError(stock_code)
+        
+        terms = parse_terms(data)
+        stock_info['mezzanine'] = terms
+        stock_info['conversion_price'] = terms['conversion_price']
+        self.mezzanine.sync(self.monitoring_stocks)
+        
+        self.save_monitoring_stocks(codes=[stock_code])
+        logger.info(f"메자닌 발행 조건 설정: {stock_info.get('name', stock_code)} ({stock_code}) - "
+                    f"{terms['type']} 전환가 {terms['conversion_price']:,.0f}원, 리픽싱 {len(terms['refix_dates'])}회")
+        return terms
+    
+    def get_stock_indicators(self, stock_code: str) -> Optional[Dict]:
+        """종목 기술적 지표 상태 (이동평균/거래량 통계/전일 종가/갭, 상태가 없으면 None)"""
+        return self.indicators.get(stock_code)
+    
+    def get_mezzanine_results(self) -> List[Dict]:
+        """메자닌 종목별 유효 전환가/패리티/다음 리픽싱 (종목명 포함)"""
+        self.mezzanine.sync(self.monitoring_stocks)
+        results = self.mezzanine.get_results()
+        return [
+            {**result, 'name': self.monitoring_stocks.get(result['stock_code'], {}).get('name', result['stock_code'])}
+            for result in results
+        ]
+    
     def get_monitoring_status(self) -> Dict:
         """모니터링 상태 정보 반환"""
+        trading_status_counts = {}
+        for info in self.monitoring_stocks.values():
+            status = info.get('trading_status', TRADING_STATUS_UNKNOWN)
+            trading_status_counts[status] = trading_status_counts.get(status, 0) + 1
+        
         return {
             'is_monitoring': self.is_monitoring,
             'is_market_open': self.is_market_open(),
             'monitor_interval': self.monitor_interval,
             'active_stocks_count': len([s for s in self.monitoring_stocks.values() if s.get('enabled', True)]),
             'total_stocks_count': len(self.monitoring_stocks),
+            'trading_status_counts': trading_status_counts,
+            'price_series': self.price_series.get_stats(),
+            'tick_archive': self.tick_archive.get_stats(),
+            'alert_engine': self.alert_engine.get_stats(),
+            'price_cycle': self.price_cycle.get_stats(),
+            'persistence': self.stock_store.get_stats(),
+            'alert_journal': self.alert_journal.get_stats(),
+            'alert_history': self.alert_history.get_stats(),
+            'alert_state': self.alert_state.get_stats(),
+            'session_stats': self.session_stats.get_stats(),
+            'portfolio': self.portfolio.get_stats(),
+            'mezzanine': self.mezzanine.get_stats(),
+            'indicators': self.indicators.get_stats(),
+            'expressions': self.expressions.get_stats(),
+            'scanner': self.market_scanner.get_stats(),
+            'market_index': self.market_index.get_stats(),
             'last_daily_report_date': self.last_daily_report_date.isoformat() if self.last_daily_report_date else None
         }
     
     def save_daily_alert(self, stock_code: str, stock_name: str, alert_type: str, message: str, 
                          current_price: int = 0, change_percent: float = 0.0) -> bool:
-        """일일 알림 내역 저장"""
-        try:
-            today = datetime.now().strftime('%Y-%m-%d')
-            current_time = datetime.now().strftime('%H:%M:%S')
-            
-            # 기존 일일 내역 로드
-            daily_history = self.load_daily_history()
-            
-            # 오늘 날짜 키가 없으면 생성
-            if today not in daily_history['alerts']:
-                daily_history['alerts'][today] = []
-            
-            # 새 알림 내역 추가
-            alert_entry = {
-                'time': current_time,
-                'stock_code': stock_code,
-                'stock_name': stock_name,
-                'alert_type': alert_type,
-                'message': message,
-                'current_price': current_price,
-                'change_percent': change_percent,
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            daily_history['alerts'][today].append(alert_entry)
-            
-            # 7일 이전 데이터 정리 (옵션)
-            self._cleanup_old_alerts(daily_history, days_to_keep=7)
-            
-            # 파일에 저장
-            with FileLock(self.daily_history_lock_file):
-                with open(self.daily_history_file, 'w', encoding='utf-8') as f:
-                    json.dump(daily_history, f, ensure_ascii=False, indent=2)
-            
-            logger.debug(f"일일 알림 내역 저장: {stock_name} - {alert_type}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"일일 알림 내역 저장 실패: {e}")
+        """일일 알림 내역 저장 (당일 저널 파일에 한 줄 추가)"""
+        now = datetime.now()
+        alert_entry = {
+            'time': now.strftime('%H:%M:%S'),
+            'stock_code': stock_code,
+            'stock_name': stock_name,
+            'alert_type': alert_type,
+            'message': message,
+            'current_price': current_price,
+            'change_percent': change_percent,
+            'timestamp': now.isoformat()
+        }
+        
+        if not self.alert_journal.append(alert_entry, when=now):
             return False
+        self.alert_history.record(alert_entry)
+        
+        logger.debug(f"일일 알림 내역 저장: {stock_name} - {alert_type}")
+        return True
     
-    def load_daily_history(self) -> Dict:
-        """일일 내역 데이터 로드"""
-        try:
-            if os.path.exists(self.daily_history_file):
-                with FileLock(self.daily_history_lock_file):
-                    with open(self.daily_history_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        
-                        # 기본 구조 확인 및 초기화
-                        if 'alerts' not in data:
-                            data['alerts'] = {}
-                        if 'description' not in data:
-                            data['description'] = "일일 알림 내역 저장 파일"
-                        if 'version' not in data:
-                            data['version'] = "1.0"
-                        
-                        return data
-            else:
-                # 기본 구조로 초기화
-                default_data = {
-                    "description": "일일 알림 내역 저장 파일",
-                    "version": "1.0",
-                    "alerts": {}
-                }
-                
-                with FileLock(self.daily_history_lock_file):
-                    with open(self.daily_history_file, 'w', encoding='utf-8') as f:
-                        json.dump(default_data, f, ensure_ascii=False, indent=2)
-                
-                return default_data
-                
-        except Exception as e:
-            logger.error(f"일일 내역 데이터 로드 실패: {e}")
-            return {
-                "description": "일일 알림 내역 저장 파일",
-                "version": "1.0",
-                "alerts": {}
-            }
+    def query_alert_history(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                            stock_code: Optional[str] = None, alert_type: Optional[str] = None,
+                            cursor: Optional[str] = None, limit: int = 100) -> Dict:
+        """알림 이력 기간/종목/유형 조회 (커서 페이지네이션, 형식이 잘못된 커서는 ValueError)"""
+        return self.alert_history.query(start, end, stock_code, alert_type, cursor, limit)
     
-    def _cleanup_old_alerts(self, daily_history: Dict, days_to_keep: int = 7):
-        """오래된 알림 내역 정리"""
-        try:
-            cutoff_date = datetime.now() - timedelta(days=days_to_keep)
-            cutoff_str = cutoff_date.strftime('%Y-%m-%d')
-            
-            dates_to_remove = []
-            for date_str in daily_history['alerts'].keys():
-                if date_str < cutoff_str:
-                    dates_to_remove.append(date_str)
-            
-            for date_str in dates_to_remove:
-                del daily_history['alerts'][date_str]
-                logger.debug(f"오래된 알림 내역 삭제: {date_str}")
-                
-        except Exception as e:
-            logger.warning(f"오래된 알림 내역 정리 중 오류: {e}")
+    def _import_journal_history(self):
+        """이력 저장소가 비어 있으면 보관 중인 저널 일자 파일을 옮겨 둔다"""
+        imported = 0
+        for day in sorted(self.alert_journal.days()):
+            imported += self.alert_history.import_entries(self.alert_journal.get_entries(day))
+        if imported:
+            logger.info(f"알림 저널 내역을 이력 저장소로 이관: {imported}건")
     
-    def check_parity_alerts(self, stock_code: str, stock_info: Dict, current_price: int, previous_price: int) -> bool:
-        """패리티 알림 체크 (메자닌 전용)"""
-        if stock_info.get('category') != '메자닌':
-            return False
-        
-        alert_settings = stock_info.get('alert_settings', {})
-        if not alert_settings.get('parity_enabled', True):
-            return False
-        
-        # 전환가격 확인
-        conversion_price = stock_info.get('acquisition_price', 0)  # 취득가를 전환가격으로 사용
-        if conversion_price <= 0:
-            return False
-        
-        triggered_alerts = stock_info.get('triggered_alerts', set())
-        alert_triggered = False
-        
-        # 패리티 임계값들 체크 (80%, 100%, 120%)
-        parity_thresholds = [80, 100, 120]
-        
-        for threshold in parity_thresholds:
-            alert_id = f"parity_{threshold}"
-            if alert_id in triggered_alerts:
-                continue
-            
-            # 패리티 계산
-            current_parity = (current_price / conversion_price) * 100
-            previous_parity = (previous_price / conversion_price) * 100 if previous_price > 0 else 0
-            
-            # 임계값 도달 체크
-            if current_parity >= threshold and previous_parity < threshold:
-                stock_name = stock_info.get('name', stock_code)
-                
-                # 확장된 패리티 알림 발송
-                success = send_parity_alert_enhanced(
-                    stock_name, stock_code, current_price, threshold, conversion_price
-                )
-                
-                if success:
-                    # 트리거된 알림 기록
-                    triggered_alerts.add(alert_id)
-                    
-                    # 일일 내역 저장
-                    self.save_daily_alert(
-                        stock_code, stock_name, f"패리티_{threshold}%", 
-                        f"패리티 {threshold}% 도달", current_price, 0.0
-                    )
-                    
-                    alert_triggered = True
-                    logger.info(f"패리티 알림 발송: {stock_name} - {threshold}%")
-        
-        return alert_triggered
+    def get_daily_alerts(self, target_date: str = None, stock_code: str = None) -> List[Dict]:
+        """일자별 저널 알림 내역 (target_date: YYYY-MM-DD, 기본 오늘)"""
+        return self.alert_journal.get_entries(target_date, stock_code)
     
-    def check_target_stop_alerts(self, stock_code: str, stock_info: Dict, current_price: int, previous_price: int) -> bool:
-        """목표가/손절가 알림 체크"""
-        alert_settings = stock_info.get('alert_settings', {})
-        if not alert_settings.get('target_stop_enabled', True):
-            return False
-        
-        triggered_alerts = stock_info.get('triggered_alerts', set())
-        alert_triggered = False
-        stock_name = stock_info.get('name', stock_code)
-        acquisition_price = stock_info.get('acquisition_price', 0)
-        
-        # 목표가 체크
-        target_price = stock_info.get('target_price', 0)
-        if target_price > 0:
-            alert_id = f"target_price_{target_price}"
-            if alert_id not in triggered_alerts:
-                if current_price >= target_price and previous_price < target_price:
-                    success = send_target_stop_alert_enhanced(
-                        stock_name, stock_code, current_price, target_price, 
-                        "target_price", acquisition_price
-                    )
-                    
-                    if success:
-                        triggered_alerts.add(alert_id)
-                        self.save_daily_alert(
-                            stock_code, stock_name, "목표가_달성", 
-                            f"목표가 {target_price:,}원 달성", current_price
-                        )
-                        alert_triggered = True
-                        logger.info(f"목표가 알림 발송: {stock_name} - {target_price:,}원")
-        
-        # 손절가 체크
-        stop_loss = stock_info.get('stop_loss', 0)
-        if stop_loss > 0:
-            alert_id = f"stop_loss_{stop_loss}"
-            if alert_id not in triggered_alerts:
-                if current_price <= stop_loss and previous_price > stop_loss:
-                    success = send_target_stop_alert_enhanced(
-                        stock_name, stock_code, current_price, stop_loss, 
-                        "stop_loss", acquisition_price
-                    )
-                    
-                    if success:
-                        triggered_alerts.add(alert_id)
-                        self.save_daily_alert(
-                            stock_code, stock_name, "손절가_도달", 
-                            f"손절가 {stop_loss:,}원 도달", current_price
-                        )
-                        alert_triggered = True
-                        logger.info(f"손절가 알림 발송: {stock_name} - {stop_loss:,}원")
-        
-        return alert_triggered
-    
-    def check_volatility_alerts(self, stock_code: str, stock_info: Dict, current_price: int) -> bool:
-        """급등급락 알림 체크"""
-        alert_settings = stock_info.get('alert_settings', {})
-        if not alert_settings.get('volatility_enabled', True):
-            return False
-        
-        change_percent = stock_info.get('change_percent', 0.0)
-        triggered_alerts = stock_info.get('triggered_alerts', set())
-        alert_triggered = False
-        stock_name = stock_info.get('name', stock_code)
-        
-        # 급등 체크
-        surge_threshold = alert_settings.get('surge_threshold', 5.0)
-        surge_alert_id = f"surge_{datetime.now().strftime('%Y%m%d')}"
-        
-        if (change_percent >= surge_threshold and 
-            surge_alert_id not in triggered_alerts):
-            
-            success = send_volatility_alert(
-                stock_name, stock_code, current_price, change_percent, 
-                "surge", surge_threshold
-            )
-            
-            if success:
-                triggered_alerts.add(surge_alert_id)
-                self.save_daily_alert(
-                    stock_code, stock_name, "급등", 
-                    f"일일 급등 {change_percent:+.2f}%", current_price, change_percent
-                )
-                alert_triggered = True
-                logger.info(f"급등 알림 발송: {stock_name} - {change_percent:+.2f}%")
-        
-        # 급락 체크
-        drop_threshold = alert_settings.get('drop_threshold', -5.0)
-        drop_alert_id = f"drop_{datetime.now().strftime('%Y%m%d')}"
-        
-        if (change_percent <= drop_threshold and 
-            drop_alert_id not in triggered_alerts):
-            
-            success = send_volatility_alert(
-                stock_name, stock_code, current_price, change_percent, 
-                "drop", drop_threshold
-            )
-            
-            if success:
-                triggered_alerts.add(drop_alert_id)
-                self.save_daily_alert(
-                    stock_code, stock_name, "급락", 
-                    f"일일 급락 {change_percent:+.2f}%", current_price, change_percent
-                )
-                alert_triggered = True
-                logger.info(f"급락 알림 발송: {stock_name} - {change_percent:+.2f}%")
-        
-        return alert_triggered
-
     def get_daily_alert_history(self, target_date: str = None) -> Dict:
         """일일 알림 내역 조회"""
         if target_date is None:
@@ -1530,6 +2211,7 @@ class StockMonitor:
         
         alert_history = {
             'date': target_date,
+            'journal_alerts': [],
             'stock_alerts': [],
             'price_alerts': [],
             'daily_reports': [],
@@ -1541,6 +2223,9 @@ class StockMonitor:
         }
         
         try:
+            # 저널에 기록된 당일 알림
+            alert_history['journal_alerts'] = self.get_daily_alerts(target_date)
+            
             # 종목별 트리거된 알림 수집
             for code, info in self.monitoring_stocks.items():
                 triggered_alerts = info.get('triggered_alerts', set())
@@ -1605,9 +2290,9 @@ stock_monitor = StockMonitor()
 
 @performance_monitor('주식 가격 업데이트')
 @log_exception('stock')
-def update_all_stocks() -> Dict[str, Dict]:
+def update_all_stocks(force: bool = False) -> Dict[str, Dict]:
     """모든 종목 가격 업데이트 (편의 함수)"""
-    return stock_monitor.update_all_stocks()
+    return stock_monitor.update_all_stocks(force=force)
 
 def get_monitoring_stocks() -> Dict:
     """모니터링 종목 목록 조회 (편의 함수)"""
@@ -1621,9 +2306,10 @@ def add_monitoring_stock(stock_code: str,
                         acquisition_price: float = 0,
                         alert_settings: Dict = None,
                         memo: str = '',
-                        conversion_price: float = 0) -> bool:
+                        conversion_price: float = 0,
+                        quantity: float = 0) -> bool:
     """모니터링 종목 추가 (편의 함수)"""
-    return stock_monitor.add_stock(stock_code, stock_name, target_price, stop_loss, category, acquisition_price, alert_settings, memo, conversion_price)
+    return stock_monitor.add_stock(stock_code, stock_name, target_price, stop_loss, category, acquisition_price, alert_settings, memo, conversion_price, quantity)
 
 def update_monitoring_stock(stock_code: str, **kwargs) -> bool:
     """모니터링 종목 정보 업데이트 (편의 함수)"""
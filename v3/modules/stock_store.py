@@ -0,0 +1,227 @@
+"""
+모니터링 종목 저장소 모듈
+종목별 변경(dirty) 추적 + 지연 병합 백그라운드 기록으로 monitoring_stocks.json을 유지
+변경된 종목만 다시 직렬화하고, 파일은 임시 파일 기록 후 이름 바꾸기로 원자적으로 교체
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from filelock import FileLock
+
+from .config import STOCK_SAVE_DELAY_SECONDS
+from .logger_utils import get_logger
+
+logger = get_logger('stock')
+
+
+def serialize_stock(info: Dict) -> str:
+    """종목 레코드 직렬화 (set -> 정렬 list, 한 줄 JSON)"""
+    record = dict(info)
+    if isinstance(record.get('triggered_alerts'), set):
+        record['triggered_alerts'] = sorted(record['triggered_alerts'])
+    return json.dumps(record, ensure_ascii=False, default=str)
+
+
+class StockStore:
+    """
+    monitoring_stocks.json 지연 기록 저장소
+
+    파일 형식은 {종목코드: 종목정보} 단일 스키마이며 종목당 한 줄로 기록한다.
+    mark_dirty()는 변경 종목만 표시하고, 기록 스레드가 STOCK_SAVE_DELAY_SECONDS 동안 변경을 모아
+    해당 종목만 다시 직렬화한 뒤 캐시된 나머지 종목 조각과 합쳐 파일을 교체한다.
+    """
+
+    def __init__(self, path: str, delay: float = STOCK_SAVE_DELAY_SECONDS):
+        self.path = path
+        self.lock_file = path + '.lock'
+        self.delay = delay
+
+        self._data: Optional[Dict[str, Dict]] = None
+        self._fragments: Dict[str, str] = {}
+        self._dirty = set()
+        self._all_dirty = False
+        self._lock = threading.Lock()          # dirty 집합 보호
+        self._flush_lock = threading.Lock()    # 기록 직렬화
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._closed = False
+
+        self.stats = {
+            'flushes': 0,
+            'records_serialized': 0,
+            'last_flush_at': None,
+            'last_flush_records': 0,
+            'last_flush_duration': None,
+            'last_file_bytes': 0,
+            'failures': 0,
+            'last_error': None
+        }
+        atexit.register(self.close)
+
+    # === 로드 / 연결 ===
+
+    def load(self) -> Tuple[Optional[Dict[str, Dict]], bool]:
+        """
+        파일 로드
+
+        Returns:
+            (종목 데이터 또는 None(파일 없음), 표준 스키마 여부)
+            이전 메타데이터 포함 형식({'_metadata', 'stocks'})은 종목 부분만 꺼내고 False 반환
+        """
+        if not os.path.exists(self.path):
+            return None, True
+        with FileLock(self.lock_file):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        if isinstance(data.get('stocks'), dict) and '_metadata' in data:
+            return data['stocks'], False
+        return data, True
+
+    def attach(self, data: Dict[str, Dict]):
+        """기록 대상 종목 딕셔너리 연결 (이후 mark_dirty는 이 딕셔너리 기준)"""
+        with self._lock:
+            self._data = data
+            self._fragments = {}
+            self._all_dirty = True
+
+    # === 변경 표시 / 기록 ===
+
+    def mark_dirty(self, codes: Optional[Iterable[str]] = None):
+        """변경 종목 표시 (codes 생략 시 전체) 후 지연 기록 예약"""
+        with self._lock:
+            if codes is None:
+                self._all_dirty = True
+            else:
+                self._dirty.update(codes)
+            if not self._all_dirty and not self._dirty:
+                return
+        self._ensure_writer()
+        self._wakeup.set()
+
+    def has_pending(self) -> bool:
+        with self._lock:
+            return self._all_dirty or bool(self._dirty)
+
+    def flush(self) -> int:
+        """
+        변경 종목 즉시 기록
+
+        Returns:
+            int: 다시 직렬화한 종목 수 (변경이 없으면 0, 파일도 건드리지 않음)
+        """
+        with self._flush_lock:
+            with self._lock:
+                if self._data is None or (not self._all_dirty and not self._dirty):
+                    return 0
+                data = self._data
+                codes = list(data) if self._all_dirty else list(self._dirty)
+                self._dirty = set()
+                self._all_dirty = False
+
+            started = time.time()
+            failed = []
+            for code in codes:
+                info = data.get(code)
+                if info is None:
+                    self._fragments.pop(code, None)  # 삭제된 종목
+                    continue
+                try:
+                    self._fragments[code] = serialize_stock(info)
+                except (RuntimeError, TypeError, ValueError) as e:
+                    # 직렬화 중 레코드가 바뀐 경우 등 - 다음 기록에서 재시도
+                    logger.debug(f"종목 레코드 직렬화 재시도 예정: {code} - {e}")
+                    failed.append(code)
+
+            # 외부에서 직접 삭제된 종목 정리
+            for code in [code for code in self._fragments if code not in data]:
+                self._fragments.pop(code, None)
+
+            try:
+                size = self._write(self._fragments)
+            except Exception as e:
+                failed = codes
+                self.stats['failures'] += 1
+                self.stats['last_error'] = str(e)
+                logger.error(f"모니터링 종목 저장 실패: {e}")
+                size = None
+
+            if failed:
+                self.mark_dirty(failed)
+
+            serialized = len(codes) - len(failed)
+            if size is not None:
+                self.stats['flushes'] += 1
+                self.stats['records_serialized'] += serialized
+                self.stats['last_flush_at'] = datetime.now().isoformat()
+                self.stats['last_flush_records'] = serialized
+                self.stats['last_flush_duration'] = round(time.time() - started, 4)
+                self.stats['last_file_bytes'] = size
+                logger.debug(f"모니터링 종목 저장: {serialized}/{len(self._fragments)}개 종목 갱신")
+            return serialized
+
+    def write_all(self, data: Dict[str, Dict]):
+        """연결과 무관하게 전체 데이터를 즉시 기록 (초기 기본 데이터 생성용)"""
+        with self._flush_lock:
+            self._write({code: serialize_stock(info) for code, info in data.items()})
+
+    def _write(self, fragments: Dict[str, str]) -> int:
+        """종목 조각을 합쳐 임시 파일에 기록 후 원자적 교체, 기록 바이트 수 반환"""
+        lines = [f"{json.dumps(code)}: {fragment}" for code, fragment in fragments.items()]
+        content = '{\n' + ',\n'.join(lines) + '\n}\n' if lines else '{}\n'
+        encoded = content.encode('utf-8')
+
+        tmp_path = f"{self.path}.tmp"
+        with FileLock(self.lock_file):
+            with open(tmp_path, 'wb') as f:
+                f.write(encoded)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        return len(encoded)
+
+    # === 기록 스레드 ===
+
+    def _ensure_writer(self):
+        if self._thread is not None or self._closed:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._writer_loop, name='stock-store-writer', daemon=True)
+                self._thread.start()
+
+    def _writer_loop(self):
+        while not self._closed:
+            self._wakeup.wait()
+            if self._closed:
+                break
+            # 지연 시간 동안 들어온 변경을 한 번에 기록
+            time.sleep(self.delay)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"모니터링 종목 기록 스레드 오류: {e}")
+
+    def close(self):
+        """대기 중인 변경 기록 후 기록 스레드 종료"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self.flush()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            pending = len(self._data or {}) if self._all_dirty else len(self._dirty)
+        return {
+            'path': self.path,
+            'delay_seconds': self.delay,
+            'pending_records': pending,
+            'cached_records': len(self._fragments),
+            **self.stats
+        }
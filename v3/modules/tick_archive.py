@@ -0,0 +1,354 @@
+"""
+틱 아카이브 모듈
+거래일별 고정 폭 레코드 추가 전용 파일에 장중 틱을 기록하고, 장 마감 후 컬럼형(.npy) 파일로 압축하여
+np.memmap으로 파싱 없이 조회
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+from filelock import FileLock
+
+from .config import (
+    TICK_ARCHIVE_DIR,
+    TICK_ARCHIVE_FLUSH_TICKS,
+    TICK_ARCHIVE_FLUSH_SECONDS
+)
+from .logger_utils import get_logger
+
+logger = get_logger('stock')
+
+# 추가 전용 레코드 (28바이트 고정 폭)
+RECORD_DTYPE = np.dtype([
+    ('ticker', '<u4'),   # 종목 ID (tickers.json)
+    ('ts', '<f8'),       # epoch 초
+    ('price', '<f8'),
+    ('volume', '<f8')    # 누적 거래량
+])
+COLUMNS = ('ticker', 'ts', 'price', 'volume')
+
+
+def _day_key(day: date) -> str:
+    return day.strftime('%Y%m%d')
+
+
+def _empty_columns() -> Dict[str, np.ndarray]:
+    return {name: np.empty(0, dtype=RECORD_DTYPE[name]) for name in COLUMNS}
+
+
+class TickArchive:
+    """
+    거래일별 틱 저장소
+
+    장중: {dir}/YYYYMMDD.ticks (RECORD_DTYPE 레코드 연속 기록)
+    압축 후: {dir}/YYYYMMDD/{ticker,ts,price,volume}.npy (종목/시각 정렬) + index.json (종목별 구간)
+
+    압축 이후 도착한 틱(장 마감 후 갱신, 강제 갱신)은 다시 .ticks 파일에 쌓이고,
+    조회 시 압축본과 함께 읽으며 다음 압축 때 기존 컬럼과 병합한다.
+    """
+
+    def __init__(self, base_dir: str = TICK_ARCHIVE_DIR):
+        self.base_dir = base_dir
+        self.tickers_file = os.path.join(base_dir, 'tickers.json')
+        self.lock_file = os.path.join(base_dir, 'archive.lock')
+
+        self.ticker_ids: Dict[str, int] = {}
+        self.ticker_codes: Dict[int, str] = {}
+
+        self._buffer: List[tuple] = []
+        self._buffer_day: Optional[date] = None
+        self._last_flush = time.time()
+        self._lock = threading.RLock()
+
+        os.makedirs(base_dir, exist_ok=True)
+        self._load_tickers()
+
+    # === 경로 ===
+
+    def _row_file(self, day: date) -> str:
+        return os.path.join(self.base_dir, f"{_day_key(day)}.ticks")
+
+    def _column_dir(self, day: date) -> str:
+        return os.path.join(self.base_dir, _day_key(day))
+
+    def is_compacted(self, day: date) -> bool:
+        """해당 거래일 압축 완료 여부"""
+        return os.path.exists(os.path.join(self._column_dir(day), 'index.json'))
+
+    # === 종목 ID ===
+
+    def _load_tickers(self):
+        if not os.path.exists(self.tickers_file):
+            return
+        try:
+            with open(self.tickers_file, 'r', encoding='utf-8') as f:
+                self.ticker_ids = json.load(f)
+            self.ticker_codes = {ticker_id: code for code, ticker_id in self.ticker_ids.items()}
+        except Exception as e:
+            logger.error(f"틱 아카이브 종목 ID 로드 실패: {e}")
+
+    def _ticker_id(self, stock_code: str) -> int:
+        """종목 ID 조회/발급 (발급된 ID는 변경하지 않음)"""
+        ticker_id = self.ticker_ids.get(stock_code)
+        if ticker_id is None:
+            ticker_id = len(self.ticker_ids)
+            self.ticker_ids[stock_code] = ticker_id
+            self.ticker_codes[ticker_id] = stock_code
+            tmp_file = self.tickers_file + '.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.ticker_ids, f)
+            os.replace(tmp_file, self.tickers_file)
+        return ticker_id
+
+    # === 기록 ===
+
+    def append(self, stock_code: str, timestamp: float, price: float, volume: Optional[float] = None):
+        """틱 추가 (메모리 버퍼에 모았다가 일정 개수/시간마다 파일 끝에 기록)"""
+        day = datetime.fromtimestamp(timestamp).date()
+
+        with self._lock:
+            if self._buffer_day is not None and day != self._buffer_day:
+                self.flush()
+                # 거래일이 바뀌면 이전 거래일을 압축
+                self.compact_pending(include_today=False)
+
+            self._buffer_day = day
+            self._buffer.append((self._ticker_id(stock_code), timestamp, price, volume or 0.0))
+
+            if (len(self._buffer) >= TICK_ARCHIVE_FLUSH_TICKS or
+                    time.time() - self._last_flush >= TICK_ARCHIVE_FLUSH_SECONDS):
+                self.flush()
+
+    def flush(self):
+        """버퍼를 거래일 파일 끝에 기록"""
+        with self._lock:
+            if not self._buffer:
+                return
+            records = np.array(self._buffer, dtype=RECORD_DTYPE)
+            try:
+                with FileLock(self.lock_file):
+                    with open(self._row_file(self._buffer_day), 'ab') as f:
+                        f.write(records.tobytes())
+                self._buffer = []
+                self._last_flush = time.time()
+            except Exception as e:
+                logger.error(f"틱 아카이브 기록 실패: {e}")
+
+    # === 압축 ===
+
+    def compact(self, day: date) -> bool:
+        """거래일 레코드 파일을 종목/시각 순 컬럼형 파일로 변환 후 원본 삭제 (기존 압축본이 있으면 병합)"""
+        row_file = self._row_file(day)
+        if not os.path.exists(row_file):
+            return False
+
+        with self._lock:
+            if self._buffer_day == day:
+                self.flush()
+
+            try:
+                with FileLock(self.lock_file):
+                    records = self._map_rows(row_file)
+                    if self.is_compacted(day):
+                        records = np.concatenate([self._load_compacted(day), records])
+                    order = np.lexsort((records['ts'], records['ticker']))
+                    records = records[order]
+
+                    tmp_dir = self._column_dir(day) + '.tmp'
+                    shutil.rmtree(tmp_dir, ignore_errors=True)
+                    os.makedirs(tmp_dir)
+                    for name in COLUMNS:
+                        np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(records[name]))
+
+                    tickers, starts, counts = np.unique(records['ticker'], return_index=True, return_counts=True)
+                    index = {
+                        self.ticker_codes.get(int(ticker_id), str(ticker_id)): [int(start), int(start + count)]
+                        for ticker_id, start, count in zip(tickers, starts, counts)
+                    }
+                    with open(os.path.join(tmp_dir, 'index.json'), 'w', encoding='utf-8') as f:
+                        json.dump(index, f)
+
+                    shutil.rmtree(self._column_dir(day), ignore_errors=True)
+                    os.replace(tmp_dir, self._column_dir(day))
+                    os.remove(row_file)
+
+                logger.info(f"틱 아카이브 압축 완료: {_day_key(day)} - {len(records)}틱, {len(index)}개 종목")
+                return True
+
+            except Exception as e:
+                logger.error(f"틱 아카이브 압축 실패 ({_day_key(day)}): {e}")
+                return False
+
+    def compact_pending(self, include_today: bool = True) -> int:
+        """압축되지 않은 거래일 파일 일괄 압축 (include_today=False면 오늘 파일 제외)"""
+        today = datetime.now().date()
+        compacted = 0
+        for name in sorted(os.listdir(self.base_dir)):
+            if not name.endswith('.ticks'):
+                continue
+            try:
+                day = datetime.strptime(name[:-len('.ticks')], '%Y%m%d').date()
+            except ValueError:
+                continue
+            if day < today or (include_today and day == today):
+                compacted += int(self.compact(day))
+        return compacted
+
+    # === 조회 ===
+
+    @staticmethod
+    def _map_rows(row_file: str) -> np.ndarray:
+        """레코드 파일 메모리 매핑 (기록 중인 마지막 불완전 레코드는 제외)"""
+        count = os.path.getsize(row_file) // RECORD_DTYPE.itemsize
+        if count == 0:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.memmap(row_file, dtype=RECORD_DTYPE, mode='r', shape=(count,))
+
+    def _load_compacted(self, day: date) -> np.ndarray:
+        """압축본 전체를 레코드 배열로 읽기 (재압축 병합용)"""
+        column_dir = self._column_dir(day)
+        columns = {name: np.load(os.path.join(column_dir, f"{name}.npy")) for name in COLUMNS}
+        records = np.empty(len(columns['ts']), dtype=RECORD_DTYPE)
+        for name in COLUMNS:
+            records[name] = columns[name]
+        return records
+
+    def _read_compacted(self, day: date, stock_code: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """압축본 조회 (종목 구간만 memmap 슬라이스)"""
+        column_dir = self._column_dir(day)
+        columns = {
+            name: np.load(os.path.join(column_dir, f"{name}.npy"), mmap_mode='r')
+            for name in COLUMNS
+        }
+        if stock_code is None:
+            return columns
+
+        with open(os.path.join(column_dir, 'index.json'), 'r', encoding='utf-8') as f:
+            span = json.load(f).get(stock_code)
+        if span is None:
+            return _empty_columns()
+        return {name: column[span[0]:span[1]] for name, column in columns.items()}
+
+    def _read_day(self, day: date, stock_code: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """하루치 틱 조회 (압축본 + 아직 압축되지 않은 레코드, 한쪽만 있으면 memmap 뷰 그대로)"""
+        rows = self._read_rows(day, stock_code)
+        if not self.is_compacted(day):
+            return rows
+
+        columns = self._read_compacted(day, stock_code)
+        if not len(rows['ts']):
+            return columns
+        if not len(columns['ts']):
+            return rows
+        return {name: np.concatenate([columns[name], rows[name]]) for name in COLUMNS}
+
+    def _read_rows(self, day: date, stock_code: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """미압축 레코드 조회 (레코드 memmap 필터)"""
+        row_file = self._row_file(day)
+        with self._lock:
+            if self._buffer_day == day:
+                self.flush()
+        if not os.path.exists(row_file):
+            return _empty_columns()
+
+        records = self._map_rows(row_file)
+        if stock_code is not None:
+            ticker_id = self.ticker_ids.get(stock_code)
+            if ticker_id is None:
+                return _empty_columns()
+            records = records[records['ticker'] == ticker_id]
+        return {name: records[name] for name in COLUMNS}
+
+    def read(self, start_date: date, end_date: Optional[date] = None, stock_code: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """
+        기간 틱 조회
+
+        Args:
+            start_date: 시작 거래일
+            end_date: 종료 거래일 (생략 시 시작일 하루)
+            stock_code: 종목 코드 (생략 시 전체 종목, 'ticker' 컬럼은 종목 ID)
+
+        Returns:
+            Dict: 컬럼명 -> 배열 (하루 범위면 memmap 뷰, 여러 날이면 연결된 배열)
+        """
+        end_date = end_date or start_date
+        parts = []
+        day = start_date
+        while day <= end_date:
+            part = self._read_day(day, stock_code)
+            if len(part['ts']):
+                parts.append(part)
+            day += timedelta(days=1)
+
+        if not parts:
+            return _empty_columns()
+        if len(parts) == 1:
+            return parts[0]
+        return {name: np.concatenate([part[name] for part in parts]) for name in COLUMNS}
+
+    def get_series(self, stock_code: str, start_date: date, end_date: Optional[date] = None, step: int = 1) -> Dict:
+        """차트용 종목 시계열 (step 간격으로 솎아냄)"""
+        columns = self.read(start_date, end_date, stock_code)
+        step = max(1, step)
+        return {
+            'stock_code': stock_code,
+            'count': int(len(columns['ts'])),
+            'timestamps': [datetime.fromtimestamp(ts).isoformat() for ts in columns['ts'][::step]],
+            'prices': np.asarray(columns['price'][::step]).tolist(),
+            'volumes': np.asarray(columns['volume'][::step]).tolist()
+        }
+
+    def daily_summary(self, day: date) -> Dict[str, Dict]:
+        """거래일 종목별 요약 (시가/고가/저가/종가/틱 수, 벡터 연산)"""
+        columns = self.read(day)
+        if not len(columns['ts']):
+            return {}
+
+        order = np.lexsort((columns['ts'], columns['ticker']))
+        tickers = np.asarray(columns['ticker'])[order]
+        prices = np.asarray(columns['price'])[order]
+        timestamps = np.asarray(columns['ts'])[order]
+
+        ticker_ids, starts, counts = np.unique(tickers, return_index=True, return_counts=True)
+        ends = starts + counts - 1
+        highs = np.maximum.reduceat(prices, starts)
+        lows = np.minimum.reduceat(prices, starts)
+
+        summary = {}
+        for i, ticker_id in enumerate(ticker_ids):
+            code = self.ticker_codes.get(int(ticker_id), str(ticker_id))
+            summary[code] = {
+                'open': float(prices[starts[i]]),
+                'high': float(highs[i]),
+                'low': float(lows[i]),
+                'close': float(prices[ends[i]]),
+                'ticks': int(counts[i]),
+                'first_tick': datetime.fromtimestamp(timestamps[starts[i]]).isoformat(),
+                'last_tick': datetime.fromtimestamp(timestamps[ends[i]]).isoformat()
+            }
+        return summary
+
+    def get_stats(self) -> Dict:
+        """아카이브 상태 (보관 거래일, 디스크 사용량)"""
+        compacted, pending, total_bytes = [], [], 0
+        for name in os.listdir(self.base_dir):
+            path = os.path.join(self.base_dir, name)
+            if name.endswith('.ticks'):
+                pending.append(name[:-len('.ticks')])
+                total_bytes += os.path.getsize(path)
+            elif os.path.isdir(path) and os.path.exists(os.path.join(path, 'index.json')):
+                compacted.append(name)
+                total_bytes += sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+        return {
+            'compacted_days': sorted(compacted),
+            'pending_days': sorted(pending),
+            'tickers': len(self.ticker_ids),
+            'buffered_ticks': len(self._buffer),
+            'disk_bytes': total_bytes
+        }
@@ -0,0 +1,252 @@
+"""
+종목 마스터 모듈
+KRX 종목 목록을 일괄 조회하여 종목코드/종목명/시장/상장 상태를 로컬에 보관하고,
+종목명·유효성 조회를 네트워크 없이 메모리에서 처리
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from filelock import FileLock
+
+from .config import (
+    TICKER_MASTER_FILE,
+    TICKER_MASTER_MARKETS,
+    TICKER_MASTER_INCLUDE_ETF,
+    TICKER_MASTER_REFRESH_HOUR,
+    TICKER_MASTER_RETRY_SECONDS
+)
+from .logger_utils import get_logger
+
+# PyKrx 가용성 확인
+try:
+    from pykrx import stock
+    PYKRX_AVAILABLE = True
+except ImportError:
+    PYKRX_AVAILABLE = False
+
+logger = get_logger('stock')
+
+# 상장 상태
+STATUS_LISTED = 'listed'
+STATUS_DELISTED = 'delisted'
+
+
+class TickerMaster:
+    """종목 마스터 (code -> {'name', 'market', 'status'})"""
+
+    def __init__(self, file_path: str = TICKER_MASTER_FILE):
+        self.file_path = file_path
+        self.lock_file = file_path + '.lock'
+        self.tickers: Dict[str, Dict] = {}
+        self.built_date = None   # 마스터 생성 기준일 (YYYYMMDD)
+        self.updated_at = None
+        self.last_error = None
+        self.failed_at = None    # 마지막 갱신 실패 시각 (time.time(), 재시도 대기용)
+
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+        self.load()
+
+    def load(self):
+        """디스크에서 종목 마스터 로드"""
+        if not os.path.exists(self.file_path):
+            return
+
+        try:
+            with FileLock(self.lock_file):
+                with open(self.file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+
+            with self._lock:
+                self.tickers = data.get('tickers', {})
+                self.built_date = data.get('built_date')
+                self.updated_at = data.get('updated_at')
+
+            logger.info(f"종목 마스터 로드: {len(self.tickers)}개 종목 (기준일 {self.built_date})")
+
+        except Exception as e:
+            logger.error(f"종목 마스터 로드 실패: {e}")
+
+    def save(self):
+        """종목 마스터 저장"""
+        try:
+            with self._lock:
+                data = {
+                    'built_date': self.built_date,
+                    'updated_at': self.updated_at,
+                    'tickers': dict(self.tickers)
+                }
+
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            with FileLock(self.lock_file):
+                with open(self.file_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+
+        except Exception as e:
+            logger.error(f"종목 마스터 저장 실패: {e}")
+
+    def is_ready(self) -> bool:
+        """종목 마스터 사용 가능 여부"""
+        return bool(self.tickers)
+
+    def needs_refresh(self) -> bool:
+        """일일 갱신 필요 여부 (기준 시각 이후 당일 미갱신, 실패 후 재시도 대기 중이면 False)"""
+        if not PYKRX_AVAILABLE:
+            return False
+        if self.failed_at is not None and time.time() - self.failed_at < TICKER_MASTER_RETRY_SECONDS:
+            return False
+        if not self.tickers:
+            return True
+
+        now = datetime.now()
+        today = now.strftime('%Y%m%d')
+        return self.built_date != today and now.hour >= TICKER_MASTER_REFRESH_HOUR
+
+    def _fetch_listing(self) -> Dict[str, Dict]:
+        """
+        KRX 종목 목록 일괄 조회
+
+        pykrx의 종목명 조회는 최초 1회 전체 상장 목록을 받아 메모리에 두므로
+        종목별 추가 네트워크 호출이 발생하지 않는다.
+        """
+        date = datetime.now().strftime('%Y%m%d')
+        try:
+            date = stock.get_nearest_business_day_in_a_week(date)
+        except Exception as e:
+            logger.debug(f"최근 영업일 조회 실패, 당일 기준 사용: {e}")
+
+        listing = {}
+        for market in TICKER_MASTER_MARKETS:
+            for code in stock.get_market_ticker_list(date, market=market):
+                listing[code] = {
+                    'name': stock.get_market_ticker_name(code),
+                    'market': market,
+                    'status': STATUS_LISTED
+                }
+
+        if TICKER_MASTER_INCLUDE_ETF:
+            for market, list_func, name_func in (
+                ('ETF', stock.get_etf_ticker_list, stock.get_etf_ticker_name),
+                ('ETN', stock.get_etn_ticker_list, stock.get_etn_ticker_name)
+            ):
+                try:
+                    for code in list_func(date):
+                        listing[code] = {
+                            'name': name_func(code),
+                            'market': market,
+                            'status': STATUS_LISTED
+                        }
+                except Exception as e:
+                    logger.warning(f"{market} 종목 목록 조회 실패: {e}")
+
+        return listing
+
+    def refresh(self) -> bool:
+        """종목 마스터 재생성 (이전 목록에서 사라진 종목은 상장폐지로 표시)"""
+        if not PYKRX_AVAILABLE:
+            self.last_error = "PyKrx 라이브러리가 설치되지 않았습니다"
+            return False
+
+        try:
+            listing = self._fetch_listing()
+            if not listing:
+                self.last_error = "KRX 종목 목록이 비어 있습니다"
+                self.failed_at = time.time()
+                logger.warning(f"종목 마스터 갱신 건너뜀: {self.last_error}")
+                return False
+
+            with self._lock:
+                for code, info in self.tickers.items():
+                    if code not in listing:
+                        listing[code] = {**info, 'status': STATUS_DELISTED}
+
+                self.tickers = listing
+                self.built_date = datetime.now().strftime('%Y%m%d')
+                self.updated_at = datetime.now().isoformat()
+                self.last_error = None
+                self.failed_at = None
+
+            self.save()
+            logger.info(f"종목 마스터 갱신 완료: {len(listing)}개 종목")
+            return True
+
+        except Exception as e:
+            self.last_error = str(e)
+            self.failed_at = time.time()
+            logger.error(f"종목 마스터 갱신 실패: {e} ({TICKER_MASTER_RETRY_SECONDS}초 후 재시도)")
+            return False
+
+    def refresh_async(self):
+        """백그라운드 갱신 (이미 갱신 중이면 무시)"""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def worker():
+            try:
+                self.refresh()
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=worker, name='ticker-master-refresh', daemon=True).start()
+
+    def ensure_fresh(self):
+        """갱신이 필요하면 백그라운드 갱신 시작 (조회 경로를 막지 않음)"""
+        if self.needs_refresh():
+            self.refresh_async()
+
+    def lookup(self, stock_code: str) -> Optional[Dict]:
+        """종목 정보 조회"""
+        self.ensure_fresh()
+        info = self.tickers.get(stock_code)
+        return dict(info, code=stock_code) if info else None
+
+    def get_name(self, stock_code: str) -> Optional[str]:
+        """종목명 조회 (마스터에 없으면 None)"""
+        info = self.lookup(stock_code)
+        return info['name'] if info else None
+
+    def is_valid(self, stock_code: str) -> Optional[bool]:
+        """
+        상장 종목 여부
+
+        Returns:
+            Optional[bool]: 상장 중이면 True, 없거나 상장폐지면 False, 마스터 미구축 시 None
+        """
+        if not self.is_ready():
+            return None
+        info = self.lookup(stock_code)
+        return info is not None and info['status'] == STATUS_LISTED
+
+    def get_stats(self) -> Dict:
+        """종목 마스터 상태"""
+        with self._lock:
+            markets = {}
+            delisted = 0
+            for info in self.tickers.values():
+                markets[info['market']] = markets.get(info['market'], 0) + 1
+                if info['status'] == STATUS_DELISTED:
+                    delisted += 1
+
+            return {
+                'total': len(self.tickers),
+                'markets': markets,
+                'delisted': delisted,
+                'built_date': self.built_date,
+                'updated_at': self.updated_at,
+                'refreshing': self._refreshing,
+                'last_error': self.last_error,
+                'retry_at': (datetime.fromtimestamp(self.failed_at + TICKER_MASTER_RETRY_SECONDS).isoformat()
+                             if self.failed_at is not None else None)
+            }
+
+
+# 전역 인스턴스
+ticker_master = TickerMaster()
@@ -27,8 +27,7 @@ def verify_frontend_files():
         "modules/config.py": "설정 파일",
         "modules/stock_monitor.py": "주식 모니터링 모듈",
         "modules/email_utils.py": "이메일 유틸리티",
-        "data/monitoring_stocks.json": "주식 데이터",
-        "data/daily_history.json": "일일 내역 데이터"
+        "data/monitoring_stocks.json": "주식 데이터"
     }
     
     file_status = {}